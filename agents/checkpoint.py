@@ -0,0 +1,199 @@
+"""CheckpointStore: Crash-recovery checkpoints kept in a single SQLite database.
+
+Replaces the per-stage data/checkpoints/{job_id}/{stage}.json files from §7.1.
+Each save() is committed before it returns: one INSERT into `checkpoints`
+and one upsert into `latest`, in a single transaction. WAL mode with
+synchronous=NORMAL keeps that commit cheap (an append to the WAL, no fsync),
+and a committed save survives the process crashing. Payloads are stored as
+zlib-compressed JSON. The `latest` table tracks the newest checkpoint per
+job, so crash recovery is one indexed query instead of a directory walk.
+"""
+
+import dataclasses
+import json
+import os
+import sqlite3
+import zlib
+from datetime import datetime, timezone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS checkpoints (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    stage TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_checkpoints_job ON checkpoints (job_id, id);
+
+CREATE TABLE IF NOT EXISTS latest (
+    job_id TEXT PRIMARY KEY,
+    checkpoint_id INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    ts TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_latest_completed ON latest (completed);
+"""
+
+RETENTION_POLICIES = ("until_queued", "keep_all")
+
+
+def _default(obj):
+    """JSON fallback for dataclass results (ResumeResult etc.) and plain objects."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, set):
+        return sorted(obj)
+    if hasattr(obj, "__dict__"):
+        return vars(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class CheckpointStore:
+    def __init__(self, config: dict | None = None):
+        config = config or {}
+        cp_config = config.get("checkpoints", {})
+        self.db_path = cp_config.get("db_path", "data/checkpoints.db")
+        self.retention = config.get("cleanup", {}).get("checkpoint_retention", "until_queued")
+        if self.retention not in RETENTION_POLICIES:
+            raise ValueError(
+                f"Unknown checkpoint_retention '{self.retention}' "
+                f"(expected one of {', '.join(RETENTION_POLICIES)})"
+            )
+
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: commits are durable across process crashes without an
+        # fsync per transaction (only a power loss can drop the last commits).
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.conn.commit()
+
+    def save(self, job_id: str, stage: str, data) -> None:
+        """Write a checkpoint, committed before returning so a crash right after keeps it."""
+        payload = zlib.compress(json.dumps(data, default=_default).encode("utf-8"))
+        ts = datetime.now(timezone.utc).isoformat()
+        with self.conn:
+            cur = self.conn.execute(
+                "INSERT INTO checkpoints (job_id, stage, ts, payload) VALUES (?, ?, ?, ?)",
+                (job_id, stage, ts, payload),
+            )
+            self.conn.execute(
+                "INSERT INTO latest (job_id, checkpoint_id, stage, ts, completed) "
+                "VALUES (?, ?, ?, ?, 0) "
+                "ON CONFLICT(job_id) DO UPDATE SET "
+                "checkpoint_id = excluded.checkpoint_id, stage = excluded.stage, "
+                "ts = excluded.ts, completed = 0",
+                (job_id, cur.lastrowid, stage, ts),
+            )
+
+    def load_latest(self, job_id: str) -> dict | None:
+        """Return the most recent checkpoint for a job as {stage, data, ts}, or None."""
+        row = self.conn.execute(
+            "SELECT c.stage, c.ts, c.payload FROM latest l "
+            "JOIN checkpoints c ON c.id = l.checkpoint_id WHERE l.job_id = ?",
+            (job_id,),
+        ).fetchone()
+        return self._decode(row) if row else None
+
+    def load(self, job_id: str, stage: str) -> dict | None:
+        """Return the most recent checkpoint for a specific stage of a job."""
+        row = self.conn.execute(
+            "SELECT stage, ts, payload FROM checkpoints "
+            "WHERE job_id = ? AND stage = ? ORDER BY id DESC LIMIT 1",
+            (job_id, stage),
+        ).fetchone()
+        return self._decode(row) if row else None
+
+    def history(self, job_id: str) -> list[dict]:
+        """All checkpoints for a job, oldest first (e.g. every resume iteration)."""
+        rows = self.conn.execute(
+            "SELECT stage, ts, payload FROM checkpoints WHERE job_id = ? ORDER BY id",
+            (job_id,),
+        ).fetchall()
+        return [self._decode(r) for r in rows]
+
+    def list_incomplete(self, job_ids=None) -> list[dict]:
+        """Jobs with checkpoints that were never marked complete.
+
+        job_ids: optional collection (e.g. applications with status "generating")
+        to restrict the result to. Returns [{job_id, stage, ts}], oldest first.
+        """
+        rows = self.conn.execute(
+            "SELECT job_id, stage, ts FROM latest WHERE completed = 0 ORDER BY ts"
+        ).fetchall()
+        if job_ids is not None:
+            wanted = set(job_ids)
+            rows = [r for r in rows if r[0] in wanted]
+        return [{"job_id": r[0], "stage": r[1], "ts": r[2]} for r in rows]
+
+    def mark_complete(self, job_id: str) -> None:
+        """Record that a job left the pipeline (queued, skipped, expired)."""
+        with self.conn:
+            self.conn.execute("UPDATE latest SET completed = 1 WHERE job_id = ?", (job_id,))
+
+    def completed_jobs(self, limit: int = 50) -> list[tuple]:
+        """(job_id, payload bytes) for jobs marked complete, oldest first, for batched retention."""
+        return [tuple(r) for r in self.conn.execute(
+            "SELECT l.job_id, COALESCE((SELECT SUM(LENGTH(c.payload)) FROM checkpoints c "
+            "WHERE c.job_id = l.job_id), 0) FROM latest l WHERE l.completed = 1 ORDER BY l.ts LIMIT ?",
+            (limit,),
+        )]
+
+    def cleanup(self, job_id: str) -> int:
+        """Remove every checkpoint for one job. Returns rows deleted."""
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM checkpoints WHERE job_id = ?", (job_id,))
+            self.conn.execute("DELETE FROM latest WHERE job_id = ?", (job_id,))
+        return cur.rowcount
+
+    def compact(self) -> int:
+        """Apply cleanup.checkpoint_retention and truncate the WAL.
+
+        "until_queued": drop checkpoints of jobs marked complete.
+        "keep_all": delete nothing.
+        Returns the number of checkpoint rows deleted.
+        """
+        deleted = 0
+        if self.retention == "until_queued":
+            with self.conn:
+                cur = self.conn.execute(
+                    "DELETE FROM checkpoints WHERE job_id IN "
+                    "(SELECT job_id FROM latest WHERE completed = 1)"
+                )
+                self.conn.execute("DELETE FROM latest WHERE completed = 1")
+            deleted = cur.rowcount
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return deleted
+
+    def import_directory(self, checkpoint_dir: str = "data/checkpoints") -> int:
+        """One-shot migration of legacy {job_id}/{stage}.json checkpoint files."""
+        if not os.path.isdir(checkpoint_dir):
+            return 0
+        imported = 0
+        for job_id in sorted(os.listdir(checkpoint_dir)):
+            job_dir = os.path.join(checkpoint_dir, job_id)
+            if not os.path.isdir(job_dir):
+                continue
+            files = [f for f in os.listdir(job_dir) if f.endswith(".json")]
+            files.sort(key=lambda f: os.path.getmtime(os.path.join(job_dir, f)))
+            for name in files:
+                with open(os.path.join(job_dir, name)) as f:
+                    record = json.load(f)
+                self.save(job_id, record.get("stage", name[:-5]), record.get("data"))
+                imported += 1
+        return imported
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _decode(self, row) -> dict:
+        stage, ts, payload = row
+        return {
+            "stage": stage,
+            "data": json.loads(zlib.decompress(payload).decode("utf-8")),
+            "ts": ts,
+        }
@@ -0,0 +1,192 @@
+"""ConcurrencyController: AIMD tuning of the generation and Anthropic API limits.
+
+scheduling.max_concurrent_generations and anthropic_api.concurrent_max are
+starting points. Every adjust_interval_seconds the controller looks at the
+last window_seconds of LLM calls and:
+
+- halves the API limit on throttling (429s) or an error rate above threshold
+- halves the API limit when p95 latency is above threshold
+- halves the generation limit when spend is burning faster than the remaining
+  daily budget allows for the rest of the day
+- otherwise adds one slot to a limit that was saturated during the interval
+
+Limits stay within [min_limits, hard_caps]. An API decrease only looks at
+calls made since the previous API decrease, so one 429 halves the limit once
+rather than on every tick it stays in the window; the budget decrease happens
+at most once per cooldown_seconds. After a decrease a limit does not grow
+again until cooldown_seconds have passed. Every change is kept in
+adjustments with its reason and the metrics that triggered it.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+TARGETS = ("generations", "anthropic_api")
+
+
+def percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(pct / 100 * len(ordered))) - 1)]
+
+
+class ConcurrencyController:
+    def __init__(self, semaphores: dict, config: dict | None = None,
+                 budget: dict | None = None, clock=time.time):
+        """semaphores: {"generations": ResizableSemaphore, "anthropic_api": APIRateLimiter
+        or ResizableSemaphore}. budget: the budget section of config/budget.yaml."""
+        config = config or {}
+        settings = config.get("concurrency", {})
+        self.interval = settings.get("adjust_interval_seconds", 30)
+        self.window = settings.get("window_seconds", 120)
+        self.cooldown = settings.get("cooldown_seconds", self.window)
+        self.error_threshold = settings.get("error_rate_threshold", 0.05)
+        self.p95_threshold = settings.get("p95_latency_threshold_seconds", 60)
+        self.increase = settings.get("additive_increase", 1)
+        self.decrease = settings.get("multiplicative_decrease", 0.5)
+        self.min_samples = settings.get("min_samples", 5)
+        self.hard_caps = {
+            "generations": config.get("scheduling", {}).get("max_concurrent_generations", 3),
+            "anthropic_api": 5,
+            **settings.get("hard_caps", {}),
+        }
+        self.min_limits = {t: 1 for t in TARGETS} | settings.get("min_limits", {})
+        self.daily_limit = (budget or {}).get("daily_limit_usd")
+
+        self.semaphores = semaphores
+        self.clock = clock
+        self.adjustments = []
+        self._calls = deque()
+        self._spend = deque()
+        self._spent_today = 0.0
+        self._day = self._today()
+        self._last_decrease = {t: float("-inf") for t in TARGETS}
+
+    def record(self, latency: float, ok: bool = True, throttled: bool = False,
+               cost_usd: float = 0.0) -> None:
+        """Record one finished LLM call (from _call_llm)."""
+        now = self.clock()
+        self._calls.append((now, latency, ok, throttled))
+        if cost_usd:
+            self.record_cost(cost_usd)
+
+    def record_cost(self, cost_usd: float) -> None:
+        if self._today() != self._day:
+            self._day, self._spent_today = self._today(), 0.0
+        self._spend.append((self.clock(), cost_usd))
+        self._spent_today += cost_usd
+
+    def limit(self, target: str) -> int:
+        return self._sem(target).limit
+
+    def metrics(self) -> dict:
+        """Window metrics the next adjustment will be based on."""
+        now = self.clock()
+        self._trim(now)
+        calls = list(self._calls)
+        n = len(calls)
+        burn = sum(c for _, c in self._spend) / self.window
+        return {
+            "calls": n,
+            "error_rate": sum(not ok for _, _, ok, _ in calls) / n if n else 0.0,
+            "throttled": sum(t for _, _, _, t in calls),
+            "p95_latency": percentile([lat for _, lat, _, _ in calls], 95),
+            "burn_usd_per_s": burn,
+            "sustainable_usd_per_s": self._sustainable_burn(now),
+            "spent_today": self._spent_today,
+            "limits": {t: self.limit(t) for t in TARGETS if t in self.semaphores},
+        }
+
+    async def adjust(self) -> list[dict]:
+        """Run one AIMD step. Returns the adjustments made."""
+        m = self.metrics()
+        now = self.clock()
+        made = []
+
+        # Calls before the last decrease already had their effect on the limit
+        since = self._last_decrease["anthropic_api"]
+        fresh = [c for c in self._calls if c[0] > since]
+        throttled = sum(t for _, _, _, t in fresh)
+        error_rate = sum(not ok for _, _, ok, _ in fresh) / len(fresh) if fresh else 0.0
+        p95 = percentile([lat for _, lat, _, _ in fresh], 95)
+        api_reason = None
+        if throttled:
+            api_reason = f"{throttled} throttled (429) responses in window"
+        elif len(fresh) >= self.min_samples and error_rate > self.error_threshold:
+            api_reason = f"error rate {error_rate:.0%} > {self.error_threshold:.0%}"
+        elif len(fresh) >= self.min_samples and p95 > self.p95_threshold:
+            api_reason = f"p95 latency {p95:.1f}s > {self.p95_threshold}s"
+
+        gen_reason = None
+        sustainable = m["sustainable_usd_per_s"]
+        if (sustainable is not None and m["burn_usd_per_s"] > sustainable
+                and now - self._last_decrease["generations"] >= self.cooldown):
+            gen_reason = (f"budget burn ${m['burn_usd_per_s'] * 3600:.2f}/h > "
+                          f"sustainable ${sustainable * 3600:.2f}/h")
+
+        for target, reason in (("anthropic_api", api_reason), ("generations", gen_reason)):
+            if target not in self.semaphores:
+                continue
+            sem = self._sem(target)
+            peak = sem.reset_peak()
+            current = sem.limit
+            if reason is not None:
+                new = max(self.min_limits[target], int(current * self.decrease))
+                self._last_decrease[target] = now
+            elif peak >= current and now - self._last_decrease[target] >= self.cooldown:
+                new = min(self.hard_caps[target], current + self.increase)
+                reason = f"saturated ({peak}/{current} in use), healthy window"
+            else:
+                continue
+            if new != current:
+                made.append(await self._apply(target, current, new, reason, m))
+        return made
+
+    async def run(self) -> None:
+        """Background loop: adjust every adjust_interval_seconds."""
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.adjust()
+
+    async def _apply(self, target: str, old: int, new: int, reason: str, metrics: dict) -> dict:
+        holder = self.semaphores[target]
+        if hasattr(holder, "set_concurrency"):
+            await holder.set_concurrency(new)
+        else:
+            await holder.set_limit(new)
+        entry = {
+            "ts": datetime.fromtimestamp(self.clock(), timezone.utc).isoformat(),
+            "target": target,
+            "old": old,
+            "new": new,
+            "reason": reason,
+            "metrics": {k: v for k, v in metrics.items() if k != "limits"},
+        }
+        self.adjustments.append(entry)
+        return entry
+
+    def _sem(self, target: str):
+        holder = self.semaphores[target]
+        return getattr(holder, "semaphore", holder)
+
+    def _sustainable_burn(self, now: float) -> float | None:
+        """USD/s that would spend exactly the remaining budget by UTC midnight."""
+        if self.daily_limit is None:
+            return None
+        current = datetime.fromtimestamp(now, timezone.utc)
+        midnight = (current + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
+        remaining = max(0.0, self.daily_limit - self._spent_today)
+        return remaining / max(1.0, (midnight - current).total_seconds())
+
+    def _trim(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+        while self._spend and now - self._spend[0][0] > self.window:
+            self._spend.popleft()
+
+    def _today(self):
+        return datetime.fromtimestamp(self.clock(), timezone.utc).date()
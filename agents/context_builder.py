@@ -0,0 +1,146 @@
+"""ProfileContextBuilder: Job-relevant profile context for Resume and Cover Letter calls.
+
+Instead of the whole profile.json, generation prompts get a copy where the
+entry lists (experience, publications, presentations) are ranked against the
+job description with BM25 over ProfileIndex text (experience_text,
+pub_titles, skills_flat). Only the top entries keep their full text. The
+rest shrink to an id/title/date summary, so they can still be cited and the
+model knows they exist. Entries in claimed_ids, such as the previous draft's
+profile_entries_used during revision, are always kept in full.
+Everything else (identity, summary, skills, education) is passed through.
+
+Verification is unaffected: it always runs against the full ProfileIndex.
+"""
+
+import copy
+import json
+import logging
+import math
+import re
+from collections import Counter
+
+from agents.text import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Fields kept for an entry that is summarized rather than included in full
+SUMMARY_FIELDS = {
+    "experience": ("id", "title", "organization", "start_date", "end_date", "is_current"),
+    "publications": ("id", "title", "journal", "year", "type"),
+    "presentations": ("id", "title", "venue", "date", "type"),
+}
+
+
+def estimate_tokens(obj) -> int:
+    """Rough token count of the JSON a prompt would carry (~4 characters per token)."""
+    text = obj if isinstance(obj, str) else json.dumps(obj, ensure_ascii=False)
+    return math.ceil(len(text) / 4)
+
+
+class BM25:
+    """Okapi BM25 over a small fixed corpus of token lists."""
+
+    def __init__(self, docs: list[list[str]], k1: float = 1.5, b: float = 0.75):
+        self.k1, self.b = k1, b
+        self.docs = [Counter(d) for d in docs]
+        self.lengths = [len(d) for d in docs]
+        self.avg_len = sum(self.lengths) / len(docs) if docs else 0.0
+        df = Counter(t for d in self.docs for t in d)
+        n = len(docs)
+        self.idf = {t: math.log(1 + (n - f + 0.5) / (f + 0.5)) for t, f in df.items()}
+
+    def scores(self, query: list[str]) -> list[float]:
+        """Score per doc; repeated query terms count once per occurrence."""
+        terms = Counter(query)
+        out = []
+        for doc, length in zip(self.docs, self.lengths):
+            norm = self.k1 * (1 - self.b + self.b * length / (self.avg_len or 1))
+            out.append(sum(
+                qf * self.idf[t] * doc[t] * (self.k1 + 1) / (doc[t] + norm)
+                for t, qf in terms.items() if t in doc
+            ))
+        return out
+
+
+class ProfileContextBuilder:
+    def __init__(self, profile_index, config: dict | None = None):
+        self.index = profile_index
+        config = (config or {}).get("context", {})
+        self.top = {
+            "experience": config.get("top_experience", 4),
+            "publications": config.get("top_publications", 3),
+            "presentations": config.get("top_presentations", 2),
+        }
+        self.totals = {"calls": 0, "tokens_full": 0, "tokens_sent": 0}
+
+    def build(self, job: dict, claimed_ids=None, agent: str = "resume") -> dict:
+        """Returns {"profile", "full_ids", "summarized_ids", "tokens_full", "tokens_sent", "tokens_saved"}."""
+        profile = self.index.profile
+        claimed = set(claimed_ids or [])
+        query = tokenize(self._job_text(job))
+        pruned = copy.deepcopy(profile)
+        full_ids, summarized_ids = [], []
+
+        for section, top in self.top.items():
+            entries = profile.get(section, [])
+            if not entries:
+                continue
+            ranked = self._rank(section, entries, query)
+            keep = {e["id"] for e in ranked[:top]} | claimed
+            pruned[section] = [
+                copy.deepcopy(e) if e["id"] in keep else self._summarize(section, e)
+                for e in entries  # original order: chronology matters on a resume
+            ]
+            for e in entries:
+                (full_ids if e["id"] in keep else summarized_ids).append(e["id"])
+
+        tokens_full = estimate_tokens(profile)
+        tokens_sent = estimate_tokens(pruned)
+        self.totals["calls"] += 1
+        self.totals["tokens_full"] += tokens_full
+        self.totals["tokens_sent"] += tokens_sent
+        logger.info(
+            "Profile context for %s %s: %d -> %d tokens (saved %d, %d entries summarized)",
+            agent, job.get("job_id"), tokens_full, tokens_sent,
+            tokens_full - tokens_sent, len(summarized_ids),
+        )
+        return {
+            "profile": pruned,
+            "full_ids": full_ids,
+            "summarized_ids": summarized_ids,
+            "tokens_full": tokens_full,
+            "tokens_sent": tokens_sent,
+            "tokens_saved": tokens_full - tokens_sent,
+        }
+
+    def savings(self) -> dict:
+        t = self.totals
+        saved = t["tokens_full"] - t["tokens_sent"]
+        return {**t, "tokens_saved": saved,
+                "saved_fraction": saved / t["tokens_full"] if t["tokens_full"] else 0.0}
+
+    def _rank(self, section: str, entries: list, query: list) -> list:
+        docs = [tokenize(self._entry_text(section, e)) for e in entries]
+        scores = BM25(docs).scores(query)
+        order = sorted(range(len(entries)), key=lambda i: -scores[i])
+        return [entries[i] for i in order]
+
+    def _entry_text(self, section: str, entry: dict) -> str:
+        if section == "experience":
+            return self.index.experience_text.get(entry["id"], "")
+        if section == "publications":
+            return f"{self.index.pub_titles.get(entry['id'], '')} {entry.get('summary', '')}"
+        return entry.get("title", "")
+
+    def _summarize(self, section: str, entry: dict) -> dict:
+        return {k: entry[k] for k in SUMMARY_FIELDS[section] if k in entry}
+
+    def _job_text(self, job: dict) -> str:
+        role = job.get("role", {})
+        # Profile skills the job names count twice: they are what tailoring hinges on
+        text = f"{role.get('title', '')} {role.get('description_raw', '')}"
+        named = [
+            s for s in self.index.skills_flat
+            if re.search(rf"(?<![\w+#]){re.escape(s)}(?![\w+#])", text, re.I)
+        ]
+        return f"{text} {' '.join(named)}"
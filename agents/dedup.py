@@ -0,0 +1,357 @@
+"""JobDeduplicator: Discovery-time dedup against data/seen_jobs.db.
+
+Answers "is this the same job posting?" (Appendix B.9). Exact match on the
+canonical URL first; a Bloom filter loaded at startup answers "definitely new"
+so only possible repeats cost a SQLite lookup. The filter is written back
+every url_filter_save_every new URLs and on close(); after a crash, a saved
+filter that lags seen_jobs is rebuilt from it. Otherwise a MinHash/LSH index
+over description shingles, persisted next to seen_jobs.db, narrows the whole
+history to a few candidates in sub-linear time, and only those candidates are
+confirmed with an exact similarity.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import zlib
+from datetime import datetime, timezone
+
+import numpy as np
+
+from agents.url_filter import URLFilter, canonicalize_url
+
+# Universal hashing (a*x + b) mod p; a < 2**31 and x < 2**32 keep the product in uint64
+MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+MAX_HASH = np.uint64(0xFFFFFFFF)
+
+
+class MinHasher:
+    """Word k-shingles and their MinHash signatures."""
+
+    def __init__(self, num_perm: int = 128, shingle_size: int = 5, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, 1 << 31, num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, 1 << 31, num_perm, dtype=np.uint64)
+
+    def shingles(self, text: str) -> set:
+        """Hashed word k-shingles. Short texts fall back to a single shingle."""
+        words = re.findall(r"\w+", text.lower())
+        k = self.shingle_size
+        if len(words) < k:
+            return {zlib.crc32(" ".join(words).encode())} if words else set()
+        return {
+            zlib.crc32(" ".join(words[i:i + k]).encode())
+            for i in range(len(words) - k + 1)
+        }
+
+    def signature(self, shingles: set) -> np.ndarray:
+        """MinHash signature (uint32[num_perm]) of a shingle set, vectorized over permutations."""
+        if not shingles:
+            return np.full(self.num_perm, MAX_HASH, dtype=np.uint32)
+        hv = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        phv = (np.outer(hv, self.a) + self.b) % MERSENNE_PRIME & MAX_HASH
+        return phv.min(axis=0).astype(np.uint32)
+
+
+class LSHIndex:
+    """Banded LSH buckets over MinHash signatures, stored in SQLite.
+
+    bands * rows must equal the signature length (num_perm); anything else is
+    rejected. The similarity at which a pair becomes likely to share a bucket
+    is roughly (1 / bands) ** (1 / rows).
+    """
+
+    def __init__(self, path: str, bands: int = 16, rows: int = 8, num_perm: int = 128):
+        if bands * rows != num_perm:
+            raise ValueError(
+                f"lsh_bands * lsh_rows must equal minhash_permutations "
+                f"({bands} * {rows} = {bands * rows}, expected {num_perm})"
+            )
+        self.bands = bands
+        self.rows = rows
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                key INTEGER NOT NULL,
+                job_id TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_buckets ON buckets (band, key);
+            CREATE TABLE IF NOT EXISTS indexed (job_id TEXT PRIMARY KEY);
+            """
+        )
+        self.conn.commit()
+
+    def band_keys(self, signature: np.ndarray) -> list[tuple]:
+        keys = []
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            keys.append((band, int.from_bytes(digest, "big", signed=True)))
+        return keys
+
+    def add(self, job_id: str, signature: np.ndarray, commit: bool = True) -> None:
+        if self.conn.execute("SELECT 1 FROM indexed WHERE job_id = ?", (job_id,)).fetchone():
+            return
+        self.conn.executemany(
+            "INSERT INTO buckets (band, key, job_id) VALUES (?, ?, ?)",
+            [(band, key, job_id) for band, key in self.band_keys(signature)],
+        )
+        self.conn.execute("INSERT INTO indexed (job_id) VALUES (?)", (job_id,))
+        if commit:
+            self.conn.commit()
+
+    def candidates(self, signature: np.ndarray) -> set:
+        """job_ids sharing at least one band bucket with the signature."""
+        keys = self.band_keys(signature)
+        # One indexed point lookup per band; UNION also de-duplicates
+        sql = " UNION ".join(
+            "SELECT job_id FROM buckets WHERE band = ? AND key = ?" for _ in keys
+        )
+        rows = self.conn.execute(sql, [v for pair in keys for v in pair]).fetchall()
+        return {r[0] for r in rows}
+
+    def __contains__(self, job_id: str) -> bool:
+        return bool(self.conn.execute(
+            "SELECT 1 FROM indexed WHERE job_id = ?", (job_id,)
+        ).fetchone())
+
+    def commit(self) -> None:
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def jaccard(a: set, b: set) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class JobDeduplicator:
+    def __init__(self, config: dict | None = None, similarity=None):
+        """similarity: optional callable (text_a, text_b) -> float used to confirm
+        LSH candidates. Defaults to exact shingle Jaccard."""
+        config = (config or {}).get("dedup", {})
+        self.db_path = config.get("seen_jobs_path", "data/seen_jobs.db")
+        self.threshold = config.get("similarity_threshold", 0.80)
+        self.hasher = MinHasher(
+            num_perm=config.get("minhash_permutations", 128),
+            shingle_size=config.get("shingle_size", 5),
+        )
+        self.similarity = similarity
+
+        os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        root, _ = os.path.splitext(self.db_path)
+        self.lsh = LSHIndex(
+            config.get("lsh_path", root + "_lsh.db"),
+            bands=config.get("lsh_bands", 16),
+            rows=config.get("lsh_rows", 8),
+            num_perm=self.hasher.num_perm,
+        )
+
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                job_id TEXT PRIMARY KEY,
+                url TEXT,
+                company TEXT,
+                title TEXT,
+                text TEXT,
+                first_seen TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_seen_jobs_url ON seen_jobs (url);
+            """
+        )
+        self.conn.commit()
+
+        self.url_filter_path = config.get("url_filter_path", root + "_urls.bloom")
+        self.url_filter_capacity = config.get("url_filter_capacity", 200_000)
+        self.url_filter_fp_rate = config.get("url_filter_fp_rate", 0.01)
+        self.url_filter_save_every = config.get("url_filter_save_every", 500)
+        self._unsaved_urls = 0
+        self.url_stats = {"checks": 0, "db_lookups": 0, "false_positives": 0}
+        # DiscoveryPipeline checks and records from separate worker threads
+        self._lock = threading.RLock()
+        self.url_filter = self._load_url_filter()
+
+    def add_seen(self, job: dict) -> None:
+        self.add_many([job])
+
+    def add_many(self, jobs) -> int:
+        """Record jobs as seen and index them, in one transaction. Returns count added."""
+        with self._lock:
+            return self._add_many(jobs)
+
+    def _add_many(self, jobs) -> int:
+        added = 0
+        now = datetime.now(timezone.utc).isoformat()
+        for job in jobs:
+            text = self._job_text(job)
+            url = self._url(job)
+            cur = self.conn.execute(
+                "INSERT OR IGNORE INTO seen_jobs (job_id, url, company, title, text, first_seen) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job["job_id"], url, job.get("company", {}).get("name", ""),
+                 job.get("role", {}).get("title", ""), text, now),
+            )
+            if cur.rowcount:
+                if url:
+                    self.url_filter.add(url)
+                    self._unsaved_urls += 1
+                sig = self.hasher.signature(self.hasher.shingles(text))
+                self.lsh.add(job["job_id"], sig, commit=False)
+                added += 1
+        self.conn.commit()
+        self.lsh.commit()
+        if self.url_filter.over_capacity():
+            self.url_filter = self.rebuild_url_filter()
+        elif self._unsaved_urls >= self.url_filter_save_every:
+            self._save_url_filter()
+        return added
+
+    def is_duplicate(self, job: dict) -> tuple:
+        """Returns (is_dup, matched_job_id, similarity).
+
+        Exact URL match -> similarity 1.0. Otherwise LSH candidates are
+        confirmed against threshold with the exact similarity function.
+        """
+        url_match = self.url_duplicate(job)
+        if url_match is not None:
+            return (True, url_match, 1.0)
+        return self.near_duplicate(job)
+
+    def url_duplicate(self, job: dict) -> str | None:
+        """job_id of a seen job with the same canonical URL, or None."""
+        url = self._url(job)
+        if not url:
+            return None
+        with self._lock:
+            return self._url_duplicate(url)
+
+    def _url_duplicate(self, url: str) -> str | None:
+        self.url_stats["checks"] += 1
+        # Bloom filter: a miss means definitely unseen, so skip the lookup
+        if url not in self.url_filter:
+            return None
+        self.url_stats["db_lookups"] += 1
+        row = self.conn.execute(
+            "SELECT job_id FROM seen_jobs WHERE url = ? LIMIT 1", (url,)
+        ).fetchone()
+        if row:
+            return row[0]
+        self.url_stats["false_positives"] += 1
+        return None
+
+    def near_duplicate(self, job: dict) -> tuple:
+        """LSH + exact-similarity check only. Returns (is_dup, matched_job_id, similarity)."""
+        text = self._job_text(job)
+        shingles = self.hasher.shingles(text)
+        signature = self.hasher.signature(shingles)
+        with self._lock:
+            candidates = self.lsh.candidates(signature)
+            candidates.discard(job.get("job_id"))
+            rows = [(cid, self.conn.execute("SELECT text FROM seen_jobs WHERE job_id = ?", (cid,)).fetchone())
+                    for cid in candidates]
+
+        best_id, best_sim = None, 0.0
+        for cid, row in rows:
+            if row is None:
+                continue
+            if self.similarity is not None:
+                sim = self.similarity(text, row[0])
+            else:
+                sim = jaccard(shingles, self.hasher.shingles(row[0]))
+            if sim > best_sim:
+                best_id, best_sim = cid, sim
+
+        if best_sim >= self.threshold:
+            return (True, best_id, best_sim)
+        return (False, None, best_sim)
+
+    def reindex(self) -> int:
+        """Index seen_jobs rows that predate the LSH index. Returns rows indexed."""
+        indexed = 0
+        for job_id, text in self.conn.execute("SELECT job_id, text FROM seen_jobs"):
+            if job_id in self.lsh:
+                continue
+            self.lsh.add(job_id, self.hasher.signature(self.hasher.shingles(text or "")), commit=False)
+            indexed += 1
+        self.lsh.commit()
+        return indexed
+
+    def rebuild_url_filter(self) -> URLFilter:
+        """Rebuild the URL filter from seen_jobs, sized for twice the current rows.
+
+        Also rewrites stored URLs into canonical form so filter hits and
+        lookups agree with rows written before canonicalization.
+        """
+        rows = self.conn.execute("SELECT job_id, url FROM seen_jobs WHERE url != ''").fetchall()
+        capacity = max(self.url_filter_capacity, 2 * len(rows))
+        url_filter = URLFilter(capacity, self.url_filter_fp_rate)
+        updates = []
+        for job_id, url in rows:
+            canonical = canonicalize_url(url)
+            if canonical != url:
+                updates.append((canonical, job_id))
+            url_filter.add(canonical)
+        if updates:
+            with self.conn:
+                self.conn.executemany("UPDATE seen_jobs SET url = ? WHERE job_id = ?", updates)
+        url_filter.save(self.url_filter_path)
+        self._unsaved_urls = 0
+        return url_filter
+
+    def url_filter_report(self) -> dict:
+        """Filter size, memory and false-positive rates (expected and observed)."""
+        f = self.url_filter
+        negatives = self.url_stats["checks"] - (self.url_stats["db_lookups"] - self.url_stats["false_positives"])
+        return {
+            "urls": f.count,
+            "capacity": f.capacity,
+            "memory_bytes": f.memory_bytes(),
+            "hashes": f.num_hashes,
+            "expected_fp_rate": f.expected_fp_rate(),
+            "observed_fp_rate": self.url_stats["false_positives"] / negatives if negatives else 0.0,
+            **self.url_stats,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._save_url_filter()
+            self.conn.close()
+            self.lsh.close()
+
+    def _save_url_filter(self) -> None:
+        self.url_filter.save(self.url_filter_path)
+        self._unsaved_urls = 0
+
+    def _load_url_filter(self) -> URLFilter:
+        if os.path.exists(self.url_filter_path):
+            url_filter = URLFilter.load(self.url_filter_path)
+            rows = self.conn.execute("SELECT COUNT(*) FROM seen_jobs WHERE url != ''").fetchone()[0]
+            # A filter that lags the table (crash before save) or is over capacity is rebuilt
+            if url_filter.count >= rows and not url_filter.over_capacity():
+                return url_filter
+        return self.rebuild_url_filter()
+
+    def _url(self, job: dict) -> str:
+        return canonicalize_url(job.get("source_url") or job.get("role", {}).get("url", ""))
+
+    def _job_text(self, job: dict) -> str:
+        role = job.get("role", {})
+        return " ".join([
+            role.get("title", ""),
+            job.get("company", {}).get("name", ""),
+            role.get("description_raw", ""),
+        ])
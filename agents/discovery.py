@@ -0,0 +1,234 @@
+"""DiscoveryPipeline: Streaming Scout -> Match discovery with bounded queues.
+
+Stages run concurrently and hand listings downstream through bounded
+asyncio queues:
+
+    fetch -> normalize -> url_dedup -> near_dup -> prescreen -> match
+
+Matching of the first listings overlaps with fetching the rest. A full queue
+blocks the stage feeding it, so slow LLM matching throttles the sources
+instead of buffering a whole cycle in memory. Each stage reports its queue
+depth and throughput; the pipeline reports time to first match.
+
+A stage function takes one listing and returns the listing to pass on, or
+None to drop it. Sync and async functions are both accepted. The dedup
+stages do blocking SQLite and file I/O, so they run in worker threads. A stage that
+raises drops that listing and records the error ("log and move on", §4.1).
+"""
+
+import asyncio
+import hashlib
+import inspect
+import time
+from datetime import datetime, timezone
+
+from agents.url_filter import canonicalize_url
+
+_DONE = object()
+
+
+def normalize_listing(raw: dict) -> dict | None:
+    """Fill the Scout output shape (§4.1) for a raw listing; None if it has no URL or title."""
+    job = dict(raw)
+    company = dict(job.get("company") or {})
+    role = dict(job.get("role") or {})
+    role.setdefault("title", job.pop("title", ""))
+    role.setdefault("url", job.get("source_url", ""))
+    role.setdefault("description_raw", job.pop("description", ""))
+    role["title"] = (role["title"] or "").strip()
+    role["description_raw"] = (role["description_raw"] or "").strip()
+    company.setdefault("name", "")
+    job["company"] = company
+    job["role"] = role
+    job.setdefault("source_url", role["url"])
+    if not job["source_url"] or not role["title"]:
+        return None
+    if not job.get("job_id"):
+        digest = hashlib.sha1(job["source_url"].encode("utf-8")).hexdigest()[:10]
+        job["job_id"] = f"scout_{datetime.now(timezone.utc).strftime('%Y%m%d%H%M%S')}_{digest}"
+    job.setdefault("application_questions", [])
+    return job
+
+
+class StageMetrics:
+    """Counters for one stage. Throughput is items processed per second since start."""
+
+    def __init__(self, name: str, queue: asyncio.Queue | None, workers: int):
+        self.name = name
+        self.queue = queue
+        self.workers = workers
+        self.processed = 0
+        self.passed = 0
+        self.dropped = 0
+        self.errors = 0
+        self.busy = 0.0
+        self.last_error = None
+
+    def summary(self, elapsed: float) -> dict:
+        return {
+            "workers": self.workers,
+            "queue_depth": self.queue.qsize() if self.queue is not None else 0,
+            "queue_max": self.queue.maxsize if self.queue is not None else 0,
+            "processed": self.processed,
+            "passed": self.passed,
+            "dropped": self.dropped,
+            "errors": self.errors,
+            "throughput_per_s": self.processed / elapsed if elapsed > 0 else 0.0,
+            "busy_s": round(self.busy, 3),
+            "last_error": self.last_error,
+        }
+
+
+def _in_thread(fn):
+    """Stage function running the blocking fn in a worker thread."""
+    async def stage(item):
+        return await asyncio.to_thread(fn, item)
+    return stage
+
+
+class DiscoveryPipeline:
+    def __init__(self, sources, match, deduplicator=None, prescreen=None,
+                 normalize=normalize_listing, config: dict | None = None):
+        """sources: async iterables (or zero-arg callables returning one) of raw listings.
+        match: stage function for the Match Agent; its return value is what run() yields.
+        deduplicator: JobDeduplicator; listings that pass near-dup are recorded as seen.
+        prescreen: optional stage function run before matching."""
+        config = (config or {}).get("discovery", {})
+        self.queue_size = config.get("queue_size", 50)
+        self.sources = list(sources)
+        self.dedup = deduplicator
+
+        stages = [("normalize", normalize, config.get("normalize_workers", 1))]
+        if deduplicator is not None:
+            stages.append(("url_dedup", _in_thread(self._url_dedup), 1))
+            stages.append(("near_dup", _in_thread(self._near_dup), 1))
+        if prescreen is not None:
+            stages.append(("prescreen", prescreen, config.get("prescreen_workers", 1)))
+        stages.append(("match", match, config.get("match_workers", 3)))
+        self.stages = stages
+
+        self._metrics = {}
+        self._started = None
+        self._finished = None
+        self._first_match = None
+        self._cycle_urls = set()
+
+    async def run(self):
+        """Async generator yielding match results as soon as each one completes."""
+        self._started = time.monotonic()
+        self._finished = self._first_match = None
+        self._cycle_urls = set()
+        queues = [asyncio.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        self._metrics = {"fetch": StageMetrics("fetch", None, len(self.sources))}
+        for (name, _, workers), queue in zip(self.stages, queues):
+            self._metrics[name] = StageMetrics(name, queue, workers)
+
+        tasks = [asyncio.create_task(self._fetch_all(queues[0], self.stages[0][2]))]
+        for i, (name, fn, workers) in enumerate(self.stages):
+            downstream = self.stages[i + 1][2] if i + 1 < len(self.stages) else 1
+            tasks.append(asyncio.create_task(
+                self._run_stage(self._metrics[name], fn, queues[i], queues[i + 1], downstream)
+            ))
+
+        results = queues[-1]
+        try:
+            while True:
+                item = await results.get()
+                if item is _DONE:
+                    break
+                if self._first_match is None:
+                    self._first_match = time.monotonic()
+                yield item
+            await asyncio.gather(*tasks)
+        finally:
+            # Consumer stopped early or failed: stop fetching and matching
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._finished = time.monotonic()
+
+    async def collect(self) -> list:
+        return [result async for result in self.run()]
+
+    def metrics(self) -> dict:
+        """Per-stage queue depth and throughput, plus cycle timing."""
+        if self._started is None:
+            return {}
+        end = self._finished or time.monotonic()
+        elapsed = end - self._started
+        return {
+            "elapsed_s": elapsed,
+            "time_to_first_match_s": (
+                self._first_match - self._started if self._first_match is not None else None
+            ),
+            "stages": {name: m.summary(elapsed) for name, m in self._metrics.items()},
+        }
+
+    async def _fetch_all(self, out: asyncio.Queue, downstream: int) -> None:
+        await asyncio.gather(*(self._fetch(source, out) for source in self.sources))
+        for _ in range(downstream):
+            await out.put(_DONE)
+
+    async def _fetch(self, source, out: asyncio.Queue) -> None:
+        metrics = self._metrics["fetch"]
+        if callable(source):
+            source = source()
+        try:
+            async for listing in source:
+                metrics.processed += 1
+                metrics.passed += 1
+                # Blocks while normalize's queue is full, which pauses this source
+                await out.put(listing)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            metrics.errors += 1
+            metrics.last_error = f"{type(e).__name__}: {e}"
+
+    async def _run_stage(self, metrics: StageMetrics, fn, inbox: asyncio.Queue,
+                         out: asyncio.Queue, downstream: int) -> None:
+        await asyncio.gather(*(
+            self._worker(metrics, fn, inbox, out) for _ in range(metrics.workers)
+        ))
+        for _ in range(downstream):
+            await out.put(_DONE)
+
+    async def _worker(self, metrics: StageMetrics, fn, inbox: asyncio.Queue, out: asyncio.Queue) -> None:
+        while True:
+            item = await inbox.get()
+            if item is _DONE:
+                return
+            start = time.monotonic()
+            try:
+                result = fn(item)
+                if inspect.isawaitable(result):
+                    result = await result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                metrics.errors += 1
+                metrics.last_error = f"{type(e).__name__}: {e}"
+                result = None
+            metrics.busy += time.monotonic() - start
+            metrics.processed += 1
+            if result is None:
+                metrics.dropped += 1
+                continue
+            metrics.passed += 1
+            await out.put(result)
+
+    def _url_dedup(self, job: dict) -> dict | None:
+        # Listings still in flight aren't in seen_jobs yet, so also check this cycle's URLs
+        url = canonicalize_url(job.get("source_url") or job["role"].get("url", ""))
+        if url in self._cycle_urls or self.dedup.url_duplicate(job) is not None:
+            return None
+        self._cycle_urls.add(url)
+        return job
+
+    def _near_dup(self, job: dict) -> dict | None:
+        is_dup, _, _ = self.dedup.near_duplicate(job)
+        if is_dup:
+            return None
+        # Record now so later listings in the same cycle dedup against this one
+        self.dedup.add_seen(job)
+        return job
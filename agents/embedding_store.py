@@ -0,0 +1,175 @@
+"""EmbeddingStore: Append-only, memory-mapped float16 embedding matrix.
+
+Vectors for job descriptions and profile entries are stored as raw float16
+rows in one file (data/embeddings.f16) with a text-hash -> row index in a
+small SQLite sidecar. Misses are encoded in batches by a sentence-transformers
+model loaded from a local path. Worker processes open the store read-only and
+share the mapped pages through the OS page cache instead of copying them.
+
+Single writer: only one process should open the store with read_only=False.
+"""
+
+import hashlib
+import os
+import sqlite3
+
+import numpy as np
+
+SEARCH_BLOCK_ROWS = 65536
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    def __init__(self, config: dict | None = None, read_only: bool = False, encoder=None):
+        """encoder: optional object with encode(texts, ...) -> ndarray. Defaults to a
+        SentenceTransformer loaded lazily from embeddings.model_path on first miss."""
+        config = (config or {}).get("embeddings", {})
+        self.path = config.get("store_path", "data/embeddings.f16")
+        self.index_path = config.get("index_path", self.path + ".idx.db")
+        self.model_path = config.get("model_path", "models/all-MiniLM-L6-v2")
+        self.dim = config.get("dim", 384)
+        self.batch_size = config.get("batch_size", 64)
+        self.read_only = read_only
+        self._encoder = encoder
+
+        if read_only:
+            self.conn = sqlite3.connect(
+                f"file:{self.index_path}?mode=ro", uri=True, check_same_thread=False
+            )
+        else:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.conn = sqlite3.connect(self.index_path, check_same_thread=False)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS rows (hash TEXT PRIMARY KEY, row INTEGER NOT NULL);
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+                """
+            )
+            self.conn.execute(
+                "INSERT OR IGNORE INTO meta (key, value) VALUES ('dim', ?)", (str(self.dim),)
+            )
+            self.conn.commit()
+            if not os.path.exists(self.path):
+                open(self.path, "wb").close()
+
+        stored_dim = self.conn.execute("SELECT value FROM meta WHERE key = 'dim'").fetchone()
+        if stored_dim and int(stored_dim[0]) != self.dim:
+            raise ValueError(f"Store {self.path} has dim {stored_dim[0]}, config says {self.dim}")
+
+        self._matrix = None
+        self._remap()
+
+    def __len__(self) -> int:
+        return self._matrix.shape[0]
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The (rows, dim) float16 memmap. Read-only view; never copied."""
+        return self._matrix
+
+    def rows_for(self, texts) -> list:
+        """Row numbers for texts (None for texts not yet stored)."""
+        hashes = [text_hash(t) for t in texts]
+        found = {}
+        for i in range(0, len(hashes), 500):
+            chunk = hashes[i:i + 500]
+            placeholders = ", ".join("?" for _ in chunk)
+            found.update(self.conn.execute(
+                f"SELECT hash, row FROM rows WHERE hash IN ({placeholders})", chunk
+            ).fetchall())
+        rows = [found.get(h) for h in hashes]
+        if any(r is not None and r >= len(self) for r in rows):
+            self._remap()  # another process appended since we mapped the file
+        return rows
+
+    def get(self, texts) -> np.ndarray:
+        """float32 (len(texts), dim) vectors; misses are encoded in batches and appended."""
+        texts = list(texts)
+        rows = self.rows_for(texts)
+        missing = list(dict.fromkeys(t for t, r in zip(texts, rows) if r is None))
+        if missing:
+            if self.read_only:
+                raise KeyError(f"{len(missing)} texts not in read-only embedding store")
+            self._append(missing, self._encode(missing))
+            rows = self.rows_for(texts)
+        if not rows:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return self._matrix[rows].astype(np.float32)
+
+    def vector(self, text: str) -> np.ndarray:
+        return self.get([text])[0]
+
+    def similarity(self, text_a: str, text_b: str) -> float:
+        """Cosine similarity of two texts (usable as JobDeduplicator's confirmer)."""
+        a, b = self.get([text_a, text_b])
+        return float(np.dot(a, b) / (np.linalg.norm(a) * np.linalg.norm(b) or 1.0))
+
+    def top_k(self, query, k: int = 10) -> list[tuple]:
+        """Brute-force cosine top-k over all rows: [(row, score)], best first.
+
+        query: text or vector. Scans the memmap block by block so memory stays
+        flat as the matrix grows.
+        """
+        q = self.vector(query) if isinstance(query, str) else np.asarray(query, dtype=np.float32)
+        q = q / (np.linalg.norm(q) or 1.0)
+        n = len(self)
+        if n == 0 or k <= 0:
+            return []
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, n, SEARCH_BLOCK_ROWS):
+            block = self._matrix[start:start + SEARCH_BLOCK_ROWS].astype(np.float32)
+            norms = np.linalg.norm(block, axis=1)
+            norms[norms == 0] = 1.0
+            scores = block @ q / norms
+            rows = np.arange(start, start + len(block))
+            best_rows = np.concatenate([best_rows, rows])
+            best_scores = np.concatenate([best_scores, scores])
+            if len(best_scores) > k:
+                keep = np.argpartition(-best_scores, k)[:k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        order = np.argsort(-best_scores)
+        return [(int(best_rows[i]), float(best_scores[i])) for i in order]
+
+    def close(self) -> None:
+        self._matrix = None
+        self.conn.close()
+
+    def _encode(self, texts: list) -> np.ndarray:
+        if self._encoder is None:
+            from sentence_transformers import SentenceTransformer
+            self._encoder = SentenceTransformer(self.model_path, device="cpu")
+        vectors = self._encoder.encode(
+            texts, batch_size=self.batch_size, normalize_embeddings=True, convert_to_numpy=True
+        )
+        vectors = np.asarray(vectors, dtype=np.float16)
+        if vectors.shape != (len(texts), self.dim):
+            raise ValueError(f"Encoder returned {vectors.shape}, expected ({len(texts)}, {self.dim})")
+        return vectors
+
+    def _append(self, texts: list, vectors: np.ndarray) -> None:
+        # Data first, index second: readers never see a row past the end of the file
+        start = os.path.getsize(self.path) // (self.dim * 2)
+        with open(self.path, "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float16).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO rows (hash, row) VALUES (?, ?)",
+                [(text_hash(t), start + i) for i, t in enumerate(texts)],
+            )
+        self._remap()
+
+    def _remap(self) -> None:
+        n = os.path.getsize(self.path) // (self.dim * 2) if os.path.exists(self.path) else 0
+        if n == 0:
+            self._matrix = np.empty((0, self.dim), dtype=np.float16)
+        else:
+            self._matrix = np.memmap(self.path, dtype=np.float16, mode="r", shape=(n, self.dim))
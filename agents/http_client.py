@@ -0,0 +1,207 @@
+"""HTTPClient: Pooled, keep-alive aiohttp client shared by Scout sources and PostingChecker.
+
+One ClientSession for the whole process: per-host connection pools with
+keep-alive (no TLS handshake per request), cached DNS, gzip, a cap on response
+size, and a per-host APIRateLimiter configured from config/rate_limits.yaml.
+Latency and error counts are tracked per host.
+"""
+
+import asyncio
+import json
+import time
+from collections import deque
+from urllib.parse import urlsplit
+
+import aiohttp
+from multidict import CIMultiDict
+
+from agents.rate_limiter import APIRateLimiter
+
+# Hosts whose limits come from a named section of config/rate_limits.yaml
+HOST_LIMIT_KEYS = {
+    "serpapi.com": "serpapi",
+    "api.greenhouse.io": "greenhouse_api",
+    "boards-api.greenhouse.io": "greenhouse_api",
+    "api.lever.co": "lever_api",
+}
+
+
+class ResponseTooLarge(Exception):
+    """Raised by get_json when a JSON body exceeds the response size limit."""
+
+
+class HTTPResponse:
+    def __init__(self, url, status, headers, body, truncated, elapsed):
+        self.url = url
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.truncated = truncated
+        self.elapsed = elapsed
+
+    def text(self, encoding: str = "utf-8") -> str:
+        return self.body.decode(encoding, errors="replace")
+
+
+class HostMetrics:
+    """Request count, error count, status histogram and recent latencies for one host."""
+
+    def __init__(self, window: int = 1000):
+        self.requests = 0
+        self.errors = 0
+        self.bytes_read = 0
+        self.statuses = {}
+        self.latencies = deque(maxlen=window)
+
+    def record(self, latency: float, status: int | None = None, nbytes: int = 0) -> None:
+        self.requests += 1
+        self.latencies.append(latency)
+        self.bytes_read += nbytes
+        if status is None or status >= 500:
+            self.errors += 1
+        if status is not None:
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+
+    def summary(self) -> dict:
+        ordered = sorted(self.latencies)
+
+        def pct(p):
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "error_rate": self.errors / self.requests if self.requests else 0.0,
+            "p50_latency": pct(0.50),
+            "p95_latency": pct(0.95),
+            "bytes_read": self.bytes_read,
+            "statuses": dict(self.statuses),
+        }
+
+
+class HTTPClient:
+    def __init__(self, rate_limits: dict | None = None, config: dict | None = None):
+        self.rate_limits = rate_limits or {}
+        config = (config or {}).get("http", {})
+        self.total_connections = config.get("max_connections", 100)
+        self.connections_per_host = config.get("connections_per_host", 8)
+        self.keepalive = config.get("keepalive_seconds", 30)
+        self.dns_cache = config.get("dns_cache_seconds", 300)
+        self.max_bytes = config.get("max_response_bytes", 5 * 1024 * 1024)
+        self.timeout = config.get("timeout_seconds", 10)
+        self.user_agent = config.get("user_agent", "job-agent/3")
+
+        self._session = None
+        self._limiters = {}
+        self._metrics = {}
+
+    async def start(self) -> None:
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.total_connections,
+            limit_per_host=self.connections_per_host,
+            ttl_dns_cache=self.dns_cache,
+            keepalive_timeout=self.keepalive,
+        )
+        self._session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=self.timeout),
+            headers={"User-Agent": self.user_agent, "Accept-Encoding": "gzip, deflate"},
+            auto_decompress=True,
+        )
+
+    async def close(self) -> None:
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict | None = None,
+        max_bytes: int | None = None,
+        allow_redirects: bool = True,
+        **kwargs,
+    ) -> HTTPResponse:
+        """Issue a request through the host's limiter; body reading stops at max_bytes.
+
+        Connection errors and timeouts are recorded as errors and re-raised.
+        """
+        await self.start()
+        host = urlsplit(url).hostname or ""
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        limiter = self._limiter(host)
+        metrics = self._metrics.setdefault(host, HostMetrics())
+
+        await limiter.acquire()
+        start = time.monotonic()
+        try:
+            async with self._session.request(
+                method, url, headers=headers, allow_redirects=allow_redirects, **kwargs
+            ) as resp:
+                body, truncated = await self._read_capped(resp, limit)
+                elapsed = time.monotonic() - start
+                metrics.record(elapsed, resp.status, len(body))
+                return HTTPResponse(
+                    str(resp.url), resp.status, CIMultiDict(resp.headers), body, truncated, elapsed
+                )
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            metrics.record(time.monotonic() - start, None)
+            raise
+        finally:
+            limiter.release()
+
+    async def get(self, url: str, **kwargs) -> HTTPResponse:
+        return await self.request("GET", url, **kwargs)
+
+    async def head(self, url: str, **kwargs) -> HTTPResponse:
+        return await self.request("HEAD", url, **kwargs)
+
+    async def get_json(self, url: str, **kwargs):
+        """GET and decode JSON. Raises ResponseTooLarge rather than parse a cut-off body."""
+        resp = await self.get(url, **kwargs)
+        if resp.truncated:
+            raise ResponseTooLarge(f"{url}: response exceeded {self.max_bytes} bytes")
+        return json.loads(resp.body)
+
+    def metrics(self) -> dict:
+        """Per-host latency/error summary: host -> summary dict."""
+        return {host: m.summary() for host, m in self._metrics.items()}
+
+    def _limiter(self, host: str) -> APIRateLimiter:
+        if host not in self._limiters:
+            key = HOST_LIMIT_KEYS.get(host)
+            host_config = self.rate_limits.get("http_hosts", {}).get(host)
+            if host_config is None:
+                host_config = self.rate_limits.get(key) if key else None
+            if host_config is None:
+                host_config = self.rate_limits.get("http_default", {})
+            self._limiters[host] = APIRateLimiter({
+                "concurrent_max": host_config.get("concurrent_max", 4),
+                "requests_per_minute": host_config.get("requests_per_minute", 60),
+            })
+        return self._limiters[host]
+
+    async def _read_capped(self, resp, limit: int):
+        if resp.method == "HEAD":
+            return b"", False
+        chunks = []
+        size = 0
+        async for chunk in resp.content.iter_chunked(16 * 1024):
+            if size + len(chunk) > limit:
+                chunks.append(chunk[:limit - size])
+                return b"".join(chunks), True
+            chunks.append(chunk)
+            size += len(chunk)
+        return b"".join(chunks), False
@@ -0,0 +1,146 @@
+"""IssueDelta: Aggregated, iteration-aware issue feedback for revise prompts.
+
+verify_resume returns one issue per occurrence (every "leverage" is its own
+AI_VOCABULARY entry), and the §7.1 loop sends the whole list back on every
+revision, including issues the model already fixed. IssueDelta instead:
+
+- aggregates repeated issues under a stable key (word plus count)
+- compares against the previous iteration and marks each as new, persisting
+  (the model saw it and didn't fix it) or resolved
+- formats only the actionable set for the prompt: HIGH before MEDIUM before
+  LOW, persisting before new within a severity, trimmed to a token budget
+  with a count of what was left out
+
+One IssueDelta per resume (or cover letter) loop.
+"""
+
+import re
+
+from agents.context_builder import estimate_tokens
+
+SEVERITY_RANK = {"HIGH": 0, "MEDIUM": 1, "LOW": 2}
+
+# Document-level checks: one issue per draft, identified by type alone
+DOCUMENT_LEVEL = {
+    "PARALLEL_BULLETS", "TRICOLON_EXCESS", "CONNECTOR_EXCESS",
+    "PARAGRAPH_BALANCE", "SENTENCE_UNIFORMITY",
+}
+
+
+def issue_key(issue: dict) -> str:
+    """Identity of an issue that survives edits elsewhere in the draft."""
+    kind = issue.get("type", "")
+    if kind in ("AI_VOCABULARY", "AI_PHRASE"):
+        return f"{kind}:{issue.get('text', '').lower()}"
+    if kind == "UNVERIFIED_METRIC":
+        return f"{kind}:{issue.get('number', '')}"
+    if kind == "SKILL_LEVEL_OVERCLAIM":
+        return f"{kind}:{issue.get('skill', '')}"
+    if kind in DOCUMENT_LEVEL:
+        return kind
+    # UNGROUNDED_* messages lead with a line number that shifts between drafts
+    message = re.sub(r"^Line \S+: ", "", issue.get("message", ""))
+    message = message.split(" — best match")[0]
+    return f"{kind}:{message}"
+
+
+def aggregate(issues: list[dict]) -> dict:
+    """key -> {"key", "type", "severity", "count", "message"}; worst severity wins."""
+    grouped = {}
+    for issue in issues:
+        key = issue_key(issue)
+        entry = grouped.get(key)
+        if entry is None:
+            grouped[key] = {
+                "key": key,
+                "type": issue.get("type", ""),
+                "severity": issue.get("severity", "LOW"),
+                "count": 1,
+                "message": issue.get("message", ""),
+            }
+            continue
+        entry["count"] += 1
+        if SEVERITY_RANK.get(issue.get("severity"), 2) < SEVERITY_RANK.get(entry["severity"], 2):
+            entry["severity"] = issue["severity"]
+    return grouped
+
+
+class IssueDelta:
+    def __init__(self, config: dict | None = None):
+        config = (config or {}).get("generation", {})
+        self.token_budget = config.get("revise_issue_token_budget", 600)
+        self.iteration = 0
+        self._previous = {}
+        self._first_seen = {}
+
+    def update(self, issues: list[dict]) -> dict:
+        """Advance one iteration. Returns {"new", "persisting", "resolved"} lists of aggregates."""
+        current = aggregate(issues)
+        self.iteration += 1
+        new, persisting = [], []
+        for key, entry in current.items():
+            if key in self._previous:
+                entry["previous_count"] = self._previous[key]["count"]
+                entry["since"] = self._first_seen[key]
+                persisting.append(entry)
+            else:
+                self._first_seen[key] = self.iteration
+                entry["since"] = self.iteration
+                new.append(entry)
+        resolved = [e for k, e in self._previous.items() if k not in current]
+        for entry in resolved:
+            self._first_seen.pop(entry["key"], None)
+        self._previous = current
+        return {"new": new, "persisting": persisting, "resolved": resolved}
+
+    def format(self, delta: dict, token_budget: int | None = None) -> str:
+        """Prompt block with the actionable issues, most severe first, within the budget."""
+        budget = self.token_budget if token_budget is None else token_budget
+        ranked = sorted(
+            [(0, e) for e in delta["persisting"]] + [(1, e) for e in delta["new"]],
+            key=lambda p: (SEVERITY_RANK.get(p[1]["severity"], 2), p[0], -p[1]["count"]),
+        )
+        lines = ["Fix these issues in the current draft:"]
+        used = estimate_tokens(lines[0])
+        omitted = 0
+        for persisting, entry in ranked:
+            line = self._line(entry, persisting == 0)
+            cost = estimate_tokens(line)
+            if used + cost > budget:
+                omitted += 1
+                continue
+            lines.append(line)
+            used += cost
+        if omitted:
+            lines.append(f"- ...and {omitted} lower-priority issue(s) not listed; fix the above first.")
+        if delta["resolved"]:
+            fixed = ", ".join(self._label(e) for e in delta["resolved"])
+            resolved_line = f"Resolved since last draft (don't reintroduce): {fixed}"
+            if used + estimate_tokens(resolved_line) <= budget:
+                lines.append(resolved_line)
+            else:
+                lines.append(f"{len(delta['resolved'])} issue(s) resolved since last draft.")
+        if len(lines) == 1:
+            return "No remaining issues."
+        return "\n".join(lines)
+
+    def feedback(self, issues: list[dict]) -> tuple:
+        """update() then format(). Returns (prompt_text, delta)."""
+        delta = self.update(issues)
+        return self.format(delta), delta
+
+    def _line(self, entry: dict, persisting: bool) -> str:
+        status = f"STILL PRESENT since draft {entry['since']}" if persisting else "NEW"
+        if entry["type"] == "AI_VOCABULARY":
+            word = entry["key"].split(":", 1)[1]
+            text = f"AI vocabulary '{word}' used {entry['count']}x — replace every occurrence"
+            if persisting and entry.get("previous_count") != entry["count"]:
+                text += f" (was {entry['previous_count']}x)"
+        else:
+            text = entry["message"]
+            if entry["count"] > 1:
+                text += f" ({entry['count']}x)"
+        return f"- [{entry['severity']}, {status}] {text}"
+
+    def _label(self, entry: dict) -> str:
+        return entry["key"].split(":", 1)[1] if ":" in entry["key"] else entry["key"]
@@ -0,0 +1,159 @@
+"""ModelRouter: Cheap-first model cascade with verification-gated escalation.
+
+model_tiers still names the model each agent must reach. For agents listed in
+model_cascade, the router first tries the cheaper model and escalates to the
+model_tiers model only when the result fails a gate:
+
+- route(): generation agents (resume, cover letter). The cheap draft is
+  checked with VerificationRunner. FAIL, or a quality_score under
+  quality_bar, triggers an escalated call that receives the cheap attempt.
+- model_for(): the Verify agent. The programmatic verification of the
+  content decides up front: clean content gets the cheap reviewer, and
+  anything borderline goes straight to the model_tiers model.
+
+Per agent, the router records calls, escalations with their reasons, spend
+per tier, and cost saved. Cost saved is what the accepted cheap calls would
+have cost on the expensive model (same tokens, budget.yaml pricing) minus
+what was actually spent, including cheap attempts wasted on escalations.
+Stats persist to model_cascade.stats_path so the bars can be tuned.
+"""
+
+import json
+import os
+import re
+
+
+def model_family(model: str) -> str:
+    """'claude-opus-4-6' -> 'opus'. Pricing in budget.yaml is keyed by family."""
+    for family in ("opus", "sonnet", "haiku"):
+        if family in model:
+            return family
+    return model
+
+
+def verification_gate(verification: dict, quality_bar: float) -> tuple:
+    """(ok, reason) for a VerificationRunner result."""
+    if verification["status"] != "PASS":
+        return (False, f"verification FAIL ({verification.get('high_count', 0)} HIGH)")
+    if verification["quality_score"] < quality_bar:
+        return (False, f"quality {verification['quality_score']} < {quality_bar}")
+    return (True, "passed")
+
+
+class ModelRouter:
+    def __init__(self, config: dict | None = None, budget: dict | None = None):
+        config = config or {}
+        self.tiers = config.get("model_tiers", {})
+        cascade = config.get("model_cascade", {})
+        self.stats_path = cascade.get("stats_path", "data/model_routing.json")
+        self.cascade = {k: v for k, v in cascade.items() if isinstance(v, dict)}
+        self.pricing = (budget or {}).get("pricing", {})
+        self.stats = self._load()
+
+    def is_cascaded(self, agent: str) -> bool:
+        return agent in self.cascade and bool(self.cascade[agent].get("cheap"))
+
+    def model_for(self, agent: str, verification: dict | None = None) -> str:
+        """Pick the model before the call (Verify agent). Records the choice."""
+        if not self.is_cascaded(agent):
+            return self.tiers[agent]
+        if verification is None:
+            ok, reason = (False, "no programmatic verification")
+        else:
+            ok, reason = verification_gate(verification, self._bar(agent))
+        stats = self._agent_stats(agent)
+        stats["calls"] += 1
+        if ok:
+            stats["cheap_accepted"] += 1
+        else:
+            self._escalated(stats, reason)
+        self._save()
+        return self.cascade[agent]["cheap"] if ok else self.tiers[agent]
+
+    def record_cost(self, agent: str, model: str, usage: dict) -> None:
+        """Record spend for a call chosen with model_for()."""
+        stats = self._agent_stats(agent)
+        cost = self.cost(model, usage)
+        if model == self.tiers.get(agent) or not self.is_cascaded(agent):
+            stats["expensive_cost"] += cost
+        else:
+            stats["cheap_cost"] += cost
+            stats["cost_saved"] += self.cost(self.tiers[agent], usage) - cost
+        self._save()
+
+    async def route(self, agent: str, call, gate) -> dict:
+        """Cheap call, gated; escalate on failure.
+
+        call: async (model, escalated_from=None) -> result dict with "token_usage".
+        gate: result -> (ok, reason), usually verification_gate over a verify_resume.
+        Returns the accepted result with "model" and "escalated" keys added.
+        """
+        if not self.is_cascaded(agent):
+            result = await call(self.tiers[agent])
+            return {**result, "model": self.tiers[agent], "escalated": False}
+
+        stats = self._agent_stats(agent)
+        stats["calls"] += 1
+        cheap_model = self.cascade[agent]["cheap"]
+        cheap = await call(cheap_model)
+        cheap_cost = self.cost(cheap_model, cheap.get("token_usage", {}))
+        stats["cheap_cost"] += cheap_cost
+
+        ok, reason = gate(cheap)
+        if ok:
+            stats["cheap_accepted"] += 1
+            stats["cost_saved"] += self.cost(self.tiers[agent], cheap.get("token_usage", {})) - cheap_cost
+            self._save()
+            return {**cheap, "model": cheap_model, "escalated": False}
+
+        self._escalated(stats, reason)
+        stats["cost_saved"] -= cheap_cost  # spent for nothing
+        result = await call(self.tiers[agent], escalated_from={**cheap, "gate_reason": reason})
+        stats["expensive_cost"] += self.cost(self.tiers[agent], result.get("token_usage", {}))
+        self._save()
+        return {**result, "model": self.tiers[agent], "escalated": True, "escalation_reason": reason}
+
+    def cost(self, model: str, usage: dict) -> float:
+        price = self.pricing.get(model_family(model), {})
+        return (usage.get("input_tokens", 0) * price.get("input_per_mtok", 0.0)
+                + usage.get("output_tokens", 0) * price.get("output_per_mtok", 0.0)) / 1_000_000
+
+    def report(self) -> dict:
+        """Per-agent escalation rate, spend by tier and cost saved."""
+        out = {}
+        for agent, s in self.stats.items():
+            out[agent] = {
+                **s,
+                "escalation_rate": s["escalations"] / s["calls"] if s["calls"] else 0.0,
+            }
+        return out
+
+    def _bar(self, agent: str) -> float:
+        return self.cascade[agent].get("quality_bar", 85)
+
+    def _agent_stats(self, agent: str) -> dict:
+        return self.stats.setdefault(agent, {
+            "calls": 0, "cheap_accepted": 0, "escalations": 0,
+            "cheap_cost": 0.0, "expensive_cost": 0.0, "cost_saved": 0.0, "reasons": {},
+        })
+
+    def _escalated(self, stats: dict, reason: str) -> None:
+        stats["escalations"] += 1
+        # Group "quality 72 < 85" and "quality 80 < 85" under one key
+        key = re.sub(r"\d+(?:\.\d+)?", "N", reason)
+        stats["reasons"][key] = stats["reasons"].get(key, 0) + 1
+
+    def _load(self) -> dict:
+        if self.stats_path and os.path.exists(self.stats_path):
+            with open(self.stats_path) as f:
+                return json.load(f)
+        return {}
+
+    def _save(self) -> None:
+        if not self.stats_path:
+            return
+        os.makedirs(os.path.dirname(self.stats_path) or ".", exist_ok=True)
+        tmp = self.stats_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.stats, f, indent=2)
+        os.replace(tmp, self.stats_path)
@@ -0,0 +1,303 @@
+"""PreScreener: Deterministic pre-score that keeps clear rejects away from the Match Agent.
+
+Runs between dedup and Match (§4.2) and decides one of:
+
+- "reject": companies_to_avoid, a deal-breaker hit, an infeasible location, or
+  near-zero overlap with the profile. No Match call.
+- "fast_track": many profile skills named, high keyword overlap, location fits.
+  Proceeds as GOOD without a Match call.
+- "llm": everything in between goes to the Match Agent as before.
+
+Keyword overlap is the share of a posting's distinct terms that also occur in
+the profile (ProfileIndex.experience_text, skills_flat, summary), weighted by
+IDF so boilerplate every posting shares carries little weight. So that a
+job's decision doesn't depend on what was screened before it, the IDF is
+fixed: document frequencies are collected from the first idf_warmup postings
+(overlap is unweighted until then), then frozen and saved to idf_path, and
+later runs load them.
+
+Every decision is logged with its reason. A deterministic audit sample of
+reject/fast_track decisions is sent to the Match Agent anyway;
+record_outcome() compares the two so stats() can report how often the
+pre-screen is wrong.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+from datetime import datetime, timezone
+
+from agents.text import tokenize
+from verification.application_dedup import normalize_company
+
+logger = logging.getLogger(__name__)
+
+ONSITE_PATTERNS = [
+    r"\bno remote\b",
+    r"\bnot (?:a )?remote\b",
+    r"\bon-?site only\b",
+    r"\b(?:100%|fully) (?:on-?site|in[- ]office)\b",
+    r"\bin[- ]office (?:5|five) days\b",
+]
+
+# Deal-breaker phrases (substring of application_preferences.deal_breakers)
+# -> patterns that signal a hit in the posting text
+DEAL_BREAKER_PATTERNS = {
+    "no remote": ONSITE_PATTERNS,
+    "onsite only": ONSITE_PATTERNS,
+    "on-site only": ONSITE_PATTERNS,
+    "relocation": [r"\brelocation (?:is )?required\b", r"\bmust relocate\b"],
+    "travel": [r"\b(?:[5-9]\d|100)% travel\b", r"\btravel (?:up to )?(?:[5-9]\d|100)%"],
+    "security clearance": [r"\b(?:security|secret|ts/sci) clearance\b"],
+}
+
+# Deal-breaker phrases an on-site remote_policy also hits
+ONSITE_PHRASES = ("no remote", "onsite only", "on-site only")
+
+ONSITE_POLICIES = ("onsite", "on-site", "in office", "in-office", "office")
+
+# Match classifications that contradict each pre-screen verdict
+AUDIT_DISAGREES = {
+    "reject": ("STRONG", "GOOD"),
+    "fast_track": ("MARGINAL", "WEAK"),
+}
+
+
+class PreScreener:
+    def __init__(self, profile_index, config: dict | None = None):
+        self.index = profile_index
+        config = (config or {}).get("prescreen", {})
+        self.reject_overlap = config.get("reject_overlap", 0.10)
+        self.fast_track_overlap = config.get("fast_track_overlap", 0.45)
+        self.fast_track_skills = config.get("fast_track_skills", 5)
+        self.audit_rate = config.get("audit_rate", 0.05)
+        self.log_path = config.get("log_path", "data/logs/prescreen.jsonl")
+        self.idf_path = config.get("idf_path", "data/prescreen_idf.json")
+        self.idf_warmup = config.get("idf_warmup", 200)
+
+        profile = profile_index.profile
+        prefs = profile.get("application_preferences", {})
+        self.avoid = {normalize_company(c) for c in prefs.get("companies_to_avoid", [])}
+        compiled = self._compile_deal_breakers(
+            prefs.get("deal_breakers", []),
+            {**DEAL_BREAKER_PATTERNS, **config.get("deal_breaker_patterns", {})},
+        )
+        self.deal_breakers = [(breaker, pattern) for breaker, _, pattern in compiled]
+        # A deal breaker like "No remote option" is also hit by an on-site remote_policy
+        self.remote_breaker = next((b for b, phrase, _ in compiled if phrase in ONSITE_PHRASES), None)
+        self.location = profile.get("identity", {}).get("location", {})
+        self.onsite = re.compile("|".join(ONSITE_PATTERNS), re.I)
+
+        self.vocab = set(tokenize(" ".join([
+            " ".join(profile_index.experience_text.values()),
+            " ".join(profile_index.skills_flat),
+            " ".join(profile.get("summary", {}).get("keywords", [])),
+            profile.get("summary", {}).get("elevator_pitch", ""),
+            " ".join(p for r in profile.get("summary", {}).get("target_roles", [])
+                     for p in r.get("title_patterns", [])),
+            " ".join(e.get("field", "") for e in profile.get("education", [])),
+            " ".join(profile_index.pub_titles.values()),
+        ])))
+        # One alternation over all skills; longest first so "sas viya" beats "sas"
+        skills = sorted(profile_index.skills_flat, key=len, reverse=True)
+        self.skill_matcher = re.compile(
+            r"(?<![\w+#])(" + "|".join(re.escape(s) for s in skills) + r")(?![\w+#])", re.I
+        ) if skills else None
+
+        self._df, self._docs = self._load_idf()
+        self._audits = {}
+        self.counts = {"reject": 0, "fast_track": 0, "llm": 0}
+        self.audit_stats = {d: {"audited": 0, "resolved": 0, "wrong": 0} for d in AUDIT_DISAGREES}
+
+    def screen(self, job: dict) -> dict:
+        """Returns {"decision", "reason", "overlap", "skill_hits", "location_fit", "audit"}."""
+        role = job.get("role", {})
+        company = job.get("company", {}).get("name", "")
+        text = f"{role.get('title', '')} {role.get('description_raw', '')}"
+        terms = set(tokenize(text))
+        overlap = self._overlap(terms)
+        self._observe(terms)
+
+        skill_hits = sorted({m.group(1).lower() for m in self.skill_matcher.finditer(text)}) \
+            if self.skill_matcher else []
+        location_fit = self._location_fit(role, text)
+        result = {
+            "overlap": round(overlap, 3),
+            "skill_hits": skill_hits,
+            "location_fit": location_fit,
+        }
+
+        breaker = self._deal_breaker_hit(text)
+        if breaker is None and (role.get("remote_policy") or "").lower() in ONSITE_POLICIES:
+            breaker = self.remote_breaker
+        if company and normalize_company(company) in self.avoid:
+            decision, reason = "reject", f"Company on companies_to_avoid: {company}"
+        elif breaker:
+            decision, reason = "reject", f"Deal breaker: {breaker}"
+        elif location_fit == 0.0:
+            decision, reason = "reject", f"Location infeasible: {role.get('location', '')!r}, {role.get('remote_policy', '')!r}"
+        elif not skill_hits and overlap < self.reject_overlap:
+            decision, reason = "reject", f"No profile skills named and keyword overlap {overlap:.2f} < {self.reject_overlap}"
+        elif (len(skill_hits) >= self.fast_track_skills and overlap >= self.fast_track_overlap
+              and location_fit == 1.0):
+            decision, reason = "fast_track", f"{len(skill_hits)} profile skills, keyword overlap {overlap:.2f}"
+        else:
+            decision, reason = "llm", "Needs Match Agent scoring"
+
+        audit = decision != "llm" and self._sampled(job.get("job_id", ""))
+        result.update(decision=decision, reason=reason, audit=audit)
+        self.counts[decision] += 1
+        if audit:
+            self.audit_stats[decision]["audited"] += 1
+            self._audits[job.get("job_id")] = decision
+        self._log(job, result)
+        return result
+
+    def stage(self, job: dict) -> dict | None:
+        """DiscoveryPipeline stage: drops rejects (unless audited), annotates the rest."""
+        result = self.screen(job)
+        if result["decision"] == "reject" and not result["audit"]:
+            return None
+        return {**job, "prescreen": result}
+
+    def needs_llm(self, job: dict) -> bool:
+        """True unless the job was fast-tracked (audited jobs always go to the LLM)."""
+        result = job.get("prescreen")
+        return result is None or result["decision"] == "llm" or result["audit"]
+
+    def fast_track_result(self, job: dict) -> dict:
+        """Match Agent-shaped output (§4.2) for a fast-tracked job."""
+        result = job["prescreen"]
+        return {
+            "job_id": job.get("job_id"),
+            "classification": "GOOD",
+            "composite_score": 6.0,
+            "dimension_scores": {},
+            "key_selling_points": result["skill_hits"],
+            "gaps": [],
+            "tailoring_notes": f"Fast-tracked by pre-screen: {result['reason']}",
+            "prescreen": result,
+        }
+
+    def record_outcome(self, job_id: str, classification: str) -> bool | None:
+        """Record the Match Agent's verdict for an audited job. Returns True if pre-screen was wrong."""
+        decision = self._audits.pop(job_id, None)
+        if decision is None:
+            return None
+        wrong = classification in AUDIT_DISAGREES[decision]
+        self.audit_stats[decision]["resolved"] += 1
+        self.audit_stats[decision]["wrong"] += wrong
+        if wrong:
+            logger.warning("Pre-screen %s of %s contradicted by Match: %s", decision, job_id, classification)
+        return wrong
+
+    def stats(self) -> dict:
+        total = sum(self.counts.values())
+        audited = sum(s["audited"] for s in self.audit_stats.values())
+        skipped = self.counts["reject"] + self.counts["fast_track"] - audited
+        return {
+            "screened": total,
+            **self.counts,
+            "match_calls_saved": skipped,
+            "match_call_reduction": skipped / total if total else 0.0,
+            "audits": {
+                d: {**s, "error_rate": s["wrong"] / s["resolved"] if s["resolved"] else None}
+                for d, s in self.audit_stats.items()
+            },
+        }
+
+    @property
+    def idf_frozen(self) -> bool:
+        return self._docs >= self.idf_warmup
+
+    def _overlap(self, terms: set) -> float:
+        if not terms:
+            return 0.0
+        if not self.idf_frozen:
+            return len(terms & self.vocab) / len(terms)
+        weights = {t: math.log((self._docs + 1) / (self._df.get(t, 0) + 1)) + 1 for t in terms}
+        total = sum(weights.values())
+        return sum(w for t, w in weights.items() if t in self.vocab) / total
+
+    def _observe(self, terms: set) -> None:
+        if self.idf_frozen:
+            return
+        self._docs += 1
+        for t in terms:
+            self._df[t] = self._df.get(t, 0) + 1
+        if self.idf_frozen:
+            self._save_idf()
+
+    def _load_idf(self) -> tuple:
+        if self.idf_path and os.path.exists(self.idf_path):
+            with open(self.idf_path) as f:
+                saved = json.load(f)
+            return saved["df"], saved["docs"]
+        return {}, 0
+
+    def _save_idf(self) -> None:
+        if not self.idf_path:
+            return
+        os.makedirs(os.path.dirname(self.idf_path) or ".", exist_ok=True)
+        tmp = self.idf_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"docs": self._docs, "df": self._df}, f)
+        os.replace(tmp, self.idf_path)
+
+    def _location_fit(self, role: dict, text: str) -> float:
+        """1.0 fits, 0.5 feasible but not a clear fit, 0.0 infeasible.
+
+        A job at home or in a relocation target is feasible whatever the remote
+        preference; a candidate who prefers remote only gets 0.5 for it, so the
+        Match Agent weighs that preference instead of a hard reject."""
+        policy = (role.get("remote_policy") or "").lower()
+        location = (role.get("location") or "").lower()
+        preference = (self.location.get("remote_preference") or "flexible").lower()
+        remote = "remote" in policy or (not policy and "remote" in location)
+        if remote and not self.onsite.search(text):
+            return 1.0 if preference != "onsite" else 0.5
+        if not location:
+            return 0.5  # unknown: let the Match Agent judge feasibility
+        home = [self.location.get("city", ""), self.location.get("state", "")]
+        if (any(h and re.search(rf"\b{re.escape(h.lower())}\b", location) for h in home)
+                or any(p and p.lower() in location for p in self.location.get("relocation_preferences", []))):
+            return 0.5 if preference == "remote" else 1.0
+        return 0.5 if self.location.get("willing_to_relocate") else 0.0
+
+    def _compile_deal_breakers(self, deal_breakers: list, patterns: dict) -> list:
+        """[(deal breaker, the phrase it matched, compiled patterns)]."""
+        compiled = []
+        for breaker in deal_breakers:
+            lowered = breaker.lower()
+            for phrase, regexes in patterns.items():
+                if phrase in lowered:
+                    compiled.append((breaker, phrase, re.compile("|".join(regexes), re.I)))
+                    break
+        return compiled
+
+    def _deal_breaker_hit(self, text: str) -> str | None:
+        for breaker, pattern in self.deal_breakers:
+            if pattern.search(text):
+                return breaker
+        return None
+
+    def _sampled(self, job_id: str) -> bool:
+        digest = hashlib.sha1(job_id.encode("utf-8")).digest()
+        return int.from_bytes(digest[:4], "big") / 2**32 < self.audit_rate
+
+    def _log(self, job: dict, result: dict) -> None:
+        logger.info("Pre-screen %s %s: %s", job.get("job_id"), result["decision"], result["reason"])
+        if not self.log_path:
+            return
+        os.makedirs(os.path.dirname(self.log_path) or ".", exist_ok=True)
+        with open(self.log_path, "a") as f:
+            f.write(json.dumps({
+                "ts": datetime.now(timezone.utc).isoformat(),
+                "job_id": job.get("job_id"),
+                "company": job.get("company", {}).get("name", ""),
+                "title": job.get("role", {}).get("title", ""),
+                **result,
+            }) + "\n")
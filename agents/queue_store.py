@@ -0,0 +1,261 @@
+"""QueueStore: Queue entries on disk with a SQLite summary index for the dashboard.
+
+Full entries stay one JSON file each under data/queue/{queue_entry_id}.json
+(§12). Alongside them, a summary index holds one small row per entry: id,
+company, title, classification, score, deadline, flags and status. The Queue
+View (GET /) is served from the index alone:
+
+- page() sorts in SQL ("deadline": deadline first then score, as §4.7
+  packages them; or "score") and paginates by keyset. The cursor is the last
+  row's sort key, so page N costs the same as page 1 no matter how many
+  entries the 90-day retention keeps.
+- get() reads a full entry file only when the Detail View asks for it.
+
+put() writes the entry file atomically and then upserts its summary row.
+rebuild_index() recreates the index from the files if it is lost or stale.
+Listeners (add_listener) see every put and delete, e.g. the History search
+index in dashboard/search.py.
+"""
+
+import base64
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+from agents.scheduler import parse_deadline
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS queue_summary (
+    entry_id TEXT PRIMARY KEY,
+    job_id TEXT,
+    company TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    classification TEXT,
+    score REAL NOT NULL DEFAULT 0,
+    neg_score REAL NOT NULL DEFAULT 0,
+    deadline TEXT,
+    deadline_key TEXT NOT NULL,
+    flags TEXT NOT NULL DEFAULT '[]',
+    status TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_queue_deadline ON queue_summary (status, deadline_key, neg_score, entry_id);
+CREATE INDEX IF NOT EXISTS idx_queue_score ON queue_summary (status, neg_score, deadline_key, entry_id);
+CREATE INDEX IF NOT EXISTS idx_queue_created ON queue_summary (created_at);
+"""
+
+# Sort name -> key columns, all ascending (score is stored negated)
+SORTS = {
+    "deadline": ("deadline_key", "neg_score", "entry_id"),
+    "score": ("neg_score", "deadline_key", "entry_id"),
+}
+
+NO_DEADLINE = "9999-12-31"
+
+SUMMARY_FIELDS = ("entry_id", "job_id", "company", "title", "classification", "score",
+                  "deadline", "flags", "status", "created_at", "updated_at")
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def summarize(entry: dict) -> dict:
+    """Summary row for a packaged queue entry (Queue Agent output)."""
+    job = entry.get("job") or {}
+    match = entry.get("match") or {}
+    role = job.get("role") or {}
+    company = job.get("company") or entry.get("company") or ""
+    deadline = parse_deadline(role.get("application_deadline") or entry.get("deadline"))
+    flags = list(entry.get("flags") or [])
+    if entry.get("needs_human_help") and "needs_human_help" not in flags:
+        flags.append("needs_human_help")
+    return {
+        "entry_id": entry["queue_entry_id"],
+        "job_id": job.get("job_id") or entry.get("job_id"),
+        "company": company.get("name", "") if isinstance(company, dict) else company,
+        "title": role.get("title") or entry.get("title") or "",
+        "classification": match.get("classification") or entry.get("classification"),
+        "score": float(match.get("composite_score", entry.get("composite_score")) or 0.0),
+        "deadline": deadline.date().isoformat() if deadline else None,
+        "flags": flags,
+        "status": entry.get("status", "pending"),
+        "created_at": entry.get("created_at") or _now(),
+    }
+
+
+def encode_cursor(key: tuple) -> str:
+    return base64.urlsafe_b64encode(json.dumps(list(key)).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    try:
+        return tuple(json.loads(base64.urlsafe_b64decode(cursor.encode())))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+
+class QueueStore:
+    def __init__(self, config: dict | None = None):
+        config = (config or {}).get("queue", {})
+        self.queue_dir = config.get("queue_dir", "data/queue")
+        self.index_path = config.get("index_path", "data/queue_index.db")
+        self.page_size = config.get("page_size", 25)
+        os.makedirs(self.queue_dir, exist_ok=True)
+        if self.index_path != ":memory:":
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.index_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self._listeners = []
+
+    def add_listener(self, listener) -> None:
+        """listener(event) after each put/delete.
+        event: {"kind": "queue_put", "entry_id", "entry"} or {"kind": "queue_delete", "entry_id"}."""
+        self._listeners.append(listener)
+
+    def put(self, entry: dict) -> dict:
+        """Write the full entry file, then index it. Returns the summary."""
+        entry.setdefault("created_at", _now())
+        entry.setdefault("status", "pending")
+        self._write_file(entry)
+        summary = summarize(entry)
+        self._index(summary)
+        for listener in self._listeners:
+            listener({"kind": "queue_put", "entry_id": summary["entry_id"], "entry": entry})
+        return summary
+
+    def get(self, entry_id: str) -> dict | None:
+        """Full entry for the Detail View, read from its file."""
+        path = self._path(entry_id)
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def summary(self, entry_id: str) -> dict | None:
+        row = self.conn.execute(
+            "SELECT * FROM queue_summary WHERE entry_id = ?", (entry_id,)
+        ).fetchone()
+        return self._row(row) if row else None
+
+    def update(self, entry_id: str, **fields) -> dict | None:
+        """Change fields of an entry (status on approve/skip, flags, edited documents)."""
+        entry = self.get(entry_id)
+        if entry is None:
+            return None
+        entry.update(fields)
+        entry["updated_at"] = _now()
+        return self.put(entry)
+
+    def delete(self, entry_id: str) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM queue_summary WHERE entry_id = ?", (entry_id,))
+            self.conn.commit()
+        try:
+            os.remove(self._path(entry_id))
+        except FileNotFoundError:
+            pass
+        for listener in self._listeners:
+            listener({"kind": "queue_delete", "entry_id": entry_id})
+
+    def page(self, status: str | None = "pending", sort: str = "deadline",
+             cursor: str | None = None, limit: int | None = None) -> dict:
+        """One page of summaries. Returns {"items", "next_cursor"}; next_cursor is None on the last page."""
+        if sort not in SORTS:
+            raise ValueError(f"Unknown sort '{sort}'; expected one of {sorted(SORTS)}")
+        limit = limit or self.page_size
+        columns = SORTS[sort]
+        sql, args = "SELECT * FROM queue_summary WHERE 1=1", []
+        if status:
+            sql += " AND status = ?"
+            args.append(status)
+        if cursor:
+            key = decode_cursor(cursor)
+            if len(key) != len(columns):
+                raise ValueError(f"Cursor does not match sort '{sort}'")
+            sql += f" AND ({', '.join(columns)}) > ({', '.join('?' for _ in columns)})"
+            args.extend(key)
+        sql += f" ORDER BY {', '.join(columns)} LIMIT ?"
+        args.append(limit + 1)
+
+        rows = self.conn.execute(sql, args).fetchall()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_cursor = encode_cursor(tuple(rows[-1][c] for c in columns)) if has_more else None
+        return {"items": [self._row(r) for r in rows], "next_cursor": next_cursor}
+
+    def count(self, status: str | None = "pending") -> int:
+        if status is None:
+            return self.conn.execute("SELECT COUNT(*) FROM queue_summary").fetchone()[0]
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM queue_summary WHERE status = ?", (status,)
+        ).fetchone()[0]
+
+    def older_than(self, cutoff: str) -> list[str]:
+        """entry_ids created before cutoff (ISO timestamp), for retention."""
+        return [r[0] for r in self.conn.execute(
+            "SELECT entry_id FROM queue_summary WHERE created_at < ?", (cutoff,)
+        )]
+
+    def rebuild_index(self) -> int:
+        """Recreate the index from the entry files. Returns the number indexed."""
+        summaries = []
+        for name in os.listdir(self.queue_dir):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(self.queue_dir, name)) as f:
+                summaries.append(summarize(json.load(f)))
+        with self._lock:
+            self.conn.execute("DELETE FROM queue_summary")
+            self.conn.executemany(self._upsert_sql(), [self._params(s) for s in summaries])
+            self.conn.commit()
+        return len(summaries)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _index(self, summary: dict) -> None:
+        with self._lock:
+            self.conn.execute(self._upsert_sql(), self._params(summary))
+            self.conn.commit()
+
+    def _upsert_sql(self) -> str:
+        return (
+            "INSERT INTO queue_summary (entry_id, job_id, company, title, classification, score, "
+            "neg_score, deadline, deadline_key, flags, status, created_at, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT(entry_id) DO UPDATE SET "
+            "job_id = excluded.job_id, company = excluded.company, title = excluded.title, "
+            "classification = excluded.classification, score = excluded.score, "
+            "neg_score = excluded.neg_score, deadline = excluded.deadline, "
+            "deadline_key = excluded.deadline_key, flags = excluded.flags, "
+            "status = excluded.status, updated_at = excluded.updated_at"
+        )
+
+    def _params(self, s: dict) -> tuple:
+        return (s["entry_id"], s["job_id"], s["company"], s["title"], s["classification"],
+                s["score"], -s["score"], s["deadline"], s["deadline"] or NO_DEADLINE,
+                json.dumps(s["flags"]), s["status"], s["created_at"], _now())
+
+    def _write_file(self, entry: dict) -> None:
+        path = self._path(entry["queue_entry_id"])
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    def _path(self, entry_id: str) -> str:
+        if os.sep in entry_id or entry_id.startswith("."):
+            raise ValueError(f"Invalid queue entry id: {entry_id!r}")
+        return os.path.join(self.queue_dir, f"{entry_id}.json")
+
+    def _row(self, row) -> dict:
+        out = {k: row[k] for k in SUMMARY_FIELDS}
+        out["flags"] = json.loads(out["flags"])
+        return out
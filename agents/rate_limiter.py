@@ -0,0 +1,104 @@
+"""APIRateLimiter: Concurrency cap plus sliding-window requests-per-minute limit.
+
+Separate from the orchestrator's task semaphore (§7.2). One limiter is used
+for the Anthropic API and one per external host in the shared HTTP client.
+Both the limiter and the task semaphore can be resized at runtime by the
+ConcurrencyController.
+"""
+
+import asyncio
+import time
+
+
+class ResizableSemaphore:
+    """asyncio semaphore whose limit can change while tasks hold or wait for slots.
+
+    Shrinking never interrupts holders; new acquirers wait until in_use drops
+    below the new limit. peak_in_use records saturation between resets.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self.peak_in_use = 0
+        self._cond = asyncio.Condition()
+        self._notifiers = set()  # strong refs: the loop only keeps weak ones to pending tasks
+
+    async def acquire(self) -> None:
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_use < self.limit)
+            self.in_use += 1
+            self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def release(self) -> None:
+        self.in_use -= 1
+        task = asyncio.get_running_loop().create_task(self._notify())
+        self._notifiers.add(task)
+        task.add_done_callback(self._notifiers.discard)
+
+    async def set_limit(self, limit: int) -> None:
+        async with self._cond:
+            self.limit = limit
+            self._cond.notify_all()
+
+    def reset_peak(self) -> int:
+        peak, self.peak_in_use = self.peak_in_use, self.in_use
+        return peak
+
+    async def _notify(self) -> None:
+        async with self._cond:
+            self._cond.notify()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class APIRateLimiter:
+    def __init__(self, config: dict):
+        self.concurrent_max = config.get("concurrent_max", 5)
+        self.rpm = config.get("requests_per_minute", 60)
+        self._semaphore = ResizableSemaphore(self.concurrent_max)
+        self._lock = asyncio.Lock()
+        self._times = []
+        self.on_wait = None  # optional callback(seconds) before waiting for a per-minute slot
+
+    async def acquire(self) -> None:
+        """Block until a concurrency slot and a per-minute slot are available."""
+        await self._semaphore.acquire()
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self._times = [t for t in self._times if now - t < 60]
+                    if len(self._times) < self.rpm:
+                        break
+                    delay = 60 - (now - self._times[0])
+                    if self.on_wait:
+                        self.on_wait(delay)
+                    await asyncio.sleep(delay)
+                self._times.append(time.monotonic())
+        except BaseException:
+            self._semaphore.release()
+            raise
+
+    def release(self) -> None:
+        self._semaphore.release()
+
+    @property
+    def semaphore(self) -> ResizableSemaphore:
+        return self._semaphore
+
+    async def set_concurrency(self, limit: int) -> None:
+        self.concurrent_max = limit
+        await self._semaphore.set_limit(limit)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.release()
@@ -0,0 +1,356 @@
+"""RetentionEngine: Incremental background cleanup driven by an expiry index.
+
+The cleanup config (§14) used to mean a full sweep of every data directory at
+startup, so startup got slower as the disk filled (Appendix B, item 10).
+Instead, each artifact's expiry time is recorded when it is written, and a
+background task removes what is due in small batches:
+
+- queue entries: tracked on QueueStore put, due queue_retention_days after
+  created_at. They are archived as gzip under queue_archive_dir (or just
+  deleted if that is empty) and then removed from the store. History
+  search keeps its copy.
+- render cache files: tracked when RenderService writes or serves them, due
+  render_cache_retention_days after last use.
+- log files: tracked by track_file() from whatever writes them, or found by
+  the startup backfill. They are due log_retention_days after their last
+  modification. A log still being appended to is rescheduled, not deleted.
+- checkpoints: with checkpoint_retention "until_queued", jobs marked complete
+  in the CheckpointStore are dropped a few at a time. Its `latest.completed`
+  flag is already the index.
+
+Each batch holds at most batch_size items. An item that cannot be removed
+(an OSError or sqlite3.Error) is logged and retried retry_seconds later, so
+one bad path never stops the task. After a batch the task pauses so
+that deletions stay under max_bytes_per_second. Once nothing is due, it sleeps
+interval_seconds. Batches run in a worker thread, and start() only schedules
+the task, so neither startup nor the event loop waits on disk I/O.
+With run_cleanup_on_startup, the first thing the task does is index the
+artifacts already on disk, one chunk per worker-thread step. report() gives reclaimed bytes per kind.
+"""
+
+import asyncio
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS expiry (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    path TEXT,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+CREATE INDEX IF NOT EXISTS idx_expiry_due ON expiry (expires_at);
+
+CREATE TABLE IF NOT EXISTS reclaimed (
+    kind TEXT PRIMARY KEY,
+    items INTEGER NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+DAY = 86400.0
+
+FILE_KINDS = ("log", "render_cache")
+
+
+def _epoch(iso: str | None) -> float:
+    if not iso:
+        return time.time()
+    try:
+        ts = datetime.fromisoformat(iso)
+    except ValueError:
+        return time.time()
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.timestamp()
+
+
+class RetentionEngine:
+    def __init__(self, config: dict | None = None):
+        config = (config or {}).get("cleanup", {})
+        self.index_path = config.get("index_path", "data/retention.db")
+        self.log_dir = config.get("log_dir", "data/logs")
+        self.queue_archive_dir = config.get("queue_archive_dir", "data/queue_archive")
+        self.checkpoint_retention = config.get("checkpoint_retention", "until_queued")
+        self.days = {
+            "queue": config.get("queue_retention_days", 90),
+            "log": config.get("log_retention_days", 30),
+            "render_cache": config.get("render_cache_retention_days", 30),
+        }
+        self.backfill_on_start = config.get("run_cleanup_on_startup", True)
+        self.batch_size = config.get("batch_size", 50)
+        self.max_bytes_per_second = config.get("max_bytes_per_second", 8 * 1024 * 1024)
+        self.min_pause = config.get("min_pause_seconds", 0.05)
+        self.interval = config.get("interval_seconds", 300)
+        self.retry_delay = config.get("retry_seconds", 3600)
+        if self.index_path != ":memory:":
+            os.makedirs(os.path.dirname(self.index_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.index_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+        self.queue_store = None
+        self.checkpoints = None
+        self.render_cache_dir = None
+        self._task = None
+        self.counters = {"batches": 0, "deleted": 0, "archived": 0, "rescheduled": 0, "missing": 0,
+                         "backfilled": 0, "errors": 0}
+
+    # -- recording expiry --------------------------------------------------
+
+    def attach(self, queue_store=None, checkpoints=None, render_service=None) -> None:
+        """Track queue entries and render outputs as they are written; clean completed checkpoints."""
+        if queue_store is not None:
+            self.queue_store = queue_store
+            queue_store.add_listener(self._on_queue)
+        if checkpoints is not None:
+            self.checkpoints = checkpoints
+        if render_service is not None:
+            self.render_cache_dir = render_service.cache_dir
+            render_service.on_output = lambda path: self.track_file("render_cache", path, start=time.time())
+
+    def track(self, kind: str, key: str, expires_at: float, path: str | None = None) -> None:
+        with self._lock:
+            self.conn.execute(
+                "INSERT INTO expiry (kind, key, path, expires_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(kind, key) DO UPDATE SET path = excluded.path, expires_at = excluded.expires_at",
+                (kind, key, path, expires_at),
+            )
+            self.conn.commit()
+
+    def track_file(self, kind: str, path: str, start: float | None = None) -> None:
+        """Expire path days[kind] after start (default: its modification time)."""
+        if start is None:
+            try:
+                start = os.path.getmtime(path)
+            except FileNotFoundError:
+                return
+        self.track(kind, path, start + self.days[kind] * DAY, path)
+
+    def untrack(self, kind: str, key: str) -> None:
+        with self._lock:
+            self.conn.execute("DELETE FROM expiry WHERE kind = ? AND key = ?", (kind, key))
+            self.conn.commit()
+
+    def backfill(self, chunk: int = 500):
+        """Index artifacts already on disk that nothing tracked yet. A generator: each
+        step indexes up to chunk items, so the caller can yield to other work in between."""
+        if self.queue_store is not None:
+            cursor = None
+            while True:
+                page = self.queue_store.page(status=None, cursor=cursor, limit=chunk)
+                self._track_missing([("queue", s["entry_id"], None,
+                                      _epoch(s["created_at"]) + self.days["queue"] * DAY)
+                                     for s in page["items"]])
+                yield
+                cursor = page["next_cursor"]
+                if cursor is None:
+                    break
+        for kind, directory in (("log", self.log_dir), ("render_cache", self.render_cache_dir)):
+            if not directory or not os.path.isdir(directory):
+                continue
+            rows = []
+            with os.scandir(directory) as it:
+                for item in it:
+                    if not item.is_file():
+                        continue
+                    rows.append((kind, item.path, item.path, item.stat().st_mtime + self.days[kind] * DAY))
+                    if len(rows) >= chunk:
+                        self._track_missing(rows)
+                        rows = []
+                        yield
+            self._track_missing(rows)
+            yield
+
+    # -- cleaning ------------------------------------------------------------
+
+    def due(self, now: float | None = None, limit: int | None = None) -> list[dict]:
+        now = time.time() if now is None else now
+        kinds = list(FILE_KINDS) + (["queue"] if self.queue_store is not None else [])
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT kind, key, path, expires_at FROM expiry WHERE expires_at <= ? "
+                f"AND kind IN ({', '.join('?' for _ in kinds)}) ORDER BY expires_at LIMIT ?",
+                (now, *kinds, limit or self.batch_size),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def run_batch(self, now: float | None = None) -> dict:
+        """Remove up to batch_size due items. Returns {"items", "bytes", "more"}."""
+        now = time.time() if now is None else now
+        reclaimed = {}
+        items = 0
+        due = self.due(now)
+        for row in due:
+            kind = row["kind"]
+            try:
+                freed = self._expire_queue(row) if kind == "queue" else self._expire_file(row, now)
+            except (OSError, sqlite3.Error) as e:
+                self._defer(row, now, e)
+                continue
+            if freed is not None:
+                items += 1
+                n, b = reclaimed.get(kind, (0, 0))
+                reclaimed[kind] = (n + 1, b + freed)
+        remaining = self.batch_size - items
+        checkpoints_more = False
+        if self.checkpoints is not None and self.checkpoint_retention == "until_queued" and remaining > 0:
+            completed = self.checkpoints.completed_jobs(remaining + 1)
+            checkpoints_more = len(completed) > remaining
+            for job_id, size in completed[:remaining]:
+                try:
+                    self.checkpoints.cleanup(job_id)
+                except sqlite3.Error as e:
+                    # Still marked complete, so a later batch retries it
+                    logger.warning("Retention could not clean checkpoints for %s: %s", job_id, e)
+                    self.counters["errors"] += 1
+                    checkpoints_more = False
+                    break
+                items += 1
+                n, b = reclaimed.get("checkpoint", (0, 0))
+                reclaimed["checkpoint"] = (n + 1, b + (size or 0))
+        with self._lock:
+            for kind, (n, b) in reclaimed.items():
+                self.conn.execute(
+                    "INSERT INTO reclaimed (kind, items, bytes) VALUES (?, ?, ?) ON CONFLICT(kind) DO UPDATE "
+                    "SET items = items + excluded.items, bytes = bytes + excluded.bytes",
+                    (kind, n, b),
+                )
+            self.conn.commit()
+        self.counters["batches"] += 1
+        return {"items": items, "bytes": sum(b for _, b in reclaimed.values()),
+                "more": len(due) >= self.batch_size or checkpoints_more}
+
+    def pause_for(self, batch: dict) -> float:
+        """Seconds to wait after a batch: I/O rate limit while catching up, interval when idle."""
+        if not batch["more"]:
+            return self.interval
+        return max(self.min_pause, batch["bytes"] / self.max_bytes_per_second)
+
+    async def run(self) -> None:
+        """Background loop: backfill once (if configured), then batches paced by pause_for()."""
+        if self.backfill_on_start:
+            # Each step scans a directory chunk or a queue page: run it off the loop
+            steps, done = self.backfill(), object()
+            try:
+                while await asyncio.to_thread(next, steps, done) is not done:
+                    pass
+            except (OSError, sqlite3.Error) as e:  # batches still clean what is tracked
+                logger.warning("Retention backfill failed: %s", e)
+                self.counters["errors"] += 1
+        while True:
+            try:
+                batch = await asyncio.to_thread(self.run_batch)
+            except (OSError, sqlite3.Error) as e:  # the index itself failed; try again later
+                logger.warning("Retention batch failed: %s", e)
+                self.counters["errors"] += 1
+                batch = {"items": 0, "bytes": 0, "more": False}
+            await asyncio.sleep(self.pause_for(batch))
+
+    def start(self) -> asyncio.Task:
+        """Schedule run() on the running loop and return at once."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self.run())
+        return self._task
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def report(self, now: float | None = None) -> dict:
+        now = time.time() if now is None else now
+        with self._lock:
+            reclaimed = {r["kind"]: {"items": r["items"], "bytes": r["bytes"]}
+                         for r in self.conn.execute("SELECT kind, items, bytes FROM reclaimed")}
+            tracked = self.conn.execute("SELECT COUNT(*) FROM expiry").fetchone()[0]
+            due = self.conn.execute("SELECT COUNT(*) FROM expiry WHERE expires_at <= ?", (now,)).fetchone()[0]
+        return {
+            "reclaimed": reclaimed,
+            "bytes_reclaimed": sum(r["bytes"] for r in reclaimed.values()),
+            "tracked": tracked,
+            "due": due,
+            **self.counters,
+        }
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _track_missing(self, rows: list[tuple]) -> None:
+        if not rows:
+            return
+        with self._lock:
+            cur = self.conn.executemany(
+                "INSERT OR IGNORE INTO expiry (kind, key, path, expires_at) VALUES (?, ?, ?, ?)", rows
+            )
+            self.conn.commit()
+        self.counters["backfilled"] += cur.rowcount
+
+    def _defer(self, row: dict, now: float, error: Exception) -> None:
+        logger.warning("Retention could not remove %s %s: %s; retrying in %ss",
+                       row["kind"], row["key"], error, self.retry_delay)
+        self.counters["errors"] += 1
+        try:
+            self.track(row["kind"], row["key"], now + self.retry_delay, row["path"])
+        except sqlite3.Error as e:  # stays due; the next batch tries again
+            logger.warning("Retention could not reschedule %s %s: %s", row["kind"], row["key"], e)
+
+    def _expire_file(self, row: dict, now: float) -> int | None:
+        path = row["path"]
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            self.counters["missing"] += 1
+            self.untrack(row["kind"], row["key"])
+            return None
+        if row["kind"] == "log" and stat.st_mtime + self.days["log"] * DAY > now:  # written since tracked
+            self.track_file("log", path, start=stat.st_mtime)
+            self.counters["rescheduled"] += 1
+            return None
+        os.remove(path)
+        self.untrack(row["kind"], row["key"])
+        self.counters["deleted"] += 1
+        return stat.st_size
+
+    def _expire_queue(self, row: dict) -> int | None:
+        entry_id = row["key"]
+        entry = self.queue_store.get(entry_id)
+        if entry is None:
+            self.counters["missing"] += 1
+            self.untrack("queue", entry_id)
+            return None
+        path = os.path.join(self.queue_store.queue_dir, f"{entry_id}.json")
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if self.queue_archive_dir:
+            os.makedirs(self.queue_archive_dir, exist_ok=True)
+            archive = os.path.join(self.queue_archive_dir, f"{entry_id}.json.gz")
+            with gzip.open(archive, "wt") as f:
+                json.dump(entry, f)
+            size -= os.path.getsize(archive)
+            self.counters["archived"] += 1
+        self.queue_store.delete(entry_id)  # untracks through the listener
+        self.counters["deleted"] += 1
+        return max(size, 0)
+
+    def _on_queue(self, event: dict) -> None:
+        if event["kind"] == "queue_put":
+            entry = event["entry"]
+            expires = _epoch(entry.get("created_at")) + self.days["queue"] * DAY
+            self.track("queue", event["entry_id"], expires)
+        elif event["kind"] == "queue_delete":
+            self.untrack("queue", event["entry_id"])
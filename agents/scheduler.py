@@ -0,0 +1,242 @@
+"""GenerationScheduler: Deadline-aware priority queue for the generation pipeline.
+
+Match results waiting for generation are ranked, not taken in discovery order:
+
+1. Dashboard-initiated regenerations, oldest request first.
+2. Postings whose application_deadline is within urgent_days,
+   earliest deadline first.
+3. Everything else by value density: composite_score per estimated dollar
+   (config/budget.yaml estimates), then by score.
+
+get() hands out the best item that still fits the day's remaining budget and
+max_applications_per_day (regenerations don't count against the latter).
+Postings whose deadline has passed are dropped. When a regeneration arrives
+and every slot is busy, the lowest-ranked running background job is asked to
+yield: its preempt event is set, and the orchestrator checks preempted() at
+stage boundaries and calls requeue(). The job resumes later from its
+checkpoint. A regeneration of a job that is still running is held until that
+run yields (requeue) or finishes (complete), so the two never share a
+running slot. order() exposes the current queue for inspection.
+"""
+
+import asyncio
+import itertools
+from datetime import datetime, time, timezone
+
+REGENERATION = "regeneration"
+BACKGROUND = "background"
+
+
+def parse_deadline(value) -> datetime | None:
+    """ISO date or datetime -> aware datetime. A bare date means end of that day (UTC)."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+    try:
+        parsed = datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+    if len(str(value)) <= 10:
+        parsed = datetime.combine(parsed.date(), time.max)
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+class GenerationScheduler:
+    def __init__(self, config: dict | None = None, budget: dict | None = None, clock=None):
+        """budget: the full config/budget.yaml dict (budget + estimates sections)."""
+        config = config or {}
+        scheduling = config.get("scheduling", {})
+        self.slots = scheduling.get("max_concurrent_generations", 3)
+        self.max_per_day = scheduling.get("max_applications_per_day", 10)
+        self.urgent_days = scheduling.get("urgent_deadline_days", 3)
+        budget = budget or {}
+        self.daily_limit = budget.get("budget", {}).get("daily_limit_usd")
+        self.estimates = {
+            "with_cover_letter": 1.50, "without_cover_letter": 0.75, "app_questions": 0.02,
+            **budget.get("estimates", {}),
+        }
+        self.clock = clock or (lambda: datetime.now(timezone.utc))
+
+        self._pending = {}       # job_id -> entry
+        self._running = {}       # job_id -> entry
+        self._seq = itertools.count()
+        self._cond = asyncio.Condition()
+        self.expired = []
+        self._day = self.clock().date()
+        self.started_today = 0
+        self.spent_today = 0.0
+
+    def estimate_cost(self, match_result: dict) -> float:
+        job = match_result.get("job", match_result)
+        role = job.get("role", {})
+        # requires_cover_letter is null when unknown: budget for one
+        cost = self.estimates["without_cover_letter"] if role.get("requires_cover_letter") is False \
+            else self.estimates["with_cover_letter"]
+        if job.get("application_questions"):
+            cost += self.estimates["app_questions"]
+        return cost
+
+    async def submit(self, match_result: dict, kind: str = BACKGROUND) -> None:
+        """Queue a match result. A regeneration replaces any queued entry for the same job."""
+        job = match_result.get("job", match_result)
+        job_id = match_result.get("job_id") or job.get("job_id")
+        async with self._cond:
+            if kind == BACKGROUND and (job_id in self._pending or job_id in self._running):
+                return
+            self._pending[job_id] = {
+                "job_id": job_id,
+                "kind": kind,
+                "match_result": match_result,
+                "deadline": parse_deadline(job.get("role", {}).get("application_deadline")),
+                "score": float(match_result.get("composite_score") or 0.0),
+                "cost": self.estimate_cost(match_result),
+                "seq": next(self._seq),
+                "preempt": asyncio.Event(),
+            }
+            if kind == REGENERATION:
+                if job_id in self._running:
+                    self._running[job_id]["preempt"].set()  # superseded by the regeneration
+                else:
+                    self._preempt_for_regeneration()
+            self._cond.notify_all()
+
+    async def get(self) -> dict:
+        """Wait for and claim the next runnable entry (see module docstring for order)."""
+        async with self._cond:
+            while True:
+                entry = self._next_runnable()
+                if entry is not None:
+                    return entry
+                await self._cond.wait()
+
+    def get_nowait(self) -> dict | None:
+        return self._next_runnable()
+
+    async def complete(self, job_id: str, actual_cost: float | None = None) -> None:
+        """Release a slot; replaces the reserved estimate with the actual cost if given."""
+        async with self._cond:
+            entry = self._running.pop(job_id, None)
+            if entry is not None and actual_cost is not None:
+                self.spent_today += actual_cost - entry["cost"]
+            self._cond.notify_all()
+
+    def preempted(self, job_id: str) -> bool:
+        entry = self._running.get(job_id)
+        return entry is not None and entry["preempt"].is_set()
+
+    async def requeue(self, job_id: str) -> None:
+        """Put a preempted (or interrupted) running job back in the queue.
+
+        Its reservation is returned; it keeps its original position among ties.
+        """
+        async with self._cond:
+            entry = self._running.pop(job_id, None)
+            if entry is None:
+                return
+            self.spent_today -= entry["cost"]
+            if entry["kind"] == BACKGROUND:
+                self.started_today -= 1
+            if job_id in self._pending:
+                return  # a regeneration of this job is already queued
+            entry["preempt"] = asyncio.Event()
+            self._pending[job_id] = entry
+            self._cond.notify_all()
+
+    def order(self) -> list[dict]:
+        """Queued entries best first, with why each is ranked where it is."""
+        self._roll_day()
+        now = self.clock()
+        remaining = self._remaining_budget()
+        rows = []
+        for rank, entry in enumerate(self._ranked(now), 1):
+            rows.append({
+                "rank": rank,
+                "job_id": entry["job_id"],
+                "kind": entry["kind"],
+                "deadline": entry["deadline"].isoformat() if entry["deadline"] else None,
+                "score": entry["score"],
+                "estimated_cost": entry["cost"],
+                "tier": self._tier_name(entry, now),
+                "affordable": remaining is None or entry["cost"] <= remaining,
+            })
+        return rows
+
+    def running(self) -> list[dict]:
+        return [{"job_id": e["job_id"], "kind": e["kind"], "preempt": e["preempt"].is_set()}
+                for e in self._running.values()]
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def _next_runnable(self) -> dict | None:
+        self._roll_day()
+        now = self.clock()
+        self._drop_expired(now)
+        remaining = self._remaining_budget()
+        # A background job asked to yield no longer holds its slot
+        busy = len(self._running) - sum(e["preempt"].is_set() for e in self._running.values())
+        if busy >= self.slots:
+            return None
+        for entry in self._ranked(now):
+            if entry["job_id"] in self._running:
+                continue  # a regeneration waits until the run it supersedes yields or completes
+            regen = entry["kind"] == REGENERATION
+            if not regen and self.started_today >= self.max_per_day:
+                continue
+            if remaining is not None and entry["cost"] > remaining:
+                continue
+            del self._pending[entry["job_id"]]
+            self._running[entry["job_id"]] = entry
+            self.spent_today += entry["cost"]
+            if not regen:
+                self.started_today += 1
+            return entry
+        return None
+
+    def _ranked(self, now: datetime) -> list:
+        return sorted(self._pending.values(), key=lambda e: self._key(e, now))
+
+    def _key(self, entry: dict, now: datetime) -> tuple:
+        tier = self._tier(entry, now)
+        if tier == 0:
+            return (0, entry["seq"])
+        if tier == 1:
+            return (1, entry["deadline"], -entry["score"], entry["seq"])
+        return (2, -entry["score"] / max(entry["cost"], 0.01), -entry["score"], entry["seq"])
+
+    def _tier(self, entry: dict, now: datetime) -> int:
+        if entry["kind"] == REGENERATION:
+            return 0
+        deadline = entry["deadline"]
+        if deadline is not None and (deadline - now).total_seconds() <= self.urgent_days * 86400:
+            return 1
+        return 2
+
+    def _tier_name(self, entry: dict, now: datetime) -> str:
+        return ("regeneration", "deadline", "value")[self._tier(entry, now)]
+
+    def _preempt_for_regeneration(self) -> None:
+        active = [e for e in self._running.values() if not e["preempt"].is_set()]
+        if len(active) < self.slots:
+            return
+        background = [e for e in active if e["kind"] == BACKGROUND]
+        if background:
+            now = self.clock()
+            victim = max(background, key=lambda e: self._key(e, now))
+            victim["preempt"].set()
+
+    def _drop_expired(self, now: datetime) -> None:
+        for job_id, entry in list(self._pending.items()):
+            if entry["kind"] == BACKGROUND and entry["deadline"] is not None and entry["deadline"] < now:
+                self.expired.append(self._pending.pop(job_id))
+
+    def _remaining_budget(self) -> float | None:
+        if self.daily_limit is None:
+            return None
+        return self.daily_limit - self.spent_today
+
+    def _roll_day(self) -> None:
+        today = self.clock().date()
+        if today != self._day:
+            self._day, self.started_today, self.spent_today = today, 0, 0.0
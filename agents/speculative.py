@@ -0,0 +1,167 @@
+"""SpeculativeResumeLoop: Parallel diverse drafts for the resume loop (opt-in).
+
+The §7.1 resume loop runs draft -> verify -> revise one step at a time. With
+generation.speculative_drafts set to N > 1, this loop instead:
+
+1. requests N drafts concurrently, each with a different drafting strategy
+2. verifies each one with VerificationRunner as it arrives (in worker threads,
+   so verification overlaps with drafts still generating)
+3. returns at once if any draft passes, cancelling the drafts still in flight
+4. otherwise revises only the best quality_score draft, as §7.1 does
+
+Candidates are ranked by (passed, quality_score): a passing draft always
+beats a failing one, whatever their scores.
+
+A draft that fails (API error, verifier error) is recorded in the history and
+skipped; the run fails only if every draft fails.
+
+N is capped so the extra drafts fit in budget.per_application_limit_usd after
+reserving the normal per-application estimate, and no call is started once
+spend would cross that limit. The winner is chosen by the programmatic
+verifier, never by the LLM.
+"""
+
+import asyncio
+import math
+
+DRAFT_STRATEGIES = [
+    "Lead with the experience most relevant to this role.",
+    "Emphasize quantified accomplishments from the profile.",
+    "Mirror the job posting's language wherever the profile genuinely supports it.",
+    "Foreground methods and technical skills before domain experience.",
+]
+
+
+def _rank(verification: dict) -> tuple:
+    return (verification["status"] == "PASS", verification["quality_score"])
+
+
+class BudgetExceeded(Exception):
+    """Raised when not even one draft fits within the per-application limit."""
+
+
+class DraftFailed(Exception):
+    """One speculative draft failed; the cause is chained. Internal to run()."""
+
+    def __init__(self, index: int):
+        super().__init__(f"draft {index} failed")
+        self.index = index
+
+
+class SpeculativeResumeLoop:
+    def __init__(self, draft, revise, verifier, config: dict | None = None,
+                 budget: dict | None = None, on_iteration=None):
+        """draft: async (strategy: str, index: int) -> {"content", "entry_ids", "cost_usd"}.
+        revise: async (previous: dict, issues: list) -> same shape.
+        verifier: VerificationRunner (verify_resume is called in a worker thread).
+        budget: the full config/budget.yaml dict.
+        on_iteration: optional callback(iteration, candidate, verification), e.g. a checkpoint."""
+        generation = (config or {}).get("generation", {})
+        budget = budget or {}
+        self.draft = draft
+        self.revise = revise
+        self.verifier = verifier
+        self.on_iteration = on_iteration
+        self.max_iterations = generation.get("max_programmatic_iterations", 4)
+        self.requested_drafts = max(1, generation.get("speculative_drafts", 1))
+        self.per_app_limit = budget.get("budget", {}).get("per_application_limit_usd", 5.00)
+        estimates = budget.get("estimates", {})
+        self.draft_cost = estimates.get("resume_draft", 0.35)
+        self.baseline_cost = estimates.get("with_cover_letter", 1.50)
+
+    def draft_count(self, spent: float = 0.0) -> int:
+        """N actually used: requested drafts, minus any that don't fit the limit.
+
+        The normal application estimate is reserved first; only the remainder
+        pays for extra speculative drafts.
+        """
+        extra_budget = self.per_app_limit - spent - self.baseline_cost
+        affordable_extra = max(0, math.floor(extra_budget / self.draft_cost + 1e-9))
+        return max(1, min(self.requested_drafts, 1 + affordable_extra))
+
+    async def run(self, spent: float = 0.0) -> dict:
+        """Returns {"candidate", "verification", "iterations", "drafts", "cancelled", "failed",
+        "cost_usd", "history"}. spent: what this application has already cost.
+        If every draft fails, the first failure's exception is raised."""
+        if spent + self.draft_cost > self.per_app_limit:
+            raise BudgetExceeded(f"${spent:.2f} spent; a draft would exceed ${self.per_app_limit:.2f}")
+        n = self.draft_count(spent)
+        history = []
+        cost = 0.0
+
+        tasks = [
+            asyncio.create_task(self._draft_and_verify(DRAFT_STRATEGIES[i % len(DRAFT_STRATEGIES)], i))
+            for i in range(n)
+        ]
+        best = best_v = None
+        cancelled = 0
+        failures = []
+        try:
+            for finished in asyncio.as_completed(tasks):
+                try:
+                    candidate, verification = await finished
+                except DraftFailed as e:
+                    failures.append(e)
+                    history.append({"iteration": 0, "draft": e.index, "quality_score": None,
+                                    "status": "ERROR", "error": repr(e.__cause__)})
+                    continue
+                cost += candidate.get("cost_usd", 0.0)
+                history.append({"iteration": 0, "draft": candidate["index"],
+                                "quality_score": verification["quality_score"],
+                                "status": verification["status"]})
+                if self.on_iteration:
+                    self.on_iteration(0, candidate, verification)
+                if best_v is None or _rank(verification) > _rank(best_v):
+                    best, best_v = candidate, verification
+                if verification["status"] == "PASS":
+                    break
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    cancelled += 1
+            # Cancelled drafts still cost whatever they had consumed; callers
+            # reconcile against the API's usage records
+            await asyncio.gather(*tasks, return_exceptions=True)
+        if best is None:
+            raise failures[0].__cause__
+
+        iterations = 1
+        current, current_v = best, best_v
+        while (best_v["status"] != "PASS" and iterations < self.max_iterations
+               and spent + cost + self.draft_cost <= self.per_app_limit):
+            current = await self.revise(current, current_v["issues"])
+            current_v = await asyncio.to_thread(
+                self.verifier.verify_resume, current["content"], current.get("entry_ids")
+            )
+            cost += current.get("cost_usd", 0.0)
+            history.append({"iteration": iterations, "draft": best["index"],
+                            "quality_score": current_v["quality_score"],
+                            "status": current_v["status"]})
+            if self.on_iteration:
+                self.on_iteration(iterations, current, current_v)
+            iterations += 1
+            if _rank(current_v) > _rank(best_v):
+                best, best_v = {**current, "index": best["index"]}, current_v
+
+        return {
+            "candidate": best,
+            "verification": best_v,
+            "iterations": iterations,
+            "drafts": n,
+            "cancelled": cancelled,
+            "failed": len(failures),
+            "cost_usd": cost,
+            "history": history,
+        }
+
+    async def _draft_and_verify(self, strategy: str, index: int) -> tuple:
+        try:
+            candidate = await self.draft(strategy, index)
+            candidate = {**candidate, "index": index, "strategy": strategy}
+            verification = await asyncio.to_thread(
+                self.verifier.verify_resume, candidate["content"], candidate.get("entry_ids")
+            )
+        except Exception as e:
+            raise DraftFailed(index) from e
+        return candidate, verification
@@ -0,0 +1,370 @@
+"""StateManager: Orchestrator state in SQLite instead of data/state.json.
+
+state.json (§7.1) is rewritten in full on every status change. Here each
+application, job and budget entry is one row, so a status change is one
+indexed UPDATE. Dashboard views query by status, date and company through
+indexes, however long the history grows. The database runs in WAL mode, so
+readers never block the writer.
+
+- set_status() is compare-and-set: a transition applies only if the row is
+  still in the expected status.
+- transition() applies several status changes atomically, all or nothing.
+- Scalar flags ("paused", last run times) live in a key/value table.
+- Listeners registered with add_listener() get each committed change;
+  in_transaction listeners run inside the writing transaction, so derived
+  tables (calibration/stats_aggregates.py) commit or roll back with it.
+- import_json() loads an existing state.json once.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS applications (
+    job_id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    company TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    classification TEXT,
+    composite_score REAL,
+    outcome TEXT,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    data TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_applications_status ON applications (status, updated_at);
+CREATE INDEX IF NOT EXISTS idx_applications_updated ON applications (updated_at);
+CREATE INDEX IF NOT EXISTS idx_applications_company ON applications (company COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    company TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    source TEXT,
+    discovered_at TEXT NOT NULL,
+    data TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_discovered ON jobs (discovered_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_company ON jobs (company COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS budget_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts TEXT NOT NULL,
+    day TEXT NOT NULL,
+    job_id TEXT,
+    agent TEXT,
+    model TEXT,
+    input_tokens INTEGER NOT NULL DEFAULT 0,
+    output_tokens INTEGER NOT NULL DEFAULT 0,
+    cost_usd REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_budget_day ON budget_entries (day);
+CREATE INDEX IF NOT EXISTS idx_budget_job ON budget_entries (job_id);
+
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Application columns stored outside the data JSON
+APP_COLUMNS = ("status", "company", "title", "classification", "composite_score", "outcome")
+
+
+class StateConflict(Exception):
+    """A transition's expected status didn't match the stored one; nothing was applied."""
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _name(value) -> str:
+    """Company/title may be a plain string or a Scout-style {"name": ...} dict."""
+    if isinstance(value, dict):
+        return value.get("name") or value.get("title") or ""
+    return value or ""
+
+
+class StateManager:
+    def __init__(self, config: dict | None = None):
+        config = (config or {}).get("state", {})
+        self.db_path = config.get("db_path", "data/state.db")
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        # Autocommit mode; transactions are opened explicitly with BEGIN IMMEDIATE
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.RLock()
+        self._listeners = []
+        self._tx_listeners = []
+        self._events = None
+        self._depth = 0
+
+        legacy = config.get("json_path", "data/state.json")
+        if config.get("import_on_startup", True) and legacy and os.path.exists(legacy):
+            self.import_json(legacy)
+
+    # -- transactions and listeners --------------------------------------
+
+    @contextmanager
+    def transaction(self):
+        """Group writes into one atomic commit. Nested use joins the outer transaction."""
+        with self._lock:
+            if self._depth:
+                self._depth += 1
+                try:
+                    yield self
+                finally:
+                    self._depth -= 1
+                return
+            self.conn.execute("BEGIN IMMEDIATE")
+            self._depth, self._events = 1, []
+            try:
+                yield self
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            else:
+                self.conn.execute("COMMIT")
+                events = self._events
+            finally:
+                self._depth, self._events = 0, None
+        for event in events:
+            for listener in self._listeners:
+                listener(event)
+
+    def add_listener(self, listener, in_transaction: bool = False) -> None:
+        """listener(event) after each commit, or before it with in_transaction=True
+        (an exception then rolls the write back).
+        event: {"kind", "job_id", "old", "new", "row", "previous"}."""
+        (self._tx_listeners if in_transaction else self._listeners).append(listener)
+
+    def _emit(self, kind: str, job_id: str | None, old, new, row: dict | None = None,
+              previous: dict | None = None) -> None:
+        event = {"kind": kind, "job_id": job_id, "old": old, "new": new, "row": row, "previous": previous}
+        for listener in self._tx_listeners:
+            listener(event)
+        self._events.append(event)
+
+    # -- key/value flags ---------------------------------------------------
+
+    def get(self, key: str, default=None):
+        row = self.conn.execute("SELECT value FROM kv WHERE key = ?", (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, key: str, value) -> None:
+        with self.transaction():
+            self.conn.execute(
+                "INSERT INTO kv (key, value) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                (key, json.dumps(value)),
+            )
+
+    # -- jobs ----------------------------------------------------------------
+
+    def upsert_job(self, job: dict) -> None:
+        with self.transaction():
+            self.conn.execute(
+                "INSERT INTO jobs (job_id, company, title, source, discovered_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(job_id) DO UPDATE SET "
+                "company = excluded.company, title = excluded.title, "
+                "source = excluded.source, data = excluded.data",
+                (job["job_id"], _name(job.get("company")), _name(job.get("role", job.get("title"))),
+                 job.get("source"), job.get("discovered_at") or _now(), json.dumps(job)),
+            )
+
+    def get_job(self, job_id: str) -> dict | None:
+        row = self.conn.execute("SELECT data FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def jobs(self, company: str | None = None, since: str | None = None, limit: int = 100) -> list[dict]:
+        sql, args = "SELECT data FROM jobs WHERE 1=1", []
+        if company:
+            sql += " AND company = ? COLLATE NOCASE"
+            args.append(company)
+        if since:
+            sql += " AND discovered_at >= ?"
+            args.append(since)
+        sql += " ORDER BY discovered_at DESC LIMIT ?"
+        args.append(limit)
+        return [json.loads(r[0]) for r in self.conn.execute(sql, args)]
+
+    # -- applications -----------------------------------------------------
+
+    def upsert_application(self, job_id: str, **fields) -> dict:
+        """Insert or update one application row. Unknown fields go into the data JSON."""
+        with self.transaction():
+            current = self._app_row(job_id)
+            now = _now()
+            if current is None:
+                app = {"status": "pending", **fields}
+                data = {k: v for k, v in app.items() if k not in APP_COLUMNS}
+                self.conn.execute(
+                    "INSERT INTO applications (job_id, status, company, title, classification, "
+                    "composite_score, outcome, created_at, updated_at, data) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (job_id, app["status"], _name(app.get("company")), _name(app.get("title")),
+                     app.get("classification"), app.get("composite_score"), app.get("outcome"),
+                     app.get("created_at", now), now, json.dumps(data)),
+                )
+                row = self._app_row(job_id)
+                self._emit("application", job_id, None, row["status"], row)
+                return row
+
+            columns = {k: fields[k] for k in APP_COLUMNS if k in fields}
+            for key in ("company", "title"):
+                if key in columns:
+                    columns[key] = _name(columns[key])
+            extra = {k: v for k, v in fields.items() if k not in APP_COLUMNS}
+            sets = [f"{k} = ?" for k in columns] + ["updated_at = ?"]
+            args = list(columns.values()) + [now]
+            if extra:
+                sets.append("data = json_patch(data, ?)")
+                args.append(json.dumps(extra))
+            self.conn.execute(
+                f"UPDATE applications SET {', '.join(sets)} WHERE job_id = ?", args + [job_id]
+            )
+            row = self._app_row(job_id)
+            self._emit("application", job_id, current["status"], row["status"], row, current)
+            return row
+
+    def get_application(self, job_id: str) -> dict | None:
+        return self._app_row(job_id)
+
+    def set_status(self, job_id: str, status: str, expected: str | tuple | None = None) -> bool:
+        """Compare-and-set one application's status. False if expected didn't match."""
+        try:
+            self.transition([(job_id, status, expected)])
+            return True
+        except StateConflict:
+            return False
+
+    def transition(self, changes: list[tuple]) -> None:
+        """Atomically apply [(job_id, new_status, expected_status_or_None), ...].
+
+        expected may be a tuple of acceptable statuses. Raises StateConflict
+        (and applies nothing) if any row is missing or not in its expected status.
+        """
+        with self.transaction():
+            now = _now()
+            for job_id, status, expected in changes:
+                row = self._app_row(job_id)
+                if row is None:
+                    raise StateConflict(f"No application {job_id}")
+                allowed = (expected,) if isinstance(expected, str) else expected
+                if allowed is not None and row["status"] not in allowed:
+                    raise StateConflict(f"{job_id} is '{row['status']}', expected {allowed}")
+                self.conn.execute(
+                    "UPDATE applications SET status = ?, updated_at = ? WHERE job_id = ?",
+                    (status, now, job_id),
+                )
+                self._emit("application", job_id, row["status"], status, self._app_row(job_id), row)
+
+    def applications(self, status: str | tuple | None = None, company: str | None = None,
+                     since: str | None = None, limit: int = 100, offset: int = 0) -> list[dict]:
+        """Newest first. Filters use the status/updated_at/company indexes."""
+        sql, args = "SELECT * FROM applications WHERE 1=1", []
+        if status:
+            statuses = (status,) if isinstance(status, str) else tuple(status)
+            sql += f" AND status IN ({', '.join('?' for _ in statuses)})"
+            args.extend(statuses)
+        if company:
+            sql += " AND company = ? COLLATE NOCASE"
+            args.append(company)
+        if since:
+            sql += " AND updated_at >= ?"
+            args.append(since)
+        sql += " ORDER BY updated_at DESC LIMIT ? OFFSET ?"
+        args.extend([limit, offset])
+        return [self._row_dict(r) for r in self.conn.execute(sql, args)]
+
+    def count_by_status(self) -> dict:
+        return dict(self.conn.execute("SELECT status, COUNT(*) FROM applications GROUP BY status").fetchall())
+
+    def incomplete(self) -> list[str]:
+        """job_ids left in 'generating' (crash recovery, §7.1)."""
+        return [r[0] for r in self.conn.execute(
+            "SELECT job_id FROM applications WHERE status = 'generating'"
+        )]
+
+    # -- budget -------------------------------------------------------------
+
+    def record_cost(self, cost_usd: float, job_id: str | None = None, agent: str | None = None,
+                    model: str | None = None, usage: dict | None = None, ts: str | None = None) -> None:
+        usage = usage or {}
+        ts = ts or _now()
+        day = ts[:10]
+        with self.transaction():
+            self.conn.execute(
+                "INSERT INTO budget_entries (ts, day, job_id, agent, model, input_tokens, "
+                "output_tokens, cost_usd) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (ts, day, job_id, agent, model,
+                 usage.get("input_tokens", 0), usage.get("output_tokens", 0), cost_usd),
+            )
+            self._emit("budget", job_id, None, cost_usd, {"day": day, "agent": agent, "model": model})
+
+    def spent_on(self, day: str | None = None) -> float:
+        day = day or datetime.now(timezone.utc).date().isoformat()
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(cost_usd), 0) FROM budget_entries WHERE day = ?", (day,)
+        ).fetchone()[0]
+
+    def spent_for(self, job_id: str) -> float:
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(cost_usd), 0) FROM budget_entries WHERE job_id = ?", (job_id,)
+        ).fetchone()[0]
+
+    # -- import -------------------------------------------------------------
+
+    def import_json(self, path: str) -> dict:
+        """One-shot import of a legacy state.json. Returns counts; no-op if already imported.
+
+        Expected shape: {"applications": {job_id: {...}}, "jobs": {job_id: {...}},
+        "budget": {"entries": [...]}, ...}; other top-level keys become flags.
+        """
+        if self.get("_imported_from") == os.path.abspath(path):
+            return {"skipped": True}
+        with open(path) as f:
+            state = json.load(f)
+        counts = {"applications": 0, "jobs": 0, "budget_entries": 0, "flags": 0}
+        with self.transaction():
+            for job_id, job in (state.get("jobs") or {}).items():
+                self.upsert_job({"job_id": job_id, **job})
+                counts["jobs"] += 1
+            for job_id, app in (state.get("applications") or {}).items():
+                self.upsert_application(job_id, **app)
+                counts["applications"] += 1
+            budget = state.get("budget") or {}
+            for entry in budget.get("entries", []) if isinstance(budget, dict) else budget:
+                self.record_cost(
+                    entry.get("cost_usd", entry.get("cost", 0.0)), job_id=entry.get("job_id"),
+                    agent=entry.get("agent"), model=entry.get("model"), usage=entry,
+                    ts=entry.get("ts") or entry.get("day"),
+                )
+                counts["budget_entries"] += 1
+            for key, value in state.items():
+                if key not in ("applications", "jobs", "budget"):
+                    self.set(key, value)
+                    counts["flags"] += 1
+            self.set("_imported_from", os.path.abspath(path))
+        return counts
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _app_row(self, job_id: str) -> dict | None:
+        row = self.conn.execute("SELECT * FROM applications WHERE job_id = ?", (job_id,)).fetchone()
+        return self._row_dict(row) if row else None
+
+    def _row_dict(self, row) -> dict:
+        out = dict(row)
+        data = json.loads(out.pop("data") or "{}")
+        return {**data, **out}
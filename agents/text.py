@@ -0,0 +1,15 @@
+"""Text utilities: Keyword tokenization shared by the pre-screener and context builder."""
+
+import re
+
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "has", "have",
+    "in", "is", "it", "its", "of", "on", "or", "our", "that", "the", "their", "this",
+    "to", "we", "will", "with", "you", "your", "who", "what", "all", "can", "us",
+    "work", "team", "role", "job", "including", "experience", "ability", "strong",
+}
+
+
+def tokenize(text: str) -> list:
+    """Lowercased word tokens (skill-friendly: keeps c++, c#, r2), stopwords removed."""
+    return [t for t in re.findall(r"[a-z][a-z0-9+#]*", text.lower()) if t not in STOPWORDS]
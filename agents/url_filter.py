@@ -0,0 +1,174 @@
+"""URL canonicalization and a persisted Bloom filter for exact-URL dedup.
+
+canonicalize_url() collapses the URL shapes Scout sees for one posting
+(tracking parameters, utm_* tags, trailing slashes, redirect wrappers,
+Greenhouse/Lever/LinkedIn/Indeed variants) into one string. It errs towards
+keeping parameters: generic names like "source" or "position" are only
+stripped on hosts known to use them for tracking, and only known redirector
+hosts are unwrapped, because collapsing two real postings into one URL would
+silently drop a job as a duplicate. URLFilter is a
+Bloom filter over canonical URLs, loaded at startup, that answers "definitely
+new" without touching seen_jobs.db. A Bloom filter is used rather than an xor
+filter because discovery inserts URLs incrementally.
+"""
+
+import hashlib
+import math
+import os
+import re
+import struct
+from urllib.parse import parse_qsl, unquote, urlencode, urlsplit, urlunsplit
+
+# Tracker keys no job board uses to identify a posting; stripped on every host
+TRACKING_PARAMS = {
+    "gclid", "fbclid", "msclkid", "mc_cid", "mc_eid", "trk", "trkinfo", "trackingid",
+    "tracking_id", "gh_src", "lever-source", "lever-origin", "lever-via", "original_referer",
+}
+
+# Generic names ("source", "position", "sid", ...) can identify the posting on
+# some boards, so they are only stripped on hosts known to use them for tracking
+HOST_TRACKING_PARAMS = {
+    "linkedin.com": {"refid", "ref", "position", "pagenum", "origin"},
+    "indeed.com": {"from", "tk", "alid", "ebp", "vjs", "sid", "cid", "pagenum"},
+}
+
+# Redirector hosts and the query parameter that wraps the real destination
+REDIRECT_PARAMS = {
+    "linkedin.com": ("url",),                 # /redir/redirect?url=
+    "google.com": ("q", "url"),               # /url?q=
+    "googleadservices.com": ("adurl",),
+    "facebook.com": ("u",),                   # l.facebook.com/l.php?u=
+}
+
+LINKEDIN_VIEW = re.compile(r"/jobs/view/(?:[^/]*?-)?(\d+)/?$")
+LEVER_POSTING = re.compile(r"^/([^/]+)/([0-9a-f-]{36})(?:/apply)?/?$", re.I)
+GREENHOUSE_POSTING = re.compile(r"^/([^/]+)/jobs/(\d+)/?$")
+
+FILTER_MAGIC = b"JABF1"
+
+
+def canonicalize_url(url: str, _depth: int = 0) -> str:
+    """Canonical form of a job posting URL. Unknown shapes get generic cleanup."""
+    if not url:
+        return ""
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    path = parts.path or "/"
+    params = parse_qsl(parts.query, keep_blank_values=False)
+    lowered = {k.lower(): v for k, v in params}
+
+    # 1. Redirect wrappers, on known redirector hosts only
+    if _depth < 3:
+        for key in _for_host(REDIRECT_PARAMS, host, ()):
+            target = unquote(lowered.get(key, ""))
+            if target.startswith(("http://", "https://")):
+                return canonicalize_url(target, _depth + 1)
+
+    # 2. Known job-board shapes
+    if host.endswith("greenhouse.io"):
+        m = GREENHOUSE_POSTING.match(path)
+        if m:
+            return f"https://boards.greenhouse.io/{m.group(1).lower()}/jobs/{m.group(2)}"
+        if path.rstrip("/").endswith("/embed/job_app") and "for" in lowered and "token" in lowered:
+            return f"https://boards.greenhouse.io/{lowered['for'].lower()}/jobs/{lowered['token']}"
+    if "gh_jid" in lowered:
+        # Greenhouse posting embedded on a company career site
+        return urlunsplit(("https", host, path.rstrip("/") or "/", f"gh_jid={lowered['gh_jid']}", ""))
+    if host == "jobs.lever.co":
+        m = LEVER_POSTING.match(path)
+        if m:
+            return f"https://jobs.lever.co/{m.group(1).lower()}/{m.group(2).lower()}"
+    if host.endswith("linkedin.com"):
+        m = LINKEDIN_VIEW.search(path)
+        job_id = m.group(1) if m else lowered.get("currentjobid")
+        if job_id:
+            return f"https://linkedin.com/jobs/view/{job_id}"
+    if host == "indeed.com" or host.endswith(".indeed.com"):
+        job_key = lowered.get("jk") or lowered.get("vjk")
+        if job_key:
+            return f"https://{host}/viewjob?jk={job_key}"
+
+    # 3. Generic cleanup: drop tracking params, sort the rest, trim trailing slash
+    host_tracking = _for_host(HOST_TRACKING_PARAMS, host, set())
+    kept = sorted(
+        (k, v) for k, v in params
+        if k.lower() not in TRACKING_PARAMS and k.lower() not in host_tracking
+        and not k.lower().startswith("utm_")
+    )
+    path = path.rstrip("/") or "/"
+    return urlunsplit(("https", host, path, urlencode(kept), ""))
+
+
+def _for_host(table: dict, host: str, default):
+    """table's entry for host or the registered domain it belongs to."""
+    for domain, value in table.items():
+        if host == domain or host.endswith("." + domain):
+            return value
+    return default
+
+
+class URLFilter:
+    """Bloom filter over canonical URLs, persisted to a single file."""
+
+    def __init__(self, capacity: int = 100_000, fp_rate: float = 0.01):
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.num_bits = max(8, int(-capacity * math.log(fp_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def add(self, item: str) -> None:
+        for pos in self._positions(item):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(item))
+
+    def expected_fp_rate(self) -> float:
+        """(1 - e^(-kn/m))^k for the current fill."""
+        return (1 - math.exp(-self.num_hashes * self.count / self.num_bits)) ** self.num_hashes
+
+    def memory_bytes(self) -> int:
+        return len(self.bits)
+
+    def over_capacity(self) -> bool:
+        return self.count > self.capacity
+
+    def save(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(FILTER_MAGIC)
+            f.write(struct.pack("<QdQQQ", self.capacity, self.fp_rate,
+                                self.num_bits, self.num_hashes, self.count))
+            f.write(self.bits)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> "URLFilter":
+        with open(path, "rb") as f:
+            if f.read(len(FILTER_MAGIC)) != FILTER_MAGIC:
+                raise ValueError(f"{path} is not a URL filter file")
+            capacity, fp_rate, num_bits, num_hashes, count = struct.unpack(
+                "<QdQQQ", f.read(struct.calcsize("<QdQQQ"))
+            )
+            bits = bytearray(f.read())
+        filt = cls.__new__(cls)
+        filt.capacity, filt.fp_rate = capacity, fp_rate
+        filt.num_bits, filt.num_hashes, filt.count = num_bits, num_hashes, count
+        filt.bits = bits
+        return filt
+
+    def _positions(self, item: str):
+        # Kirsch-Mitzenmacher double hashing from one 128-bit digest
+        digest = hashlib.blake2b(item.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
@@ -0,0 +1,97 @@
+"""Benchmark: discovery-time near-duplicate lookup at 100k+ seen jobs.
+
+Compares the LSH candidate lookup in JobDeduplicator with the linear scan it
+replaces (exact similarity against every seen job).
+
+    python -m benchmarks.bench_dedup_lsh [--seen 100000] [--queries 200]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from agents.dedup import JobDeduplicator, jaccard
+
+VOCAB = [f"w{i}" for i in range(5000)]
+
+
+def synthetic_job(i, rng, base=None):
+    words = list(base) if base else [rng.choice(VOCAB) for _ in range(150)]
+    if base:
+        for _ in range(2):
+            words[rng.randrange(len(words))] = rng.choice(VOCAB)
+    return {
+        "job_id": f"job_{i}",
+        "source_url": f"https://example.com/jobs/{i}",
+        "company": {"name": f"company {i % 5000}"},
+        "role": {"title": "Statistician", "description_raw": " ".join(words)},
+    }, words
+
+
+def pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seen", type=int, default=100_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--linear-sample", type=int, default=5_000)
+    args = parser.parse_args()
+    rng = random.Random(7)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dedup = JobDeduplicator({"dedup": {"seen_jobs_path": os.path.join(tmp, "seen_jobs.db")}})
+
+        bases = []
+        start = time.perf_counter()
+        batch = []
+        for i in range(args.seen):
+            job, words = synthetic_job(i, rng)
+            if i < args.queries:
+                bases.append(words)
+            batch.append(job)
+            if len(batch) == 5_000:
+                dedup.add_many(batch)
+                batch = []
+        dedup.add_many(batch)
+        build = time.perf_counter() - start
+        print(f"indexed {args.seen} jobs in {build:.1f}s ({args.seen / build:.0f} jobs/s)")
+
+        # Half near-duplicates of seen jobs, half fresh postings
+        queries = []
+        for q in range(args.queries):
+            if q % 2 == 0:
+                job, _ = synthetic_job(args.seen + q, rng, base=bases[q])
+            else:
+                job, _ = synthetic_job(args.seen + q, rng)
+            queries.append((q % 2 == 0, job))
+
+        latencies, hits = [], 0
+        for expect_dup, job in queries:
+            t = time.perf_counter()
+            is_dup, _, _ = dedup.is_duplicate(job)
+            latencies.append((time.perf_counter() - t) * 1000)
+            hits += is_dup == expect_dup
+        print(f"LSH lookup: p50 {pct(latencies, 0.5):.2f} ms, p95 {pct(latencies, 0.95):.2f} ms, "
+              f"accuracy {hits}/{len(queries)}")
+
+        # Linear scan baseline on a sample, extrapolated to the full history
+        rows = dedup.conn.execute(
+            "SELECT text FROM seen_jobs LIMIT ?", (args.linear_sample,)
+        ).fetchall()
+        probe = dedup.hasher.shingles(queries[0][1]["role"]["description_raw"])
+        t = time.perf_counter()
+        for (text,) in rows:
+            jaccard(probe, dedup.hasher.shingles(text))
+        per_row = (time.perf_counter() - t) / len(rows)
+        print(f"linear scan: ~{per_row * args.seen * 1000:.0f} ms per lookup at {args.seen} jobs "
+              f"(measured on {len(rows)} rows)")
+        dedup.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Benchmark: DOCX throughput, in-process DocxWriter vs a pandoc subprocess.
+
+Renders the fixture resume N times with each engine and reports documents
+per second and per-document latency. The pandoc engine is skipped when
+pandoc is not on PATH.
+
+    python -m benchmarks.bench_docx [--docs 200]
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from rendering.renderer import ResumeRenderer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures")
+
+
+def run(renderer, resume, docs, out_dir):
+    times = []
+    for i in range(docs):
+        t = time.perf_counter()
+        renderer.to_docx(resume + f"\n\n- Variant {i}\n", os.path.join(out_dir, f"{i}.docx"))
+        times.append((time.perf_counter() - t) * 1000)
+    times.sort()
+    return sum(times), times[len(times) // 2], times[min(len(times) - 1, int(0.95 * len(times)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=200)
+    args = parser.parse_args()
+
+    with open(os.path.join(FIXTURES_DIR, "resumes", "good_resume.md")) as f:
+        resume = f.read()
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        for engine in ("native", "pandoc"):
+            if engine == "pandoc" and shutil.which("pandoc") is None:
+                print("pandoc:  skipped (pandoc not on PATH)")
+                continue
+            renderer = ResumeRenderer.for_template("resume", docx_engine=engine)
+            docs = args.docs if engine == "native" else min(args.docs, 50)
+            total, p50, p95 = run(renderer, resume, docs, out_dir)
+            print(f"{engine + ':':8} {docs / (total / 1000):8.1f} docs/s, "
+                  f"p50 {p50:.2f} ms, p95 {p95:.2f} ms ({docs} docs)")
+
+
+if __name__ == "__main__":
+    main()
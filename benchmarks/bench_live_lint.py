@@ -0,0 +1,69 @@
+"""Benchmark: live-lint latency while editing a resume.
+
+Replays a typing session over the fixture resume (one character appended to
+a bullet per keystroke) and times LiveLinter.lint for each buffer, against a
+per-keystroke re-run of the same checks without the claim cache. The spaCy
+structural checks are excluded from both; they run only when idle.
+
+    python -m benchmarks.bench_live_lint [--keystrokes 300]
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+
+from verification.live_lint import LiveLinter
+from verification.profile_index import ProfileIndex
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "fixtures")
+
+
+def pct(values, p):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keystrokes", type=int, default=300)
+    args = parser.parse_args()
+    rng = random.Random(3)
+
+    with open(os.path.join(FIXTURES_DIR, "profile_complete.json")) as f:
+        index = ProfileIndex(json.load(f))
+    with open(os.path.join(FIXTURES_DIR, "resumes", "good_resume.md")) as f:
+        resume = f.read()
+
+    lines = resume.split("\n")
+    bullets = [i for i, line in enumerate(lines) if line.startswith("- ")]
+    buffers = []
+    for _ in range(args.keystrokes):
+        i = rng.choice(bullets)
+        lines[i] += rng.choice("abcdefghij ")
+        buffers.append("\n".join(lines))
+
+    linter = LiveLinter(index)
+    linter.lint(resume)  # warm: an opened document is linted once on load
+    live = []
+    for buffer in buffers:
+        t = time.perf_counter()
+        linter.lint(buffer)
+        live.append((time.perf_counter() - t) * 1000)
+
+    uncached = []
+    for buffer in buffers[:50]:
+        cold = LiveLinter(index)
+        t = time.perf_counter()
+        cold.lint(buffer)
+        uncached.append((time.perf_counter() - t) * 1000)
+
+    print(f"live lint:   p50 {pct(live, 0.5):.2f} ms, p95 {pct(live, 0.95):.2f} ms "
+          f"({args.keystrokes} keystrokes, target p95 < 50 ms)")
+    print(f"no cache:    p50 {pct(uncached, 0.5):.2f} ms, p95 {pct(uncached, 0.95):.2f} ms")
+    print(f"claims mapped {linter.stats['claims_mapped']}, served from cache {linter.stats['claims_cached']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Benchmark: Queue View latency from 100 to 100k queue entries.
+
+Times one page of the queue (first page and a deep page reached by keyset
+cursor) served from the QueueStore summary index, against the approach it
+replaces: loading every entry file and sorting in Python.
+
+    python -m benchmarks.bench_queue_store [--sizes 100 1000 10000 100000] [--page 25]
+"""
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+
+from agents.queue_store import QueueStore
+
+COMPANIES = [f"Company {i}" for i in range(2000)]
+TITLES = ["Statistician", "Senior Biostatistician", "Data Scientist", "Quant Researcher", "ML Engineer"]
+
+
+def synthetic_entry(i, rng):
+    deadline = f"2026-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}" if rng.random() < 0.3 else None
+    return {
+        "queue_entry_id": f"q_{i:06d}",
+        "job": {
+            "job_id": f"job_{i}",
+            "company": {"name": rng.choice(COMPANIES)},
+            "role": {"title": rng.choice(TITLES), "application_deadline": deadline,
+                     "description_raw": "lorem ipsum " * 400},
+        },
+        "match": {"classification": "GOOD", "composite_score": round(rng.uniform(4.5, 9.5), 2)},
+        "resume": {"content": "# Resume\n" + "- bullet\n" * 40},
+        "cover_letter": {"content": "Dear team, " * 100},
+        "status": "pending" if rng.random() < 0.8 else "approved",
+    }
+
+
+def timed(fn, repeats):
+    samples = []
+    for _ in range(repeats):
+        t = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - t) * 1000)
+    return sorted(samples)[len(samples) // 2]
+
+
+def load_all_page(queue_dir, page):
+    """Baseline: read every entry file, filter, sort deadline-then-score, slice."""
+    entries = []
+    for name in os.listdir(queue_dir):
+        with open(os.path.join(queue_dir, name)) as f:
+            entries.append(json.load(f))
+    pending = [e for e in entries if e["status"] == "pending"]
+    pending.sort(key=lambda e: (e["job"]["role"]["application_deadline"] or "9999",
+                                -e["match"]["composite_score"]))
+    return pending[:page]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--page", type=int, default=25)
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--baseline-max", type=int, default=10_000,
+                        help="skip the load-every-file baseline above this size")
+    args = parser.parse_args()
+    rng = random.Random(11)
+
+    print(f"{'entries':>8} {'first page':>11} {'deep page':>10} {'load-all':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            store = QueueStore({"queue": {"queue_dir": os.path.join(tmp, "queue"),
+                                          "index_path": os.path.join(tmp, "queue_index.db"),
+                                          "page_size": args.page}})
+            for i in range(size):
+                store.put(synthetic_entry(i, rng))
+
+            first = timed(lambda: store.page(), args.repeats)
+            # Walk to roughly the middle of the queue, then time the next page from there
+            cursor = store.page(limit=max(1, store.count() // 2))["next_cursor"]
+            deep = timed(lambda: store.page(cursor=cursor), args.repeats)
+            if size <= args.baseline_max:
+                baseline = f"{timed(lambda: load_all_page(store.queue_dir, args.page), 3):.1f}ms"
+            else:
+                baseline = "skipped"
+            print(f"{size:>8} {first:>9.2f}ms {deep:>8.2f}ms {baseline:>10}")
+            store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+"""StatsAggregates: Materialized counters behind the Stats view (GET /stats).
+
+Instead of scanning application history on every request, the Stats view
+reads a small table of counters in the state database, keyed by
+(metric, bucket, segment):
+
+    created   day             classification   applications created that day
+    status    status          classification   applications currently in a status
+    outcome   outcome         classification   recorded outcomes (§11.1)
+    score     score bucket    classification   composite_score histogram
+    cost      day             agent            API spend
+
+The counters are kept up to date by a StateManager in-transaction listener.
+Each change subtracts the old row's contribution and adds the new one, in
+the same transaction as the write itself. Reading the stats touches a number
+of rows bounded by the days shown and the number of classifications, not by
+history. rebuild() recomputes everything from the applications and
+budget_entries tables, and check() reports any drift.
+
+    python -m calibration.stats_aggregates [--config config/config.yaml] [--check]
+"""
+
+import argparse
+import math
+import sys
+from collections import Counter
+from datetime import date, datetime, timedelta, timezone
+
+import yaml
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats_aggregates (
+    metric TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    segment TEXT NOT NULL,
+    value REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (metric, bucket, segment)
+) WITHOUT ROWID;
+"""
+
+POSITIVE_OUTCOMES = ("phone_screen", "interview", "offer")
+
+# Funnel stages after "applied"; an outcome counts toward every stage up to its own
+FUNNEL = (
+    ("responded", ("rejection", "phone_screen", "interview", "offer")),
+    ("phone_screen", ("phone_screen", "interview", "offer")),
+    ("interview", ("interview", "offer")),
+    ("offer", ("offer",)),
+)
+
+
+class StatsAggregates:
+    def __init__(self, state, config: dict | None = None):
+        """state: agents.state.StateManager. Registers itself as an in-transaction listener."""
+        config = (config or {}).get("stats", {})
+        self.state = state
+        self.bucket_width = config.get("score_bucket_width", 0.5)
+        self.applied_statuses = tuple(config.get("applied_statuses", ("approved", "submitted")))
+        self.conn = state.conn
+        self.conn.executescript(SCHEMA)
+        state.add_listener(self.apply, in_transaction=True)
+        if not state.get("_stats_built"):
+            self.rebuild()
+
+    def apply(self, event: dict) -> None:
+        """Fold one StateManager change event into the counters."""
+        if event["kind"] == "application":
+            delta = self._contributions(event["row"])
+            delta.subtract(self._contributions(event["previous"]))
+        elif event["kind"] == "budget":
+            delta = self._cost_contribution(event["row"], event["new"])
+        else:
+            return
+        self._add(delta)
+
+    def stats(self, days: int = 30, today: str | None = None) -> dict:
+        """Everything the Stats view shows, read from the counters alone.
+
+        Day buckets come from UTC timestamps (created_at, budget days), so
+        today defaults to the UTC date too.
+        """
+        today = today or datetime.now(timezone.utc).date().isoformat()
+        since = (date.fromisoformat(today) - timedelta(days=days - 1)).isoformat()
+
+        status = self._metric("status")
+        outcome = self._metric("outcome")
+        applied = sum(v for (b, _), v in status.items() if b in self.applied_statuses)
+        outcomes = Counter()
+        by_class = {}
+        for (bucket, segment), value in outcome.items():
+            outcomes[bucket] += value
+            entry = by_class.setdefault(segment, {"applied": 0, "positive": 0})
+            entry["positive"] += value if bucket in POSITIVE_OUTCOMES else 0
+        for (bucket, segment), value in status.items():
+            if bucket in self.applied_statuses:
+                by_class.setdefault(segment, {"applied": 0, "positive": 0})["applied"] += value
+        positive = sum(outcomes[o] for o in POSITIVE_OUTCOMES)
+
+        created_by_day = Counter()
+        for (bucket, _), value in self._metric("created", since).items():
+            created_by_day[bucket] += value
+        cost_by_day = Counter()
+        for (bucket, _), value in self._metric("cost", since).items():
+            cost_by_day[bucket] += value
+        scores = Counter()
+        for (bucket, _), value in self._metric("score").items():
+            scores[bucket] += value
+
+        total = sum(v for v in status.values())
+        return {
+            "total_applications": int(total),
+            "by_status": self._collapse(status),
+            "by_classification": self._collapse(status, by="segment"),
+            "applied": int(applied),
+            "conversion_rate": positive / applied if applied else 0.0,
+            "conversion_by_classification": {
+                c: {**v, "rate": v["positive"] / v["applied"] if v["applied"] else 0.0}
+                for c, v in by_class.items()
+            },
+            "total_cost_usd": self._total("cost"),
+            "cost_by_day": [(d, round(cost_by_day[d], 4)) for d in self._days(since, today)],
+            "apps_over_time": [(d, int(created_by_day[d])) for d in self._days(since, today)],
+            "score_distribution": sorted((float(b), int(v)) for b, v in scores.items() if v),
+            "funnel": [("queued", int(total)), ("applied", int(applied))] + [
+                (stage, int(sum(outcomes[o] for o in included))) for stage, included in FUNNEL
+            ],
+        }
+
+    def rebuild(self) -> int:
+        """Recompute every counter from history. Returns the number of counter rows."""
+        expected = self._from_history()
+        with self.state.transaction():
+            self.conn.execute("DELETE FROM stats_aggregates")
+            self.conn.executemany(
+                "INSERT INTO stats_aggregates (metric, bucket, segment, value) VALUES (?, ?, ?, ?)",
+                [(*key, value) for key, value in expected.items() if value],
+            )
+            self.state.set("_stats_built", True)
+        return len(expected)
+
+    def check(self) -> list[dict]:
+        """Counters that differ from a fresh recomputation (empty when consistent)."""
+        expected = self._from_history()
+        stored = {
+            (r[0], r[1], r[2]): r[3]
+            for r in self.conn.execute("SELECT metric, bucket, segment, value FROM stats_aggregates")
+        }
+        drift = []
+        for key in set(expected) | set(stored):
+            want, have = expected.get(key, 0.0), stored.get(key, 0.0)
+            if not math.isclose(want, have, abs_tol=1e-6):
+                drift.append({"key": key, "expected": want, "stored": have})
+        return sorted(drift, key=lambda d: d["key"])
+
+    def _contributions(self, row: dict | None) -> Counter:
+        if row is None:
+            return Counter()
+        segment = row.get("classification") or "UNCLASSIFIED"
+        out = Counter({
+            ("created", row["created_at"][:10], segment): 1,
+            ("status", row["status"], segment): 1,
+        })
+        if row.get("outcome"):
+            out[("outcome", row["outcome"], segment)] += 1
+        if row.get("composite_score") is not None:
+            bucket = math.floor(row["composite_score"] / self.bucket_width) * self.bucket_width
+            out[("score", f"{bucket:g}", segment)] += 1
+        return out
+
+    def _cost_contribution(self, row: dict, cost_usd: float) -> Counter:
+        return Counter({("cost", row["day"], row.get("agent") or "other"): cost_usd})
+
+    def _from_history(self) -> Counter:
+        expected = Counter()
+        for row in self.state.applications(limit=-1):
+            expected.update(self._contributions(row))
+        for day, agent, cost in self.conn.execute("SELECT day, agent, cost_usd FROM budget_entries"):
+            expected.update(self._cost_contribution({"day": day, "agent": agent}, cost))
+        return expected
+
+    def _add(self, delta: Counter) -> None:
+        self.conn.executemany(
+            "INSERT INTO stats_aggregates (metric, bucket, segment, value) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(metric, bucket, segment) DO UPDATE SET value = value + excluded.value",
+            [(*key, value) for key, value in delta.items() if value],
+        )
+
+    def _metric(self, metric: str, since: str | None = None) -> dict:
+        sql, args = "SELECT bucket, segment, value FROM stats_aggregates WHERE metric = ?", [metric]
+        if since:
+            sql += " AND bucket >= ?"
+            args.append(since)
+        return {(b, s): v for b, s, v in self.conn.execute(sql, args) if v}
+
+    def _total(self, metric: str) -> float:
+        return self.conn.execute(
+            "SELECT COALESCE(SUM(value), 0) FROM stats_aggregates WHERE metric = ?", (metric,)
+        ).fetchone()[0]
+
+    def _collapse(self, counters: dict, by: str = "bucket") -> dict:
+        out = Counter()
+        for (bucket, segment), value in counters.items():
+            out[bucket if by == "bucket" else segment] += int(value)
+        return dict(out)
+
+    def _days(self, since: str, today: str) -> list[str]:
+        start, end = date.fromisoformat(since), date.fromisoformat(today)
+        return [(start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)]
+
+
+def main(argv=None) -> int:
+    from agents.state import StateManager
+
+    parser = argparse.ArgumentParser(description="Rebuild or check the Stats view aggregates.")
+    parser.add_argument("--config", default="config/config.yaml")
+    parser.add_argument("--check", action="store_true", help="report drift without rewriting")
+    args = parser.parse_args(argv)
+    with open(args.config) as f:
+        config = yaml.safe_load(f)
+
+    state = StateManager(config)
+    try:
+        aggregates = StatsAggregates(state, config)
+        if args.check:
+            drift = aggregates.check()
+            for d in drift:
+                print(f"{'/'.join(d['key'])}: stored {d['stored']}, expected {d['expected']}")
+            print(f"{len(drift)} counter(s) drifted")
+            return 1 if drift else 0
+        print(f"Rebuilt {aggregates.rebuild()} counters")
+        return 0
+    finally:
+        state.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
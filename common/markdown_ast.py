@@ -0,0 +1,214 @@
+"""MarkdownDocument: One parse of a resume or cover letter, shared by every consumer.
+
+The same markdown used to be parsed separately by ClaimExtractor,
+StructuralAIDetector._parallel_bullets, python-markdown in the renderer and
+the dashboard preview. parse() does the work once per document version and
+caches the result by the content's sha256:
+
+- lines: one node per non-blank line, {"kind": heading|bullet|numbered|rule|text,
+  "text" (markers removed), "source" (the stripped line), "marker" (a bullet's
+  marker character), "level", "section", "line_number"}. Line numbers count
+  from the stripped content, as ClaimExtractor's always have.
+- sections: the section/bullet model for verification.
+- blocks: paragraphs joined, for DocxWriter.
+- html: python-markdown's HTML body, built on first use, for PDF rendering and
+  the dashboard preview.
+
+Kinds follow markdown, so "+ item" is a bullet and "---" a rule. Verification
+keeps its own, narrower bullet set: is_claim_bullet() accepts only the
+CLAIM_BULLETS markers, and bullet_runs() counts only those. A "+" item or a
+rule is a plain line to ClaimExtractor and ends a run of parallel bullets.
+
+The cache is per process, so each RenderService worker keeps its own.
+"""
+
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+
+import markdown
+
+MARKDOWN_EXTENSIONS = ["extra", "sane_lists"]
+
+CACHE_SIZE = 128
+
+HEADING = re.compile(r"^(#{1,6})\s*(.*?)\s*#*\s*$")
+BULLET = re.compile(r"^(\s*)[-*+•]\s+(.*)$")
+NUMBERED = re.compile(r"^(\s*)\d+[.)]\s+(.*)$")
+RULE = re.compile(r"^\s*(?:-{3,}|\*{3,}|_{3,})\s*$")
+
+# Bullet markers verification treats as claims, as it always has
+CLAIM_BULLETS = "-*•"
+
+INLINE = re.compile(
+    r"\\(?P<escaped>[\\`*_{}\[\]()#+\-.!|])"
+    r"|\[(?P<link_text>[^\]]+)\]\((?P<link_url>[^)\s]+)(?:\s+\"[^\"]*\")?\)"
+    r"|<(?P<autolink>(?:https?://|mailto:)[^>\s]+)>"
+    r"|\*\*(?P<bold>.+?)\*\*|__(?P<bold_u>.+?)__"
+    r"|\*(?P<italic>[^*\s](?:.*?[^*\s])?)\*"
+    r"|(?<![\w])_(?P<italic_u>[^_\s](?:.*?[^_\s])?)_(?![\w])"
+)
+
+_cache = OrderedDict()  # sha256 -> MarkdownDocument
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+
+def digest(md_content: str) -> str:
+    return hashlib.sha256(md_content.encode()).hexdigest()
+
+
+def parse(md_content: str) -> "MarkdownDocument":
+    """The parsed document for md_content, from the cache when this version was seen before."""
+    key = digest(md_content)
+    with _cache_lock:
+        doc = _cache.get(key)
+        if doc is not None:
+            _cache.move_to_end(key)
+            _cache_stats["hits"] += 1
+            return doc
+        _cache_stats["misses"] += 1
+    doc = MarkdownDocument(md_content, key)
+    with _cache_lock:
+        _cache[key] = doc
+        if len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return doc
+
+
+def cache_info() -> dict:
+    with _cache_lock:
+        return {**_cache_stats, "size": len(_cache), "max_size": CACHE_SIZE}
+
+
+def is_claim_bullet(node: dict) -> bool:
+    """True for a bullet line that verification counts as a bullet claim."""
+    return node["kind"] == "bullet" and node["marker"] in CLAIM_BULLETS
+
+
+def parse_inline(text: str, bold: bool = False, italic: bool = False, link: str | None = None) -> list[dict]:
+    """Runs: [{"text", "bold", "italic", "link"}] for one line of inline markdown."""
+    runs = []
+    pos = 0
+    for m in INLINE.finditer(text):
+        if m.start() > pos:
+            runs.append({"text": text[pos:m.start()], "bold": bold, "italic": italic, "link": link})
+        if m.group("escaped") is not None:
+            runs.append({"text": m.group("escaped"), "bold": bold, "italic": italic, "link": link})
+        elif m.group("link_text") is not None:
+            runs.extend(parse_inline(m.group("link_text"), bold, italic, m.group("link_url")))
+        elif m.group("autolink") is not None:
+            url = m.group("autolink")
+            runs.append({"text": url.removeprefix("mailto:"), "bold": bold, "italic": italic, "link": url})
+        elif m.group("bold") is not None or m.group("bold_u") is not None:
+            runs.extend(parse_inline(m.group("bold") or m.group("bold_u"), True, italic, link))
+        else:
+            runs.extend(parse_inline(m.group("italic") or m.group("italic_u"), bold, True, link))
+        pos = m.end()
+    if pos < len(text):
+        runs.append({"text": text[pos:], "bold": bold, "italic": italic, "link": link})
+    return [r for r in runs if r["text"]]
+
+
+def parse_blocks(md_content: str) -> list[dict]:
+    """Blocks: {"kind": heading|paragraph|bullet|numbered|rule, "level", "text"}."""
+    return [dict(b) for b in parse(md_content).blocks]
+
+
+class MarkdownDocument:
+    def __init__(self, source: str, key: str | None = None):
+        self.source = source
+        self.digest = key or digest(source)
+        self.lines = self._scan(source)
+        self.sections = self._sections()
+        self.blocks = self._blocks()
+        self._html = None
+
+    @property
+    def html(self) -> str:
+        if self._html is None:
+            self._html = markdown.markdown(self.source, extensions=MARKDOWN_EXTENSIONS)
+        return self._html
+
+    def bullet_runs(self) -> list[list[str]]:
+        """Texts of consecutive claim bullets (see is_claim_bullet). Headings and
+        other non-blank lines, "+" items and rules included, end a run."""
+        runs, run = [], []
+        for node in self.lines:
+            if is_claim_bullet(node):
+                run.append(node["text"])
+            elif run:
+                runs.append(run)
+                run = []
+        if run:
+            runs.append(run)
+        return runs
+
+    def preview(self) -> dict:
+        """Server-rendered preview for the dashboard: HTML plus the section outline."""
+        return {
+            "digest": self.digest,
+            "html": self.html,
+            "sections": [
+                {"title": s["title"], "line_number": s["line_number"],
+                 "bullets": [n["text"] for n in s["lines"] if n["kind"] == "bullet"]}
+                for s in self.sections
+            ],
+        }
+
+    def _scan(self, source: str) -> list[dict]:
+        nodes, section = [], None
+        for i, line in enumerate(source.replace("\r\n", "\n").strip().split("\n")):
+            stripped = line.strip()
+            if not stripped:
+                continue
+            node = {"kind": "text", "text": stripped, "source": stripped, "marker": None, "level": 0,
+                    "section": section, "line_number": i + 1}
+            heading = HEADING.match(stripped)
+            if RULE.match(line):
+                node.update(kind="rule", text="")
+            elif heading:
+                section = heading.group(2).lower()
+                node.update(kind="heading", text=heading.group(2), level=len(heading.group(1)), section=section)
+            else:
+                bullet = BULLET.match(line)
+                item = bullet or NUMBERED.match(line)
+                if item:
+                    node.update(kind="bullet" if bullet else "numbered", text=item.group(2).strip(),
+                                marker=stripped[0] if bullet else None,
+                                level=1 if len(item.group(1).expandtabs(4)) >= 2 else 0)
+            nodes.append(node)
+        return nodes
+
+    def _sections(self) -> list[dict]:
+        """[{"title", "name", "level", "line_number", "lines"}]. name is the lowercased title
+        ClaimExtractor matches on; content before the first heading has title None."""
+        sections = []
+        for node in self.lines:
+            if node["kind"] == "heading":
+                sections.append({"title": node["text"], "name": node["section"], "level": node["level"],
+                                 "line_number": node["line_number"], "lines": []})
+            else:
+                if not sections:
+                    sections.append({"title": None, "name": None, "level": 0,
+                                     "line_number": node["line_number"], "lines": []})
+                sections[-1]["lines"].append(node)
+        return sections
+
+    def _blocks(self) -> list[dict]:
+        blocks, paragraph, last_line = [], [], None
+        for node in self.lines:
+            kind = node["kind"]
+            if paragraph and (kind != "text" or node["line_number"] != last_line + 1):
+                blocks.append({"kind": "paragraph", "level": 0, "text": " ".join(paragraph)})
+                paragraph = []
+            if kind == "text":
+                paragraph.append(node["text"])
+            else:
+                level = min(node["level"], 3) if kind == "heading" else node["level"]
+                blocks.append({"kind": kind, "level": level, "text": node["text"]})
+            last_line = node["line_number"]
+        if paragraph:
+            blocks.append({"kind": "paragraph", "level": 0, "text": " ".join(paragraph)})
+        return blocks
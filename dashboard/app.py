@@ -0,0 +1,203 @@
+"""Dashboard: FastAPI app for the review dashboard (§10).
+
+create_app() wires the shared services into the routes:
+
+    GET /events          server-sent events from the EventBus (live pipeline progress)
+    GET /events/recent   the last few events as JSON, for a first render
+    POST /lint           cheap live-lint checks on an edited document (htmx)
+    POST /lint/structural  spaCy structural checks, sent when the editor is idle
+    WS /lint/ws          debounced live lint; structural results follow when idle
+    GET /search          full-text search over application history, with facets
+    POST /preview        server-rendered document preview (HTML and section outline)
+
+create_app_from_config() also builds the live linter and search from config;
+the module-level app is built that way on first access, so importing this
+module has no side effects.
+
+Run with: uvicorn dashboard.app:app (reads config/config.yaml)
+"""
+
+import asyncio
+import json
+import logging
+import os
+
+import yaml
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+from common.markdown_ast import parse
+from dashboard.events import EventBus
+from verification.live_lint import LintSession
+
+logger = logging.getLogger(__name__)
+
+
+class LintRequest(BaseModel):
+    content: str
+    content_type: str = "resume"
+    claimed_ids: list[str] | None = None
+
+
+class PreviewRequest(BaseModel):
+    content: str
+
+
+def format_sse(event: dict) -> str:
+    lines = []
+    if event.get("id") is not None:
+        lines.append(f"id: {event['id']}")
+    lines.append(f"event: {event['type']}")
+    lines.append(f"data: {json.dumps({**event['data'], 'ts': event['ts']})}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def event_stream(subscription, is_disconnected, heartbeat: float = 15.0):
+    """SSE body for one subscription. Sends a comment line when idle so proxies
+    keep the connection open and disconnects are noticed."""
+    try:
+        yield "retry: 3000\n\n"
+        while True:
+            event = await subscription.next(timeout=heartbeat)
+            if event is None:
+                if subscription.closed:
+                    return
+                if await is_disconnected():
+                    return
+                yield ": keepalive\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        subscription.close()
+
+
+def create_app(config: dict | None = None, bus: EventBus | None = None, linter=None,
+               search=None) -> FastAPI:
+    """linter: verification.live_lint.LiveLinter; search: dashboard.search.ApplicationSearch.
+    Their routes return 503 when not provided."""
+    config = config or {}
+    dashboard = config.get("dashboard", {})
+    heartbeat = dashboard.get("sse_heartbeat_seconds", 15)
+    app = FastAPI(title="Job Agent Dashboard")
+    app.state.bus = bus or EventBus(config)
+    app.state.linter = linter
+    app.state.search = search
+
+    def require_linter():
+        if app.state.linter is None:
+            raise HTTPException(503, "Live lint is not configured")
+        return app.state.linter
+
+    @app.get("/events")
+    async def events(request: Request, types: str | None = Query(None), job_id: str | None = Query(None)):
+        last_id = request.headers.get("last-event-id")
+        subscription = app.state.bus.subscribe(
+            types=types.split(",") if types else None,
+            job_id=job_id,
+            last_event_id=int(last_id) if last_id and last_id.isdigit() else None,
+        )
+        return StreamingResponse(
+            event_stream(subscription, request.is_disconnected, heartbeat),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    @app.get("/events/recent")
+    async def recent_events(limit: int = Query(50, ge=1, le=500)):
+        return app.state.bus.recent(limit)
+
+    @app.post("/lint")
+    async def lint(body: LintRequest):
+        linter = require_linter()
+        return await asyncio.to_thread(linter.lint, body.content, body.content_type, body.claimed_ids)
+
+    @app.post("/lint/structural")
+    async def lint_structural(body: LintRequest):
+        linter = require_linter()
+        return await asyncio.to_thread(linter.structural, body.content, body.content_type)
+
+    @app.get("/search")
+    def search_history(
+        q: str | None = Query(None),
+        status: list[str] | None = Query(None),
+        classification: list[str] | None = Query(None),
+        outcome: list[str] | None = Query(None),
+        company: str | None = Query(None),
+        since: str | None = Query(None),
+        until: str | None = Query(None),
+        limit: int = Query(20, ge=1, le=200),
+        offset: int = Query(0, ge=0),
+    ):
+        if app.state.search is None:
+            raise HTTPException(503, "Search is not configured")
+        return app.state.search.search(q, status=status, classification=classification, outcome=outcome,
+                                       company=company, since=since, until=until,
+                                       limit=limit, offset=offset)
+
+    @app.post("/preview")
+    def preview(body: PreviewRequest):
+        return parse(body.content).preview()
+
+    @app.websocket("/lint/ws")
+    async def lint_ws(websocket: WebSocket):
+        await websocket.accept()
+        if app.state.linter is None:
+            await websocket.close(code=1011, reason="Live lint is not configured")
+            return
+        session = LintSession(app.state.linter, websocket.send_json, config)
+        try:
+            while True:
+                message = await websocket.receive_json()
+                session.submit(message.get("seq", 0), message.get("content", ""),
+                               message.get("content_type", "resume"), message.get("claimed_ids"))
+        except WebSocketDisconnect:
+            pass
+        finally:
+            await session.close()
+
+    return app
+
+
+def create_app_from_config(config: dict | None = None) -> FastAPI:
+    """create_app() with the live linter and search built from config.
+
+    The linter needs the candidate profile at live_lint.profile_path; when it
+    is missing the lint routes stay 503. Search opens search.db, indexes queue
+    puts made in this process, and is rebuilt from the queue store when empty.
+    """
+    from agents.queue_store import QueueStore
+    from dashboard.search import ApplicationSearch
+    from verification.live_lint import LiveLinter
+    from verification.profile_index import ProfileIndex
+
+    config = config or {}
+    linter = None
+    profile_path = config.get("live_lint", {}).get("profile_path", "profile/profile.json")
+    if os.path.exists(profile_path):
+        with open(profile_path) as f:
+            linter = LiveLinter(ProfileIndex(json.load(f)), config)
+    else:
+        logger.warning("No profile at %s: live lint is disabled", profile_path)
+
+    search = ApplicationSearch(config)
+    queue_store = QueueStore(config)
+    search.attach(queue_store=queue_store)
+    if len(search) == 0:
+        search.rebuild(queue_store)
+    return create_app(config, linter=linter, search=search)
+
+
+def _load_config(path: str = "config/config.yaml") -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def __getattr__(name: str):
+    # uvicorn dashboard.app:app; built on first access rather than at import
+    if name == "app":
+        globals()["app"] = create_app_from_config(_load_config())
+        return globals()["app"]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,196 @@
+"""EventBus: In-process pub/sub for live pipeline progress in the dashboard.
+
+The orchestrator publishes without waiting for anyone. Each dashboard tab
+subscribes through the SSE endpoint (dashboard/app.py GET /events), and each
+subscriber gets its own bounded buffer:
+
+- A full buffer drops its oldest event. The subscriber then receives a
+  "dropped" event with a count, so the page knows to refresh its view.
+- A subscriber that falls more than evict_after_dropped events behind is
+  disconnected. The browser's EventSource reconnects with Last-Event-ID.
+- A short history of recent events is replayed on reconnect.
+
+publish() never blocks and is safe to call from worker threads, so a
+stalled tab cannot slow the pipeline.
+
+Event types:
+
+    stage            job_id, stage, phase (started | finished | failed), elapsed_s
+    iteration        job_id, document, iteration, quality_score, status, high_count
+    budget           job_id, agent, cost_usd, spent_today
+    status           job_id, old, new
+    rate_limit_wait  limiter, seconds
+    dropped          count   (synthetic, per subscriber)
+"""
+
+import asyncio
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One subscriber's bounded buffer. Iterate with `async for` or await next()."""
+
+    def __init__(self, bus, maxsize: int, types=None, job_id: str | None = None):
+        self.bus = bus
+        self.types = set(types) if types else None
+        self.job_id = job_id
+        self.buffer = deque(maxlen=maxsize)
+        self.dropped = 0          # since the last "dropped" notice
+        self.dropped_total = 0
+        self.closed = False
+        self.loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+
+    def wants(self, event: dict) -> bool:
+        if self.types and event["type"] not in self.types:
+            return False
+        return self.job_id is None or event["data"].get("job_id") in (None, self.job_id)
+
+    def offer(self, event: dict) -> None:
+        """Called on the subscriber's loop. Drops the oldest event when full."""
+        if self.closed:
+            return
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+            self.dropped_total += 1
+            if self.dropped > self.bus.evict_after_dropped:
+                logger.warning("Evicting slow event subscriber (%d events dropped)", self.dropped_total)
+                self.close()
+                return
+        self.buffer.append(event)
+        self._ready.set()
+
+    async def next(self, timeout: float | None = None) -> dict | None:
+        """Next event; None on timeout or once closed and drained."""
+        while not self.buffer and not self.dropped:
+            if self.closed:
+                return None
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                return None
+        if self.dropped:
+            count, self.dropped = self.dropped, 0
+            return {"id": None, "type": "dropped", "ts": time.time(), "data": {"count": count}}
+        return self.buffer.popleft()
+
+    def close(self) -> None:
+        self.closed = True
+        self.bus.unsubscribe(self)
+        self._ready.set()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        event = await self.next()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class EventBus:
+    def __init__(self, config: dict | None = None):
+        config = (config or {}).get("dashboard", {})
+        self.buffer_size = config.get("event_buffer", 256)
+        self.evict_after_dropped = config.get("evict_after_dropped", 1000)
+        self.history = deque(maxlen=config.get("event_history", 500))
+        self._ids = itertools.count(1)
+        self._subscribers = []
+        self._lock = threading.RLock()
+        self.published = 0
+
+    def publish(self, event_type: str, **data) -> dict:
+        """Record and fan out one event. Never blocks; callable from any thread."""
+        with self._lock:
+            event = {"id": next(self._ids), "type": event_type, "ts": time.time(), "data": data}
+            self.history.append(event)
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for sub in subscribers:
+            if not sub.wants(event):
+                continue
+            if self._on_loop(sub.loop):
+                sub.offer(event)
+            else:
+                try:
+                    sub.loop.call_soon_threadsafe(sub.offer, event)
+                except RuntimeError:  # subscriber's loop already closed
+                    self.unsubscribe(sub)
+        return event
+
+    def subscribe(self, types=None, job_id: str | None = None, last_event_id: int | None = None) -> Subscription:
+        """New subscription on the running loop. last_event_id replays newer events from history."""
+        sub = Subscription(self, self.buffer_size, types, job_id)
+        with self._lock:
+            if last_event_id is not None:
+                for event in self.history:
+                    if event["id"] > last_event_id and sub.wants(event):
+                        sub.offer(event)
+            self._subscribers.append(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            if sub in self._subscribers:
+                self._subscribers.remove(sub)
+
+    def recent(self, limit: int = 50) -> list[dict]:
+        return list(self.history)[-limit:]
+
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    # -- producers -----------------------------------------------------------
+
+    @contextmanager
+    def stage(self, job_id: str, stage: str, **data):
+        """Publish stage started, then finished (or failed) with elapsed time."""
+        self.publish("stage", job_id=job_id, stage=stage, phase="started", **data)
+        start = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.publish("stage", job_id=job_id, stage=stage, phase="failed",
+                         elapsed_s=round(time.monotonic() - start, 3), error=type(e).__name__)
+            raise
+        self.publish("stage", job_id=job_id, stage=stage, phase="finished",
+                     elapsed_s=round(time.monotonic() - start, 3))
+
+    def iteration_callback(self, job_id: str, document: str = "resume"):
+        """on_iteration(iteration, candidate, verification) for the generation loops."""
+        def on_iteration(iteration, candidate, verification):
+            self.publish("iteration", job_id=job_id, document=document, iteration=iteration,
+                         quality_score=verification["quality_score"], status=verification["status"],
+                         high_count=verification.get("high_count", 0))
+        return on_iteration
+
+    def attach_state(self, state) -> None:
+        """Publish status changes and budget entries committed to a StateManager."""
+        def listener(event):
+            if event["kind"] == "application" and event["old"] != event["new"]:
+                self.publish("status", job_id=event["job_id"], old=event["old"], new=event["new"])
+            elif event["kind"] == "budget":
+                self.publish("budget", job_id=event["job_id"], agent=event["row"].get("agent"),
+                             cost_usd=event["new"], spent_today=state.spent_on(event["row"]["day"]))
+        state.add_listener(listener)
+
+    def attach_rate_limiter(self, name: str, limiter) -> None:
+        """Publish each wait an APIRateLimiter makes for a per-minute slot."""
+        limiter.on_wait = lambda seconds: self.publish(
+            "rate_limit_wait", limiter=name, seconds=round(seconds, 2)
+        )
+
+    def _on_loop(self, loop) -> bool:
+        try:
+            return asyncio.get_running_loop() is loop
+        except RuntimeError:
+            return False
@@ -0,0 +1,308 @@
+"""ApplicationSearch: SQLite FTS5 full-text search for the History view.
+
+One document per application: company, industry and title, the job
+description, the generated resume and cover letter, and the verification
+issues, indexed by FTS5 with the porter stemmer. A side table holds the facet
+columns (status, classification, outcome, dates) so filters are indexed
+lookups. For example, "every application mentioning causal inference at
+pharma companies in Q2" is:
+
+    search.search('"causal inference" AND industry:pharma*', since="2026-04-01", until="2026-06-30")
+
+The index keeps itself in sync through listeners:
+
+- QueueStore put (queued, edited): the documents are re-indexed.
+- StateManager application changes (status, outcome, classification): the
+  facets are updated.
+
+Queue retention deletes don't remove anything, because history outlives the
+queue. rebuild() re-indexes from the queue store.
+"""
+
+import html
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime, timezone
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS search_docs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL UNIQUE,
+    entry_id TEXT,
+    company TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    status TEXT,
+    classification TEXT,
+    outcome TEXT,
+    score REAL,
+    created_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_search_status ON search_docs (status, created_at);
+CREATE INDEX IF NOT EXISTS idx_search_class ON search_docs (classification, created_at);
+CREATE INDEX IF NOT EXISTS idx_search_created ON search_docs (created_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+    company, industry, title, description, resume, cover_letter, issues,
+    tokenize = 'porter unicode61'
+);
+"""
+
+FTS_COLUMNS = ("company", "industry", "title", "description", "resume", "cover_letter", "issues")
+
+# bm25 column weights, in FTS_COLUMNS order: what the job is outranks what we wrote
+WEIGHTS = (4.0, 2.0, 4.0, 1.0, 1.0, 1.0, 0.5)
+
+FACETS = ("status", "classification", "outcome")
+
+# snippet() marks matches with control characters; the text is HTML-escaped
+# before they become <mark> tags, so indexed markup is never rendered
+MARK_OPEN, MARK_CLOSE = "\x02", "\x03"
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _text(doc) -> str:
+    """Document body from a generated document (dict with content, or plain string)."""
+    if isinstance(doc, dict):
+        return doc.get("content") or doc.get("resume_content") or doc.get("text") or ""
+    return doc or ""
+
+
+def _issues(entry: dict) -> str:
+    """Verification issue messages from wherever the queue entry carries them."""
+    sources = [entry, entry.get("verification") or {}]
+    for key in ("resume", "cover_letter"):
+        doc = entry.get(key)
+        if isinstance(doc, dict):
+            sources += [doc, doc.get("verification") or {}]
+    messages = []
+    for source in sources:
+        for issue in source.get("issues") or []:
+            messages.append(issue.get("message", "") if isinstance(issue, dict) else str(issue))
+    return "\n".join(messages)
+
+
+def document(entry: dict) -> dict:
+    """Indexed fields for a packaged queue entry."""
+    job = entry.get("job") or {}
+    company = job.get("company") or {}
+    role = job.get("role") or {}
+    match = entry.get("match") or {}
+    return {
+        "job_id": job.get("job_id") or entry.get("job_id") or entry["queue_entry_id"],
+        "entry_id": entry.get("queue_entry_id"),
+        "company": company.get("name", "") if isinstance(company, dict) else company,
+        "industry": company.get("industry", "") if isinstance(company, dict) else "",
+        "title": role.get("title", ""),
+        "description": role.get("description_raw", ""),
+        "resume": _text(entry.get("resume")),
+        "cover_letter": _text(entry.get("cover_letter")),
+        "issues": _issues(entry),
+        "status": entry.get("status"),
+        "classification": match.get("classification"),
+        "score": match.get("composite_score"),
+        "created_at": entry.get("created_at") or _now(),
+    }
+
+
+def highlight(snippet: str) -> str:
+    """Escaped snippet HTML with the matched terms wrapped in <mark>."""
+    return html.escape(snippet).replace(MARK_OPEN, "<mark>").replace(MARK_CLOSE, "</mark>")
+
+
+def quote_terms(query: str) -> str:
+    """Fallback for input that isn't valid FTS5 syntax: each word as a quoted term (all required)."""
+    words = [w for w in re.findall(r"[\w+#.-]+", query) if w not in ("AND", "OR", "NOT", "NEAR")]
+    return " ".join('"' + w.replace('"', '""') + '"' for w in words)
+
+
+class ApplicationSearch:
+    def __init__(self, config: dict | None = None):
+        config = (config or {}).get("search", {})
+        self.db_path = config.get("db_path", "data/search.db")
+        self.snippet_tokens = config.get("snippet_tokens", 12)
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM search_docs").fetchone()[0]
+
+    # -- keeping in sync ---------------------------------------------------
+
+    def attach(self, queue_store=None, state=None) -> None:
+        """Follow QueueStore puts and StateManager application changes."""
+        if queue_store is not None:
+            queue_store.add_listener(self._on_queue)
+        if state is not None:
+            state.add_listener(self._on_state)
+
+    def index_entry(self, entry: dict) -> None:
+        """(Re-)index one queue entry's documents."""
+        doc = document(entry)
+        with self._lock:
+            row = self.conn.execute("SELECT id FROM search_docs WHERE job_id = ?", (doc["job_id"],)).fetchone()
+            if row is None:
+                cur = self.conn.execute(
+                    "INSERT INTO search_docs (job_id, entry_id, company, title, status, classification, "
+                    "score, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (doc["job_id"], doc["entry_id"], doc["company"], doc["title"], doc["status"],
+                     doc["classification"], doc["score"], doc["created_at"], _now()),
+                )
+                rowid = cur.lastrowid
+            else:
+                rowid = row["id"]
+                self.conn.execute(
+                    "UPDATE search_docs SET entry_id = ?, company = ?, title = ?, "
+                    "status = COALESCE(?, status), classification = COALESCE(?, classification), "
+                    "score = COALESCE(?, score), updated_at = ? WHERE id = ?",
+                    (doc["entry_id"], doc["company"], doc["title"], doc["status"],
+                     doc["classification"], doc["score"], _now(), rowid),
+                )
+                self.conn.execute("DELETE FROM search_fts WHERE rowid = ?", (rowid,))
+            self.conn.execute(
+                f"INSERT INTO search_fts (rowid, {', '.join(FTS_COLUMNS)}) "
+                f"VALUES (?, {', '.join('?' for _ in FTS_COLUMNS)})",
+                (rowid, *(doc[c] for c in FTS_COLUMNS)),
+            )
+            self.conn.commit()
+
+    def update_facets(self, job_id: str, **facets) -> None:
+        """Set status/classification/outcome for a job; creates a bare document if needed."""
+        facets = {k: v for k, v in facets.items() if k in FACETS + ("company", "title")}
+        with self._lock:
+            row = self.conn.execute("SELECT id FROM search_docs WHERE job_id = ?", (job_id,)).fetchone()
+            if row is None:
+                cur = self.conn.execute(
+                    "INSERT INTO search_docs (job_id, company, title, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (job_id, facets.get("company") or "", facets.get("title") or "", _now(), _now()),
+                )
+                self.conn.execute(
+                    "INSERT INTO search_fts (rowid, company, title) VALUES (?, ?, ?)",
+                    (cur.lastrowid, facets.get("company") or "", facets.get("title") or ""),
+                )
+            # A cleared outcome is meaningful; a missing status/classification is not
+            updates = {k: v for k, v in facets.items() if k in FACETS and (v is not None or k == "outcome")}
+            if updates:
+                sets = ", ".join(f"{k} = ?" for k in updates)
+                self.conn.execute(
+                    f"UPDATE search_docs SET {sets}, updated_at = ? WHERE job_id = ?",
+                    (*updates.values(), _now(), job_id),
+                )
+            self.conn.commit()
+
+    def rebuild(self, queue_store) -> int:
+        """Re-index every entry in the queue store. Returns the number indexed."""
+        count, cursor = 0, None
+        while True:
+            page = queue_store.page(status=None, cursor=cursor, limit=500)
+            for summary in page["items"]:
+                entry = queue_store.get(summary["entry_id"])
+                if entry is not None:
+                    self.index_entry(entry)
+                    count += 1
+            cursor = page["next_cursor"]
+            if cursor is None:
+                return count
+
+    # -- querying ----------------------------------------------------------
+
+    def search(self, query: str | None = None, status=None, classification=None, outcome=None,
+               company: str | None = None, since: str | None = None, until: str | None = None,
+               limit: int = 20, offset: int = 0) -> dict:
+        """Ranked results with snippets, plus facet counts over all matches.
+
+        query: FTS5 syntax (phrases, AND/OR/NOT, column:term, prefix*). Input
+        that isn't valid syntax is searched as plain words.
+        status/classification/outcome: one value or a list. since/until: ISO
+        dates on created_at, inclusive.
+        Returns {"results", "total", "facets", "query"}.
+        """
+        where, args = [], []
+        for column, value in (("status", status), ("classification", classification), ("outcome", outcome)):
+            if value:
+                values = [value] if isinstance(value, str) else list(value)
+                where.append(f"d.{column} IN ({', '.join('?' for _ in values)})")
+                args.extend(values)
+        if company:
+            where.append("d.company = ? COLLATE NOCASE")
+            args.append(company)
+        if since:
+            where.append("d.created_at >= ?")
+            args.append(since)
+        if until:
+            where.append("d.created_at < ?")
+            args.append(until + "\uffff")  # inclusive of the whole until day
+
+        if query and query.strip():
+            try:
+                return self._run(query, where, args, limit, offset)
+            except sqlite3.OperationalError:
+                fallback = quote_terms(query)
+                if not fallback:
+                    return {"results": [], "total": 0, "facets": {}, "query": query}
+                return self._run(fallback, where, args, limit, offset)
+        return self._run(None, where, args, limit, offset)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _run(self, query, where, args, limit, offset) -> dict:
+        if query:
+            source = "search_fts JOIN search_docs d ON d.id = search_fts.rowid"
+            conditions = ["search_fts MATCH ?"] + where
+            args = [query] + args
+            select = (
+                f"d.*, bm25(search_fts, {', '.join(map(str, WEIGHTS))}) AS rank, "
+                f"snippet(search_fts, -1, '{MARK_OPEN}', '{MARK_CLOSE}', '…', {int(self.snippet_tokens)}) AS snippet"
+            )
+            order = "rank"
+        else:
+            source = "search_docs d"
+            conditions = where
+            select = "d.*, NULL AS rank, NULL AS snippet"
+            order = "d.created_at DESC"
+        clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        rows = self.conn.execute(
+            f"SELECT {select} FROM {source}{clause} ORDER BY {order} LIMIT ? OFFSET ?",
+            (*args, limit, offset),
+        ).fetchall()
+        total = self.conn.execute(f"SELECT COUNT(*) FROM {source}{clause}", args).fetchone()[0]
+        facets = {}
+        for facet in FACETS:
+            facets[facet] = {
+                (value if value is not None else "none"): n
+                for value, n in self.conn.execute(
+                    f"SELECT d.{facet}, COUNT(*) FROM {source}{clause} GROUP BY d.{facet}", args
+                )
+            }
+        results = [{k: r[k] for k in r.keys() if k != "id"} for r in rows]
+        for result in results:
+            if result["snippet"] is not None:
+                result["snippet"] = highlight(result["snippet"])
+        return {"results": results, "total": total, "facets": facets, "query": query}
+
+    def _on_queue(self, event: dict) -> None:
+        if event["kind"] == "queue_put":
+            self.index_entry(event["entry"])
+
+    def _on_state(self, event: dict) -> None:
+        if event["kind"] != "application":
+            return
+        row = event["row"]
+        self.update_facets(event["job_id"], status=row.get("status"), outcome=row.get("outcome"),
+                           classification=row.get("classification"),
+                           company=row.get("company"), title=row.get("title"))
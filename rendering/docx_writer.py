@@ -0,0 +1,219 @@
+"""DocxWriter: In-process markdown to DOCX, with no pandoc subprocess.
+
+Covers the markdown subset the Resume and Cover Letter agents produce:
+#/##/### headings, paragraphs, bullet and numbered lists (two levels),
+**bold**, *italic*, [links](url), <autolinks>, backslash escapes and ---
+rules. Each maps directly onto OOXML.
+
+Styles come from the reference .docx when one exists (§9
+resume_reference.docx). Its styles.xml, theme, fonts, settings and page
+setup (sectPr) are copied as-is, so the template keeps control of the look.
+The style ids used are the ones pandoc's reference documents define
+(Heading1-3, BodyText, FirstParagraph, Compact, Hyperlink), so a reference
+document prepared for pandoc works unchanged. Without a reference document,
+built-in defaults are used.
+
+The output is a zip written with zipfile, entirely in-process.
+"""
+
+import io
+import re
+import zipfile
+from xml.sax.saxutils import escape, quoteattr
+
+from common.markdown_ast import parse, parse_inline
+
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_RELS_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+
+# Reference-document parts copied verbatim when present: part -> (relationship type, content type)
+COPIED_PARTS = {
+    "word/styles.xml": (f"{REL}/styles",
+                        "application/vnd.openxmlformats-officedocument.wordprocessingml.styles+xml"),
+    "word/theme/theme1.xml": (f"{REL}/theme", "application/vnd.openxmlformats-officedocument.theme+xml"),
+    "word/fontTable.xml": (f"{REL}/fontTable",
+                           "application/vnd.openxmlformats-officedocument.wordprocessingml.fontTable+xml"),
+    "word/settings.xml": (f"{REL}/settings",
+                          "application/vnd.openxmlformats-officedocument.wordprocessingml.settings+xml"),
+}
+
+DEFAULT_SECT_PR = (
+    '<w:sectPr><w:pgSz w:w="12240" w:h="15840"/>'
+    '<w:pgMar w:top="1080" w:right="1080" w:bottom="1080" w:left="1080" '
+    'w:header="720" w:footer="720" w:gutter="0"/></w:sectPr>'
+)
+
+
+def _style(style_id, name, kind="paragraph", ppr="", rpr="", based_on="Normal", default=False):
+    based = f'<w:basedOn w:val="{based_on}"/>' if based_on else ""
+    flag = ' w:default="1"' if default else ""
+    return (f'<w:style w:type="{kind}"{flag} w:styleId="{style_id}"><w:name w:val="{name}"/>{based}'
+            f'<w:qFormat/>{f"<w:pPr>{ppr}</w:pPr>" if ppr else ""}{f"<w:rPr>{rpr}</w:rPr>" if rpr else ""}'
+            f"</w:style>")
+
+
+DEFAULT_STYLES = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:styles xmlns:w="{W_NS}">'
+    '<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="Calibri" w:hAnsi="Calibri" w:cs="Calibri"/>'
+    '<w:sz w:val="21"/><w:szCs w:val="21"/></w:rPr></w:rPrDefault>'
+    '<w:pPrDefault><w:pPr><w:spacing w:after="60" w:line="252" w:lineRule="auto"/></w:pPr></w:pPrDefault>'
+    "</w:docDefaults>"
+    + _style("Normal", "Normal", based_on=None, default=True)
+    + _style("Heading1", "heading 1", ppr='<w:keepNext/><w:spacing w:before="0" w:after="40"/><w:outlineLvl w:val="0"/>',
+             rpr='<w:b/><w:sz w:val="40"/><w:szCs w:val="40"/>')
+    + _style("Heading2", "heading 2",
+             ppr='<w:keepNext/><w:pBdr><w:bottom w:val="single" w:sz="4" w:space="1" w:color="888888"/></w:pBdr>'
+                 '<w:spacing w:before="240" w:after="80"/><w:outlineLvl w:val="1"/>',
+             rpr='<w:b/><w:caps/><w:sz w:val="23"/><w:szCs w:val="23"/>')
+    + _style("Heading3", "heading 3", ppr='<w:keepNext/><w:spacing w:before="160" w:after="40"/><w:outlineLvl w:val="2"/>',
+             rpr='<w:b/><w:sz w:val="21"/><w:szCs w:val="21"/>')
+    + _style("BodyText", "Body Text")
+    + _style("FirstParagraph", "First Paragraph", based_on="BodyText")
+    + _style("Compact", "Compact", ppr='<w:spacing w:before="0" w:after="20"/>', based_on="BodyText")
+    + _style("Hyperlink", "Hyperlink", kind="character", rpr='<w:color w:val="1F4E79"/>', based_on=None)
+    + "</w:styles>"
+)
+
+# One bullet list definition and one decimal definition, two levels each
+NUMBERING = (
+    f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><w:numbering xmlns:w="{W_NS}">'
+    '<w:abstractNum w:abstractNumId="0"><w:multiLevelType w:val="hybridMultilevel"/>'
+    '<w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="bullet"/><w:lvlText w:val="•"/>'
+    '<w:lvlJc w:val="left"/><w:pPr><w:ind w:left="360" w:hanging="360"/></w:pPr></w:lvl>'
+    '<w:lvl w:ilvl="1"><w:start w:val="1"/><w:numFmt w:val="bullet"/><w:lvlText w:val="–"/>'
+    '<w:lvlJc w:val="left"/><w:pPr><w:ind w:left="720" w:hanging="360"/></w:pPr></w:lvl>'
+    "</w:abstractNum>"
+    '<w:abstractNum w:abstractNumId="1"><w:multiLevelType w:val="hybridMultilevel"/>'
+    '<w:lvl w:ilvl="0"><w:start w:val="1"/><w:numFmt w:val="decimal"/><w:lvlText w:val="%1."/>'
+    '<w:lvlJc w:val="left"/><w:pPr><w:ind w:left="360" w:hanging="360"/></w:pPr></w:lvl>'
+    '<w:lvl w:ilvl="1"><w:start w:val="1"/><w:numFmt w:val="lowerLetter"/><w:lvlText w:val="%2."/>'
+    '<w:lvlJc w:val="left"/><w:pPr><w:ind w:left="720" w:hanging="360"/></w:pPr></w:lvl>'
+    "</w:abstractNum>"
+    '<w:num w:numId="1"><w:abstractNumId w:val="0"/></w:num>'
+    '<w:num w:numId="2"><w:abstractNumId w:val="1"/></w:num>'
+    "</w:numbering>"
+)
+BULLET_NUM, DECIMAL_NUM = 1, 2
+
+# Characters not allowed in XML 1.0
+INVALID_XML = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class DocxWriter:
+    def __init__(self, reference_docx: str | None = None):
+        self.reference_docx = reference_docx
+        self.parts = {}
+        self.sect_pr = DEFAULT_SECT_PR
+        if reference_docx:
+            self._load_reference(reference_docx)
+        self.parts.setdefault("word/styles.xml", DEFAULT_STYLES.encode())
+
+    def write(self, md_content: str, output_path: str) -> str:
+        with open(output_path, "wb") as f:
+            f.write(self.to_bytes(md_content))
+        return output_path
+
+    def to_bytes(self, md_content: str) -> bytes:
+        links = {}
+        body = self._body(parse(md_content).blocks, links)
+        document = (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            f'<w:document xmlns:w="{W_NS}" xmlns:r="{R_NS}"><w:body>{body}{self.sect_pr}</w:body></w:document>'
+        )
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
+            z.writestr("[Content_Types].xml", self._content_types())
+            z.writestr("_rels/.rels", self._package_rels())
+            z.writestr("word/document.xml", document)
+            z.writestr("word/numbering.xml", NUMBERING)
+            z.writestr("word/_rels/document.xml.rels", self._document_rels(links))
+            for name, data in self.parts.items():
+                z.writestr(name, data)
+        return buffer.getvalue()
+
+    def _body(self, blocks: list[dict], links: dict) -> str:
+        out = []
+        after_heading = True
+        for block in blocks:
+            kind = block["kind"]
+            if kind == "heading":
+                out.append(self._paragraph(f'<w:pStyle w:val="Heading{block["level"]}"/>', block["text"], links))
+                after_heading = True
+                continue
+            if kind == "rule":
+                out.append('<w:p><w:pPr><w:pBdr><w:bottom w:val="single" w:sz="6" w:space="1" '
+                           'w:color="auto"/></w:pBdr></w:pPr></w:p>')
+                continue
+            if kind in ("bullet", "numbered"):
+                num = BULLET_NUM if kind == "bullet" else DECIMAL_NUM
+                ppr = (f'<w:pStyle w:val="Compact"/><w:numPr><w:ilvl w:val="{block["level"]}"/>'
+                       f'<w:numId w:val="{num}"/></w:numPr>')
+                out.append(self._paragraph(ppr, block["text"], links))
+            else:
+                style = "FirstParagraph" if after_heading else "BodyText"
+                out.append(self._paragraph(f'<w:pStyle w:val="{style}"/>', block["text"], links))
+            after_heading = False
+        return "".join(out)
+
+    def _paragraph(self, ppr: str, text: str, links: dict) -> str:
+        runs = []
+        for run in parse_inline(text):
+            rpr = ("<w:b/><w:bCs/>" if run["bold"] else "") + ("<w:i/><w:iCs/>" if run["italic"] else "")
+            if run["link"]:
+                rpr = '<w:rStyle w:val="Hyperlink"/>' + rpr
+            xml = f'<w:r>{f"<w:rPr>{rpr}</w:rPr>" if rpr else ""}<w:t xml:space="preserve">{self._text(run["text"])}</w:t></w:r>'
+            if run["link"]:
+                rel_id = links.setdefault(run["link"], f"rIdLink{len(links) + 1}")
+                xml = f'<w:hyperlink r:id="{rel_id}">{xml}</w:hyperlink>'
+            runs.append(xml)
+        return f'<w:p><w:pPr>{ppr}</w:pPr>{"".join(runs)}</w:p>'
+
+    def _text(self, text: str) -> str:
+        return escape(INVALID_XML.sub("", text))
+
+    def _content_types(self) -> str:
+        overrides = [
+            ("/word/document.xml", "application/vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"),
+            ("/word/numbering.xml", "application/vnd.openxmlformats-officedocument.wordprocessingml.numbering+xml"),
+        ] + [(f"/{name}", COPIED_PARTS[name][1]) for name in self.parts]
+        return (
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            + "".join(f'<Override PartName="{p}" ContentType="{t}"/>' for p, t in overrides)
+            + "</Types>"
+        )
+
+    def _package_rels(self) -> str:
+        return (
+            f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?><Relationships xmlns="{PKG_RELS_NS}">'
+            f'<Relationship Id="rId1" Type="{REL}/officeDocument" Target="word/document.xml"/>'
+            "</Relationships>"
+        )
+
+    def _document_rels(self, links: dict) -> str:
+        rels = [f'<Relationship Id="rIdNumbering" Type="{REL}/numbering" Target="numbering.xml"/>']
+        for i, name in enumerate(self.parts, 1):
+            rels.append(f'<Relationship Id="rIdPart{i}" Type="{COPIED_PARTS[name][0]}" '
+                        f'Target="{name.removeprefix("word/")}"/>')
+        for url, rel_id in links.items():
+            rels.append(f'<Relationship Id="{rel_id}" Type="{REL}/hyperlink" '
+                        f'Target={quoteattr(url)} TargetMode="External"/>')
+        return (f'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                f'<Relationships xmlns="{PKG_RELS_NS}">{"".join(rels)}</Relationships>')
+
+    def _load_reference(self, path: str) -> None:
+        with zipfile.ZipFile(path) as z:
+            names = set(z.namelist())
+            for name in COPIED_PARTS:
+                if name in names:
+                    self.parts[name] = z.read(name)
+            if "word/document.xml" in names:
+                document = z.read("word/document.xml").decode("utf-8")
+                # The body's final sectPr holds the template's page size and margins
+                sections = re.findall(r"<w:sectPr\b.*?</w:sectPr>", document, re.S)
+                if sections and "r:id=" not in sections[-1]:  # header/footer refs would dangle
+                    self.sect_pr = sections[-1]
@@ -0,0 +1,114 @@
+"""ResumeRenderer: Markdown to HTML, PDF and DOCX for submission (§9).
+
+Deterministic, no LLM. The stylesheet is read and parsed once per renderer
+(WeasyPrint CSS object, shared FontConfiguration) instead of on every call,
+so a long-lived renderer, such as one held by a RenderService worker,
+pays the parse cost once.
+
+HTML comes from the shared markdown parse (common/markdown_ast.py), so a
+document version already parsed for verification or preview isn't parsed
+again. WeasyPrint is imported on first PDF use. DOCX is written in-process by
+DocxWriter (docx_engine="native", the default), styled by the template's
+reference document when one exists and by DocxWriter's built-in styles
+otherwise (no reference documents ship in rendering/templates). An edited
+reference is re-read on the next DOCX. docx_engine="pandoc" shells out instead.
+"""
+
+import os
+import subprocess
+import tempfile
+
+from common.markdown_ast import parse
+from rendering.docx_writer import DocxWriter
+
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), "templates")
+
+
+class ResumeRenderer:
+    def __init__(self, css_path: str, reference_docx: str | None = None, docx_engine: str = "native"):
+        self.css_path = css_path
+        with open(css_path) as f:
+            self.css = f.read()
+        self.reference_docx = reference_docx if reference_docx and os.path.exists(reference_docx) else None
+        if docx_engine not in ("native", "pandoc"):
+            raise ValueError(f"Unknown docx_engine '{docx_engine}'")
+        self.docx_engine = docx_engine
+        self._docx_writer = None
+        self._stylesheet = None
+        self._fonts = None
+
+    @classmethod
+    def for_template(cls, name: str, templates_dir: str = TEMPLATES_DIR,
+                     docx_engine: str = "native") -> "ResumeRenderer":
+        """Renderer for "resume" or "cover_letter" from rendering/templates."""
+        return cls(os.path.join(templates_dir, f"{name}.css"),
+                   os.path.join(templates_dir, f"{name}_reference.docx"), docx_engine)
+
+    def warm(self) -> None:
+        """Import WeasyPrint and parse the stylesheet now rather than on the first PDF."""
+        self._pdf_stylesheet()
+
+    def to_html(self, md_content: str, inline_css: bool = True) -> str:
+        body = parse(md_content).html
+        style = f"<style>{self.css}</style>" if inline_css else ""
+        return f'<!DOCTYPE html><html><head><meta charset="utf-8">{style}</head><body>{body}</body></html>'
+
+    def to_pdf(self, md_content: str, output_path: str) -> str:
+        from weasyprint import HTML
+
+        stylesheet, fonts = self._pdf_stylesheet()
+        HTML(string=self.to_html(md_content, inline_css=False)).write_pdf(
+            output_path, stylesheets=[stylesheet], font_config=fonts
+        )
+        return output_path
+
+    def to_docx(self, md_content: str, output_path: str) -> str:
+        if self.docx_engine == "pandoc":
+            return self.to_docx_pandoc(md_content, output_path)
+        version = self._reference_version()
+        if self._docx_writer is None or self._docx_writer[0] != version:
+            # Reads the reference document once per version of it
+            self._docx_writer = (version, DocxWriter(self.reference_docx if version else None))
+        return self._docx_writer[1].write(md_content, output_path)
+
+    def to_docx_pandoc(self, md_content: str, output_path: str) -> str:
+        """pandoc --from markdown --to docx [--reference-doc=...] -o output_path"""
+        cmd = ["pandoc", "--from", "markdown", "--to", "docx", "-o", output_path]
+        if self.reference_docx:
+            cmd.append(f"--reference-doc={self.reference_docx}")
+        with tempfile.NamedTemporaryFile("w", suffix=".md", delete=False) as f:
+            f.write(md_content)
+            source = f.name
+        try:
+            subprocess.run(cmd + [source], check=True, capture_output=True, timeout=60)
+        finally:
+            os.remove(source)
+        return output_path
+
+    def render(self, md_content: str, fmt: str, output_path: str) -> str:
+        if fmt == "pdf":
+            return self.to_pdf(md_content, output_path)
+        if fmt == "docx":
+            return self.to_docx(md_content, output_path)
+        if fmt == "html":
+            with open(output_path, "w") as f:
+                f.write(self.to_html(md_content))
+            return output_path
+        raise ValueError(f"Unknown render format '{fmt}'")
+
+    def _pdf_stylesheet(self) -> tuple:
+        if self._stylesheet is None:
+            from weasyprint import CSS
+            from weasyprint.text.fonts import FontConfiguration
+
+            self._fonts = FontConfiguration()
+            self._stylesheet = CSS(string=self.css, font_config=self._fonts)
+        return self._stylesheet, self._fonts
+
+    def _reference_version(self) -> tuple | None:
+        # Size as well as mtime, as in RenderService: edits within the
+        # timestamp resolution keep the mtime
+        if not self.reference_docx or not os.path.exists(self.reference_docx):
+            return None
+        st = os.stat(self.reference_docx)
+        return (st.st_mtime_ns, st.st_size)
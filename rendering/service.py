@@ -0,0 +1,299 @@
+"""RenderService: Warm render worker pool with a content-addressed output cache.
+
+Rendering on Approve made the user wait for WeasyPrint to start, parse the
+stylesheet and lay out the document. RenderService instead:
+
+- keeps a pool of worker processes, started and warmed up front. Each worker
+  holds one ResumeRenderer per template with its stylesheet already parsed,
+  and rebuilds it when the template's CSS or reference docx changes (by
+  mtime and size) or the docx engine does.
+- caches outputs under cache_dir as {sha256(markdown, template, format, CSS,
+  reference docx)}.{format}. The same document is never rendered twice, and
+  a changed stylesheet misses the cache naturally.
+- pre-renders each entry as it is queued (attach() to a QueueStore), from a
+  background thread so QueueStore.put() never waits on the pool starting or
+  fails with it. Approve usually then finds a cached file or joins a render
+  already in flight.
+
+stats() reports cache hits (split into ready and in-flight), misses, failures
+and render-time percentiles.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from agents.concurrency import percentile
+from rendering.renderer import TEMPLATES_DIR, ResumeRenderer
+
+logger = logging.getLogger(__name__)
+
+# Bump when renderer output changes for the same inputs
+RENDER_VERSION = "2"
+
+TEMPLATES = ("resume", "cover_letter")
+
+_renderers = {}  # per worker process: template -> (version, ResumeRenderer); see _renderer()
+_docx_engine = "native"
+
+
+def _init_worker(templates_dir: str, warm_pdf: bool, docx_engine: str = "native") -> None:
+    global _docx_engine
+    _docx_engine = docx_engine
+    for name in TEMPLATES:
+        renderer = _renderer(templates_dir, name)
+        if warm_pdf and renderer is not None:
+            try:
+                renderer.warm()
+            except (ImportError, OSError) as e:  # WeasyPrint or its system libraries missing
+                logger.warning("PDF warm-up failed in render worker: %s", e)
+
+
+def _renderer(templates_dir: str, name: str) -> ResumeRenderer | None:
+    css_path = os.path.join(templates_dir, f"{name}.css")
+    if not os.path.exists(css_path):
+        return None
+    reference = os.path.join(templates_dir, f"{name}_reference.docx")
+    # Everything the cache key covers besides the document: a new or edited
+    # reference docx, or another engine, needs a new renderer too
+    version = (_file_version(css_path),
+               _file_version(reference) if os.path.exists(reference) else None,
+               _docx_engine)
+    held = _renderers.get(name)
+    if held is None or held[0] != version:
+        held = (version, ResumeRenderer.for_template(name, templates_dir, _docx_engine))
+        _renderers[name] = held
+    return held[1]
+
+
+def _render(templates_dir: str, template: str, fmt: str, md_content: str, output_path: str) -> float:
+    """Worker entry point. Writes atomically; returns render time in ms."""
+    start = time.perf_counter()
+    renderer = _renderer(templates_dir, template)
+    if renderer is None:
+        raise FileNotFoundError(f"No stylesheet for template '{template}' in {templates_dir}")
+    tmp = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        renderer.render(md_content, fmt, tmp)
+        os.replace(tmp, output_path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return (time.perf_counter() - start) * 1000
+
+
+def _file_version(path: str) -> tuple:
+    # Size as well as mtime: an edit within the filesystem's timestamp
+    # resolution leaves the mtime unchanged
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class RenderService:
+    def __init__(self, config: dict | None = None):
+        config = (config or {}).get("rendering", {})
+        self.templates_dir = config.get("templates_dir", TEMPLATES_DIR)
+        self.cache_dir = config.get("cache_dir", "data/render_cache")
+        self.workers = config.get("workers", 2)
+        self.formats = tuple(config.get("formats", ("pdf", "docx")))
+        self.prerender_on_queue = config.get("prerender_on_queue", True)
+        self.docx_engine = config.get("docx_engine", "native")
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self._pool = None
+        self._lock = threading.Lock()
+        self._inflight = {}       # cache key -> Future[path]
+        self._fingerprints = {}   # template file path -> ((mtime, size), digest)
+        self._prerenderer = None  # one thread that starts pre-renders for attach()
+        self._render_ms = deque(maxlen=1000)
+        self.on_output = None     # on_output(path) when a cached output is written or served (retention)
+        self.counters = {"requests": 0, "hits": 0, "inflight_hits": 0, "misses": 0,
+                         "renders": 0, "failures": 0, "prerendered": 0}
+
+    def start(self) -> None:
+        """Start and warm the worker processes (idempotent)."""
+        with self._lock:
+            if self._pool is not None:
+                return
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers, initializer=_init_worker,
+                initargs=(self.templates_dir, "pdf" in self.formats, self.docx_engine),
+            )
+            pings = [self._pool.submit(_ping) for _ in range(self.workers)]
+        for ping in pings:
+            ping.result()
+
+    def key(self, md_content: str, template: str, fmt: str) -> str:
+        digest = hashlib.sha256()
+        for part in (RENDER_VERSION, template, fmt, md_content):
+            digest.update(part.encode())
+            digest.update(b"\0")
+        digest.update(self._fingerprint(os.path.join(self.templates_dir, f"{template}.css")).encode())
+        if fmt == "docx":
+            digest.update(self.docx_engine.encode())
+            reference = os.path.join(self.templates_dir, f"{template}_reference.docx")
+            digest.update(self._fingerprint(reference).encode())
+        return digest.hexdigest()
+
+    def cached(self, md_content: str, template: str = "resume", fmt: str = "pdf") -> str | None:
+        path = self._cache_path(self.key(md_content, template, fmt), fmt)
+        return path if os.path.exists(path) else None
+
+    def submit(self, md_content: str, template: str = "resume", fmt: str = "pdf",
+               _count: bool = True) -> Future:
+        """Future for the cached output path, rendering in a worker only if needed."""
+        key = self.key(md_content, template, fmt)
+        path = self._cache_path(key, fmt)
+        with self._lock:
+            if _count:
+                self.counters["requests"] += 1
+            hit = os.path.exists(path)
+            if hit:
+                if _count:
+                    self.counters["hits"] += 1
+            elif key in self._inflight:
+                if _count:
+                    self.counters["inflight_hits"] += 1
+                return self._inflight[key]
+            elif _count:
+                self.counters["misses"] += 1
+        if hit:
+            # Outside the lock: on_output writes to the retention index
+            if self.on_output is not None:
+                self.on_output(path)
+            done = Future()
+            done.set_result(path)
+            return done
+        self.start()
+        with self._lock:
+            if key in self._inflight:  # raced with another submitter while starting
+                return self._inflight[key]
+            pool = self._pool
+            result = Future()
+            try:
+                job = pool.submit(_render, self.templates_dir, template, fmt, md_content, path)
+            except BrokenProcessPool:
+                self._pool = None  # a worker died; the next submit starts a fresh pool
+                raise
+            self._inflight[key] = result
+        job.add_done_callback(lambda f: self._finished(key, path, f, result, pool))
+        return result
+
+    async def render(self, md_content: str, template: str = "resume", fmt: str = "pdf",
+                     output_path: str | None = None) -> str:
+        """Rendered file path (copied to output_path if given). Used on Approve."""
+        path = await asyncio.wrap_future(self.submit(md_content, template, fmt))
+        if output_path:
+            os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+            shutil.copyfile(path, output_path)
+            return output_path
+        return path
+
+    def prerender(self, entry: dict) -> list[Future]:
+        """Start rendering a queued entry's documents in every configured format."""
+        futures = []
+        for template in TEMPLATES:
+            content = self._content(entry.get(template))
+            if not content:
+                continue
+            for fmt in self.formats:
+                future = self.submit(content, template, fmt, _count=False)
+                future.add_done_callback(self._log_failure)
+                futures.append(future)
+        self.counters["prerendered"] += len(futures)
+        return futures
+
+    def attach(self, queue_store) -> None:
+        """Pre-render entries as they are queued or edited."""
+        if self.prerender_on_queue:
+            queue_store.add_listener(self._on_queue_event)
+
+    def stats(self) -> dict:
+        c = self.counters
+        served = c["hits"] + c["inflight_hits"]
+        times = list(self._render_ms)
+        return {
+            **c,
+            "hit_rate": served / c["requests"] if c["requests"] else 0.0,
+            "render_ms_p50": round(percentile(times, 50), 1) if times else None,
+            "render_ms_p95": round(percentile(times, 95), 1) if times else None,
+            "workers": self.workers,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            prerenderer, self._prerenderer = self._prerenderer, None
+        if prerenderer is not None:
+            prerenderer.shutdown(wait=True, cancel_futures=True)
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+    def _on_queue_event(self, event: dict) -> None:
+        # Runs inside QueueStore.put(): only hand the entry off
+        if event["kind"] != "queue_put":
+            return
+        with self._lock:
+            if self._prerenderer is None:
+                self._prerenderer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prerender")
+            self._prerenderer.submit(self._prerender_quietly, event["entry"])
+
+    def _prerender_quietly(self, entry: dict) -> None:
+        try:
+            self.prerender(entry)
+        except Exception as e:  # e.g. BrokenProcessPool; Approve renders on demand instead
+            logger.warning("Pre-render of %s failed: %s", entry.get("queue_entry_id"), e)
+
+    def _finished(self, key: str, path: str, job: Future, result: Future, pool) -> None:
+        with self._lock:
+            self._inflight.pop(key, None)
+            if job.cancelled():  # pool shut down before the job ran
+                result.cancel()
+                return
+            if job.exception() is None:
+                self.counters["renders"] += 1
+                self._render_ms.append(job.result())
+            else:
+                self.counters["failures"] += 1
+                if isinstance(job.exception(), BrokenProcessPool) and self._pool is pool:
+                    self._pool = None
+        if job.exception() is None:
+            if self.on_output is not None:
+                self.on_output(path)
+            result.set_result(path)
+        else:
+            result.set_exception(job.exception())
+
+    def _log_failure(self, future: Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("Pre-render failed: %s", future.exception())
+
+    def _fingerprint(self, path: str) -> str:
+        if not os.path.exists(path):
+            return "-"
+        version = _file_version(path)
+        held = self._fingerprints.get(path)
+        if held is None or held[0] != version:
+            with open(path, "rb") as f:
+                held = (version, hashlib.sha256(f.read()).hexdigest())
+            self._fingerprints[path] = held
+        return held[1]
+
+    def _cache_path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{fmt}")
+
+    def _content(self, doc) -> str:
+        if isinstance(doc, dict):
+            return doc.get("content") or doc.get("resume_content") or ""
+        return doc or ""
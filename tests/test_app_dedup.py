@@ -0,0 +1,241 @@
+"""Tests for ApplicationDeduplicator."""
+
+import random
+from difflib import SequenceMatcher
+
+import pytest
+
+from agents.state import StateManager
+from verification.application_dedup import ApplicationDeduplicator, normalize_company
+
+
+def make_job(company, title):
+    return {"company": {"name": company}, "role": {"title": title}}
+
+
+def linear_scan(job, history):
+    """The §5.6 reference implementation."""
+    for past in history:
+        if past["status"] in ("skipped", "error"):
+            continue
+        if SequenceMatcher(None, job["company"]["name"].lower(), past["company"].lower()).ratio() < 0.80:
+            continue
+        title_sim = SequenceMatcher(None, job["role"]["title"].lower(), past["title"].lower()).ratio()
+        if title_sim > 0.75:
+            return (True, past, title_sim)
+    return (False, None, 0.0)
+
+
+def normalized_scan(job, history):
+    """The linear scan plus the one intended difference: normalized company names also match."""
+    company = job["company"]["name"]
+    for past in history:
+        if past["status"] in ("skipped", "error"):
+            continue
+        same_company = (normalize_company(company) == normalize_company(past["company"])
+                        or SequenceMatcher(None, company.lower(), past["company"].lower()).ratio() >= 0.80)
+        if not same_company:
+            continue
+        title_sim = SequenceMatcher(None, job["role"]["title"].lower(), past["title"].lower()).ratio()
+        if title_sim > 0.75:
+            return (True, past, title_sim)
+    return (False, None, 0.0)
+
+
+@pytest.fixture
+def history():
+    return [
+        {"job_id": "a1", "company": "Adaptive Bio", "title": "Senior Statistician", "status": "approved"},
+        {"job_id": "a2", "company": "Citadel", "title": "Quant Researcher", "status": "approved"},
+        {"job_id": "a3", "company": "Moderna", "title": "Biostatistician II", "status": "skipped"},
+    ]
+
+
+class TestVerdicts:
+    def test_same_company_similar_title(self, history):
+        """'Sr. Statistician' vs 'Senior Statistician' at same company -> duplicate."""
+        dedup = ApplicationDeduplicator(history)
+        is_dup, past, sim = dedup.check(make_job("Adaptive Bio", "Sr. Statistician"))
+        assert is_dup
+        assert past["job_id"] == "a1"
+        assert sim > 0.75
+
+    def test_same_company_different_role(self, history):
+        dedup = ApplicationDeduplicator(history)
+        assert not dedup.check(make_job("Adaptive Bio", "ML Engineer"))[0]
+
+    def test_different_company(self, history):
+        dedup = ApplicationDeduplicator(history)
+        assert not dedup.check(make_job("Pfizer", "Senior Statistician"))[0]
+
+    def test_skipped_apps_ignored(self, history):
+        dedup = ApplicationDeduplicator(history)
+        assert not dedup.check(make_job("Moderna", "Biostatistician II"))[0]
+
+    def test_legal_suffix_collapsed(self):
+        """The linear scan misses 'Pfizer Inc.' vs 'Pfizer'; the blocking index does not."""
+        history = [{"job_id": "p", "company": "Pfizer Inc.", "title": "Biostatistician", "status": "approved"}]
+        job = make_job("Pfizer", "Biostatistician")
+        assert not linear_scan(job, history)[0]
+        assert ApplicationDeduplicator(history).check(job)[0]
+
+    def test_alias_collapsed(self):
+        history = [{"job_id": "g", "company": "Google LLC", "title": "Data Scientist", "status": "approved"}]
+        assert ApplicationDeduplicator(history).check(make_job("Alphabet", "Data Scientist"))[0]
+
+    def test_equals_linear_scan_on_fixture(self, history):
+        """Without legal suffixes or aliases in play, verdicts equal the scan's both ways."""
+        dedup = ApplicationDeduplicator(history)
+        for company in ("Adaptive Bio", "Citadel", "Moderna", "Pfizer", "Adaptive Biotech"):
+            for title in ("Senior Statistician", "Sr. Statistician", "Quant Researcher",
+                          "Biostatistician II", "ML Engineer"):
+                job = make_job(company, title)
+                assert dedup.check(job)[0] == linear_scan(job, history)[0], (company, title)
+
+    def test_matches_linear_scan(self):
+        """On a randomized history, verdicts equal the scan's plus normalized-company matches only."""
+        rng = random.Random(3)
+        companies = ["Adaptive Bio", "Adaptive Bio Inc", "Citadel", "Citadel LLC", "Moderna",
+                     "Pfizer", "Genentech", "Genentec", "Two Sigma", "Jane Street"]
+        titles = ["Statistician", "Senior Statistician", "Sr. Statistician", "Biostatistician",
+                  "Biostatistician II", "Quant Researcher", "Quantitative Researcher",
+                  "ML Engineer", "Data Scientist", "Senior Data Scientist"]
+        statuses = ["approved", "queued", "skipped", "error", "approved"]
+        history = [
+            {"job_id": f"h{i}", "company": rng.choice(companies), "title": rng.choice(titles),
+             "status": rng.choice(statuses)}
+            for i in range(300)
+        ]
+        dedup = ApplicationDeduplicator(history)
+        for company in companies:
+            for title in titles:
+                job = make_job(company, title)
+                verdict = dedup.check(job)[0]
+                assert verdict == normalized_scan(job, history)[0], (company, title)
+                if linear_scan(job, history)[0]:
+                    assert verdict, (company, title)
+
+
+class TestSync:
+    def test_add_incremental(self):
+        dedup = ApplicationDeduplicator()
+        job = make_job("Citadel", "Quant Researcher")
+        assert not dedup.check(job)[0]
+        dedup.add({"job_id": "c", "company": "Citadel", "title": "Quant Researcher", "status": "approved"})
+        assert dedup.check(job)[0]
+
+    def test_status_update(self, history):
+        dedup = ApplicationDeduplicator(history)
+        job = make_job("Adaptive Bio", "Senior Statistician")
+        assert dedup.check(job)[0]
+        dedup.update(dict(history[0], status="skipped"))
+        assert not dedup.check(job)[0]
+
+    def test_title_update_reindexes(self, history):
+        dedup = ApplicationDeduplicator(history)
+        dedup.update(dict(history[1], title="Portfolio Manager"))
+        assert not dedup.check(make_job("Citadel", "Quant Researcher"))[0]
+        assert dedup.check(make_job("Citadel", "Portfolio Manager"))[0]
+
+    def test_remove(self, history):
+        dedup = ApplicationDeduplicator(history)
+        dedup.remove("a2")
+        assert len(dedup) == 2
+        assert not dedup.check(make_job("Citadel", "Quant Researcher"))[0]
+
+    def test_check_with_history_syncs(self, history):
+        """The §5.6 call shape still works and picks up history changes."""
+        dedup = ApplicationDeduplicator()
+        job = make_job("Citadel", "Quant Researcher")
+        assert dedup.check(job, history)[0]
+        assert not dedup.check(job, history[:1])[0]
+
+    def test_check_does_not_resync_seen_history(self, history, monkeypatch):
+        """Repeated checks against the same history don't walk it again; appends index only the tail."""
+        dedup = ApplicationDeduplicator()
+        job = make_job("Genentech", "Biostatistician")
+        dedup.check(job, history)
+        calls = []
+        update = dedup.update
+
+        def counting_update(app, key=None):
+            calls.append(key)
+            update(app, key)
+
+        monkeypatch.setattr(dedup, "sync", calls.append)
+        monkeypatch.setattr(dedup, "update", counting_update)
+        for _ in range(5):
+            assert not dedup.check(job, history)[0]
+        assert calls == []
+        history.append({"job_id": "g1", "company": "Genentech", "title": "Biostatistician", "status": "approved"})
+        assert dedup.check(job, history)[0]
+        assert calls == ["g1"]
+
+    def test_attach_state(self, tmp_path):
+        """attach() indexes existing applications and follows later changes."""
+        state = StateManager({"state": {"db_path": str(tmp_path / "state.db"), "import_on_startup": False}})
+        state.upsert_application("a1", company="Citadel", title="Quant Researcher", status="approved")
+        dedup = ApplicationDeduplicator()
+        dedup.attach(state)
+        job = make_job("Citadel", "Quant Researcher")
+        assert dedup.check(job)[0]
+        state.upsert_application("a1", status="skipped")
+        assert not dedup.check(job)[0]
+        state.upsert_application("a2", company="Moderna", title="Biostatistician", status="queued")
+        assert dedup.check(make_job("Moderna", "Biostatistician"))[1]["job_id"] == "a2"
+        state.close()
+
+    def test_dict_history(self, history):
+        dedup = ApplicationDeduplicator({app["job_id"]: app for app in history})
+        assert dedup.check(make_job("Citadel", "Quant Researcher"))[1]["job_id"] == "a2"
+
+
+class TestCompanyIndex:
+    def random_companies(self, rng, n):
+        letters = "abcdefghij "
+        return {"".join(rng.choice(letters) for _ in range(rng.randint(0, 14))) for _ in range(n)}
+
+    @pytest.mark.parametrize("threshold", [0.5, 0.8, 0.9])
+    def test_similar_companies_equal_full_scan(self, threshold):
+        rng = random.Random(threshold)
+        names = self.random_companies(rng, 200)
+        dedup = ApplicationDeduplicator(config={"application_dedup": {"company_threshold": threshold}})
+        for i, name in enumerate(names):
+            dedup.add({"job_id": i, "company": name, "title": "Statistician", "status": "approved"})
+        for query in self.random_companies(rng, 80) | {"", "a"}:
+            expected = {n for n in names if SequenceMatcher(None, query, n).ratio() >= threshold}
+            assert dedup._similar_companies(query) == expected, query
+
+    def test_miss_compares_few_names(self, monkeypatch):
+        """An uncached company is compared with names that could match, not with all of them."""
+        names = self.random_companies(random.Random(5), 2000)
+        dedup = ApplicationDeduplicator([
+            {"job_id": i, "company": name, "title": "Statistician", "status": "approved"}
+            for i, name in enumerate(names)
+        ])
+        compared = []
+        match = dedup._companies_match
+        monkeypatch.setattr(dedup, "_companies_match", lambda a, b: compared.append(b) or match(a, b))
+        dedup.check(make_job("Pfizer", "Statistician"))
+        assert len(compared) < len(names) // 10
+
+    def test_new_company_updates_cache_in_place(self, history):
+        dedup = ApplicationDeduplicator(history)
+        assert dedup._similar_companies("genentech") == set()
+        assert dedup._similar_companies("citadel") == {"citadel"}
+        dedup.add({"job_id": "g", "company": "Genentec", "title": "Statistician", "status": "approved"})
+        assert dedup._company_cache == {"genentech": {"genentec"}, "citadel": {"citadel"}}
+        dedup.remove("g")
+        assert dedup._company_cache == {"genentech": set(), "citadel": {"citadel"}}
+
+
+class TestNormalization:
+    @pytest.mark.parametrize("raw,expected", [
+        ("Pfizer Inc.", "pfizer"),
+        ("Acme Holdings, LLC", "acme holdings"),
+        ("Johnson & Johnson", "johnson and johnson"),
+        ("Meta Platforms, Inc.", "meta"),
+        ("Co", "co"),
+    ])
+    def test_normalize_company(self, raw, expected):
+        assert normalize_company(raw) == expected
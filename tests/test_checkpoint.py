@@ -0,0 +1,152 @@
+"""Tests for CheckpointStore."""
+
+import json
+import sqlite3
+import pytest
+
+from agents.checkpoint import CheckpointStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = CheckpointStore({"checkpoints": {"db_path": str(tmp_path / "checkpoints.db")}})
+    yield s
+    s.close()
+
+
+class TestSaveAndLoad:
+    def test_save_and_load(self, store):
+        """Saved checkpoint round-trips through compression."""
+        store.save("job_1", "resume", {"content": "# Resume", "quality_score": 92})
+        cp = store.load_latest("job_1")
+        assert cp["stage"] == "resume"
+        assert cp["data"] == {"content": "# Resume", "quality_score": 92}
+        assert cp["ts"]
+
+    def test_load_latest(self, store):
+        """Three iterations for the same job -> latest is the last one saved."""
+        for i in range(3):
+            store.save("job_1", f"resume_iter_{i}", {"iteration": i})
+        cp = store.load_latest("job_1")
+        assert cp["stage"] == "resume_iter_2"
+        assert cp["data"]["iteration"] == 2
+
+    def test_load_specific_stage(self, store):
+        store.save("job_1", "resume", {"v": 1})
+        store.save("job_1", "cover_letter", {"v": 2})
+        assert store.load("job_1", "resume")["data"] == {"v": 1}
+        assert store.load("job_1", "app_questions") is None
+
+    def test_history_keeps_all_iterations(self, store):
+        for i in range(4):
+            store.save("job_1", f"resume_iter_{i}", {"iteration": i})
+        stages = [cp["stage"] for cp in store.history("job_1")]
+        assert stages == [f"resume_iter_{i}" for i in range(4)]
+
+    def test_missing_job(self, store):
+        assert store.load_latest("nope") is None
+
+    def test_payload_is_compressed(self, store):
+        """Large repetitive payloads are stored smaller than their JSON."""
+        data = {"content": "Led adaptive trial design. " * 500}
+        store.save("job_1", "resume", data)
+        (size,) = store.conn.execute("SELECT length(payload) FROM checkpoints").fetchone()
+        assert size < len(json.dumps(data)) / 10
+
+
+class TestDurability:
+    def test_save_committed_immediately(self, tmp_path):
+        """A checkpoint is visible to another connection as soon as save() returns."""
+        path = str(tmp_path / "cp.db")
+        store = CheckpointStore({"checkpoints": {"db_path": path}})
+        store.save("job_1", "resume", {"i": 0})
+        other = sqlite3.connect(path)
+        assert other.execute("SELECT COUNT(*) FROM checkpoints").fetchone()[0] == 1
+        assert other.execute("SELECT stage FROM latest WHERE job_id = 'job_1'").fetchone()[0] == "resume"
+        other.close()
+        store.close()
+
+    def test_survives_crash_without_close(self, tmp_path):
+        """No buffered writes: an abandoned store loses nothing it reported as saved."""
+        config = {"checkpoints": {"db_path": str(tmp_path / "cp.db")}}
+        CheckpointStore(config).save("job_1", "resume", {"v": 1})
+        reopened = CheckpointStore(config)
+        assert reopened.load_latest("job_1")["data"] == {"v": 1}
+        reopened.close()
+
+    def test_wal_mode(self, store):
+        mode = store.conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode.lower() == "wal"
+
+
+class TestRecovery:
+    def test_list_incomplete(self, store):
+        """Jobs not marked complete are reported with their latest stage."""
+        store.save("job_1", "resume", {})
+        store.save("job_1", "cover_letter", {})
+        store.save("job_2", "resume", {})
+        store.mark_complete("job_2")
+        incomplete = store.list_incomplete()
+        assert [r["job_id"] for r in incomplete] == ["job_1"]
+        assert incomplete[0]["stage"] == "cover_letter"
+
+    def test_list_incomplete_filtered_by_state(self, store):
+        store.save("job_1", "resume", {})
+        store.save("job_2", "resume", {})
+        incomplete = store.list_incomplete(job_ids={"job_2"})
+        assert [r["job_id"] for r in incomplete] == ["job_2"]
+
+    def test_survives_reopen(self, tmp_path):
+        config = {"checkpoints": {"db_path": str(tmp_path / "cp.db")}}
+        store = CheckpointStore(config)
+        store.save("job_1", "resume", {"v": 1})
+        store.close()
+        reopened = CheckpointStore(config)
+        assert reopened.list_incomplete()[0]["job_id"] == "job_1"
+        reopened.close()
+
+
+class TestRetention:
+    def test_cleanup(self, store):
+        store.save("job_1", "resume", {})
+        assert store.cleanup("job_1") == 1
+        assert store.load_latest("job_1") is None
+
+    def test_compact_until_queued(self, store):
+        """until_queued drops checkpoints only for completed jobs."""
+        for i in range(3):
+            store.save("job_1", f"resume_iter_{i}", {})
+        store.save("job_2", "resume", {})
+        store.mark_complete("job_1")
+        assert store.compact() == 3
+        assert store.load_latest("job_1") is None
+        assert store.load_latest("job_2") is not None
+
+    def test_compact_keep_all(self, tmp_path):
+        store = CheckpointStore({
+            "checkpoints": {"db_path": str(tmp_path / "cp.db")},
+            "cleanup": {"checkpoint_retention": "keep_all"},
+        })
+        store.save("job_1", "resume", {})
+        store.mark_complete("job_1")
+        assert store.compact() == 0
+        assert store.load_latest("job_1") is not None
+        store.close()
+
+    def test_unknown_retention_rejected(self, tmp_path):
+        with pytest.raises(ValueError):
+            CheckpointStore({
+                "checkpoints": {"db_path": str(tmp_path / "cp.db")},
+                "cleanup": {"checkpoint_retention": "sometimes"},
+            })
+
+
+class TestLegacyImport:
+    def test_import_directory(self, store, tmp_path):
+        """Existing per-stage JSON files migrate into the database."""
+        job_dir = tmp_path / "checkpoints" / "job_1"
+        job_dir.mkdir(parents=True)
+        with open(job_dir / "resume.json", "w") as f:
+            json.dump({"stage": "resume", "data": {"v": 1}, "ts": "2026-01-01"}, f)
+        assert store.import_directory(str(tmp_path / "checkpoints")) == 1
+        assert store.load_latest("job_1")["data"] == {"v": 1}
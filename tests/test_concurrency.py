@@ -0,0 +1,225 @@
+"""Tests for ConcurrencyController against a simulated, throttling LLM."""
+
+import asyncio
+import gc
+
+from agents.concurrency import ConcurrencyController, percentile
+from agents.rate_limiter import APIRateLimiter, ResizableSemaphore
+
+# 2026-10-19 12:00:00 UTC
+NOON = 1792411200.0
+
+
+class FakeClock:
+    def __init__(self, now=NOON):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class SimulatedLLM:
+    """Throttles (429) whenever more than capacity calls are in flight."""
+
+    def __init__(self, capacity: int, base_latency: float = 5.0):
+        self.capacity = capacity
+        self.base_latency = base_latency
+        self.in_flight = 0
+
+    async def call(self) -> tuple:
+        self.in_flight += 1
+        try:
+            await asyncio.sleep(0.001)
+            throttled = self.in_flight > self.capacity
+            latency = self.base_latency * (1 + self.in_flight / self.capacity)
+            return (not throttled, throttled, latency)
+        finally:
+            self.in_flight -= 1
+
+
+def make_controller(clock, api_limit=1, gen_limit=1, caps=None, budget=None, **settings):
+    semaphores = {
+        "anthropic_api": APIRateLimiter({"concurrent_max": api_limit, "requests_per_minute": 100000}),
+        "generations": ResizableSemaphore(gen_limit),
+    }
+    config = {"concurrency": {
+        "hard_caps": caps or {"anthropic_api": 10, "generations": 6},
+        "window_seconds": 30, "cooldown_seconds": 30, **settings,
+    }}
+    return ConcurrencyController(semaphores, config, budget=budget, clock=clock)
+
+
+async def run_round(controller, llm, clock, workers=20, cost=0.0):
+    limiter = controller.semaphores["anthropic_api"]
+
+    async def worker():
+        async with limiter:
+            ok, throttled, latency = await llm.call()
+        controller.record(latency, ok=ok, throttled=throttled, cost_usd=cost)
+
+    await asyncio.gather(*(worker() for _ in range(workers)))
+    made = await controller.adjust()
+    clock.now += 31  # next interval; this window rolls off
+    return made
+
+
+class TestAIMD:
+    def test_converges_near_capacity(self):
+        clock = FakeClock()
+        controller = make_controller(clock)
+        llm = SimulatedLLM(capacity=6)
+
+        async def main():
+            history = []
+            for _ in range(30):
+                await run_round(controller, llm, clock)
+                history.append(controller.limit("anthropic_api"))
+            return history
+
+        history = asyncio.run(main())
+        assert max(history) <= 10
+        assert 3 <= min(history[10:]) and max(history[10:]) <= 7
+        reasons = [a["reason"] for a in controller.adjustments]
+        assert any("throttled" in r for r in reasons)
+        assert any(r.startswith("saturated") for r in reasons)
+
+    def test_hard_cap_respected(self):
+        clock = FakeClock()
+        controller = make_controller(clock, caps={"anthropic_api": 4, "generations": 2})
+        llm = SimulatedLLM(capacity=100, base_latency=1.0)
+
+        async def main():
+            for _ in range(10):
+                await run_round(controller, llm, clock)
+
+        asyncio.run(main())
+        assert controller.limit("anthropic_api") == 4
+        assert all(a["new"] <= 4 for a in controller.adjustments)
+
+    def test_unsaturated_limit_not_raised(self):
+        clock = FakeClock()
+        controller = make_controller(clock, api_limit=5)
+        llm = SimulatedLLM(capacity=100, base_latency=1.0)
+
+        async def main():
+            for _ in range(3):
+                await run_round(controller, llm, clock, workers=2)
+
+        asyncio.run(main())
+        assert controller.limit("anthropic_api") == 5
+        assert controller.adjustments == []
+
+    def test_p95_latency_decreases(self):
+        clock = FakeClock()
+        controller = make_controller(clock, api_limit=8, p95_latency_threshold_seconds=20)
+        for _ in range(10):
+            controller.record(45.0)
+        made = asyncio.run(controller.adjust())
+        assert made[0]["target"] == "anthropic_api" and made[0]["new"] == 4
+        assert "p95 latency" in made[0]["reason"]
+
+    def test_no_increase_during_cooldown(self):
+        clock = FakeClock()
+        controller = make_controller(clock, api_limit=4, cooldown_seconds=300)
+        controller.record(1.0, ok=False, throttled=True)
+        asyncio.run(controller.adjust())
+        assert controller.limit("anthropic_api") == 2
+        clock.now += 31
+        llm = SimulatedLLM(capacity=100, base_latency=1.0)
+        asyncio.run(run_round(controller, llm, clock))
+        assert controller.limit("anthropic_api") == 2
+
+    def test_budget_burn_lowers_generations(self):
+        clock = FakeClock()
+        controller = make_controller(clock, gen_limit=4, budget={"daily_limit_usd": 20.0})
+        # $5 in 30 s, with $15 left for 12 hours of the day
+        for _ in range(10):
+            controller.record(3.0, cost_usd=0.5)
+        made = asyncio.run(controller.adjust())
+        gen = [a for a in made if a["target"] == "generations"]
+        assert gen and gen[0]["new"] == 2
+        assert gen[0]["reason"].startswith("budget burn")
+        assert controller.limit("anthropic_api") == 1
+
+    def test_one_throttle_means_one_halving(self):
+        clock = FakeClock()
+        controller = make_controller(clock, api_limit=8, window_seconds=120, cooldown_seconds=120)
+        controller.record(1.0, ok=False, throttled=True)
+        limits = []
+        for _ in range(4):  # 90 s of healthy calls with the 429 still in the window
+            for _ in range(10):
+                controller.record(1.0)
+            asyncio.run(controller.adjust())
+            limits.append(controller.limit("anthropic_api"))
+            clock.now += 30
+        assert limits == [4, 4, 4, 4]
+
+    def test_new_throttle_after_decrease_halves_again(self):
+        clock = FakeClock()
+        controller = make_controller(clock, api_limit=8, window_seconds=120, cooldown_seconds=120)
+        controller.record(1.0, ok=False, throttled=True)
+        asyncio.run(controller.adjust())
+        clock.now += 30
+        controller.record(1.0, ok=False, throttled=True)
+        asyncio.run(controller.adjust())
+        assert controller.limit("anthropic_api") == 2
+
+    def test_min_limit_floor(self):
+        clock = FakeClock()
+        controller = make_controller(clock, api_limit=1)
+        controller.record(1.0, ok=False, throttled=True)
+        assert asyncio.run(controller.adjust()) == []
+        assert controller.limit("anthropic_api") == 1
+
+
+class TestResizableSemaphore:
+    def test_grow_wakes_waiters(self):
+        async def main():
+            sem = ResizableSemaphore(1)
+            await sem.acquire()
+            waiter = asyncio.create_task(sem.acquire())
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+            await sem.set_limit(2)
+            await asyncio.wait_for(waiter, timeout=1)
+            return sem.in_use
+
+        assert asyncio.run(main()) == 2
+
+    def test_shrink_blocks_new_acquirers(self):
+        async def main():
+            sem = ResizableSemaphore(3)
+            for _ in range(3):
+                await sem.acquire()
+            await sem.set_limit(1)
+            sem.release()
+            sem.release()
+            waiter = asyncio.create_task(sem.acquire())
+            await asyncio.sleep(0.01)
+            blocked = not waiter.done()
+            sem.release()
+            await asyncio.wait_for(waiter, timeout=1)
+            return blocked, sem.peak_in_use
+
+        blocked, peak = asyncio.run(main())
+        assert blocked and peak == 3
+
+    def test_release_notify_survives_gc(self):
+        """The wake-up task scheduled by release() is held until it runs."""
+        async def main():
+            sem = ResizableSemaphore(1)
+            await sem.acquire()
+            waiter = asyncio.create_task(sem.acquire())
+            await asyncio.sleep(0.01)
+            sem.release()
+            held = len(sem._notifiers)
+            gc.collect()
+            await asyncio.wait_for(waiter, timeout=1)
+            return held, len(sem._notifiers)
+
+        assert asyncio.run(main()) == (1, 0)
+
+
+def test_percentile():
+    assert percentile([], 95) == 0.0
+    assert percentile(list(range(1, 101)), 95) == 95
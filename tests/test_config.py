@@ -0,0 +1,43 @@
+"""Tests for config/config.yaml: sections the components read are present and unique."""
+
+import os
+
+import pytest
+import yaml
+
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), "..", "config", "config.yaml")
+
+
+class UniqueKeyLoader(yaml.SafeLoader):
+    """SafeLoader that fails on duplicate mapping keys instead of keeping the last one."""
+
+    def construct_mapping(self, node, deep=False):
+        keys = [self.construct_object(k, deep=deep) for k, _ in node.value]
+        duplicates = {k for k in keys if keys.count(k) > 1}
+        if duplicates:
+            raise yaml.constructor.ConstructorError(None, None, f"duplicate keys {sorted(duplicates)}",
+                                                    node.start_mark)
+        return super().construct_mapping(node, deep)
+
+
+@pytest.fixture
+def config():
+    with open(CONFIG_PATH) as f:
+        return yaml.safe_load(f)
+
+
+class TestConfig:
+    def test_no_duplicate_keys(self):
+        with open(CONFIG_PATH) as f:
+            yaml.load(f, Loader=UniqueKeyLoader)
+
+    def test_job_dedup_section(self, config):
+        dedup = config["dedup"]
+        for key in ("seen_jobs_path", "similarity_threshold", "lsh_bands", "lsh_rows",
+                    "url_filter_capacity", "url_filter_fp_rate"):
+            assert key in dedup, key
+        assert dedup["lsh_bands"] * dedup["lsh_rows"] == dedup["minhash_permutations"]
+
+    def test_application_dedup_section(self, config):
+        assert config["application_dedup"] == {
+            "company_threshold": 0.80, "title_threshold": 0.75, "company_aliases": {}}
@@ -0,0 +1,78 @@
+"""Tests for ProfileContextBuilder."""
+
+import json
+import os
+
+import pytest
+
+from agents.context_builder import BM25, ProfileContextBuilder, estimate_tokens
+from verification.profile_index import ProfileIndex
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@pytest.fixture
+def profile():
+    with open(os.path.join(FIXTURES_DIR, "profile_complete.json")) as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def builder(profile):
+    return ProfileContextBuilder(ProfileIndex(profile), {"context": {
+        "top_experience": 1, "top_publications": 1, "top_presentations": 1,
+    }})
+
+
+def job_about(text):
+    return {"job_id": "j1", "role": {"title": "Biostatistician", "description_raw": text}}
+
+
+class TestBuild:
+    def test_top_entry_full_rest_summarized(self, builder, profile):
+        ctx = builder.build(job_about("Adaptive enrichment design, Bayesian subgroup analysis, Sanofi-style oncology trials"))
+        experience = {e["id"]: e for e in ctx["profile"]["experience"]}
+        full = [i for i, e in experience.items() if "accomplishments" in e]
+        assert full == ["exp_001"]
+        summary = next(e for i, e in experience.items() if i != "exp_001")
+        assert set(summary) <= {"id", "title", "organization", "start_date", "end_date", "is_current"}
+
+    def test_original_order_kept(self, builder, profile):
+        ctx = builder.build(job_about("anything"))
+        assert [e["id"] for e in ctx["profile"]["experience"]] == [e["id"] for e in profile["experience"]]
+
+    def test_claimed_ids_always_full(self, builder, profile):
+        last = profile["experience"][-1]["id"]
+        pub = profile["publications"][-1]["id"]
+        ctx = builder.build(job_about("Adaptive enrichment design"), claimed_ids=[last, pub])
+        experience = {e["id"]: e for e in ctx["profile"]["experience"]}
+        assert "responsibilities" in experience[last]
+        assert pub in ctx["full_ids"] and pub not in ctx["summarized_ids"]
+
+    def test_non_entry_sections_unchanged(self, builder, profile):
+        ctx = builder.build(job_about("survival analysis"))
+        for key in ("identity", "skills", "education", "summary"):
+            assert ctx["profile"][key] == profile[key]
+
+    def test_source_profile_not_mutated(self, builder, profile):
+        before = json.dumps(profile, sort_keys=True)
+        builder.build(job_about("survival analysis"))
+        assert json.dumps(builder.index.profile, sort_keys=True) == before
+
+    def test_token_savings_reported(self, builder):
+        ctx = builder.build(job_about("survival analysis"))
+        assert ctx["tokens_saved"] == ctx["tokens_full"] - ctx["tokens_sent"] > 0
+        builder.build(job_about("causal inference"))
+        savings = builder.savings()
+        assert savings["calls"] == 2 and 0 < savings["saved_fraction"] < 1
+
+
+class TestBM25:
+    def test_ranks_matching_doc_first(self):
+        bm = BM25([["survival", "analysis"], ["causal", "inference"], ["oncology"]])
+        scores = bm.scores(["causal", "inference", "methods"])
+        assert scores.index(max(scores)) == 1
+        assert scores[2] == 0.0
+
+    def test_estimate_tokens(self):
+        assert estimate_tokens("abcd" * 10) == 10
@@ -0,0 +1,145 @@
+"""Tests for JobDeduplicator and the MinHash/LSH index."""
+
+import pytest
+
+from agents.dedup import JobDeduplicator, MinHasher, jaccard
+
+DESCRIPTION = (
+    "We are hiring a Senior Biostatistician to lead the design and analysis of "
+    "Phase II and Phase III oncology trials. You will develop adaptive designs, "
+    "write statistical analysis plans, collaborate with clinical scientists, and "
+    "present results to regulatory agencies. Experience with Bayesian methods, "
+    "survival analysis, and R or SAS is required. PhD in statistics preferred."
+)
+
+
+def make_job(job_id, url, description=DESCRIPTION, company="Adaptive Bio",
+             title="Senior Biostatistician"):
+    return {
+        "job_id": job_id,
+        "source_url": url,
+        "company": {"name": company},
+        "role": {"title": title, "url": url, "description_raw": description},
+    }
+
+
+@pytest.fixture
+def dedup(tmp_path):
+    d = JobDeduplicator({"dedup": {"seen_jobs_path": str(tmp_path / "seen_jobs.db")}})
+    yield d
+    d.close()
+
+
+class TestMinHash:
+    def test_identical_signatures(self):
+        h = MinHasher()
+        s = h.shingles(DESCRIPTION)
+        assert (h.signature(s) == h.signature(set(s))).all()
+
+    def test_signature_estimates_jaccard(self):
+        """Fraction of equal signature slots approximates shingle Jaccard."""
+        h = MinHasher(num_perm=256)
+        a = h.shingles(DESCRIPTION)
+        b = h.shingles(DESCRIPTION.replace("oncology", "cardiology"))
+        estimate = (h.signature(a) == h.signature(b)).mean()
+        assert abs(estimate - jaccard(a, b)) < 0.1
+
+    def test_empty_text(self):
+        h = MinHasher()
+        assert h.shingles("") == set()
+        assert len(h.signature(set())) == h.num_perm
+
+
+class TestDuplicates:
+    def test_exact_url_duplicate(self, dedup):
+        dedup.add_seen(make_job("a", "https://boards.greenhouse.io/adaptive/jobs/1"))
+        is_dup, match, sim = dedup.is_duplicate(
+            make_job("b", "https://boards.greenhouse.io/adaptive/jobs/1", description="other")
+        )
+        assert is_dup and match == "a" and sim == 1.0
+
+    def test_different_url_same_job(self, dedup):
+        """A cross-platform repost with a small edit is found via LSH."""
+        dedup.add_seen(make_job("a", "https://boards.greenhouse.io/adaptive/jobs/1"))
+        repost = make_job(
+            "b", "https://www.linkedin.com/jobs/view/99",
+            description=DESCRIPTION + " Remote within the US.",
+        )
+        is_dup, match, sim = dedup.is_duplicate(repost)
+        assert is_dup and match == "a"
+        assert sim >= 0.8
+
+    def test_different_jobs_not_duplicate(self, dedup):
+        dedup.add_seen(make_job("a", "https://boards.greenhouse.io/adaptive/jobs/1"))
+        other = make_job(
+            "b", "https://jobs.lever.co/quant/2", company="Citadel", title="Quant Researcher",
+            description=(
+                "Join our systematic equities team to research alpha signals, build "
+                "portfolio optimization tooling in Python and C++, and run large-scale "
+                "backtests on tick data."
+            ),
+        )
+        is_dup, match, _ = dedup.is_duplicate(other)
+        assert not is_dup and match is None
+
+    def test_custom_similarity_confirms_candidates(self, tmp_path):
+        """The confirmation step is pluggable (e.g. embedding similarity)."""
+        calls = []
+
+        def similarity(a, b):
+            calls.append((a, b))
+            return 0.0
+
+        d = JobDeduplicator(
+            {"dedup": {"seen_jobs_path": str(tmp_path / "seen.db")}}, similarity=similarity
+        )
+        d.add_seen(make_job("a", "https://x/1"))
+        assert d.is_duplicate(make_job("b", "https://x/2"))[0] is False
+        assert len(calls) == 1
+        d.close()
+
+
+class TestIndex:
+    def test_candidates_are_sublinear(self, dedup):
+        """Unrelated history never reaches the exact-similarity step."""
+        jobs = [
+            make_job(f"j{i}", f"https://x/{i}", description=f"role {i} " + " ".join(
+                f"token{i}_{k}" for k in range(40)
+            ))
+            for i in range(200)
+        ]
+        dedup.add_many(jobs)
+        sig = dedup.hasher.signature(dedup.hasher.shingles(DESCRIPTION))
+        assert len(dedup.lsh.candidates(sig)) == 0
+
+    def test_persisted_and_incremental(self, tmp_path):
+        config = {"dedup": {"seen_jobs_path": str(tmp_path / "seen.db")}}
+        d = JobDeduplicator(config)
+        d.add_seen(make_job("a", "https://x/1"))
+        d.close()
+        reopened = JobDeduplicator(config)
+        assert reopened.is_duplicate(make_job("b", "https://y/2"))[0]
+        reopened.add_seen(make_job("c", "https://z/3", description="entirely new posting text"))
+        assert "c" in reopened.lsh
+        reopened.close()
+
+    def test_add_seen_idempotent(self, dedup):
+        job = make_job("a", "https://x/1")
+        assert dedup.add_many([job, job]) == 1
+
+    def test_reindex_backfills(self, dedup):
+        dedup.conn.execute(
+            "INSERT INTO seen_jobs (job_id, url, text) VALUES ('old', 'https://old', ?)",
+            (DESCRIPTION,),
+        )
+        dedup.conn.commit()
+        assert dedup.reindex() == 1
+        assert dedup.is_duplicate(make_job("new", "https://new"))[1] == "old"
+
+    def test_band_layout_must_cover_signature(self, tmp_path):
+        """lsh_bands * lsh_rows that doesn't match the signature length is rejected."""
+        config = {"dedup": {"seen_jobs_path": str(tmp_path / "seen.db"), "lsh_bands": 20, "lsh_rows": 8}}
+        with pytest.raises(ValueError, match="lsh_bands"):
+            JobDeduplicator(config)
+        config["dedup"].update(minhash_permutations=160)
+        JobDeduplicator(config).close()
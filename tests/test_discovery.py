@@ -0,0 +1,172 @@
+"""Tests for the streaming DiscoveryPipeline."""
+
+import asyncio
+import threading
+
+import pytest
+
+from agents.dedup import JobDeduplicator
+from agents.discovery import DiscoveryPipeline, normalize_listing
+
+
+def listing(i, description=None):
+    return {
+        "source_url": f"https://boards.greenhouse.io/acme/jobs/{i}",
+        "title": f"Statistician {i}",
+        "company": {"name": "Acme"},
+        "description": description or f"Unique posting number {i} about topic {i * 7919} and more {i}",
+    }
+
+
+async def source(items, delay=0.0, log=None):
+    for item in items:
+        if delay:
+            await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("fetch", item["source_url"]))
+        yield item
+
+
+async def score(job):
+    await asyncio.sleep(0)
+    return {"job_id": job["job_id"], "title": job["role"]["title"]}
+
+
+@pytest.fixture
+def dedup(tmp_path):
+    d = JobDeduplicator({"dedup": {"seen_jobs_path": str(tmp_path / "seen_jobs.db")}})
+    yield d
+    d.close()
+
+
+class TestNormalize:
+    def test_fills_scout_shape(self):
+        job = normalize_listing(listing(1))
+        assert job["job_id"].startswith("scout_")
+        assert job["role"]["url"] == job["source_url"]
+        assert job["role"]["description_raw"].startswith("Unique")
+        assert job["application_questions"] == []
+
+    def test_drops_listing_without_url(self):
+        assert normalize_listing({"title": "x"}) is None
+
+
+class TestPipeline:
+    def test_all_listings_matched(self):
+        pipe = DiscoveryPipeline([source([listing(i) for i in range(20)])], score)
+        results = asyncio.run(pipe.collect())
+        assert len(results) == 20
+        stages = pipe.metrics()["stages"]
+        assert stages["fetch"]["processed"] == 20
+        assert stages["match"]["passed"] == 20
+
+    def test_dedup_within_and_across_cycles(self, dedup):
+        items = [listing(1), listing(2), listing(1)]  # repeated URL
+        items.append(dict(listing(3, description=items[0]["description"]), title="Statistician 1"))
+        pipe = DiscoveryPipeline([source(items)], score, deduplicator=dedup)
+        results = asyncio.run(pipe.collect())
+        assert len(results) == 2
+        stages = pipe.metrics()["stages"]
+        assert stages["url_dedup"]["dropped"] == 1
+        assert stages["near_dup"]["dropped"] == 1
+
+        again = DiscoveryPipeline([source([listing(1), listing(4)])], score, deduplicator=dedup)
+        assert [r["title"] for r in asyncio.run(again.collect())] == ["Statistician 4"]
+
+    def test_dedup_runs_off_the_event_loop(self, dedup, monkeypatch):
+        threads = []
+        for name in ("url_duplicate", "near_duplicate", "add_seen"):
+            method = getattr(dedup, name)
+            monkeypatch.setattr(dedup, name, lambda job, m=method: threads.append(threading.get_ident()) or m(job))
+
+        async def main():
+            results = await DiscoveryPipeline([source([listing(i) for i in range(5)])], score,
+                                              deduplicator=dedup).collect()
+            return results, threading.get_ident()
+
+        results, loop_thread = asyncio.run(main())
+        assert len(results) == 5
+        assert len(threads) == 15 and loop_thread not in threads
+
+    def test_prescreen_drops(self):
+        def prescreen(job):
+            return job if int(job["role"]["title"].split()[-1]) % 2 == 0 else None
+
+        pipe = DiscoveryPipeline([source([listing(i) for i in range(10)])], score, prescreen=prescreen)
+        results = asyncio.run(pipe.collect())
+        assert len(results) == 5
+        assert pipe.metrics()["stages"]["prescreen"]["dropped"] == 5
+
+    def test_first_match_before_fetch_finishes(self):
+        """Matching overlaps with fetching: the first result arrives mid-cycle."""
+        log = []
+
+        async def consume():
+            pipe = DiscoveryPipeline([source([listing(i) for i in range(10)], delay=0.01, log=log)], score)
+            async for _ in pipe.run():
+                log.append(("match", None))
+            return pipe
+
+        pipe = asyncio.run(consume())
+        first_match = log.index(("match", None))
+        assert first_match < len([e for e in log if e[0] == "fetch"])
+        assert pipe.metrics()["time_to_first_match_s"] < pipe.metrics()["elapsed_s"]
+
+    def test_slow_match_throttles_fetch(self):
+        """With a small queue, fetch stays within the queues' capacity of match."""
+        fetched = []
+        matched = []
+        max_gap = 0
+
+        async def slow_match(job):
+            nonlocal max_gap
+            await asyncio.sleep(0.005)
+            matched.append(job["job_id"])
+            max_gap = max(max_gap, len(fetched) - len(matched))
+            return job
+
+        config = {"discovery": {"queue_size": 2, "match_workers": 1}}
+        pipe = DiscoveryPipeline([source([listing(i) for i in range(40)], log=fetched)], slow_match,
+                                 config=config)
+        results = asyncio.run(pipe.collect())
+        assert len(results) == 40
+        # two queues of 2, one item in each worker, one held by the source
+        assert max_gap <= 8
+
+    def test_stage_errors_drop_item(self):
+        async def flaky(job):
+            if job["role"]["title"].endswith("3"):
+                raise RuntimeError("model timeout")
+            return job
+
+        pipe = DiscoveryPipeline([source([listing(i) for i in range(5)])], flaky)
+        assert len(asyncio.run(pipe.collect())) == 4
+        match = pipe.metrics()["stages"]["match"]
+        assert match["errors"] == 1 and "model timeout" in match["last_error"]
+
+    def test_failing_source_does_not_stop_others(self):
+        async def broken():
+            yield listing(100)
+            raise ConnectionError("career page down")
+
+        pipe = DiscoveryPipeline([broken(), source([listing(i) for i in range(3)])], score)
+        assert len(asyncio.run(pipe.collect())) == 4
+        assert pipe.metrics()["stages"]["fetch"]["errors"] == 1
+
+    def test_early_stop_cancels_stages(self):
+        async def endless():
+            i = 0
+            while True:
+                yield listing(i)
+                i += 1
+
+        async def take_three():
+            pipe = DiscoveryPipeline([endless()], score)
+            gen = pipe.run()
+            taken = [await gen.__anext__() for _ in range(3)]
+            await gen.aclose()
+            return pipe, taken
+
+        pipe, taken = asyncio.run(take_three())
+        assert len(taken) == 3
+        assert pipe.metrics()["stages"]["normalize"]["queue_max"] == 50
@@ -0,0 +1,188 @@
+"""Tests for the native DOCX writer, including fidelity against a reference template."""
+
+import io
+import os
+import zipfile
+import xml.etree.ElementTree as ET
+from html.parser import HTMLParser
+
+import markdown
+import pytest
+
+from rendering.docx_writer import DocxWriter
+from common.markdown_ast import parse_blocks, parse_inline
+from rendering.renderer import ResumeRenderer
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+R = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+# Modeled on the styles.xml of pandoc's own reference document
+# (`pandoc -o custom-reference.docx --print-default-data-file reference.docx`):
+# the same style ids and names, restyled in Garamond. Written out by hand so
+# the writer is checked against a template it did not produce.
+REFERENCE_STYLES = (
+    '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    '<w:styles xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+    '<w:docDefaults><w:rPrDefault><w:rPr><w:rFonts w:ascii="Garamond" w:hAnsi="Garamond" '
+    'w:eastAsia="Garamond" w:cs="Garamond"/><w:sz w:val="22"/><w:szCs w:val="22"/><w:lang w:val="en-US"/>'
+    '</w:rPr></w:rPrDefault><w:pPrDefault><w:pPr><w:spacing w:after="200"/></w:pPr></w:pPrDefault>'
+    '</w:docDefaults>'
+    '<w:style w:type="paragraph" w:default="1" w:styleId="Normal"><w:name w:val="Normal"/><w:qFormat/></w:style>'
+    '<w:style w:type="paragraph" w:styleId="BodyText"><w:name w:val="Body Text"/><w:basedOn w:val="Normal"/>'
+    '<w:link w:val="BodyTextChar"/><w:pPr><w:spacing w:before="180" w:after="180"/></w:pPr><w:qFormat/></w:style>'
+    '<w:style w:type="paragraph" w:customStyle="1" w:styleId="FirstParagraph"><w:name w:val="First Paragraph"/>'
+    '<w:basedOn w:val="BodyText"/><w:next w:val="BodyText"/><w:qFormat/></w:style>'
+    '<w:style w:type="paragraph" w:customStyle="1" w:styleId="Compact"><w:name w:val="Compact"/>'
+    '<w:basedOn w:val="BodyText"/><w:qFormat/><w:pPr><w:spacing w:before="36" w:after="36"/></w:pPr></w:style>'
+    + "".join(
+        f'<w:style w:type="paragraph" w:styleId="Heading{n}"><w:name w:val="heading {n}"/>'
+        f'<w:basedOn w:val="Normal"/><w:next w:val="BodyText"/><w:uiPriority w:val="9"/><w:qFormat/>'
+        f'<w:pPr><w:keepNext/><w:keepLines/><w:spacing w:before="{before}" w:after="0"/>'
+        f'<w:outlineLvl w:val="{n - 1}"/></w:pPr><w:rPr><w:b/><w:color w:val="1F3864"/>'
+        f'<w:sz w:val="{size}"/><w:szCs w:val="{size}"/></w:rPr></w:style>'
+        for n, before, size in ((1, 480, 32), (2, 200, 28), (3, 200, 24))
+    )
+    + '<w:style w:type="character" w:default="1" w:styleId="DefaultParagraphFont">'
+    '<w:name w:val="Default Paragraph Font"/><w:uiPriority w:val="1"/><w:semiHidden/></w:style>'
+    '<w:style w:type="character" w:customStyle="1" w:styleId="BodyTextChar"><w:name w:val="Body Text Char"/>'
+    '<w:basedOn w:val="DefaultParagraphFont"/><w:link w:val="BodyText"/></w:style>'
+    '<w:style w:type="character" w:styleId="Hyperlink"><w:name w:val="Hyperlink"/>'
+    '<w:basedOn w:val="BodyTextChar"/><w:rPr><w:color w:val="4F81BD"/></w:rPr></w:style>'
+    '</w:styles>'
+).encode()
+REFERENCE_SECT_PR = ('<w:sectPr><w:pgSz w:w="11906" w:h="16838"/><w:pgMar w:top="720" w:right="720" '
+                     'w:bottom="720" w:left="720" w:header="0" w:footer="0" w:gutter="0"/></w:sectPr>')
+
+
+@pytest.fixture
+def reference(tmp_path):
+    path = tmp_path / "resume_reference.docx"
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("word/styles.xml", REFERENCE_STYLES)
+        z.writestr("word/settings.xml", '<w:settings xmlns:w="http://schemas.openxmlformats.org/'
+                                        'wordprocessingml/2006/main"/>')
+        z.writestr("word/document.xml", '<w:document xmlns:w="http://schemas.openxmlformats.org/'
+                                        f'wordprocessingml/2006/main"><w:body><w:p/>{REFERENCE_SECT_PR}'
+                                        '</w:body></w:document>')
+    return str(path)
+
+
+@pytest.fixture
+def resume():
+    with open(os.path.join(FIXTURES_DIR, "resumes", "good_resume.md")) as f:
+        return f.read()
+
+
+class BlockText(HTMLParser):
+    """Text of each block element in markdown's HTML rendering."""
+
+    BLOCKS = {"h1", "h2", "h3", "p", "li"}
+
+    def __init__(self):
+        super().__init__()
+        self.blocks, self._current = [], None
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.BLOCKS:
+            self._current = []
+
+    def handle_endtag(self, tag):
+        if tag in self.BLOCKS and self._current is not None:
+            self.blocks.append(" ".join("".join(self._current).split()))
+            self._current = None
+
+    def handle_data(self, data):
+        if self._current is not None:
+            self._current.append(data)
+
+
+def docx_paragraphs(data: bytes) -> list:
+    with zipfile.ZipFile(io.BytesIO(data)) as z:
+        body = ET.fromstring(z.read("word/document.xml")).find(f"{W}body")
+    out = []
+    for p in body.findall(f"{W}p"):
+        text = "".join(t.text or "" for t in p.iter(f"{W}t"))
+        style = p.find(f"{W}pPr/{W}pStyle")
+        out.append((style.get(f"{W}val") if style is not None else None, " ".join(text.split())))
+    return out
+
+
+class TestInline:
+    def test_bold_italic_link(self):
+        runs = parse_inline("**Sanofi** | *Senior* [site](https://x.org) \\*literal\\*")
+        assert [(r["text"], r["bold"], r["italic"], r["link"]) for r in runs] == [
+            ("Sanofi", True, False, None), (" | ", False, False, None), ("Senior", False, True, None),
+            (" ", False, False, None), ("site", False, False, "https://x.org"), (" ", False, False, None),
+            ("*", False, False, None), ("literal", False, False, None), ("*", False, False, None),
+        ]
+
+    def test_snake_case_not_italic(self):
+        assert parse_inline("use my_var_name here")[0]["italic"] is False
+
+    def test_blocks(self):
+        blocks = parse_blocks("# Name\n\nLine one\nline two\n\n- a\n  - b\n1. c\n---\n")
+        assert [(b["kind"], b["level"]) for b in blocks] == [
+            ("heading", 1), ("paragraph", 0), ("bullet", 0), ("bullet", 1), ("numbered", 0), ("rule", 0)]
+        assert blocks[1]["text"] == "Line one line two"
+
+
+class TestFidelity:
+    def test_reference_template_parts_reused(self, reference, resume):
+        data = DocxWriter(reference).to_bytes(resume)
+        with zipfile.ZipFile(io.BytesIO(data)) as z:
+            assert z.read("word/styles.xml") == REFERENCE_STYLES
+            assert "word/settings.xml" in z.namelist()
+            document = z.read("word/document.xml").decode()
+            for name in z.namelist():
+                if name.endswith(".xml") or name.endswith(".rels"):
+                    ET.fromstring(z.read(name))  # every part well-formed
+        assert document.endswith(f"{REFERENCE_SECT_PR}</w:body></w:document>")
+
+    def test_styles_used_exist_in_template(self, reference, resume):
+        """Every paragraph and run style the writer references is defined by the pandoc template."""
+        styles = ET.fromstring(REFERENCE_STYLES)
+        defined = {(s.get(f"{W}type"), s.get(f"{W}styleId")) for s in styles.iter(f"{W}style")}
+        data = DocxWriter(reference).to_bytes(resume + "\nSee [the paper](https://doi.org/10.1/x).\n")
+        with zipfile.ZipFile(io.BytesIO(data)) as z:
+            body = ET.fromstring(z.read("word/document.xml"))
+        used = {("paragraph", s.get(f"{W}val")) for s in body.iter(f"{W}pStyle")}
+        used |= {("character", s.get(f"{W}val")) for s in body.iter(f"{W}rStyle")}
+        assert {("paragraph", "Heading1"), ("paragraph", "Compact"), ("character", "Hyperlink")} <= used
+        assert used <= defined
+
+    def test_text_matches_markdown_rendering(self, reference, resume):
+        """Every heading, paragraph and bullet carries the same text as markdown's HTML."""
+        parser = BlockText()
+        parser.feed(markdown.markdown(resume))
+        paragraphs = [text for _, text in docx_paragraphs(DocxWriter(reference).to_bytes(resume)) if text]
+        assert paragraphs == [b for b in parser.blocks if b]
+
+    def test_bold_and_hyperlink_runs(self, tmp_path):
+        data = DocxWriter().to_bytes("**Sanofi** | Lead\n\n- See [paper](https://doi.org/10.1/x)\n")
+        with zipfile.ZipFile(io.BytesIO(data)) as z:
+            body = ET.fromstring(z.read("word/document.xml"))
+            rels = ET.fromstring(z.read("word/_rels/document.xml.rels"))
+        first_run = next(body.iter(f"{W}r"))
+        assert first_run.find(f"{W}rPr/{W}b") is not None
+        link = next(body.iter(f"{W}hyperlink"))
+        target = {r.get("Id"): r.get("Target") for r in rels}[link.get(f"{R}id")]
+        assert target == "https://doi.org/10.1/x"
+        assert next(body.iter(f"{W}numId")).get(f"{W}val") == "1"
+
+    def test_renderer_rereads_edited_reference(self, tmp_path, reference, resume):
+        css = tmp_path / "resume.css"
+        css.write_text("body { font-size: 10pt; }")
+        renderer = ResumeRenderer(str(css), reference)
+        out = str(tmp_path / "resume.docx")
+        renderer.to_docx(resume, out)
+        edited = REFERENCE_STYLES.replace(b"</w:styles>", b'<w:style w:styleId="Edited"/></w:styles>')
+        with zipfile.ZipFile(reference, "w") as z:
+            z.writestr("word/styles.xml", edited)
+        renderer.to_docx(resume, out)
+        with zipfile.ZipFile(out) as z:
+            assert z.read("word/styles.xml") == edited
+
+    def test_renderer_uses_native_writer(self, tmp_path, resume):
+        out = ResumeRenderer.for_template("resume").to_docx(resume, str(tmp_path / "resume.docx"))
+        assert zipfile.is_zipfile(out)
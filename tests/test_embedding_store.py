@@ -0,0 +1,114 @@
+"""Tests for EmbeddingStore."""
+
+import os
+import numpy as np
+import pytest
+
+from agents.embedding_store import EmbeddingStore
+
+DIM = 8
+
+
+class FakeEncoder:
+    """Deterministic bag-of-words encoder standing in for a local sentence-transformers model."""
+
+    def __init__(self):
+        self.calls = []
+
+    def encode(self, texts, batch_size=64, normalize_embeddings=True, convert_to_numpy=True):
+        self.calls.append(list(texts))
+        out = np.zeros((len(texts), DIM), dtype=np.float32)
+        for i, t in enumerate(texts):
+            for word in t.lower().split():
+                out[i, sum(map(ord, word)) % DIM] += 1.0
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return out / norms
+
+
+@pytest.fixture
+def config(tmp_path):
+    return {"embeddings": {"store_path": str(tmp_path / "emb.f16"), "dim": DIM}}
+
+
+@pytest.fixture
+def encoder():
+    return FakeEncoder()
+
+
+@pytest.fixture
+def store(config, encoder):
+    s = EmbeddingStore(config, encoder=encoder)
+    yield s
+    s.close()
+
+
+class TestEncodeOnMiss:
+    def test_misses_encoded_in_one_batch(self, store, encoder):
+        vecs = store.get(["causal inference", "survival analysis", "causal inference"])
+        assert vecs.shape == (3, DIM)
+        assert encoder.calls == [["causal inference", "survival analysis"]]
+
+    def test_hits_not_reencoded(self, store, encoder):
+        store.get(["bayesian trials"])
+        store.get(["bayesian trials"])
+        assert len(encoder.calls) == 1
+
+    def test_stored_as_float16(self, store, config):
+        store.get(["a b c", "d e f"])
+        assert store.matrix.dtype == np.float16
+        assert os.path.getsize(config["embeddings"]["store_path"]) == 2 * DIM * 2
+
+
+class TestPersistence:
+    def test_reopen(self, config, encoder):
+        s = EmbeddingStore(config, encoder=encoder)
+        first = s.vector("adaptive designs")
+        s.close()
+        reopened = EmbeddingStore(config, encoder=encoder)
+        assert np.allclose(reopened.vector("adaptive designs"), first)
+        assert len(encoder.calls) == 1
+        reopened.close()
+
+    def test_read_only_shares_rows(self, store, config):
+        """A read-only reader maps the same file and sees later appends."""
+        store.get(["first posting"])
+        reader = EmbeddingStore(config, read_only=True)
+        assert len(reader) == 1
+        store.get(["second posting"])
+        assert reader.get(["second posting"]).shape == (1, DIM)
+        assert not reader.matrix.flags.writeable
+        reader.close()
+
+    def test_read_only_miss_raises(self, store, config):
+        store.get(["known"])
+        reader = EmbeddingStore(config, read_only=True)
+        with pytest.raises(KeyError):
+            reader.get(["unknown"])
+        reader.close()
+
+    def test_dim_mismatch_rejected(self, store, config):
+        bad = {"embeddings": dict(config["embeddings"], dim=DIM * 2)}
+        with pytest.raises(ValueError):
+            EmbeddingStore(bad, encoder=FakeEncoder())
+
+
+class TestSearch:
+    def test_top_k(self, store):
+        store.get(["quant trading desk", "portfolio risk", "survival analysis"])
+        results = store.top_k("survival analysis", k=2)
+        assert len(results) == 2
+        assert results[0][0] == 2
+        assert results[0][1] == pytest.approx(1.0, abs=1e-2)
+        assert results[0][1] >= results[1][1]
+
+    def test_top_k_across_blocks(self, store, monkeypatch):
+        monkeypatch.setattr("agents.embedding_store.SEARCH_BLOCK_ROWS", 2)
+        store.get([f"posting {i} alpha" for i in range(7)] + ["needle phrase"])
+        assert store.top_k("needle phrase", k=1)[0][0] == 7
+
+    def test_empty_store(self, store):
+        assert store.top_k(np.ones(DIM), k=3) == []
+
+    def test_similarity(self, store):
+        assert store.similarity("causal inference", "causal inference") == pytest.approx(1.0, abs=1e-2)
@@ -0,0 +1,146 @@
+"""Tests for the dashboard EventBus and SSE stream."""
+
+import asyncio
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agents.rate_limiter import APIRateLimiter
+from agents.state import StateManager
+from dashboard.app import create_app, event_stream, format_sse
+from dashboard.events import EventBus
+
+
+def bus(buffer=4, evict=100):
+    return EventBus({"dashboard": {"event_buffer": buffer, "evict_after_dropped": evict}})
+
+
+class TestEventBus:
+    def test_fan_out_and_filters(self):
+        async def run():
+            b = bus()
+            everything = b.subscribe()
+            stages = b.subscribe(types=["stage"], job_id="j1")
+            b.publish("stage", job_id="j1", stage="resume", phase="started")
+            b.publish("stage", job_id="j2", stage="resume", phase="started")
+            b.publish("budget", job_id="j1", cost_usd=0.4)
+            got_all = [(await everything.next(0.1))["type"] for _ in range(3)]
+            got_stage = await stages.next(0.1)
+            assert await stages.next(0.01) is None
+            return got_all, got_stage
+        got_all, got_stage = asyncio.run(run())
+        assert got_all == ["stage", "stage", "budget"]
+        assert got_stage["data"]["job_id"] == "j1"
+
+    def test_slow_consumer_drops_oldest(self):
+        async def run():
+            b = bus(buffer=3)
+            sub = b.subscribe()
+            for i in range(10):
+                b.publish("iteration", iteration=i)
+            first = await sub.next(0.1)
+            rest = [(await sub.next(0.1))["data"]["iteration"] for _ in range(3)]
+            return first, rest
+        first, rest = asyncio.run(run())
+        assert first == {"id": None, "type": "dropped", "ts": first["ts"], "data": {"count": 7}}
+        assert rest == [7, 8, 9]
+
+    def test_stalled_subscriber_evicted(self):
+        async def run():
+            b = bus(buffer=2, evict=5)
+            sub = b.subscribe()
+            for i in range(20):
+                b.publish("iteration", iteration=i)
+            return sub, b
+        sub, b = asyncio.run(run())
+        assert sub.closed
+        assert b.subscriber_count() == 0
+
+    def test_replay_after_last_event_id(self):
+        async def run():
+            b = bus(buffer=10)
+            for i in range(5):
+                b.publish("iteration", iteration=i)
+            sub = b.subscribe(last_event_id=3)
+            return [(await sub.next(0.1))["id"] for _ in range(2)]
+        assert asyncio.run(run()) == [4, 5]
+
+    def test_publish_from_worker_thread(self):
+        async def run():
+            b = bus()
+            sub = b.subscribe()
+            thread = threading.Thread(target=b.publish, args=("status",), kwargs={"job_id": "j1"})
+            thread.start()
+            thread.join()
+            return await sub.next(1.0)
+        assert asyncio.run(run())["type"] == "status"
+
+    def test_stage_context_manager(self):
+        b = bus()
+        with pytest.raises(ValueError):
+            with b.stage("j1", "cover_letter"):
+                raise ValueError
+        phases = [e["data"]["phase"] for e in b.recent()]
+        assert phases == ["started", "failed"]
+
+
+class TestProducers:
+    def test_state_and_iteration_events(self, tmp_path):
+        b = bus(buffer=10)
+        state = StateManager({"state": {"db_path": str(tmp_path / "state.db"), "json_path": None}})
+        b.attach_state(state)
+        state.upsert_application("j1", status="generating")
+        state.record_cost(0.5, job_id="j1", agent="resume")
+        b.iteration_callback("j1")(1, {}, {"quality_score": 88, "status": "PASS", "high_count": 0})
+        state.close()
+        types = [e["type"] for e in b.recent()]
+        assert types == ["status", "budget", "iteration"]
+        assert b.recent()[1]["data"]["spent_today"] == pytest.approx(0.5)
+
+    def test_rate_limit_wait_published(self):
+        async def run():
+            b = bus()
+            limiter = APIRateLimiter({"concurrent_max": 2, "requests_per_minute": 1})
+            b.attach_rate_limiter("anthropic", limiter)
+            async with limiter:
+                pass
+            task = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0.01)
+            task.cancel()
+            return b.recent()
+        events = asyncio.run(run())
+        assert events[0]["type"] == "rate_limit_wait"
+        assert events[0]["data"]["limiter"] == "anthropic"
+
+
+class TestSSE:
+    def test_format(self):
+        text = format_sse({"id": 7, "type": "stage", "ts": 1.0, "data": {"job_id": "j1"}})
+        assert text == 'id: 7\nevent: stage\ndata: {"job_id": "j1", "ts": 1.0}\n\n'
+
+    def test_stream_heartbeat_and_disconnect(self):
+        async def run():
+            b = bus()
+            sub = b.subscribe()
+            disconnected = iter([False, True])
+
+            async def is_disconnected():
+                return next(disconnected)
+
+            b.publish("stage", job_id="j1", stage="resume", phase="started")
+            chunks = [c async for c in event_stream(sub, is_disconnected, heartbeat=0.01)]
+            return chunks, b
+        chunks, b = asyncio.run(run())
+        assert chunks[0].startswith("retry:")
+        assert chunks[1].startswith("id: 1\nevent: stage")
+        assert chunks[2] == ": keepalive\n\n"
+        assert b.subscriber_count() == 0
+
+    def test_recent_endpoint(self):
+        b = EventBus()
+        b.publish("status", job_id="j1", old="ready", new="submitted")
+        client = TestClient(create_app({}, bus=b))
+        response = client.get("/events/recent")
+        assert response.status_code == 200
+        assert response.json()[0]["data"]["new"] == "submitted"
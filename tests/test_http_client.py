@@ -0,0 +1,159 @@
+"""Tests for HTTPClient against a local stub HTTP server."""
+
+import asyncio
+import pytest
+from aiohttp import ClientError, web
+from aiohttp.test_utils import TestServer
+
+from agents.http_client import HTTPClient, ResponseTooLarge
+
+RATE_LIMITS = {"http_default": {"concurrent_max": 2, "requests_per_minute": 1000}}
+
+
+def make_app(state):
+    async def ok(request):
+        return web.Response(text="hello")
+
+    async def big(request):
+        return web.Response(body=b"x" * 100_000)
+
+    async def big_json(request):
+        return web.Response(text="[" + ",".join(["1"] * 50_000) + "]")
+
+    async def compressed(request):
+        state["accept_encoding"] = request.headers.get("Accept-Encoding", "")
+        resp = web.Response(text="compressed " * 500)
+        resp.enable_compression()
+        return resp
+
+    async def fail(request):
+        return web.Response(status=500)
+
+    async def slow(request):
+        state["active"] += 1
+        state["peak"] = max(state["peak"], state["active"])
+        await asyncio.sleep(0.05)
+        state["active"] -= 1
+        return web.Response(text="done")
+
+    async def peer(request):
+        return web.Response(text=str(request.transport.get_extra_info("peername")[1]))
+
+    app = web.Application()
+    app.router.add_get("/ok", ok)
+    app.router.add_get("/big", big)
+    app.router.add_get("/big.json", big_json)
+    app.router.add_get("/gzip", compressed)
+    app.router.add_get("/fail", fail)
+    app.router.add_get("/slow", slow)
+    app.router.add_get("/peer", peer)
+    return app
+
+
+def run(scenario, rate_limits=RATE_LIMITS, config=None):
+    async def main():
+        state = {"active": 0, "peak": 0}
+        server = TestServer(make_app(state))
+        await server.start_server()
+        client = HTTPClient(rate_limits, config)
+        try:
+            return await scenario(server, client, state)
+        finally:
+            await client.close()
+            await server.close()
+
+    return asyncio.run(main())
+
+
+class TestRequests:
+    def test_get(self):
+        async def scenario(server, client, state):
+            resp = await client.get(str(server.make_url("/ok")))
+            assert resp.status == 200
+            assert resp.text() == "hello"
+            assert not resp.truncated
+
+        run(scenario)
+
+    def test_gzip(self):
+        """Client advertises gzip and transparently decompresses."""
+        async def scenario(server, client, state):
+            resp = await client.get(str(server.make_url("/gzip")))
+            assert "gzip" in state["accept_encoding"]
+            assert resp.headers.get("Content-Encoding") in ("gzip", "deflate")
+            assert resp.text().startswith("compressed compressed")
+
+        run(scenario)
+
+    def test_keep_alive_reuses_connection(self):
+        """Sequential requests to one host go over the same pooled connection."""
+        async def scenario(server, client, state):
+            ports = set()
+            for _ in range(5):
+                resp = await client.get(str(server.make_url("/peer")))
+                ports.add(resp.text())
+            assert len(ports) == 1
+
+        run(scenario)
+
+
+class TestLimits:
+    def test_response_size_limit(self):
+        async def scenario(server, client, state):
+            resp = await client.get(str(server.make_url("/big")), max_bytes=1024)
+            assert resp.truncated
+            assert len(resp.body) == 1024
+
+        run(scenario)
+
+    def test_json_over_limit_raises(self):
+        async def scenario(server, client, state):
+            with pytest.raises(ResponseTooLarge):
+                await client.get_json(str(server.make_url("/big.json")))
+
+        run(scenario, config={"http": {"max_response_bytes": 1024}})
+
+    def test_per_host_concurrency_cap(self):
+        """6 concurrent requests with concurrent_max=2 -> server sees at most 2."""
+        async def scenario(server, client, state):
+            url = str(server.make_url("/slow"))
+            await asyncio.gather(*(client.get(url) for _ in range(6)))
+            assert state["peak"] == 2
+
+        run(scenario)
+
+    def test_host_override(self):
+        async def scenario(server, client, state):
+            url = str(server.make_url("/slow"))
+            await asyncio.gather(*(client.get(url) for _ in range(6)))
+            assert state["peak"] == 1
+
+        limits = {
+            "http_default": {"concurrent_max": 4},
+            "http_hosts": {"127.0.0.1": {"concurrent_max": 1, "requests_per_minute": 1000}},
+        }
+        run(scenario, rate_limits=limits)
+
+
+class TestMetrics:
+    def test_latency_and_errors_tracked(self):
+        async def scenario(server, client, state):
+            await client.get(str(server.make_url("/ok")))
+            await client.get(str(server.make_url("/fail")))
+            m = client.metrics()["127.0.0.1"]
+            assert m["requests"] == 2
+            assert m["errors"] == 1
+            assert m["statuses"] == {200: 1, 500: 1}
+            assert m["p95_latency"] > 0
+
+        run(scenario)
+
+    def test_connection_error_recorded(self):
+        async def scenario(server, client, state):
+            url = str(server.make_url("/ok"))
+            await server.close()
+            with pytest.raises(ClientError):
+                await client.get(url)
+            assert client.metrics()["127.0.0.1"]["errors"] == 1
+
+        run(scenario)
@@ -0,0 +1,91 @@
+"""Tests for IssueDelta aggregation and revise-prompt formatting."""
+
+from agents.issue_delta import IssueDelta, aggregate, issue_key
+
+
+def vocab(word):
+    return {"type": "AI_VOCABULARY", "severity": "MEDIUM", "text": word, "message": f"Blacklisted: '{word}'"}
+
+
+def metric(number):
+    return {"type": "UNVERIFIED_METRIC", "severity": "HIGH", "number": number,
+            "context": "...", "message": f"Metric '{number}' not in profile."}
+
+
+def ungrounded(line, text, score):
+    return {"type": "UNGROUNDED_CLAIM", "severity": "HIGH",
+            "message": f"Line {line}: '{text}' — best match: exp_001 at {score:.2f}"}
+
+
+TRICOLON = {"type": "TRICOLON_EXCESS", "severity": "LOW", "message": "3 tricolon patterns (max 1)"}
+
+
+class TestAggregate:
+    def test_repeated_vocabulary_counted(self):
+        agg = aggregate([vocab("leverage"), vocab("Leverage"), vocab("spearheaded")])
+        assert agg["AI_VOCABULARY:leverage"]["count"] == 2
+        assert len(agg) == 2
+
+    def test_ungrounded_key_ignores_line_and_score(self):
+        assert issue_key(ungrounded(4, "Led a team", 0.21)) == issue_key(ungrounded(9, "Led a team", 0.18))
+
+    def test_worst_severity_wins(self):
+        agg = aggregate([
+            {"type": "SKILL_LEVEL_OVERCLAIM", "severity": "MEDIUM", "skill": "julia", "message": "m"},
+            {"type": "SKILL_LEVEL_OVERCLAIM", "severity": "HIGH", "skill": "julia", "message": "m"},
+        ])
+        assert agg["SKILL_LEVEL_OVERCLAIM:julia"]["severity"] == "HIGH"
+
+
+class TestDelta:
+    def test_new_persisting_resolved(self):
+        delta = IssueDelta()
+        first = delta.update([vocab("leverage"), vocab("leverage"), metric("40%")])
+        assert len(first["new"]) == 2 and not first["persisting"]
+
+        second = delta.update([vocab("leverage"), TRICOLON])
+        assert [e["key"] for e in second["persisting"]] == ["AI_VOCABULARY:leverage"]
+        assert second["persisting"][0]["previous_count"] == 2
+        assert [e["key"] for e in second["new"]] == ["TRICOLON_EXCESS"]
+        assert [e["key"] for e in second["resolved"]] == ["UNVERIFIED_METRIC:40%"]
+
+    def test_reintroduced_issue_is_new_again(self):
+        delta = IssueDelta()
+        delta.update([metric("40%")])
+        delta.update([])
+        third = delta.update([metric("40%")])
+        assert third["new"][0]["since"] == 3
+
+
+class TestFormat:
+    def test_severity_then_persisting_first(self):
+        delta = IssueDelta()
+        delta.update([vocab("leverage")])
+        text, _ = delta.feedback([vocab("leverage"), vocab("leverage"), metric("40%"), TRICOLON])
+        lines = text.splitlines()
+        assert lines[1].startswith("- [HIGH, NEW] Metric '40%'")
+        assert lines[2] == ("- [MEDIUM, STILL PRESENT since draft 1] AI vocabulary 'leverage' "
+                            "used 2x — replace every occurrence (was 1x)")
+        assert lines[3].startswith("- [LOW, NEW]")
+
+    def test_token_budget_trims_low_severity(self):
+        delta = IssueDelta({"generation": {"revise_issue_token_budget": 40}})
+        text, _ = delta.feedback([metric("40%"), TRICOLON] + [vocab(f"word{i}") for i in range(5)])
+        assert "Metric '40%'" in text
+        assert "TRICOLON" not in text and "tricolon" not in text
+        assert "not listed" in text
+
+    def test_resolved_summary(self):
+        delta = IssueDelta()
+        delta.feedback([vocab("spearheaded"), metric("40%")])
+        text, _ = delta.feedback([metric("40%")])
+        assert "Resolved since last draft (don't reintroduce): spearheaded" in text
+
+    def test_collapses_duplicates(self):
+        """Ten occurrences of one word become one line."""
+        delta = IssueDelta()
+        text, _ = delta.feedback([vocab("leverage")] * 10)
+        assert text.count("leverage") == 1 and "10x" in text
+
+    def test_no_issues(self):
+        assert IssueDelta().feedback([])[0] == "No remaining issues."
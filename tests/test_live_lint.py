@@ -0,0 +1,170 @@
+"""Tests for LiveLinter spans, claim caching and LintSession debounce."""
+
+import asyncio
+import json
+import os
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from dashboard.app import create_app
+from verification.live_lint import LintSession, LiveLinter, claim_spans
+from verification.profile_index import ProfileIndex
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+@pytest.fixture
+def profile_index():
+    with open(os.path.join(FIXTURES_DIR, "profile_complete.json")) as f:
+        return ProfileIndex(json.load(f))
+
+
+@pytest.fixture
+def linter(profile_index):
+    return LiveLinter(profile_index)
+
+
+@pytest.fixture
+def resume():
+    with open(os.path.join(FIXTURES_DIR, "resumes", "good_resume.md")) as f:
+        return f.read()
+
+
+class FakeStructural:
+    def check(self, content, content_type):
+        return [{"type": "TRICOLON_EXCESS", "severity": "LOW", "message": "3 tricolon patterns (max 1)"}]
+
+
+class TestSpans:
+    def test_issue_spans_point_at_text(self, linter):
+        text = "## Experience\n\n- Leveraged causal inference to cut costs by 37%\n"
+        issues = linter.lint(text)["issues"]
+        vocab = next(i for i in issues if i["type"] == "AI_VOCABULARY")
+        metric = next(i for i in issues if i["type"] == "UNVERIFIED_METRIC")
+        assert text[vocab["start"]:vocab["end"]].lower() == "leveraged"
+        assert text[metric["start"]:metric["end"]] == "37%"
+
+    def test_claim_spans_with_leading_whitespace(self, linter):
+        text = "\n\n## Experience\n- Built a tool\n- Ran trials\n"
+        claims = linter.claims.extract_from_resume(text)
+        spans = claim_spans(text, claims, "resume")
+        assert [text[s:e] for s, e in spans] == ["Built a tool", "Ran trials"]
+
+    def test_cover_letter_sentence_spans(self, linter):
+        text = "  I led trials. I built tools!  "
+        claims = linter.claims.extract_from_cover_letter(text)
+        spans = claim_spans(text, claims, "cover_letter")
+        assert [text[s:e] for s, e in spans] == ["I led trials.", "I built tools!"]
+
+
+class TestCaching:
+    def test_only_changed_claims_remapped(self, linter, resume):
+        first = linter.lint(resume)
+        assert first["claims_mapped"] > 1
+        edited = resume.replace("Mentor team of 4", "Mentor a team of 4", 1)
+        second = linter.lint(edited)
+        assert second["claims_mapped"] == 1
+
+    def test_matches_full_grounding(self, linter, resume):
+        """Live lint reports the same ungrounded claims as the full source map."""
+        claims = linter.claims.extract_from_resume(resume)
+        full = [r["issue"]["message"] for r in linter.mapper.map_claims(claims) if r["status"] == "unmatched"]
+        linter.lint(resume)
+        live = [i["message"] for i in linter.lint(resume)["issues"] if i["type"] == "UNGROUNDED_CLAIM"]
+        assert live == full
+
+    def test_concurrent_lints_keep_cache_consistent(self, profile_index):
+        """Lints run in worker threads; the LRU and counters must survive them sharing a linter."""
+        linter = LiveLinter(profile_index, {"live_lint": {"claim_cache_size": 5}})
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(20):
+                    linter.lint(f"## Experience\n- Built a tool\n- Ran trials\n- Led team {n % 3}-{i % 4}\n")
+            except Exception as e:  # an unlocked OrderedDict can raise KeyError/RuntimeError here
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+        assert linter.stats["lints"] == 160
+        assert linter.stats["claims_mapped"] + linter.stats["claims_cached"] == 160 * 3
+        assert len(linter._mapped) <= 5
+
+
+class TestStructural:
+    def test_structural_issues_have_no_span(self, profile_index):
+        result = LiveLinter(profile_index, structural=FakeStructural()).structural("text")
+        assert result["available"]
+        assert result["issues"][0]["start"] is None
+
+
+class TestSession:
+    def test_debounce_keeps_latest(self, profile_index):
+        async def run():
+            sent = []
+
+            async def send(message):
+                sent.append(message)
+
+            linter = LiveLinter(profile_index, structural=FakeStructural())
+            config = {"live_lint": {"debounce_ms": 20, "structural_idle_seconds": 0.02}}
+            session = LintSession(linter, send, config)
+            session.submit(1, "- leverage")
+            session.submit(2, "- leverage and leverage")
+            await asyncio.sleep(0.2)
+            await session.close()
+            return sent
+        sent = asyncio.run(run())
+        assert [(m["seq"], m["phase"]) for m in sent] == [(2, "cheap"), (2, "structural")]
+        assert sent[0]["counts"]["medium"] == 2
+
+    def test_lint_runs_off_the_event_loop(self, profile_index):
+        threads = []
+
+        class RecordingLinter(LiveLinter):
+            def lint(self, *args):
+                threads.append(threading.get_ident())
+                return super().lint(*args)
+
+        async def run():
+            async def send(message):
+                pass
+
+            session = LintSession(RecordingLinter(profile_index, structural=FakeStructural()), send,
+                                  {"live_lint": {"debounce_ms": 1, "structural_idle_seconds": 0.01}})
+            session.submit(1, "- leverage")
+            await asyncio.sleep(0.1)
+            await session.close()
+            return threading.get_ident()
+        loop_thread = asyncio.run(run())
+        assert threads and loop_thread not in threads
+
+
+class TestEndpoints:
+    def test_lint_endpoint(self, linter):
+        client = TestClient(create_app({}, linter=linter))
+        response = client.post("/lint", json={"content": "- spearheaded a 40% lift"})
+        assert response.status_code == 200
+        assert {i["type"] for i in response.json()["issues"]} >= {"UNVERIFIED_METRIC"}
+
+    def test_lint_without_linter(self):
+        client = TestClient(create_app({}))
+        assert client.post("/lint", json={"content": "x"}).status_code == 503
+
+    def test_websocket(self, profile_index):
+        linter = LiveLinter(profile_index, structural=FakeStructural())
+        config = {"live_lint": {"debounce_ms": 1, "structural_idle_seconds": 0.01}}
+        client = TestClient(create_app(config, linter=linter))
+        with client.websocket_connect("/lint/ws") as ws:
+            ws.send_json({"seq": 5, "content": "- leveraged 12 models"})
+            cheap = ws.receive_json()
+            structural = ws.receive_json()
+        assert (cheap["seq"], cheap["phase"]) == (5, "cheap")
+        assert structural["phase"] == "structural"
@@ -0,0 +1,177 @@
+"""Tests for the shared markdown parse: line and section model, cache, HTML and preview."""
+
+import asyncio
+import os
+import re
+
+import markdown
+import pytest
+from fastapi.testclient import TestClient
+
+from dashboard.app import create_app
+from common.markdown_ast import MARKDOWN_EXTENSIONS, cache_info, parse
+from verification.claim_extractor import ClaimExtractor
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+RESUME = """
+# Elena Vasquez
+
+## Experience
+
+**Sanofi** | Senior Biostatistician
+- Led statistical design for Phase III trials
+- Built an R package for subgroup analysis
+  - Adopted across four teams
+
+Shipped the adaptive design toolkit.
+1. Numbered note
+---
+- After the rule
+"""
+
+
+@pytest.fixture
+def good_resume():
+    with open(os.path.join(FIXTURES_DIR, "resumes", "good_resume.md")) as f:
+        return f.read()
+
+
+class TestModel:
+    def test_lines(self):
+        doc = parse(RESUME)
+        assert [n["kind"] for n in doc.lines] == [
+            "heading", "heading", "text", "bullet", "bullet", "bullet", "text", "numbered", "rule", "bullet"]
+        assert doc.lines[0]["line_number"] == 1  # counted from the stripped content
+        assert doc.lines[5]["level"] == 1
+        assert doc.lines[7]["source"] == "1. Numbered note"
+        assert {n["section"] for n in doc.lines[2:]} == {"experience"}
+
+    def test_sections(self):
+        sections = parse(RESUME).sections
+        assert [(s["title"], s["name"]) for s in sections] == [
+            ("Elena Vasquez", "elena vasquez"), ("Experience", "experience")]
+        assert len(sections[1]["lines"]) == 8
+
+    def test_bullet_runs(self):
+        assert parse(RESUME).bullet_runs() == [
+            ["Led statistical design for Phase III trials", "Built an R package for subgroup analysis",
+             "Adopted across four teams"],
+            ["After the rule"],
+        ]
+
+    def test_html_matches_python_markdown(self, good_resume):
+        assert parse(good_resume).html == markdown.markdown(good_resume, extensions=MARKDOWN_EXTENSIONS)
+
+    def test_claims_use_shared_parse(self, good_resume):
+        claims = ClaimExtractor().extract_from_resume(good_resume)
+        bullets = [n for n in parse(good_resume).lines if n["kind"] == "bullet"]
+        assert [c["line_number"] for c in claims if c["type"] == "bullet"] == [n["line_number"] for n in bullets]
+
+
+PLUS_AND_RULES = """
+## Experience
+
+**Sanofi** | Senior Biostatistician
+- Led statistical design for Phase III trials
++ Mentored three junior statisticians
+- Built an R package for subgroup analysis
+---
+- Ran the interim analyses
+
+## Interests
+
++ Trail running
+"""
+
+
+def baseline_claims(content):
+    """ClaimExtractor.extract_from_resume before the shared parse, as the reference."""
+    claims, section = [], None
+    for i, line in enumerate(content.strip().split("\n")):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("#"):
+            section = stripped.lstrip("#").strip().lower()
+            continue
+        if re.match(r"^[-*•]\s+", stripped):
+            claims.append((i + 1, "bullet", re.sub(r"^[-*•]\s+", "", stripped), section))
+        elif section in ("experience", "education", "publications", "skills"):
+            claims.append((i + 1, "line", stripped, section))
+    return claims
+
+
+class TestVerificationBullets:
+    """Only "-", "*" and "•" are bullets to verification; "+" items and rules are plain lines."""
+
+    def test_plus_and_rule_kinds_follow_markdown(self):
+        kinds = [(n["kind"], n["marker"]) for n in parse(PLUS_AND_RULES).lines]
+        assert ("bullet", "+") in kinds and ("rule", None) in kinds
+        assert "<li>Trail running</li>" in parse(PLUS_AND_RULES).html
+
+    def test_plus_item_is_content_claim_in_tracked_section(self):
+        claims = ClaimExtractor().extract_from_resume(PLUS_AND_RULES)
+        plus = [c for c in claims if "Mentored" in c["text"]]
+        assert plus == [{"text": "+ Mentored three junior statisticians", "line_number": 5,
+                         "section": "experience", "type": "content"}]
+        assert not [c for c in claims if "Trail running" in c["text"]]  # untracked section: skipped
+
+    def test_rule_is_structural_claim_in_tracked_section(self):
+        claims = ClaimExtractor().extract_from_resume(PLUS_AND_RULES)
+        assert {"text": "---", "line_number": 7, "section": "experience", "type": "structural"} in claims
+
+    def test_plus_item_and_rule_end_bullet_runs(self):
+        assert parse(PLUS_AND_RULES).bullet_runs() == [
+            ["Led statistical design for Phase III trials"],
+            ["Built an R package for subgroup analysis"],
+            ["Ran the interim analyses"],
+        ]
+
+    @pytest.mark.parametrize("name", ["good_resume.md", "ai_fingerprint.md", "hallucinated.md"])
+    def test_claims_match_baseline_extractor(self, name):
+        with open(os.path.join(FIXTURES_DIR, "resumes", name)) as f:
+            documents = [f.read(), RESUME, PLUS_AND_RULES]
+        for content in documents:
+            claims = [(c["line_number"], "bullet" if c["type"] == "bullet" else "line", c["text"], c["section"])
+                      for c in ClaimExtractor().extract_from_resume(content)]
+            assert claims == baseline_claims(content)
+
+
+class TestCache:
+    def test_same_version_parsed_once(self):
+        content = RESUME + "\n- cache probe\n"
+        before = cache_info()
+        first = parse(content)
+        assert parse(content) is first
+        after = cache_info()
+        assert (after["misses"] - before["misses"], after["hits"] - before["hits"]) == (1, 1)
+
+    def test_new_version_parsed_again(self):
+        assert parse(RESUME).digest != parse(RESUME + " ").digest
+
+
+class TestPreviewEndpoint:
+    def test_preview(self):
+        response = TestClient(create_app({})).post("/preview", json={"content": RESUME})
+        assert response.status_code == 200
+        body = response.json()
+        assert "<strong>Sanofi</strong>" in body["html"]
+        assert body["sections"][1]["title"] == "Experience"
+        assert len(body["sections"][1]["bullets"]) == 4
+        assert body["digest"] == parse(RESUME).digest
+
+    def test_preview_parses_off_the_event_loop(self, monkeypatch):
+        on_loop = []
+
+        def recording_parse(content):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return parse(content)
+
+        monkeypatch.setattr("dashboard.app.parse", recording_parse)
+        assert TestClient(create_app({})).post("/preview", json={"content": RESUME}).status_code == 200
+        assert on_loop == [False]
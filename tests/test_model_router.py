@@ -0,0 +1,106 @@
+"""Tests for the cheap-first ModelRouter cascade."""
+
+import asyncio
+
+import pytest
+
+from agents.model_router import ModelRouter, model_family, verification_gate
+
+OPUS = "claude-opus-4-6"
+SONNET = "claude-sonnet-4-5-20250929"
+BUDGET = {"pricing": {
+    "opus": {"input_per_mtok": 15.00, "output_per_mtok": 75.00},
+    "sonnet": {"input_per_mtok": 3.00, "output_per_mtok": 15.00},
+}}
+USAGE = {"input_tokens": 8000, "output_tokens": 3000}
+
+
+@pytest.fixture
+def router(tmp_path):
+    config = {
+        "model_tiers": {"resume": OPUS, "verify": OPUS, "match_default": SONNET},
+        "model_cascade": {
+            "stats_path": str(tmp_path / "routing.json"),
+            "resume": {"cheap": SONNET, "quality_bar": 85},
+            "verify": {"cheap": SONNET, "quality_bar": 95},
+        },
+    }
+    return ModelRouter(config, BUDGET)
+
+
+def verification(status="PASS", score=100, high=0):
+    return {"status": status, "quality_score": score, "high_count": high}
+
+
+def scripted_call(quality_by_model, log):
+    async def call(model, escalated_from=None):
+        log.append((model, escalated_from is not None))
+        return {"content": f"draft by {model}", "token_usage": USAGE,
+                "verification": quality_by_model[model]}
+    return call
+
+
+def gate(result):
+    return verification_gate(result["verification"], 85)
+
+
+class TestRoute:
+    def test_cheap_pass_accepted(self, router):
+        log = []
+        result = asyncio.run(router.route("resume", scripted_call({SONNET: verification()}, log), gate))
+        assert result["model"] == SONNET and not result["escalated"]
+        assert log == [(SONNET, False)]
+        stats = router.report()["resume"]
+        # (8K*15 + 3K*75) - (8K*3 + 3K*15) = 0.345 - 0.069
+        assert stats["cost_saved"] == pytest.approx(0.276)
+        assert stats["escalation_rate"] == 0.0
+
+    def test_fail_escalates_with_cheap_attempt(self, router):
+        log = []
+        call = scripted_call({SONNET: verification("FAIL", 70, high=2), OPUS: verification()}, log)
+        result = asyncio.run(router.route("resume", call, gate))
+        assert result["model"] == OPUS and result["escalated"]
+        assert result["escalation_reason"] == "verification FAIL (2 HIGH)"
+        assert log == [(SONNET, False), (OPUS, True)]
+        stats = router.report()["resume"]
+        assert stats["escalations"] == 1
+        assert stats["cost_saved"] == pytest.approx(-0.069)
+        assert stats["reasons"] == {"verification FAIL (N HIGH)": 1}
+
+    def test_low_quality_escalates(self, router):
+        log = []
+        call = scripted_call({SONNET: verification("PASS", 80), OPUS: verification()}, log)
+        result = asyncio.run(router.route("resume", call, gate))
+        assert result["escalation_reason"] == "quality 80 < 85"
+
+    def test_uncascaded_agent_uses_tier(self, router):
+        log = []
+        result = asyncio.run(router.route("match_default", scripted_call({SONNET: verification()}, log), gate))
+        assert result["model"] == SONNET and "match_default" not in router.report()
+
+
+class TestModelFor:
+    def test_clean_content_gets_cheap_verify(self, router):
+        assert router.model_for("verify", verification("PASS", 97)) == SONNET
+
+    def test_borderline_content_gets_opus(self, router):
+        assert router.model_for("verify", verification("PASS", 90)) == OPUS
+        assert router.model_for("verify", None) == OPUS
+        assert router.report()["verify"]["escalations"] == 2
+
+    def test_record_cost(self, router):
+        router.model_for("verify", verification())
+        router.record_cost("verify", SONNET, USAGE)
+        assert router.report()["verify"]["cost_saved"] == pytest.approx(0.276)
+
+
+def test_stats_persist(router, tmp_path):
+    router.model_for("verify", verification())
+    again = ModelRouter({"model_tiers": {"verify": OPUS},
+                         "model_cascade": {"stats_path": router.stats_path}}, BUDGET)
+    assert again.report()["verify"]["calls"] == 1
+
+
+def test_model_family():
+    assert model_family(OPUS) == "opus"
+    assert model_family(SONNET) == "sonnet"
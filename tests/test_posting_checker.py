@@ -0,0 +1,161 @@
+"""Tests for PostingChecker against a local stub HTTP server."""
+
+import asyncio
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from agents.http_client import HTTPClient
+from verification.posting_checker import PostingChecker
+
+RATE_LIMITS = {"http_default": {"concurrent_max": 4, "requests_per_minute": 1000}}
+
+
+def make_app(log):
+    @web.middleware
+    async def record(request, handler):
+        log.append((request.method, request.path, dict(request.headers)))
+        return await handler(request)
+
+    async def live(request):
+        return web.Response(text="<h1>Senior Statistician</h1><p>Apply now.</p>")
+
+    async def gone(request):
+        return web.Response(status=404)
+
+    async def expired(request):
+        return web.Response(text="<p>Sorry, this job is no longer available.</p>")
+
+    async def late_signal(request):
+        return web.Response(text="x" * 10_000 + "position closed")
+
+    async def slow(request):
+        await asyncio.sleep(1)
+        return web.Response(text="too late")
+
+    async def etagged(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.Response(text="open role", headers={"ETag": '"v1"'})
+
+    app = web.Application(middlewares=[record])
+    app.router.add_get("/live", live)
+    app.router.add_get("/gone", gone)
+    app.router.add_get("/expired", expired)
+    app.router.add_get("/late", late_signal)
+    app.router.add_get("/slow", slow)
+    app.router.add_get("/etag", etagged)
+    return app
+
+
+def run(scenario, config=None):
+    async def main():
+        log = []
+        server = TestServer(make_app(log))
+        await server.start_server()
+        client = HTTPClient(RATE_LIMITS, {"http": {"timeout_seconds": 0.3}})
+        checker = PostingChecker(client, config)
+        try:
+            return await scenario(server, checker, log)
+        finally:
+            await client.close()
+            await server.close()
+
+    return asyncio.run(main())
+
+
+class TestVerdicts:
+    def test_live_posting(self):
+        async def scenario(server, checker, log):
+            assert await checker.is_live(str(server.make_url("/live"))) == (True, 200, "Live")
+
+        run(scenario)
+
+    def test_404(self):
+        """HEAD 404 short-circuits: no GET is issued."""
+        async def scenario(server, checker, log):
+            live, status, _ = await checker.is_live(str(server.make_url("/gone")))
+            assert (live, status) == (False, 404)
+            assert [m for m, _, _ in log] == ["HEAD"]
+
+        run(scenario)
+
+    def test_expired_signal(self):
+        async def scenario(server, checker, log):
+            live, status, notes = await checker.is_live(str(server.make_url("/expired")))
+            assert (live, status) == (False, 200)
+            assert "no longer available" in notes
+
+        run(scenario)
+
+    def test_timeout(self):
+        async def scenario(server, checker, log):
+            result = await checker.is_live(str(server.make_url("/slow")))
+            assert result == (False, 0, "Connection timed out — treat as potentially expired")
+
+        run(scenario)
+
+    def test_body_scan_window(self):
+        """Signals past scan_kb are not read."""
+        async def scenario(server, checker, log):
+            live, _, _ = await checker.is_live(str(server.make_url("/late")))
+            assert live
+
+        run(scenario, {"posting_checker": {"scan_kb": 1}})
+
+
+class TestCaching:
+    def test_fresh_cache_skips_network(self):
+        async def scenario(server, checker, log):
+            url = str(server.make_url("/live"))
+            await checker.is_live(url)
+            requests_before = len(log)
+            assert await checker.is_live(url) == (True, 200, "Live")
+            assert len(log) == requests_before
+            assert checker.cached(url) == (True, 200, "Live")
+
+        run(scenario)
+
+    def test_expired_cache_revalidates_with_etag(self):
+        """Stale entry + unchanged ETag on HEAD -> no GET body is fetched."""
+        async def scenario(server, checker, log):
+            url = str(server.make_url("/etag"))
+            await checker.is_live(url)
+            log.clear()
+            assert await checker.is_live(url, max_age=0) == (True, 200, "Live")
+            assert [m for m, _, _ in log] == ["HEAD"]
+
+        run(scenario)
+
+    def test_uncached_returns_none(self):
+        async def scenario(server, checker, log):
+            assert checker.cached(str(server.make_url("/live"))) is None
+
+        run(scenario)
+
+
+class TestBulk:
+    def test_check_many(self):
+        async def scenario(server, checker, log):
+            urls = [str(server.make_url(p)) for p in ("/live", "/gone", "/expired", "/live")]
+            results = await checker.check_many(urls)
+            assert len(results) == 3
+            assert results[urls[0]][0] is True
+            assert results[urls[1]][0] is False
+            assert results[urls[2]][0] is False
+
+        run(scenario)
+
+    def test_refresh_stale_skips_fresh(self):
+        async def scenario(server, checker, log):
+            url = str(server.make_url("/live"))
+            await checker.is_live(url)
+            assert await checker.refresh_stale([url]) == {}
+
+        run(scenario)
+
+
+class TestMatcher:
+    def test_single_compiled_matcher(self):
+        checker = PostingChecker(None)
+        assert checker.matcher.search("This Listing Has Expired.")
+        assert not checker.matcher.search("We are hiring")
@@ -0,0 +1,193 @@
+"""Tests for the deterministic PreScreener."""
+
+import json
+import os
+
+import pytest
+
+from agents.prescreen import PreScreener
+from verification.profile_index import ProfileIndex
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+MATCHING = (
+    "Senior Biostatistician, oncology. Lead adaptive trial design and Bayesian methods "
+    "for Phase II-III clinical trials. Survival analysis, causal inference, group sequential "
+    "methods. Programming in R, SAS and Python; regulatory submissions experience."
+)
+UNRELATED = (
+    "Line cook wanted for busy downtown restaurant. Prepare food, clean kitchen, "
+    "manage inventory of produce and meats, weekend shifts, food handler certificate."
+)
+
+
+@pytest.fixture
+def profile_index():
+    with open(os.path.join(FIXTURES_DIR, "profile_complete.json")) as f:
+        return ProfileIndex(json.load(f))
+
+
+@pytest.fixture
+def screener(profile_index, tmp_path):
+    return PreScreener(profile_index, {"prescreen": {
+        "audit_rate": 0.0, "log_path": str(tmp_path / "prescreen.jsonl"), "idf_path": str(tmp_path / "idf.json"),
+    }})
+
+
+def make_job(job_id="j1", company="Adaptive Biotechnologies", title="Senior Biostatistician",
+             description=MATCHING, location="Boston, MA", remote_policy="remote"):
+    return {
+        "job_id": job_id,
+        "company": {"name": company},
+        "role": {"title": title, "description_raw": description,
+                 "location": location, "remote_policy": remote_policy},
+    }
+
+
+class TestDecisions:
+    def test_fast_track_strong_overlap(self, screener):
+        result = screener.screen(make_job())
+        assert result["decision"] == "fast_track"
+        assert {"r", "sas", "python", "bayesian methods"} <= set(result["skill_hits"])
+
+    def test_reject_unrelated(self, screener):
+        result = screener.screen(make_job(title="Line Cook", description=UNRELATED))
+        assert result["decision"] == "reject"
+        assert "overlap" in result["reason"]
+
+    def test_reject_company_to_avoid(self, screener):
+        result = screener.screen(make_job(company="ToxiCorp Inc."))
+        assert result["decision"] == "reject"
+        assert "companies_to_avoid" in result["reason"]
+
+    def test_deal_breaker_from_text(self, screener):
+        result = screener.screen(make_job(description=MATCHING + " This is an on-site only position.",
+                                          remote_policy=""))
+        assert result["decision"] == "reject"
+        assert result["reason"] == "Deal breaker: No remote option"
+
+    def test_deal_breaker_from_remote_policy(self, screener):
+        result = screener.screen(make_job(remote_policy="onsite"))
+        assert result["reason"] == "Deal breaker: No remote option"
+
+    def test_partial_overlap_goes_to_llm(self, screener):
+        result = screener.screen(make_job(
+            title="Data Scientist",
+            description="Data scientist for marketing analytics. Python and SQL required; "
+                        "dashboards, A/B testing, stakeholder reporting.",
+        ))
+        assert result["decision"] == "llm"
+
+    def test_location_relocation_not_fast_tracked(self, screener):
+        """Hybrid outside home and relocation targets: feasible but not a clear fit."""
+        result = screener.screen(make_job(location="Denver, CO", remote_policy="hybrid"))
+        assert result["location_fit"] == 0.5
+        assert result["decision"] == "llm"
+
+    def test_location_infeasible_without_relocation(self, profile_index, tmp_path):
+        profile_index.profile["identity"]["location"]["willing_to_relocate"] = False
+        screener = PreScreener(profile_index, {"prescreen": {"audit_rate": 0.0, "log_path": "", "idf_path": ""}})
+        result = screener.screen(make_job(location="Denver, CO", remote_policy="hybrid"))
+        assert result["decision"] == "reject"
+        assert result["reason"].startswith("Location infeasible")
+
+
+    def test_remote_preference_home_city_not_rejected(self, profile_index):
+        """A remote-preferring candidate who won't relocate can still work in their own city."""
+        profile_index.profile["identity"]["location"].update(remote_preference="remote",
+                                                             willing_to_relocate=False)
+        screener = PreScreener(profile_index, {"prescreen": {"audit_rate": 0.0, "log_path": "", "idf_path": ""}})
+        result = screener.screen(make_job(location="Boston, MA", remote_policy="hybrid"))
+        assert result["location_fit"] == 0.5
+        assert result["decision"] == "llm"
+        assert screener.screen(make_job(job_id="j2", location="Denver, CO",
+                                        remote_policy="hybrid"))["decision"] == "reject"
+
+
+    def test_remote_breaker_survives_pattern_override(self, profile_index):
+        screener = PreScreener(profile_index, {"prescreen": {
+            "audit_rate": 0.0, "log_path": "", "idf_path": "", "deal_breaker_patterns": {"no remote": [r"\bonsite required\b"]},
+        }})
+        assert screener.screen(make_job(remote_policy="onsite"))["reason"] == "Deal breaker: No remote option"
+
+
+class TestIDF:
+    JOBS = [
+        make_job("a"),
+        make_job("b", title="Data Scientist", description="Python and SQL for marketing analytics dashboards."),
+        make_job("c", title="Line Cook", description=UNRELATED),
+        make_job("d", title="Statistician", description="Clinical trials statistician using R and SAS."),
+    ]
+
+    def make(self, profile_index, tmp_path, warmup=3):
+        return PreScreener(profile_index, {"prescreen": {
+            "audit_rate": 0.0, "log_path": "", "idf_path": str(tmp_path / "idf.json"), "idf_warmup": warmup,
+        }})
+
+    def test_warmup_decisions_independent_of_order(self, profile_index, tmp_path):
+        forward = self.make(profile_index, tmp_path, warmup=100)
+        backward = self.make(profile_index, tmp_path, warmup=100)
+        first = {j["job_id"]: forward.screen(j)["overlap"] for j in self.JOBS}
+        second = {j["job_id"]: backward.screen(j)["overlap"] for j in reversed(self.JOBS)}
+        assert first == second
+
+    def test_frozen_after_warmup_and_reused(self, profile_index, tmp_path):
+        screener = self.make(profile_index, tmp_path)
+        for job in self.JOBS[:3]:
+            screener.screen(job)
+        assert screener.idf_frozen and (tmp_path / "idf.json").exists()
+        probe = self.JOBS[3]
+        overlap = screener.screen(probe)["overlap"]
+        for job in self.JOBS[:3]:
+            screener.screen(job)
+        assert screener.screen(probe)["overlap"] == overlap
+        # A later run loads the frozen IDF instead of starting over
+        assert self.make(profile_index, tmp_path).screen(probe)["overlap"] == overlap
+
+
+class TestPipelineIntegration:
+    def test_stage_drops_rejects_and_annotates(self, screener):
+        assert screener.stage(make_job(company="ToxiCorp")) is None
+        job = screener.stage(make_job(job_id="j2"))
+        assert job["prescreen"]["decision"] == "fast_track"
+        assert not screener.needs_llm(job)
+        match = screener.fast_track_result(job)
+        assert match["classification"] == "GOOD" and match["job_id"] == "j2"
+
+    def test_decisions_logged(self, screener):
+        screener.screen(make_job())
+        with open(screener.log_path) as f:
+            entry = json.loads(f.readline())
+        assert entry["job_id"] == "j1" and entry["decision"] == "fast_track"
+
+
+class TestAudit:
+    def test_audit_sample_goes_to_llm(self, profile_index):
+        screener = PreScreener(profile_index, {"prescreen": {"audit_rate": 1.0, "log_path": "", "idf_path": ""}})
+        job = screener.stage(make_job(company="ToxiCorp"))
+        assert job is not None and job["prescreen"]["audit"]
+        assert screener.needs_llm(job)
+
+    def test_audit_sample_deterministic(self, profile_index):
+        screener = PreScreener(profile_index, {"prescreen": {"audit_rate": 0.2, "log_path": "", "idf_path": ""}})
+        first = [screener.screen(make_job(job_id=f"j{i}"))["audit"] for i in range(200)]
+        again = [screener.screen(make_job(job_id=f"j{i}"))["audit"] for i in range(200)]
+        assert first == again
+        assert 15 < sum(first) < 65
+
+    def test_error_rate_reported(self, profile_index):
+        screener = PreScreener(profile_index, {"prescreen": {"audit_rate": 1.0, "log_path": "", "idf_path": ""}})
+        screener.screen(make_job(job_id="a", title="Line Cook", description=UNRELATED))
+        screener.screen(make_job(job_id="b", title="Line Cook", description=UNRELATED))
+        assert screener.record_outcome("a", "WEAK") is False
+        assert screener.record_outcome("b", "GOOD") is True
+        assert screener.record_outcome("unknown", "GOOD") is None
+        assert screener.stats()["audits"]["reject"]["error_rate"] == 0.5
+
+    def test_stats_count_saved_calls(self, screener):
+        screener.screen(make_job(job_id="a"))
+        screener.screen(make_job(job_id="b", company="ToxiCorp"))
+        screener.screen(make_job(job_id="c", title="Data Scientist", description="Python and dashboards"))
+        stats = screener.stats()
+        assert stats["screened"] == 3
+        assert stats["match_calls_saved"] == 2
@@ -0,0 +1,87 @@
+"""Tests for QueueStore summary index and keyset pagination."""
+
+import json
+import os
+
+import pytest
+
+from agents.queue_store import QueueStore
+
+
+def entry(i, score, deadline=None, status="pending"):
+    return {
+        "queue_entry_id": f"q{i:03d}",
+        "job": {"job_id": f"job{i}", "company": {"name": f"Co {i}"},
+                "role": {"title": "Statistician", "application_deadline": deadline}},
+        "match": {"classification": "GOOD", "composite_score": score},
+        "resume": {"content": "# Resume"},
+        "status": status,
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = QueueStore({"queue": {"queue_dir": str(tmp_path / "queue"),
+                              "index_path": str(tmp_path / "index.db"), "page_size": 3}})
+    yield s
+    s.close()
+
+
+class TestQueueStore:
+    def test_summary_and_lazy_full_entry(self, store):
+        summary = store.put({**entry(1, 8.2, "2026-02-15"), "needs_human_help": True})
+        assert summary["company"] == "Co 1"
+        assert summary["deadline"] == "2026-02-15"
+        assert summary["flags"] == ["needs_human_help"]
+        assert store.get("q001")["resume"]["content"] == "# Resume"
+        assert store.get("missing") is None
+
+    def test_deadline_first_then_score(self, store):
+        store.put(entry(1, 9.0))
+        store.put(entry(2, 5.0, "2026-03-01"))
+        store.put(entry(3, 7.0, "2026-02-01"))
+        store.put(entry(4, 6.0))
+        ids = [s["entry_id"] for s in store.page(limit=10)["items"]]
+        assert ids == ["q003", "q002", "q001", "q004"]
+        ids = [s["entry_id"] for s in store.page(sort="score", limit=10)["items"]]
+        assert ids == ["q001", "q003", "q004", "q002"]
+
+    def test_keyset_pages_cover_everything_once(self, store):
+        for i in range(10):
+            store.put(entry(i, float(i % 4), "2026-05-01" if i % 3 == 0 else None))
+        seen, cursor = [], None
+        while True:
+            page = store.page(cursor=cursor)
+            seen.extend(s["entry_id"] for s in page["items"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == [s["entry_id"] for s in store.page(limit=100)["items"]]
+        assert len(set(seen)) == 10
+
+    def test_status_filter_and_update(self, store):
+        store.put(entry(1, 8.0))
+        store.put(entry(2, 7.0))
+        store.update("q001", status="approved")
+        assert [s["entry_id"] for s in store.page()["items"]] == ["q002"]
+        assert store.count("approved") == 1
+        assert store.get("q001")["status"] == "approved"
+
+    def test_bad_cursor_rejected(self, store):
+        with pytest.raises(ValueError):
+            store.page(cursor="not-a-cursor")
+        with pytest.raises(ValueError):
+            store.page(sort="company")
+
+    def test_rebuild_index_from_files(self, store):
+        store.put(entry(1, 8.0))
+        with open(os.path.join(store.queue_dir, "q002.json"), "w") as f:
+            json.dump(entry(2, 9.0), f)
+        assert store.rebuild_index() == 2
+        assert [s["entry_id"] for s in store.page()["items"]] == ["q002", "q001"]
+
+    def test_delete(self, store):
+        store.put(entry(1, 8.0))
+        store.delete("q001")
+        assert store.summary("q001") is None
+        assert store.get("q001") is None
@@ -0,0 +1,64 @@
+"""Tests for APIRateLimiter."""
+
+import asyncio
+import pytest
+
+from agents.rate_limiter import APIRateLimiter
+
+
+class TestConcurrency:
+    def test_semaphore_limits_concurrency(self):
+        """10 concurrent callers with concurrent_max=3 -> at most 3 inside at once."""
+        limiter = APIRateLimiter({"concurrent_max": 3, "requests_per_minute": 1000})
+        active = 0
+        peak = 0
+
+        async def worker():
+            nonlocal active, peak
+            async with limiter:
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        async def main():
+            await asyncio.gather(*(worker() for _ in range(10)))
+
+        asyncio.run(main())
+        assert peak == 3
+
+    def test_release_on_error(self):
+        """A failing call inside the context still frees its slot."""
+        limiter = APIRateLimiter({"concurrent_max": 1, "requests_per_minute": 1000})
+
+        async def main():
+            with pytest.raises(RuntimeError):
+                async with limiter:
+                    raise RuntimeError("boom")
+            await asyncio.wait_for(limiter.acquire(), timeout=1)
+            limiter.release()
+
+        asyncio.run(main())
+
+
+class TestRPM:
+    def test_rpm_limiting(self, monkeypatch):
+        """The call after requests_per_minute waits for the window to roll."""
+        clock = [1000.0]
+        sleeps = []
+
+        async def fake_sleep(seconds):
+            sleeps.append(seconds)
+            clock[0] += seconds
+
+        monkeypatch.setattr("agents.rate_limiter.time.monotonic", lambda: clock[0])
+        monkeypatch.setattr("agents.rate_limiter.asyncio.sleep", fake_sleep)
+        limiter = APIRateLimiter({"concurrent_max": 5, "requests_per_minute": 2})
+
+        async def main():
+            for _ in range(3):
+                await limiter.acquire()
+                limiter.release()
+
+        asyncio.run(main())
+        assert sleeps == [60.0]
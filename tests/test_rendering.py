@@ -0,0 +1,187 @@
+"""Tests for ResumeRenderer and the RenderService cache and worker pool."""
+
+import asyncio
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from agents.queue_store import QueueStore
+from rendering import service as render_service
+from rendering.renderer import ResumeRenderer
+from rendering.service import RenderService
+
+RESUME = "# Elena Vasquez\n\n## Experience\n\n- Led statistical design for Phase III trials\n"
+
+
+def weasyprint_available():
+    try:
+        import weasyprint  # noqa: F401
+        return True
+    except (ImportError, OSError):
+        return False
+
+
+@pytest.fixture
+def templates(tmp_path):
+    directory = tmp_path / "templates"
+    directory.mkdir()
+    (directory / "resume.css").write_text("body { font-size: 10pt; }")
+    (directory / "cover_letter.css").write_text("body { font-size: 11pt; }")
+    return directory
+
+
+@pytest.fixture
+def service(tmp_path, templates):
+    s = RenderService({"rendering": {"templates_dir": str(templates), "cache_dir": str(tmp_path / "cache"),
+                                     "workers": 1, "formats": ["html"]}})
+    yield s
+    s.close()
+
+
+class TestRenderer:
+    def test_html_includes_css_and_markdown(self):
+        renderer = ResumeRenderer.for_template("resume")
+        html = renderer.to_html(RESUME)
+        assert "<h2>Experience</h2>" in html
+        assert "<li>Led statistical design" in html
+        assert "@page" in html
+
+    def test_unknown_format(self, tmp_path):
+        with pytest.raises(ValueError):
+            ResumeRenderer.for_template("resume").render(RESUME, "rtf", str(tmp_path / "out.rtf"))
+
+    @pytest.mark.skipif(not weasyprint_available(), reason="WeasyPrint system libraries not installed")
+    def test_pdf(self, tmp_path):
+        path = ResumeRenderer.for_template("resume").to_pdf(RESUME, str(tmp_path / "resume.pdf"))
+        with open(path, "rb") as f:
+            assert f.read(4) == b"%PDF"
+
+
+class TestRenderService:
+    def test_second_render_is_cache_hit(self, service):
+        first = asyncio.run(service.render(RESUME, fmt="html"))
+        second = asyncio.run(service.render(RESUME, fmt="html"))
+        assert first == second
+        stats = service.stats()
+        assert (stats["misses"], stats["hits"], stats["renders"]) == (1, 1, 1)
+        assert stats["hit_rate"] == 0.5
+        assert stats["render_ms_p50"] is not None
+
+    def test_on_output_called_outside_lock(self, service):
+        held = []
+        service.on_output = lambda path: held.append(service._lock.locked())
+        asyncio.run(service.render(RESUME, fmt="html"))
+        asyncio.run(service.render(RESUME, fmt="html"))  # cache hit
+        assert held == [False, False]
+
+    def test_key_covers_css(self, service, templates):
+        before = service.key(RESUME, "resume", "html")
+        assert service.key(RESUME, "cover_letter", "html") != before
+        time.sleep(0.01)
+        (templates / "resume.css").write_text("body { font-size: 12pt; }")
+        os.utime(templates / "resume.css", (time.time() + 5, time.time() + 5))
+        assert service.key(RESUME, "resume", "html") != before
+
+    def test_copy_to_output(self, service, tmp_path):
+        out = asyncio.run(service.render(RESUME, fmt="html", output_path=str(tmp_path / "out" / "r.html")))
+        with open(out) as f:
+            assert "Phase III" in f.read()
+
+    def test_prerender_on_queue(self, service, tmp_path):
+        queue = QueueStore({"queue": {"queue_dir": str(tmp_path / "queue"),
+                                      "index_path": str(tmp_path / "queue.db")}})
+        service.attach(queue)
+        queue.put({"queue_entry_id": "q1", "resume": {"content": RESUME},
+                   "cover_letter": {"content": "Dear team,\n\nI design trials."}})
+        for _ in range(200):
+            if service.cached(RESUME, "resume", "html") and service.stats()["prerendered"] == 2:
+                break
+            time.sleep(0.02)
+        asyncio.run(service.render(RESUME, fmt="html"))
+        stats = service.stats()
+        assert stats["prerendered"] == 2
+        assert stats["misses"] == 0
+        assert stats["hit_rate"] == 1.0
+        queue.close()
+
+    def test_put_does_not_wait_for_pool_start(self, service, tmp_path):
+        queue = QueueStore({"queue": {"queue_dir": str(tmp_path / "queue"),
+                                      "index_path": str(tmp_path / "queue.db")}})
+        service.attach(queue)
+        starting, release = threading.Event(), threading.Event()
+        start = service.start
+
+        def slow_start():
+            starting.set()
+            release.wait(5)
+            start()
+
+        service.start = slow_start
+        queue.put({"queue_entry_id": "q1", "resume": {"content": RESUME}})
+        # put() returned while the pool is still starting in the background
+        assert starting.wait(5) and not release.is_set()
+        release.set()
+        queue.close()
+
+    def test_broken_pool_does_not_fail_put(self, service, tmp_path):
+        queue = QueueStore({"queue": {"queue_dir": str(tmp_path / "queue"),
+                                      "index_path": str(tmp_path / "queue.db")}})
+        service.attach(queue)
+        service.start()
+        with pytest.raises(BrokenProcessPool):
+            service._pool.submit(os._exit, 1).result(timeout=10)
+        queue.put({"queue_entry_id": "q1", "resume": {"content": RESUME}})
+        # The pool is replaced rather than failing every later render
+        for _ in range(200):
+            if service.cached(RESUME, "resume", "html"):
+                break
+            time.sleep(0.02)
+        path = asyncio.run(service.render(RESUME, fmt="html"))
+        assert os.path.exists(path)
+        queue.close()
+
+    def test_key_covers_same_mtime_edit(self, service, templates):
+        css = templates / "resume.css"
+        mtime_ns = os.stat(css).st_mtime_ns
+        before = service.key(RESUME, "resume", "html")
+        css.write_text("body { font-size: 10pt; color: #222; }")
+        os.utime(css, ns=(mtime_ns, mtime_ns))
+        assert service.key(RESUME, "resume", "html") != before
+
+    def test_worker_reloads_same_mtime_edit(self, templates):
+        css = templates / "resume.css"
+        mtime_ns = os.stat(css).st_mtime_ns
+        first = render_service._renderer(str(templates), "resume")
+        css.write_text("body { font-size: 10pt; color: #222; }")
+        os.utime(css, ns=(mtime_ns, mtime_ns))
+        second = render_service._renderer(str(templates), "resume")
+        assert second is not first
+        assert "#222" in second.to_html(RESUME)
+
+    def test_worker_reloads_reference_docx(self, templates, monkeypatch):
+        first = render_service._renderer(str(templates), "resume")
+        assert first.reference_docx is None
+        reference = templates / "resume_reference.docx"
+        with zipfile.ZipFile(reference, "w") as z:
+            z.writestr("word/styles.xml", "<styles/>")
+        second = render_service._renderer(str(templates), "resume")
+        assert second is not first and second.reference_docx == str(reference)
+        monkeypatch.setattr(render_service, "_docx_engine", "pandoc")
+        third = render_service._renderer(str(templates), "resume")
+        assert third is not second and third.docx_engine == "pandoc"
+
+    def test_failure_surfaces(self, service):
+        with pytest.raises(ValueError):
+            asyncio.run(service.render(RESUME, fmt="rtf"))
+        assert service.stats()["failures"] == 1
+
+    def test_docx_in_worker(self, service):
+        path = asyncio.run(service.render(RESUME, fmt="docx"))
+        assert zipfile.is_zipfile(path)
+        assert service.key(RESUME, "resume", "docx") != RenderService(
+            {"rendering": {"templates_dir": service.templates_dir, "cache_dir": service.cache_dir,
+                           "docx_engine": "pandoc"}}).key(RESUME, "resume", "docx")
@@ -0,0 +1,225 @@
+"""Tests for RetentionEngine: expiry index, batched deletes, reclaimed bytes."""
+
+import asyncio
+import gzip
+import json
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from agents.checkpoint import CheckpointStore
+from agents.queue_store import QueueStore
+from agents.retention import DAY, RetentionEngine
+from rendering.service import RenderService
+
+
+def ago(days: float) -> str:
+    return (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+
+
+@pytest.fixture
+def config(tmp_path):
+    return {
+        "cleanup": {"index_path": str(tmp_path / "retention.db"), "log_dir": str(tmp_path / "logs"),
+                    "queue_archive_dir": str(tmp_path / "archive"), "batch_size": 10,
+                    "interval_seconds": 0.01, "min_pause_seconds": 0},
+        "queue": {"queue_dir": str(tmp_path / "queue"), "index_path": str(tmp_path / "queue.db")},
+        "checkpoints": {"db_path": str(tmp_path / "cp.db")},
+    }
+
+
+@pytest.fixture
+def engine(config):
+    e = RetentionEngine(config)
+    yield e
+    e.close()
+
+
+@pytest.fixture
+def queue(config):
+    q = QueueStore(config)
+    yield q
+    q.close()
+
+
+def write_log(config, name, age_days, size=100):
+    os.makedirs(config["cleanup"]["log_dir"], exist_ok=True)
+    path = os.path.join(config["cleanup"]["log_dir"], name)
+    with open(path, "w") as f:
+        f.write("x" * size)
+    mtime = time.time() - age_days * DAY
+    os.utime(path, (mtime, mtime))
+    return path
+
+
+class TestQueue:
+    def test_expired_entries_archived(self, engine, queue, config):
+        engine.attach(queue_store=queue)
+        queue.put({"queue_entry_id": "old", "created_at": ago(100), "resume": {"content": "a" * 2000}})
+        queue.put({"queue_entry_id": "new", "created_at": ago(5)})
+        batch = engine.run_batch()
+        assert batch["items"] == 1
+        assert queue.get("old") is None and queue.get("new") is not None
+        with gzip.open(os.path.join(config["cleanup"]["queue_archive_dir"], "old.json.gz"), "rt") as f:
+            assert json.load(f)["queue_entry_id"] == "old"
+        report = engine.report()
+        assert report["reclaimed"]["queue"]["items"] == 1
+        assert report["bytes_reclaimed"] > 0
+        assert report["tracked"] == 1
+
+    def test_deleted_entry_untracked(self, engine, queue):
+        engine.attach(queue_store=queue)
+        queue.put({"queue_entry_id": "q1", "created_at": ago(100)})
+        queue.delete("q1")
+        assert engine.report()["tracked"] == 0
+
+    def test_backfill_indexes_existing_entries(self, engine, queue):
+        queue.put({"queue_entry_id": "before_attach", "created_at": ago(100)})
+        engine.attach(queue_store=queue)
+        assert engine.due() == []
+        list(engine.backfill())
+        assert [r["key"] for r in engine.due()] == ["before_attach"]
+
+
+class TestFiles:
+    def test_logs_expire_by_mtime(self, engine, config):
+        old = write_log(config, "old.jsonl", 40, size=300)
+        fresh = write_log(config, "fresh.jsonl", 1)
+        list(engine.backfill())
+        batch = engine.run_batch()
+        assert (batch["items"], batch["bytes"]) == (1, 300)
+        assert not os.path.exists(old) and os.path.exists(fresh)
+
+    def test_log_still_written_is_rescheduled(self, engine, config):
+        path = write_log(config, "active.jsonl", 40)
+        engine.track_file("log", path)
+        os.utime(path, None)  # appended to since it was tracked
+        assert engine.run_batch()["items"] == 0
+        assert os.path.exists(path)
+        assert engine.counters["rescheduled"] == 1
+        assert engine.due() == []
+
+    def test_batch_size_bounds_work(self, engine, config):
+        for i in range(25):
+            write_log(config, f"{i}.log", 40)
+        list(engine.backfill())
+        first = engine.run_batch()
+        assert (first["items"], first["more"]) == (10, True)
+        assert engine.pause_for(first) < engine.interval
+        engine.run_batch()
+        last = engine.run_batch()
+        assert (last["items"], last["more"]) == (5, False)
+        assert engine.pause_for(last) == engine.interval
+
+    def test_unremovable_item_backed_off(self, engine, config, tmp_path):
+        stuck = tmp_path / "stuck"
+        stuck.mkdir()
+        engine.track("render_cache", str(stuck), time.time() - 1, str(stuck))
+        old = write_log(config, "old.log", 40)
+        list(engine.backfill())
+        now = time.time()
+        batch = engine.run_batch(now=now)  # os.remove on a directory: IsADirectoryError
+        assert batch["items"] == 1 and not os.path.exists(old)
+        assert engine.counters["errors"] == 1
+        assert engine.due(now=now) == []
+        assert [r["key"] for r in engine.due(now=now + engine.retry_delay)] == [str(stuck)]
+
+    def test_pause_respects_byte_budget(self, engine):
+        engine.max_bytes_per_second = 1000
+        assert engine.pause_for({"items": 10, "bytes": 5000, "more": True}) == 5.0
+
+    def test_render_outputs_tracked(self, engine, tmp_path):
+        (tmp_path / "templates").mkdir()
+        (tmp_path / "templates" / "resume.css").write_text("body {}")
+        service = RenderService({"rendering": {"templates_dir": str(tmp_path / "templates"),
+                                               "cache_dir": str(tmp_path / "cache"), "workers": 1,
+                                               "formats": ["html"]}})
+        try:
+            engine.attach(render_service=service)
+            path = asyncio.run(service.render("# Resume", fmt="html"))
+            assert engine.report()["tracked"] == 1
+            assert engine.run_batch()["items"] == 0
+            assert engine.run_batch(now=time.time() + 31 * DAY)["items"] == 1
+            assert not os.path.exists(path)
+        finally:
+            service.close()
+
+
+class TestCheckpoints:
+    def test_completed_jobs_removed_in_batches(self, engine, config):
+        checkpoints = CheckpointStore(config)
+        for i in range(12):
+            checkpoints.save(f"job_{i}", "resume", {"content": "x" * 50})
+            if i != 0:
+                checkpoints.mark_complete(f"job_{i}")
+        engine.attach(checkpoints=checkpoints)
+        first = engine.run_batch()
+        assert (first["items"], first["more"]) == (10, True)
+        assert first["bytes"] > 0
+        assert engine.run_batch()["items"] == 1
+        assert [r["job_id"] for r in checkpoints.list_incomplete()] == ["job_0"]
+        assert engine.report()["reclaimed"]["checkpoint"]["items"] == 11
+        checkpoints.close()
+
+
+class TestBackground:
+    def test_start_does_not_block(self, engine, config):
+        path = write_log(config, "old.log", 40)
+
+        async def scenario():
+            task = engine.start()
+            assert not task.done()  # returned before any cleanup ran
+            for _ in range(100):
+                if not os.path.exists(path):
+                    break
+                await asyncio.sleep(0.01)
+            await engine.stop()
+
+        asyncio.run(scenario())
+        assert not os.path.exists(path)
+        assert engine.report()["bytes_reclaimed"] == 100
+
+    def test_backfill_runs_off_the_event_loop(self, engine, config, monkeypatch):
+        threads = []
+        track_missing = engine._track_missing
+        monkeypatch.setattr(engine, "_track_missing",
+                            lambda rows: threads.append(threading.get_ident()) or track_missing(rows))
+        path = write_log(config, "old.log", 40)
+
+        async def scenario():
+            loop_thread = threading.get_ident()
+            engine.start()
+            for _ in range(100):
+                if not os.path.exists(path):
+                    break
+                await asyncio.sleep(0.01)
+            await engine.stop()
+            return loop_thread
+
+        loop_thread = asyncio.run(scenario())
+        assert not os.path.exists(path)
+        assert threads and loop_thread not in threads
+
+    def test_task_survives_failing_item(self, engine, config, tmp_path):
+        stuck = tmp_path / "stuck"
+        stuck.mkdir()
+        engine.track("render_cache", str(stuck), time.time() - 1, str(stuck))
+        path = write_log(config, "old.log", 40)
+
+        async def scenario():
+            task = engine.start()
+            for _ in range(100):
+                if not os.path.exists(path):
+                    break
+                await asyncio.sleep(0.01)
+            await asyncio.sleep(0.05)  # a few more idle passes
+            alive = not task.done()
+            await engine.stop()
+            return alive
+
+        assert asyncio.run(scenario())
+        assert not os.path.exists(path)
+        assert engine.counters["errors"] == 1
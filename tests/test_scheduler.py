@@ -0,0 +1,200 @@
+"""Tests for GenerationScheduler ordering, capacity and preemption."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from agents.scheduler import REGENERATION, GenerationScheduler, parse_deadline
+
+NOW = datetime(2026, 10, 19, 12, 0, tzinfo=timezone.utc)
+BUDGET = {
+    "budget": {"daily_limit_usd": 20.0},
+    "estimates": {"with_cover_letter": 1.50, "without_cover_letter": 0.75, "app_questions": 0.02},
+}
+
+
+def match(job_id, score=7.0, deadline=None, cover_letter=True, questions=False):
+    return {
+        "job_id": job_id,
+        "composite_score": score,
+        "job": {
+            "job_id": job_id,
+            "role": {"application_deadline": deadline, "requires_cover_letter": cover_letter},
+            "application_questions": [{"question_text": "Why us?"}] if questions else [],
+        },
+    }
+
+
+def make_scheduler(slots=3, per_day=10, budget=BUDGET, clock=None):
+    config = {"scheduling": {"max_concurrent_generations": slots, "max_applications_per_day": per_day}}
+    return GenerationScheduler(config, budget, clock=clock or (lambda: NOW))
+
+
+def submit_all(scheduler, items, kind="background"):
+    async def main():
+        for item in items:
+            await scheduler.submit(item, kind)
+    asyncio.run(main())
+
+
+class TestOrder:
+    def test_deadline_first_then_value(self):
+        s = make_scheduler()
+        submit_all(s, [
+            match("no_deadline_high", score=9.0),
+            match("closes_in_5_days", score=8.0, deadline="2026-10-24"),
+            match("closes_tomorrow", score=5.0, deadline="2026-10-20"),
+            match("closes_today", score=6.0, deadline="2026-10-19"),
+        ])
+        order = s.order()
+        assert [r["job_id"] for r in order] == [
+            "closes_today", "closes_tomorrow", "no_deadline_high", "closes_in_5_days",
+        ]
+        assert [r["tier"] for r in order] == ["deadline", "deadline", "value", "value"]
+
+    def test_value_density_prefers_cheaper(self):
+        """Same score: the application without a cover letter is cheaper, so it goes first."""
+        s = make_scheduler()
+        submit_all(s, [match("with_cl", score=7.0), match("no_cl", score=7.0, cover_letter=False)])
+        assert [r["job_id"] for r in s.order()] == ["no_cl", "with_cl"]
+
+    def test_cost_estimates(self):
+        s = make_scheduler()
+        assert s.estimate_cost(match("a", cover_letter=None)) == 1.50
+        assert s.estimate_cost(match("b", cover_letter=False, questions=True)) == pytest.approx(0.77)
+
+    def test_expired_dropped(self):
+        s = make_scheduler()
+        submit_all(s, [match("gone", deadline="2026-10-18"), match("ok")])
+        assert s.get_nowait()["job_id"] == "ok"
+        assert [e["job_id"] for e in s.expired] == ["gone"]
+
+    def test_parse_deadline(self):
+        assert parse_deadline("2026-10-20").hour == 23
+        assert parse_deadline("2026-10-20T09:00:00+00:00").hour == 9
+        assert parse_deadline("soon") is None and parse_deadline(None) is None
+
+
+class TestCapacity:
+    def test_slots(self):
+        s = make_scheduler(slots=2)
+        submit_all(s, [match(str(i)) for i in range(4)])
+        assert s.get_nowait() and s.get_nowait()
+        assert s.get_nowait() is None
+        asyncio.run(s.complete(s.running()[0]["job_id"]))
+        assert s.get_nowait() is not None
+
+    def test_daily_application_cap(self):
+        s = make_scheduler(slots=10, per_day=2)
+        submit_all(s, [match(str(i)) for i in range(4)])
+        assert s.get_nowait() and s.get_nowait()
+        assert s.get_nowait() is None
+
+    def test_budget_skips_unaffordable(self):
+        """With $1 left, a $1.50 cover-letter job is skipped for a $0.75 one."""
+        s = make_scheduler(slots=10, budget={"budget": {"daily_limit_usd": 1.0}})
+        submit_all(s, [match("expensive", score=9.0), match("cheap", score=5.0, cover_letter=False)])
+        affordable = {r["job_id"]: r["affordable"] for r in s.order()}
+        assert affordable == {"expensive": False, "cheap": True}
+        assert s.get_nowait()["job_id"] == "cheap"
+        assert s.get_nowait() is None
+
+    def test_actual_cost_replaces_estimate(self):
+        s = make_scheduler()
+        submit_all(s, [match("a")])
+        s.get_nowait()
+        asyncio.run(s.complete("a", actual_cost=0.9))
+        assert s.spent_today == pytest.approx(0.9)
+
+    def test_counters_reset_next_day(self):
+        now = [NOW]
+        s = make_scheduler(slots=10, per_day=1, clock=lambda: now[0])
+        submit_all(s, [match("a"), match("b")])
+        assert s.get_nowait()["job_id"] == "a"
+        assert s.get_nowait() is None
+        now[0] = datetime(2026, 10, 20, 0, 1, tzinfo=timezone.utc)
+        assert s.get_nowait()["job_id"] == "b"
+
+
+class TestPreemption:
+    def test_regeneration_preempts_lowest_background(self):
+        s = make_scheduler(slots=2)
+        submit_all(s, [match("urgent", deadline="2026-10-20"), match("low", score=3.0)])
+        s.get_nowait(), s.get_nowait()
+        submit_all(s, [match("regen_me")], kind=REGENERATION)
+        assert s.preempted("low") and not s.preempted("urgent")
+
+        regen = s.get_nowait()
+        assert regen["job_id"] == "regen_me" and regen["kind"] == REGENERATION
+        asyncio.run(s.requeue("low"))
+        assert [r["job_id"] for r in s.order()] == ["low"]
+        assert s.started_today == 1  # requeued job no longer counts as started
+
+    def test_regenerations_bypass_daily_cap(self):
+        s = make_scheduler(slots=5, per_day=1)
+        submit_all(s, [match("a"), match("b")])
+        s.get_nowait()
+        submit_all(s, [match("b")], kind=REGENERATION)
+        assert s.get_nowait()["kind"] == REGENERATION
+
+    def test_regenerating_running_job_supersedes_it(self):
+        s = make_scheduler(slots=1)
+        submit_all(s, [match("a")])
+        s.get_nowait()
+        submit_all(s, [match("a")], kind=REGENERATION)
+        assert s.preempted("a")
+        assert s.get_nowait() is None  # held until the superseded run yields
+        asyncio.run(s.requeue("a"))
+        entry = s.get_nowait()
+        assert entry["kind"] == REGENERATION
+
+    def test_superseded_run_cannot_disturb_regeneration(self):
+        """The old run keeps its own running entry until it yields; only then does the
+        regeneration run, with its own slot and reservation."""
+        s = make_scheduler(slots=2)
+
+        async def main():
+            await s.submit(match("a"))
+            old = s.get_nowait()
+            await s.submit(match("a"), REGENERATION)
+            assert s.get_nowait() is None      # not dispatched over the live run
+            assert s.preempted("a")            # the old worker sees its preempt...
+            await s.requeue("a")               # ...and yields
+            regen = s.get_nowait()
+            assert regen["kind"] == REGENERATION and regen is not old
+            assert not s.preempted("a")
+            assert [r["kind"] for r in s.running()] == [REGENERATION] and len(s) == 0
+            assert s.spent_today == regen["cost"]
+            await s.complete("a")
+            assert s.running() == []
+
+        asyncio.run(main())
+
+    def test_regeneration_runs_after_superseded_run_completes(self):
+        s = make_scheduler(slots=2)
+
+        async def main():
+            await s.submit(match("a"))
+            s.get_nowait()
+            await s.submit(match("a"), REGENERATION)
+            waiter = asyncio.create_task(s.get())
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+            await s.complete("a", actual_cost=1.0)
+            regen = await asyncio.wait_for(waiter, timeout=1)
+            return regen["kind"], s.spent_today
+
+        assert asyncio.run(main()) == (REGENERATION, 2.5)
+
+    def test_get_waits_for_work(self):
+        s = make_scheduler()
+
+        async def main():
+            waiter = asyncio.create_task(s.get())
+            await asyncio.sleep(0.01)
+            assert not waiter.done()
+            await s.submit(match("late"))
+            return await asyncio.wait_for(waiter, timeout=1)
+
+        assert asyncio.run(main())["job_id"] == "late"
@@ -0,0 +1,162 @@
+"""Tests for FTS5 application search."""
+
+import asyncio
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+from agents.queue_store import QueueStore
+from agents.state import StateManager
+from dashboard.app import create_app, create_app_from_config
+from dashboard.search import ApplicationSearch
+
+
+def entry(i, company, industry, title, description, resume, created_at, classification="GOOD"):
+    return {
+        "queue_entry_id": f"q{i}",
+        "job": {"job_id": f"job{i}", "company": {"name": company, "industry": industry},
+                "role": {"title": title, "description_raw": description}},
+        "match": {"classification": classification, "composite_score": 7.0},
+        "resume": {"content": resume, "verification": {"issues": [
+            {"type": "AI_VOCABULARY", "message": "Blacklisted: 'leverage'"}]}},
+        "cover_letter": {"content": "Dear hiring team"},
+        "created_at": created_at,
+    }
+
+
+@pytest.fixture
+def stores(tmp_path):
+    queue = QueueStore({"queue": {"queue_dir": str(tmp_path / "queue"),
+                                  "index_path": str(tmp_path / "queue.db")}})
+    state = StateManager({"state": {"db_path": str(tmp_path / "state.db"), "json_path": None}})
+    search = ApplicationSearch({"search": {"db_path": str(tmp_path / "search.db")}})
+    search.attach(queue_store=queue, state=state)
+    queue.put(entry(1, "Pfizer", "Pharmaceuticals", "Biostatistician",
+                    "Causal inference for real-world evidence studies", "- Built causal models",
+                    "2026-05-10T09:00:00+00:00", "STRONG"))
+    queue.put(entry(2, "Citadel", "Finance", "Quant Researcher",
+                    "Time series forecasting", "- Causal inference on market data",
+                    "2026-05-12T09:00:00+00:00"))
+    queue.put(entry(3, "Novartis", "Pharmaceuticals", "Statistician",
+                    "Survival analysis for oncology trials", "- Designed trials",
+                    "2026-08-01T09:00:00+00:00"))
+    yield queue, state, search
+    queue.close()
+    state.close()
+    search.close()
+
+
+class TestSearch:
+    def test_phrase_with_column_filter_and_dates(self, stores):
+        _, _, search = stores
+        result = search.search('"causal inference" AND industry:pharma*', since="2026-04-01", until="2026-06-30")
+        assert [r["job_id"] for r in result["results"]] == ["job1"]
+        assert "<mark>" in result["results"][0]["snippet"]
+
+    def test_searches_resume_and_issues(self, stores):
+        _, _, search = stores
+        assert {r["job_id"] for r in search.search("causal")["results"]} == {"job1", "job2"}
+        assert search.search("leverage")["total"] == 3
+
+    def test_snippet_escapes_indexed_markup(self, stores):
+        queue, _, search = stores
+        queue.put(entry(4, "Acme", "Tech", "Analyst",
+                        'Causal work <script>alert(1)</script> <img src=x onerror="alert(2)">',
+                        "- Analysis", "2026-05-01T09:00:00+00:00"))
+        snippet = search.search("onerror OR script")["results"][0]["snippet"]
+        assert "<script" not in snippet and "<img" not in snippet
+        assert "&lt;<mark>script</mark>&gt;" in snippet
+        assert "<mark>onerror</mark>=&quot;alert(2)&quot;" in snippet
+
+    def test_stemming(self, stores):
+        _, _, search = stores
+        assert search.search("design")["results"][0]["job_id"] == "job3"
+
+    def test_facets_and_filters(self, stores):
+        _, _, search = stores
+        result = search.search("causal")
+        assert result["facets"]["classification"] == {"STRONG": 1, "GOOD": 1}
+        assert search.search("causal", classification="STRONG")["total"] == 1
+        assert search.search(None, until="2026-05-12")["total"] == 2
+
+    def test_state_changes_update_facets(self, stores):
+        _, state, search = stores
+        state.upsert_application("job1", status="submitted", classification="STRONG")
+        state.upsert_application("job1", outcome="interview")
+        result = search.search("causal", outcome="interview")
+        assert [r["job_id"] for r in result["results"]] == ["job1"]
+        assert result["results"][0]["status"] == "submitted"
+
+    def test_edit_reindexes(self, stores):
+        queue, _, search = stores
+        queue.update("q3", resume={"content": "- Bayesian adaptive designs"})
+        assert search.search("bayesian")["total"] == 1
+        assert search.search("resume:trials")["total"] == 0
+
+    def test_queue_delete_keeps_history(self, stores):
+        queue, _, search = stores
+        queue.delete("q1")
+        assert search.search("pfizer")["total"] == 1
+
+    def test_invalid_syntax_falls_back(self, stores):
+        _, _, search = stores
+        assert search.search('causal AND (')["total"] == 2
+
+    def test_rebuild(self, stores, tmp_path):
+        queue, _, _ = stores
+        fresh = ApplicationSearch({"search": {"db_path": str(tmp_path / "fresh.db")}})
+        assert fresh.rebuild(queue) == 3
+        assert fresh.search("oncology")["total"] == 1
+        fresh.close()
+
+    def test_endpoint(self, stores):
+        _, _, search = stores
+        client = TestClient(create_app({}, search=search))
+        response = client.get("/search", params={"q": "causal", "classification": ["GOOD"]})
+        assert response.status_code == 200
+        assert [r["job_id"] for r in response.json()["results"]] == ["job2"]
+
+    def test_endpoint_queries_off_the_event_loop(self, stores):
+        _, _, search = stores
+        on_loop = []
+        original = search.search
+
+        def recording_search(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_loop.append(True)
+            except RuntimeError:
+                on_loop.append(False)
+            return original(*args, **kwargs)
+
+        search.search = recording_search
+        client = TestClient(create_app({}, search=search))
+        assert client.get("/search", params={"q": "causal"}).status_code == 200
+        assert on_loop == [False]
+
+    def test_app_from_config_serves_search_and_lint(self, stores, tmp_path):
+        """The served app builds search (rebuilt from the queue) and the linter from config."""
+        profile = os.path.join(os.path.dirname(__file__), "fixtures", "profile_complete.json")
+        config = {
+            "queue": {"queue_dir": str(tmp_path / "queue"), "index_path": str(tmp_path / "queue.db")},
+            "search": {"db_path": str(tmp_path / "served.db")},
+            "live_lint": {"profile_path": profile},
+        }
+        app = create_app_from_config(config)
+        client = TestClient(app)
+        assert client.get("/search", params={"q": "oncology"}).json()["total"] == 1
+        assert client.post("/lint", json={"content": "- Built a tool"}).status_code == 200
+        app.state.search.close()
+
+    def test_app_from_config_without_profile(self, tmp_path):
+        config = {
+            "queue": {"queue_dir": str(tmp_path / "queue"), "index_path": str(tmp_path / "queue.db")},
+            "search": {"db_path": str(tmp_path / "search.db")},
+            "live_lint": {"profile_path": str(tmp_path / "missing.json")},
+        }
+        app = create_app_from_config(config)
+        client = TestClient(app)
+        assert client.get("/search").status_code == 200
+        assert client.post("/lint", json={"content": "x"}).status_code == 503
+        app.state.search.close()
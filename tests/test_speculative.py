@@ -0,0 +1,156 @@
+"""Tests for SpeculativeResumeLoop with scripted drafts and a stand-in verifier."""
+
+import asyncio
+
+import pytest
+
+from agents.speculative import BudgetExceeded, SpeculativeResumeLoop
+
+BUDGET = {
+    "budget": {"per_application_limit_usd": 5.00},
+    "estimates": {"with_cover_letter": 1.50, "resume_draft": 0.35},
+}
+
+
+class ScoreVerifier:
+    """Reads the quality score embedded in the draft text: 'score=87', with an optional
+    'status=FAIL' overriding the >= 90 pass mark (e.g. a high-scoring draft that failed a check)."""
+
+    def verify_resume(self, content, claimed_ids=None):
+        score = int(content.split("score=")[1].split()[0])
+        status = content.split("status=")[1].split()[0] if "status=" in content else None
+        return {
+            "status": status or ("PASS" if score >= 90 else "FAIL"),
+            "quality_score": score,
+            "issues": [{"severity": "HIGH", "text": "fix"}] if score < 90 else [],
+        }
+
+
+def make_loop(scores, delays=None, revise_step=5, drafts=3, budget=BUDGET, log=None):
+    """scores[i] None makes draft i raise; (score, status) forces the verifier's status."""
+    delays = delays or [0.0] * len(scores)
+
+    async def draft(strategy, index):
+        if log is not None:
+            log.append(("start", index))
+        await asyncio.sleep(delays[index])
+        if log is not None:
+            log.append(("done", index))
+        if scores[index] is None:
+            raise ConnectionError(f"draft {index} API error")
+        score, status = scores[index] if isinstance(scores[index], tuple) else (scores[index], None)
+        content = f"resume score={score}" + (f" status={status}" if status else "")
+        return {"content": content, "entry_ids": [], "cost_usd": 0.35}
+
+    async def revise(previous, issues):
+        score = int(previous["content"].split("score=")[1].split()[0]) + revise_step
+        return {"content": f"resume score={score}", "entry_ids": [], "cost_usd": 0.35}
+
+    config = {"generation": {"speculative_drafts": drafts, "max_programmatic_iterations": 4}}
+    return SpeculativeResumeLoop(draft, revise, ScoreVerifier(), config, budget)
+
+
+class TestDraftCount:
+    def test_bounded_by_per_application_limit(self):
+        loop = make_loop([50] * 20, drafts=20)
+        # $5.00 - $1.50 baseline = $3.50 -> 10 extra drafts + 1
+        assert loop.draft_count() == 11
+        assert loop.draft_count(spent=3.0) == 2
+        assert loop.draft_count(spent=3.5) == 1
+
+    def test_disabled_by_default(self):
+        loop = SpeculativeResumeLoop(None, None, ScoreVerifier(), {}, BUDGET)
+        assert loop.draft_count() == 1
+
+    def test_no_room_for_any_draft(self):
+        loop = make_loop([50])
+        with pytest.raises(BudgetExceeded):
+            asyncio.run(loop.run(spent=4.9))
+
+
+class TestLoop:
+    def test_passing_draft_cancels_the_rest(self):
+        log = []
+        loop = make_loop([60, 95, 70], delays=[0.5, 0.01, 0.5], log=log)
+        result = asyncio.run(loop.run())
+        assert result["candidate"]["index"] == 1
+        assert result["verification"]["status"] == "PASS"
+        assert result["cancelled"] == 2
+        assert ("done", 0) not in log and ("done", 2) not in log
+        assert result["iterations"] == 1
+
+    def test_pass_beats_higher_scoring_fail(self):
+        """A passing draft wins over a failing one that scores higher, and stops the run."""
+        log = []
+        loop = make_loop([(85, "FAIL"), (80, "PASS"), (99, "PASS")], delays=[0.0, 0.01, 0.5], log=log)
+        result = asyncio.run(loop.run())
+        assert result["candidate"]["index"] == 1
+        assert result["verification"]["status"] == "PASS"
+        assert result["iterations"] == 1
+        assert result["cancelled"] == 1 and ("done", 2) not in log
+
+    def test_revision_keeps_pass_over_higher_fail(self):
+        revised = []
+
+        async def draft(strategy, index):
+            return {"content": "resume score=70", "entry_ids": [], "cost_usd": 0.35}
+
+        async def revise(previous, issues):
+            # 95 but failing, then a passing 91
+            content = "resume score=95 status=FAIL" if not revised else "resume score=91 status=PASS"
+            revised.append(content)
+            return {"content": content, "entry_ids": [], "cost_usd": 0.35}
+
+        config = {"generation": {"speculative_drafts": 1, "max_programmatic_iterations": 4}}
+        result = asyncio.run(SpeculativeResumeLoop(draft, revise, ScoreVerifier(), config, BUDGET).run())
+        assert result["verification"] == {"status": "PASS", "quality_score": 91, "issues": []}
+        assert len(revised) == 2
+
+    def test_revises_best_draft_only(self):
+        loop = make_loop([60, 80, 70])
+        result = asyncio.run(loop.run())
+        # best draft (80) revised: 85, 90 -> PASS
+        assert result["candidate"]["index"] == 1
+        assert result["verification"]["quality_score"] == 90
+        revisions = [h for h in result["history"] if h["iteration"] > 0]
+        assert [h["quality_score"] for h in revisions] == [85, 90]
+        assert result["cost_usd"] == pytest.approx(0.35 * 5)
+
+    def test_drafts_run_concurrently(self):
+        """Every draft starts before any of them finishes."""
+        log = []
+        loop = make_loop([60, 70, 80], delays=[0.02, 0.01, 0.03], revise_step=20, log=log)
+        asyncio.run(loop.run())
+        first_done = next(i for i, (event, _) in enumerate(log) if event == "done")
+        assert sorted(log[:first_done]) == [("start", 0), ("start", 1), ("start", 2)]
+
+    def test_failed_draft_skipped(self):
+        """One draft raising doesn't abort the run or discard the others."""
+        loop = make_loop([None, 95, 70], delays=[0.0, 0.01, 0.02])
+        result = asyncio.run(loop.run())
+        assert result["candidate"]["index"] == 1
+        assert result["failed"] == 1
+        assert {"iteration": 0, "draft": 0, "quality_score": None, "status": "ERROR",
+                "error": "ConnectionError('draft 0 API error')"} in result["history"]
+
+    def test_all_drafts_failing_raises(self):
+        loop = make_loop([None, None], drafts=2)
+        with pytest.raises(ConnectionError):
+            asyncio.run(loop.run())
+
+    def test_revision_stops_at_limit(self):
+        budget = {"budget": {"per_application_limit_usd": 2.60},
+                  "estimates": {"with_cover_letter": 1.50, "resume_draft": 0.35}}
+        loop = make_loop([10, 20, 30, 40], drafts=4, budget=budget, revise_step=1)
+        result = asyncio.run(loop.run())
+        assert result["drafts"] == 4
+        assert result["cost_usd"] <= 2.60
+        assert result["verification"]["status"] == "FAIL"
+
+    def test_checkpoint_callback(self):
+        seen = []
+        loop = make_loop([80, 60], drafts=2)
+        loop.on_iteration = lambda i, cand, v: seen.append((i, v["quality_score"]))
+        asyncio.run(loop.run())
+        assert sorted(seen)[:2] == [(0, 60), (0, 80)]
+        assert (1, 85) in seen
@@ -0,0 +1,105 @@
+"""Tests for the SQLite-backed StateManager."""
+
+import json
+
+import pytest
+
+from agents.state import StateConflict, StateManager
+
+
+@pytest.fixture
+def state(tmp_path):
+    manager = StateManager({"state": {"db_path": str(tmp_path / "state.db"), "json_path": None}})
+    yield manager
+    manager.close()
+
+
+class TestApplications:
+    def test_upsert_and_update_merges_data(self, state):
+        state.upsert_application("job1", company={"name": "Acme"}, title="Statistician",
+                                 composite_score=82, notes="first")
+        row = state.upsert_application("job1", status="ready", notes="second")
+        assert row["company"] == "Acme"
+        assert row["status"] == "ready"
+        assert row["notes"] == "second"
+        assert row["composite_score"] == 82
+
+    def test_set_status_compare_and_set(self, state):
+        state.upsert_application("job1", status="ready")
+        assert state.set_status("job1", "submitted", expected="ready")
+        assert not state.set_status("job1", "submitted", expected="ready")
+        assert state.get_application("job1")["status"] == "submitted"
+
+    def test_transition_is_all_or_nothing(self, state):
+        state.upsert_application("a", status="ready")
+        state.upsert_application("b", status="pending")
+        with pytest.raises(StateConflict):
+            state.transition([("a", "submitted", "ready"), ("b", "submitted", "ready")])
+        assert state.get_application("a")["status"] == "ready"
+
+    def test_filters_and_counts(self, state):
+        state.upsert_application("a", status="ready", company="Acme")
+        state.upsert_application("b", status="ready", company="Beta")
+        state.upsert_application("c", status="generating", company="acme")
+        assert {r["job_id"] for r in state.applications(status="ready")} == {"a", "b"}
+        assert {r["job_id"] for r in state.applications(company="ACME")} == {"a", "c"}
+        assert state.count_by_status() == {"ready": 2, "generating": 1}
+        assert state.incomplete() == ["c"]
+
+    def test_pagination(self, state):
+        for i in range(5):
+            state.upsert_application(f"job{i}")
+        first = state.applications(limit=2)
+        rest = state.applications(limit=10, offset=2)
+        assert len(first) == 2 and len(rest) == 3
+        assert not {r["job_id"] for r in first} & {r["job_id"] for r in rest}
+
+    def test_listeners_fire_after_commit_only(self, state):
+        events = []
+        state.add_listener(events.append)
+        state.upsert_application("a", status="ready")
+        state.upsert_application("b", status="pending")
+        with pytest.raises(StateConflict):
+            state.transition([("a", "submitted", None), ("b", "submitted", "ready")])
+        state.set_status("a", "submitted")
+        assert [(e["job_id"], e["old"], e["new"]) for e in events] == [
+            ("a", None, "ready"), ("b", None, "pending"), ("a", "ready", "submitted"),
+        ]
+
+
+class TestBudgetAndFlags:
+    def test_costs_by_day_and_job(self, state):
+        state.record_cost(0.40, job_id="a", agent="resume")
+        state.record_cost(0.10, job_id="a", agent="verify")
+        state.record_cost(0.25, job_id="b", agent="resume")
+        assert state.spent_for("a") == pytest.approx(0.50)
+        assert state.spent_on() == pytest.approx(0.75)
+        assert state.spent_on("2000-01-01") == 0
+
+    def test_flags_round_trip(self, state):
+        assert state.get("paused", False) is False
+        state.set("paused", True)
+        assert state.get("paused") is True
+
+
+class TestImport:
+    def test_import_once(self, tmp_path):
+        legacy = tmp_path / "state.json"
+        legacy.write_text(json.dumps({
+            "paused": True,
+            "jobs": {"a": {"company": {"name": "Acme"}, "role": {"title": "Analyst"}}},
+            "applications": {"a": {"status": "submitted", "outcome": "interview"}},
+            "budget": {"entries": [{"ts": "2026-01-05T10:00:00", "job_id": "a", "cost_usd": 1.2}]},
+        }))
+        config = {"state": {"db_path": str(tmp_path / "state.db"), "json_path": str(legacy)}}
+        state = StateManager(config)
+        assert state.get_application("a")["outcome"] == "interview"
+        assert state.get_job("a")["company"]["name"] == "Acme"
+        assert state.spent_on("2026-01-05") == pytest.approx(1.2)
+        assert state.get("paused") is True
+        assert state.import_json(str(legacy)) == {"skipped": True}
+        state.close()
+
+        reopened = StateManager(config)
+        assert reopened.count_by_status() == {"submitted": 1}
+        reopened.close()
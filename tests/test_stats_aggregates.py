@@ -0,0 +1,93 @@
+"""Tests for incrementally maintained Stats view aggregates."""
+
+from datetime import datetime, timezone
+
+import pytest
+
+from agents.state import StateConflict, StateManager
+from calibration.stats_aggregates import StatsAggregates, main
+
+
+@pytest.fixture
+def state(tmp_path):
+    manager = StateManager({"state": {"db_path": str(tmp_path / "state.db"), "json_path": None}})
+    yield manager
+    manager.close()
+
+
+@pytest.fixture
+def aggregates(state):
+    return StatsAggregates(state)
+
+
+def populate(state):
+    state.upsert_application("a", status="submitted", classification="STRONG", composite_score=8.2)
+    state.upsert_application("b", status="submitted", classification="GOOD", composite_score=6.8)
+    state.upsert_application("c", status="ready", classification="GOOD", composite_score=7.0)
+    state.upsert_application("a", outcome="interview")
+    state.upsert_application("b", outcome="rejection")
+    state.record_cost(1.25, job_id="a", agent="resume")
+    state.record_cost(0.50, job_id="b", agent="verify")
+
+
+class TestStatsAggregates:
+    def test_counts_follow_status_changes(self, state, aggregates):
+        populate(state)
+        state.set_status("c", "submitted", expected="ready")
+        stats = aggregates.stats()
+        assert stats["total_applications"] == 3
+        assert stats["by_status"] == {"submitted": 3}
+        assert stats["by_classification"] == {"STRONG": 1, "GOOD": 2}
+        assert stats["applied"] == 3
+        assert stats["conversion_rate"] == pytest.approx(1 / 3)
+        assert stats["conversion_by_classification"]["STRONG"]["rate"] == 1.0
+
+    def test_funnel_score_and_cost(self, state, aggregates):
+        populate(state)
+        stats = aggregates.stats(days=7)
+        assert dict(stats["funnel"]) == {"queued": 3, "applied": 2, "responded": 2,
+                                         "phone_screen": 1, "interview": 1, "offer": 0}
+        assert stats["score_distribution"] == [(6.5, 1), (7.0, 1), (8.0, 1)]
+        assert stats["total_cost_usd"] == pytest.approx(1.75)
+        assert stats["apps_over_time"][-1] == (datetime.now(timezone.utc).date().isoformat(), 3)
+        assert len(stats["apps_over_time"]) == 7
+
+    def test_today_is_the_utc_date(self, aggregates, monkeypatch):
+        """Buckets are UTC days, so the window ends on the UTC date, not the local one."""
+        class FixedClock(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime(2026, 3, 2, 0, 30, tzinfo=timezone.utc).astimezone(tz)
+
+        monkeypatch.setattr("calibration.stats_aggregates.datetime", FixedClock)
+        assert aggregates.stats(days=2)["apps_over_time"] == [("2026-03-01", 0), ("2026-03-02", 0)]
+
+    def test_incremental_matches_rebuild(self, state, aggregates):
+        populate(state)
+        state.transition([("a", "withdrawn", "submitted"), ("c", "skipped", "ready")])
+        assert aggregates.check() == []
+        before = aggregates.stats()
+        aggregates.rebuild()
+        assert aggregates.stats() == before
+
+    def test_failed_transition_leaves_counters(self, state, aggregates):
+        populate(state)
+        before = aggregates.stats()
+        with pytest.raises(StateConflict):
+            state.transition([("c", "submitted", "ready"), ("a", "submitted", "ready")])
+        assert aggregates.stats() == before
+
+    def test_existing_history_built_on_first_use(self, state):
+        populate(state)
+        stats = StatsAggregates(state).stats()
+        assert stats["total_applications"] == 3
+
+    def test_check_cli_reports_drift(self, tmp_path, state, aggregates, capsys):
+        populate(state)
+        state.conn.execute("UPDATE stats_aggregates SET value = value + 1 WHERE metric = 'status'")
+        config = tmp_path / "config.yaml"
+        config.write_text(f"state:\n  db_path: {tmp_path / 'state.db'}\n  json_path: null\n")
+        assert main(["--config", str(config), "--check"]) == 1
+        assert main(["--config", str(config)]) == 0
+        assert main(["--config", str(config), "--check"]) == 0
+        assert "0 counter(s) drifted" in capsys.readouterr().out
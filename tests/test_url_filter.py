@@ -0,0 +1,169 @@
+"""Tests for URL canonicalization and the URL Bloom filter."""
+
+import pytest
+
+from agents.dedup import JobDeduplicator
+from agents.url_filter import URLFilter, canonicalize_url
+
+
+class TestCanonicalize:
+    @pytest.mark.parametrize("url,expected", [
+        ("https://boards.greenhouse.io/Adaptive/jobs/123?gh_src=abc&utm_source=li",
+         "https://boards.greenhouse.io/adaptive/jobs/123"),
+        ("https://job-boards.greenhouse.io/adaptive/jobs/123/",
+         "https://boards.greenhouse.io/adaptive/jobs/123"),
+        ("https://boards.greenhouse.io/embed/job_app?for=adaptive&token=123",
+         "https://boards.greenhouse.io/adaptive/jobs/123"),
+        ("https://jobs.lever.co/acme/0c5e4a3e-1b2c-4d5e-8f90-123456789abc/apply?lever-source=LinkedIn",
+         "https://jobs.lever.co/acme/0c5e4a3e-1b2c-4d5e-8f90-123456789abc"),
+        ("https://www.linkedin.com/jobs/view/senior-biostatistician-at-acme-3812345678/?trk=public",
+         "https://linkedin.com/jobs/view/3812345678"),
+        ("https://www.linkedin.com/jobs/search/?currentJobId=3812345678&keywords=stats",
+         "https://linkedin.com/jobs/view/3812345678"),
+        ("https://www.indeed.com/rc/clk?jk=abc123&fccid=x&vjs=3",
+         "https://indeed.com/viewjob?jk=abc123"),
+        ("https://www.indeed.com/jobs?q=statistician&vjk=abc123",
+         "https://indeed.com/viewjob?jk=abc123"),
+        ("https://careers.acme.com/jobs/42/?utm_campaign=x&b=2&a=1#apply",
+         "https://careers.acme.com/jobs/42?a=1&b=2"),
+    ])
+    def test_shapes(self, url, expected):
+        assert canonicalize_url(url) == expected
+
+    def test_redirect_wrapper_unwrapped(self):
+        wrapped = ("https://www.linkedin.com/redir/redirect?url="
+                   "https%3A%2F%2Fboards.greenhouse.io%2Fadaptive%2Fjobs%2F123%3Fgh_src%3Dli")
+        assert canonicalize_url(wrapped) == "https://boards.greenhouse.io/adaptive/jobs/123"
+
+    @pytest.mark.parametrize("param", ["position", "sid", "cid", "source", "origin", "from", "ref"])
+    def test_generic_params_kept_on_unknown_hosts(self, param):
+        """On a board we don't know, a generic name may be what identifies the posting."""
+        first = canonicalize_url(f"https://careers.acme.com/job?{param}=101")
+        assert first == f"https://careers.acme.com/job?{param}=101"
+        assert first != canonicalize_url(f"https://careers.acme.com/job?{param}=102")
+
+    def test_generic_params_stripped_on_known_hosts(self):
+        assert canonicalize_url("https://www.linkedin.com/company/acme/?refId=x&position=3") == \
+            "https://linkedin.com/company/acme"
+
+    def test_redirect_params_only_unwrapped_on_redirectors(self):
+        search = "https://careers.acme.com/search?q=https%3A%2F%2Fother.com%2Fjobs%2F1"
+        assert canonicalize_url(search).startswith("https://careers.acme.com/search?q=")
+        assert canonicalize_url("https://www.google.com/url?q=https%3A%2F%2Facme.com%2Fjobs%2F1%3Futm_source%3Dg") \
+            == "https://acme.com/jobs/1"
+
+    def test_career_site_gh_jid(self):
+        assert canonicalize_url("https://acme.com/careers/?gh_jid=555&utm_medium=x") == \
+            "https://acme.com/careers?gh_jid=555"
+
+    def test_empty(self):
+        assert canonicalize_url("") == ""
+
+
+class TestURLFilter:
+    def test_no_false_negatives(self):
+        f = URLFilter(capacity=1000)
+        urls = [f"https://example.com/jobs/{i}" for i in range(1000)]
+        for u in urls:
+            f.add(u)
+        assert all(u in f for u in urls)
+
+    def test_false_positive_rate_near_target(self):
+        f = URLFilter(capacity=5000, fp_rate=0.01)
+        for i in range(5000):
+            f.add(f"https://example.com/jobs/{i}")
+        fps = sum(f"https://other.com/{i}" in f for i in range(20000))
+        assert fps / 20000 < 0.02
+        assert f.expected_fp_rate() == pytest.approx(0.01, rel=0.3)
+
+    def test_save_and_load(self, tmp_path):
+        f = URLFilter(capacity=100)
+        f.add("https://example.com/a")
+        path = str(tmp_path / "urls.bloom")
+        f.save(path)
+        loaded = URLFilter.load(path)
+        assert "https://example.com/a" in loaded
+        assert loaded.count == 1 and loaded.num_hashes == f.num_hashes
+
+    def test_load_rejects_other_files(self, tmp_path):
+        path = tmp_path / "junk.bloom"
+        path.write_bytes(b"not a filter")
+        with pytest.raises(ValueError):
+            URLFilter.load(str(path))
+
+
+def make_job(job_id, url):
+    return {
+        "job_id": job_id,
+        "source_url": url,
+        "company": {"name": "Acme"},
+        "role": {"title": "Statistician", "url": url, "description_raw": f"posting {job_id}"},
+    }
+
+
+@pytest.fixture
+def config(tmp_path):
+    return {"dedup": {"seen_jobs_path": str(tmp_path / "seen_jobs.db"), "url_filter_capacity": 1000}}
+
+
+class TestDeduplicatorIntegration:
+    def test_tracking_params_still_duplicate(self, config):
+        d = JobDeduplicator(config)
+        d.add_seen(make_job("a", "https://boards.greenhouse.io/acme/jobs/7"))
+        is_dup, match, sim = d.is_duplicate(
+            make_job("b", "https://boards.greenhouse.io/acme/jobs/7/?gh_src=x&utm_source=y")
+        )
+        assert is_dup and match == "a" and sim == 1.0
+        d.close()
+
+    def test_new_urls_skip_database(self, config):
+        """URLs the filter rejects never reach seen_jobs.db."""
+        d = JobDeduplicator(config)
+        d.add_many(make_job(str(i), f"https://acme.com/jobs/{i}") for i in range(200))
+        for i in range(1000, 1500):
+            d.is_duplicate(make_job(str(i), f"https://acme.com/jobs/{i}"))
+        report = d.url_filter_report()
+        assert report["checks"] == 500
+        assert report["db_lookups"] == report["false_positives"] < 25
+        assert report["memory_bytes"] == d.url_filter.memory_bytes()
+        d.close()
+
+    def test_filter_persists_across_restarts(self, config):
+        d = JobDeduplicator(config)
+        d.add_seen(make_job("a", "https://jobs.lever.co/acme/0c5e4a3e-1b2c-4d5e-8f90-123456789abc"))
+        d.close()
+        d = JobDeduplicator(config)
+        assert d.url_filter.count == 1
+        assert d.is_duplicate(make_job("b", "https://jobs.lever.co/acme/0c5e4a3e-1b2c-4d5e-8f90-123456789abc/apply"))[0]
+        d.close()
+
+    def test_filter_saved_every_n_urls(self, config, tmp_path):
+        config["dedup"]["url_filter_save_every"] = 3
+        path = str(tmp_path / "seen_jobs_urls.bloom")
+        d = JobDeduplicator(config)
+        for i in range(4):
+            d.add_seen(make_job(str(i), f"https://acme.com/jobs/{i}"))
+            assert URLFilter.load(path).count == (3 if i >= 2 else 0)
+        # No close(): the saved filter lags seen_jobs and is rebuilt
+        d.conn.close()
+        d.lsh.close()
+        d = JobDeduplicator(config)
+        assert "https://acme.com/jobs/3" in d.url_filter
+        d.close()
+
+    def test_stale_filter_rebuilt(self, config, tmp_path):
+        """A filter missing rows (e.g. deleted file) is rebuilt from seen_jobs."""
+        d = JobDeduplicator(config)
+        d.add_seen(make_job("a", "https://acme.com/jobs/1"))
+        d.close()
+        (tmp_path / "seen_jobs_urls.bloom").unlink()
+        d = JobDeduplicator(config)
+        assert "https://acme.com/jobs/1" in d.url_filter
+        d.close()
+
+    def test_grows_past_capacity(self, config):
+        d = JobDeduplicator(config)
+        d.add_many(make_job(str(i), f"https://acme.com/jobs/{i}") for i in range(1500))
+        assert d.url_filter.capacity >= 3000
+        assert d.is_duplicate(make_job("x", "https://acme.com/jobs/1499"))[0]
+        d.close()
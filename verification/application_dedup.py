@@ -0,0 +1,305 @@
+"""ApplicationDeduplicator: Submission-time dedup against past applications.
+
+Answers "have we already applied to a similar role at this company?"
+(Appendix B.9). The §5.6 version runs SequenceMatcher on company and title
+against every past application. This version keeps an index that is updated as
+history changes:
+
+- company blocks keyed by a normalized name (legal suffixes stripped, aliases
+  collapsed), plus the spec's fuzzy company comparison run once per distinct
+  company name rather than once per application
+- a length and character-bigram index over distinct company names, so the
+  fuzzy comparison only runs against names that could reach
+  company_threshold (see _fuzzy_candidates), never against every name
+- a title trigram index that orders same-block candidates so the likeliest
+  duplicate is compared first
+
+Verdicts equal the linear scan's with one intended difference: a company
+matches when the scan's fuzzy comparison accepts it OR when both names
+normalize to the same key. Normalization therefore only adds matches the
+scan misses (e.g. "Pfizer Inc." vs "Pfizer", "Citadel LLC" vs "Citadel");
+it never removes one. Title comparison is the scan's SequenceMatcher ratio
+and threshold.
+
+Keep the index current with attach(state), which follows StateManager
+application changes, or with add/update/remove. check(job, history) still
+accepts the §5.6 history list, but only indexes what it hasn't seen:
+the same list again costs nothing, and a list that only grew has just its new
+tail indexed.
+"""
+
+import math
+import re
+from collections import Counter
+from difflib import SequenceMatcher
+
+LEGAL_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "corp", "corporation", "co",
+    "company", "plc", "gmbh", "ag", "sa", "lp", "llp", "pbc", "nv", "bv",
+}
+
+COMPANY_ALIASES = {
+    "alphabet": "google",
+    "facebook": "meta",
+    "meta platforms": "meta",
+    "amazon web services": "amazon",
+    "aws": "amazon",
+    "jpmorgan chase": "jpmorgan",
+    "jp morgan": "jpmorgan",
+    "merck sharp and dohme": "merck",
+    "msd": "merck",
+}
+
+IGNORED_STATUSES = ("skipped", "error")
+
+
+def normalize_company(name: str, aliases: dict | None = None) -> str:
+    """Lowercase, drop punctuation and trailing legal suffixes, then apply aliases."""
+    aliases = COMPANY_ALIASES if aliases is None else aliases
+    text = name.lower().replace("&", " and ")
+    words = re.findall(r"[a-z0-9]+", text)
+    while len(words) > 1 and words[-1] in LEGAL_SUFFIXES:
+        words.pop()
+    normalized = " ".join(words)
+    return aliases.get(normalized, normalized)
+
+
+def company_bigrams(name: str) -> Counter:
+    return Counter(name[i:i + 2] for i in range(len(name) - 1))
+
+
+def title_trigrams(title: str) -> set:
+    padded = f"  {title.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ApplicationDeduplicator:
+    def __init__(self, application_history=None, config: dict | None = None):
+        config = (config or {}).get("application_dedup", {})
+        self.company_threshold = config.get("company_threshold", 0.80)
+        self.title_threshold = config.get("title_threshold", 0.75)
+        self.aliases = {**COMPANY_ALIASES, **config.get("company_aliases", {})}
+
+        self._apps = {}          # key -> app dict
+        self._fields = {}        # key -> (company, title) as indexed
+        self._seq = {}           # key -> history position (ties keep scan order)
+        self._blocks = {}        # normalized company -> {keys}
+        self._raw = {}           # lowercased company -> {keys}
+        self._raw_lengths = {}   # len(lowercased company) -> {lowercased companies}
+        self._raw_bigrams = {}   # character bigram -> {lowercased companies}
+        self._trigrams = {}      # key -> title trigram set
+        self._company_cache = {}  # lowercased query company -> {matching raw names}
+        self._next_seq = 0
+        self._history_seen = (None, 0)  # (history object, length) last synced by check()
+
+        if application_history:
+            self.sync(application_history)
+
+    def __len__(self) -> int:
+        return len(self._apps)
+
+    def add(self, app: dict, key=None) -> None:
+        """Index (or re-index) one past application. key defaults to app['job_id']."""
+        key = self._key(app, key)
+        if key in self._apps:
+            self.remove(key)
+        company = app.get("company", "")
+        self._apps[key] = app
+        self._fields[key] = (company, app.get("title", ""))
+        self._seq[key] = self._next_seq
+        self._next_seq += 1
+
+        self._blocks.setdefault(normalize_company(company, self.aliases), set()).add(key)
+        raw = company.lower()
+        if raw not in self._raw:
+            self._index_company(raw)
+        self._raw.setdefault(raw, set()).add(key)
+        self._trigrams[key] = title_trigrams(app.get("title", ""))
+
+    def update(self, app: dict, key=None) -> None:
+        """Apply a change to an indexed application (status, title, company)."""
+        key = self._key(app, key)
+        if self._fields.get(key) == (app.get("company", ""), app.get("title", "")):
+            self._apps[key] = app  # status-only change: no re-indexing needed
+            return
+        seq = self._seq.get(key)
+        self.add(app, key)
+        if seq is not None:
+            self._seq[key] = seq
+
+    def remove(self, key) -> None:
+        if self._apps.pop(key, None) is None:
+            return
+        self._seq.pop(key, None)
+        self._trigrams.pop(key, None)
+        company, _ = self._fields.pop(key)
+        self._discard(self._blocks, normalize_company(company, self.aliases), key)
+        if self._discard(self._raw, company.lower(), key):
+            self._unindex_company(company.lower())
+
+    def attach(self, state) -> None:
+        """Index every application in a StateManager, then follow its changes."""
+        apps, offset = [], 0
+        while True:
+            page = state.applications(limit=500, offset=offset)
+            apps.extend(page)
+            offset += len(page)
+            if len(page) < 500:
+                break
+        for app in reversed(apps):  # oldest first, the order a history list has
+            self.update(app, app["job_id"])
+        state.add_listener(self._on_state)
+
+    def sync(self, application_history) -> None:
+        """Bring the index in line with a history list or {job_id: app} dict."""
+        if isinstance(application_history, dict):
+            items = list(application_history.items())
+        else:
+            items = []
+            for i, app in enumerate(application_history):
+                key = self._key(app)
+                items.append((i if key is None else key, app))
+        wanted = {key for key, _ in items}
+        for key in [k for k in self._apps if k not in wanted]:
+            self.remove(key)
+        for key, app in items:
+            self.update(app, key)
+
+    def check(self, job: dict, application_history=None) -> tuple:
+        """Checks if we already applied to a similar role at the same company.
+
+        Returns (is_dup, past_app, title_similarity). application_history is
+        accepted for compatibility with §5.6; only history not already indexed
+        is synced (see _sync_new).
+        """
+        if application_history is not None:
+            self._sync_new(application_history)
+
+        company = job.get("company", {}).get("name", "")
+        title = job.get("role", {}).get("title", "").lower()
+
+        candidates = set(self._blocks.get(normalize_company(company, self.aliases), ()))
+        for raw in self._similar_companies(company.lower()):
+            candidates |= self._raw[raw]
+        if not candidates:
+            return (False, None, 0.0)
+
+        grams = title_trigrams(title)
+        ordered = sorted(
+            candidates, key=lambda k: (-len(grams & self._trigrams[k]), self._seq[k])
+        )
+
+        for key in ordered:
+            past = self._apps[key]
+            if past.get("status") in IGNORED_STATUSES:
+                continue
+            matcher = SequenceMatcher(None, title, past.get("title", "").lower())
+            # quick_ratio() is an upper bound on ratio(): skip the full comparison when it can't pass
+            if matcher.quick_ratio() <= self.title_threshold:
+                continue
+            title_sim = matcher.ratio()
+            if title_sim > self.title_threshold:
+                return (True, past, title_sim)
+        return (False, None, 0.0)
+
+    def _sync_new(self, application_history) -> None:
+        """Skip history check() has already indexed. Past apps are held by reference,
+        so in-place status changes are seen without re-syncing; company or title
+        edits should go through update() or attach()."""
+        seen, seen_len = self._history_seen
+        size = len(application_history)
+        if application_history is seen and size == seen_len:
+            return
+        if application_history is seen and size > seen_len and isinstance(application_history, list):
+            for i in range(seen_len, size):
+                app = application_history[i]
+                key = self._key(app)
+                self.update(app, i if key is None else key)
+        else:
+            self.sync(application_history)
+        self._history_seen = (application_history, size)
+
+    def _on_state(self, event: dict) -> None:
+        if event["kind"] == "application" and event["row"] is not None:
+            self.update(event["row"], event["job_id"])
+
+    def _similar_companies(self, company: str) -> set:
+        """Distinct indexed company names the spec's fuzzy comparison accepts."""
+        if company not in self._company_cache:
+            self._company_cache[company] = {
+                raw for raw in self._fuzzy_candidates(company) if self._companies_match(company, raw)
+            }
+        return self._company_cache[company]
+
+    def _companies_match(self, a: str, b: str) -> bool:
+        matcher = SequenceMatcher(None, a, b)
+        if matcher.real_quick_ratio() < self.company_threshold:
+            return False
+        return matcher.ratio() >= self.company_threshold
+
+    def _fuzzy_candidates(self, company: str) -> set:
+        """Indexed names that can reach company_threshold against company; a superset
+        of the fuzzy matches, so _similar_companies still equals a full scan.
+
+        ratio = 2M / (la + lb), where M matched characters form a common
+        subsequence. So lb is bounded by la (the real_quick_ratio bound), and
+        the two names share at least 3M - la - lb - 1 character bigrams: each
+        character of a outside the subsequence breaks at most two of a's
+        bigrams, and each of b's extra characters at most one. A name sharing
+        that many must contain one of the query's rarest bigrams, so only
+        those postings are read.
+        """
+        t = self.company_threshold
+        la = len(company)
+        needs = {}  # candidate length -> bigrams it must share
+        for lb in self._raw_lengths:
+            total = la + lb
+            if total and 2 * min(la, lb) / total < t - 1e-9:
+                continue
+            needs[lb] = 3 * math.ceil(t * total / 2 - 1e-9) - total - 1
+        candidates = set()
+        for lb, need in needs.items():
+            if need <= 0:  # very short names: nothing to filter on
+                candidates |= self._raw_lengths[lb]
+        positive = [need for need in needs.values() if need > 0]
+        if positive:
+            grams = company_bigrams(company)
+            remaining, least = sum(grams.values()), min(positive)
+            for gram in sorted(grams, key=lambda g: len(self._raw_bigrams.get(g, ()))):
+                if remaining < least:
+                    break
+                candidates |= self._raw_bigrams.get(gram, set())
+                remaining -= grams[gram]
+        return {raw for raw in candidates if len(raw) in needs}
+
+    def _index_company(self, raw: str) -> None:
+        self._raw_lengths.setdefault(len(raw), set()).add(raw)
+        for gram in company_bigrams(raw):
+            self._raw_bigrams.setdefault(gram, set()).add(raw)
+        # Only cached queries this name matches change
+        for company, matches in self._company_cache.items():
+            if self._companies_match(company, raw):
+                matches.add(raw)
+
+    def _unindex_company(self, raw: str) -> None:
+        self._discard(self._raw_lengths, len(raw), raw)
+        for gram in company_bigrams(raw):
+            self._discard(self._raw_bigrams, gram, raw)
+        for matches in self._company_cache.values():
+            matches.discard(raw)
+
+    def _key(self, app: dict, key=None):
+        if key is not None:
+            return key
+        return app.get("job_id", app.get("id"))
+
+    def _discard(self, index: dict, bucket, key) -> bool:
+        """Remove key from index[bucket]; returns True if the bucket emptied."""
+        keys = index.get(bucket)
+        if keys is None:
+            return False
+        keys.discard(key)
+        if not keys:
+            del index[bucket]
+            return True
+        return False
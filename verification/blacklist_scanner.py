@@ -26,11 +26,14 @@ class BlacklistScanner:
 
         # Phrase matching: exact substring, case-insensitive (HIGH severity)
         for phrase in self.phrases:
-            if phrase.lower() in content_lower:
+            position = content_lower.find(phrase.lower())
+            if position >= 0:
                 issues.append({
                     "type": "AI_PHRASE",
                     "severity": "HIGH",
                     "text": phrase,
+                    "start": position,  # first occurrence
+                    "end": position + len(phrase),
                     "message": f"Blacklisted phrase: '{phrase}'",
                 })
 
@@ -57,15 +60,19 @@ class BlacklistScanner:
                             "type": "AI_VOCABULARY",
                             "severity": "MEDIUM",
                             "text": word,
+                            "start": m.start(),
+                            "end": m.end(),
                             "message": f"Blacklisted: '{word}' (no exception context)",
                         })
             else:
                 # Non-context-dependent: flag each occurrence
-                for _ in re.finditer(pattern, content, re.I):
+                for m in re.finditer(pattern, content, re.I):
                     issues.append({
                         "type": "AI_VOCABULARY",
                         "severity": "MEDIUM",
                         "text": word,
+                        "start": m.start(),
+                        "end": m.end(),
                         "message": f"Blacklisted: '{word}'",
                     })
 
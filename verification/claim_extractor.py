@@ -2,10 +2,15 @@
 
 Each bullet point = one claim unit. Section headers are skipped.
 Cover letter extraction splits on sentence boundaries.
+
+Resume lines come from the shared markdown parse (common/markdown_ast.py),
+so a document version is only scanned once however many checks read it.
 """
 
 import re
 
+from common.markdown_ast import is_claim_bullet, parse
+
 
 class ClaimExtractor:
     def extract_from_resume(self, markdown_content: str) -> list[dict]:
@@ -18,29 +23,24 @@ class ClaimExtractor:
         - type: "bullet" | "structural" | "content"
         """
         claims = []
-        lines = markdown_content.strip().split('\n')
-        current_section = None
-
-        for i, line in enumerate(lines):
-            stripped = line.strip()
-            if not stripped:
-                continue
-            if stripped.startswith('#'):
-                current_section = stripped.lstrip('#').strip().lower()
+        for node in parse(markdown_content).lines:
+            section = node["section"]
+            if node["kind"] == "heading":
                 continue
-            if re.match(r'^[-*•]\s+', stripped):
+            if is_claim_bullet(node):
                 claims.append({
-                    "text": re.sub(r'^[-*•]\s+', '', stripped),
-                    "line_number": i + 1,
-                    "section": current_section,
+                    "text": node["text"],
+                    "line_number": node["line_number"],
+                    "section": section,
                     "type": "bullet",
                 })
-            elif current_section in ("experience", "education", "publications", "skills"):
-                claim_type = "structural" if self._is_structural(stripped) else "content"
+            elif section in ("experience", "education", "publications", "skills"):
+                text = node["text"] if node["kind"] == "text" else node["source"]
+                claim_type = "structural" if self._is_structural(text) else "content"
                 claims.append({
-                    "text": stripped,
-                    "line_number": i + 1,
-                    "section": current_section,
+                    "text": text,
+                    "line_number": node["line_number"],
+                    "section": section,
                     "type": claim_type,
                 })
 
@@ -0,0 +1,204 @@
+"""LiveLinter: Fast re-verification of a document while it is being edited.
+
+The Human Edit Policy (§10) only offers a manual "Re-verify", which runs the
+full verify_resume. LiveLinter re-checks the CodeMirror buffer as the user
+types, running only the cheap checks:
+
+- BlacklistScanner, NumberChecker and SkillLevelChecker on the whole buffer
+  (regex passes, a few milliseconds)
+- SourceMapper only for claims whose text changed. Mapping results are cached
+  by claim text, so an edit to one bullet re-maps one bullet.
+
+Every issue carries start/end character offsets into the buffer for inline
+highlighting (document-level issues have none). The spaCy structural checks
+are too slow to run per keystroke. They run via structural() only once the
+editor has been idle, and LintSession handles both the debounce and the
+idle timer.
+
+A live lint never blocks approval and is advisory, like Re-verify.
+"""
+
+import asyncio
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+
+from verification.blacklist_scanner import BlacklistScanner
+from verification.claim_extractor import ClaimExtractor
+from verification.number_checker import NumberChecker
+from verification.skill_checker import SkillLevelChecker
+from verification.source_mapper import SourceMapper
+
+logger = logging.getLogger(__name__)
+
+SEVERITY_POINTS = {"HIGH": 15, "MEDIUM": 5, "LOW": 1}
+
+
+def claim_spans(content: str, claims: list[dict], content_type: str) -> list[tuple]:
+    """(start, end) offsets in content for each claim from ClaimExtractor.
+
+    The extractor works on content.strip(), so offsets are shifted by the
+    stripped leading whitespace.
+    """
+    base = content.strip()
+    lead = len(content) - len(content.lstrip())
+    spans = []
+    if content_type == "resume":
+        line_starts = [0] + [m.end() for m in re.finditer("\n", base)]
+        for claim in claims:
+            line_start = line_starts[claim["line_number"] - 1]
+            line_end = base.find("\n", line_start)
+            line = base[line_start:] if line_end < 0 else base[line_start:line_end]
+            at = line.find(claim["text"])
+            start = lead + line_start + max(at, 0)
+            spans.append((start, start + len(claim["text"])))
+    else:
+        cursor = 0
+        for claim in claims:
+            at = base.find(claim["text"], cursor)
+            if at < 0:
+                spans.append((None, None))
+                continue
+            cursor = at + len(claim["text"])
+            spans.append((lead + at, lead + cursor))
+    return spans
+
+
+class LiveLinter:
+    def __init__(self, profile_index, config: dict | None = None, structural=None):
+        """structural: optional StructuralAIDetector; built on first idle check otherwise."""
+        config = config or {}
+        live = config.get("live_lint", {})
+        self.config = config
+        self.claims = ClaimExtractor()
+        self.mapper = SourceMapper(profile_index, config.get("generation", {}))
+        self.numbers = NumberChecker(profile_index)
+        self.blacklist = BlacklistScanner(config.get("blacklist_path", "config/ai_blacklist.yaml"))
+        self.skill_checker = SkillLevelChecker(profile_index)
+        self.cache_size = live.get("claim_cache_size", 2000)
+        self._mapped = OrderedDict()  # (content_type, text, claimed_ids) -> (status, best)
+        self._lock = threading.Lock()  # _mapped and stats; lints run in worker threads
+        self._structural = structural
+        self.stats = {"lints": 0, "claims_mapped": 0, "claims_cached": 0}
+
+    def lint(self, content: str, content_type: str = "resume", claimed_ids=None) -> dict:
+        """Cheap checks only. Returns {"issues", "counts", "elapsed_ms", "claims_mapped"}."""
+        start = time.perf_counter()
+        issues = self._span_issues(content)
+        grounding, mapped = self._grounding(content, content_type, claimed_ids)
+        issues.extend(grounding)
+        issues.sort(key=lambda i: (i["start"] is None, i["start"] or 0))
+        with self._lock:
+            self.stats["lints"] += 1
+        return {
+            "issues": issues,
+            "counts": self._counts(issues),
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+            "claims_mapped": mapped,
+        }
+
+    def structural(self, content: str, content_type: str = "resume") -> dict:
+        """spaCy structural checks, for when the editor is idle. Document-level issues, no spans."""
+        start = time.perf_counter()
+        detector = self._structural_detector()
+        if detector is None:
+            return {"issues": [], "available": False, "elapsed_ms": 0.0}
+        issues = [{**i, "start": None, "end": None} for i in detector.check(content, content_type)]
+        return {
+            "issues": issues,
+            "available": True,
+            "elapsed_ms": round((time.perf_counter() - start) * 1000, 2),
+        }
+
+    def _span_issues(self, content: str) -> list[dict]:
+        issues = []
+        issues.extend(self.blacklist.check(content))
+        issues.extend(self.numbers.check(content))
+        issues.extend(self.skill_checker.check(content))
+        for issue in issues:
+            issue.setdefault("start", None)
+            issue.setdefault("end", None)
+        return issues
+
+    def _grounding(self, content: str, content_type: str, claimed_ids) -> tuple[list[dict], int]:
+        """Unmatched-claim issues, and how many claims had to be mapped (cache misses)."""
+        if content_type == "resume":
+            claims = self.claims.extract_from_resume(content)
+        else:
+            claims = self.claims.extract_from_cover_letter(content)
+        ids = tuple(sorted(claimed_ids or ()))
+        issues, mapped = [], 0
+        for claim, (start, end) in zip(claims, claim_spans(content, claims, content_type)):
+            key = (content_type, claim["type"], claim["text"], ids)
+            with self._lock:
+                cached = self._mapped.get(key)
+                if cached is not None:
+                    self._mapped.move_to_end(key)
+                    self.stats["claims_cached"] += 1
+            if cached is None:
+                # Mapped outside the lock: a concurrent lint of the same claim may map it too
+                result = self.mapper.map_claims([claim], list(ids) or None, content_type)[0]
+                cached = (result["status"], result["match"])
+                mapped += 1
+                with self._lock:
+                    self._mapped[key] = cached
+                    if len(self._mapped) > self.cache_size:
+                        self._mapped.popitem(last=False)
+                    self.stats["claims_mapped"] += 1
+            status, best = cached
+            if status == "unmatched":
+                issues.append({**self.mapper.unmatched_issue(claim, best), "start": start, "end": end})
+        return issues, mapped
+
+    def _structural_detector(self):
+        if self._structural is None:
+            try:
+                from verification.structural_detector import StructuralAIDetector
+                self._structural = StructuralAIDetector(self.config.get("structural_rules", {}))
+            except (ImportError, OSError) as e:
+                # spaCy or its model missing: live lint still works without structure
+                logger.warning("Structural checks unavailable for live lint: %s", e)
+                self._structural = False
+        return self._structural or None
+
+    def _counts(self, issues: list[dict]) -> dict:
+        counts = {s.lower(): sum(1 for i in issues if i["severity"] == s) for s in SEVERITY_POINTS}
+        counts["score_estimate"] = max(0, 100 - sum(SEVERITY_POINTS.get(i["severity"], 0) for i in issues))
+        return counts
+
+
+class LintSession:
+    """Debounce and idle scheduling for one editor (one websocket).
+
+    submit() supersedes any pending lint. The cheap lint runs after
+    debounce_ms of quiet, and structural checks after a further idle_seconds.
+    send(message) receives {"seq", "phase": "cheap" | "structural", ...}.
+    """
+
+    def __init__(self, linter: LiveLinter, send, config: dict | None = None):
+        live = (config or {}).get("live_lint", {})
+        self.linter = linter
+        self.send = send
+        self.debounce = live.get("debounce_ms", 150) / 1000
+        self.idle = live.get("structural_idle_seconds", 2.0)
+        self._task = None
+
+    def submit(self, seq: int, content: str, content_type: str = "resume", claimed_ids=None) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = asyncio.create_task(self._run(seq, content, content_type, claimed_ids))
+
+    async def _run(self, seq, content, content_type, claimed_ids) -> None:
+        await asyncio.sleep(self.debounce)
+        result = await asyncio.to_thread(self.linter.lint, content, content_type, claimed_ids)
+        await self.send({"seq": seq, "phase": "cheap", **result})
+        await asyncio.sleep(self.idle)
+        result = await asyncio.to_thread(self.linter.structural, content, content_type)
+        await self.send({"seq": seq, "phase": "structural", **result})
+
+    async def close(self) -> None:
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
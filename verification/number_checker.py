@@ -30,6 +30,8 @@ class NumberChecker:
                     "severity": "HIGH",
                     "number": number,
                     "context": context.strip(),
+                    "start": match.start(1),
+                    "end": match.end(1),
                     "message": f"Metric '{number}' not in profile. Context: {context.strip()}",
                 })
 
@@ -0,0 +1,132 @@
+"""PostingChecker: Bulk posting-liveness checks with conditional requests and a TTL cache.
+
+is_live(url) keeps the §5.6 contract: returns (is_live, status_code, notes).
+Requests go through the shared HTTPClient, so per-host politeness (concurrency
+and requests-per-minute caps) comes from config/rate_limits.yaml. Each check
+tries HEAD first, revalidates with ETag / If-Modified-Since, reads at most
+scan_kb of the body, and scans it with one compiled expired-signal matcher.
+Results are cached for cache_ttl_seconds so approve-time checks are instant.
+"""
+
+import asyncio
+import re
+import time
+
+import aiohttp
+
+EXPIRED_SIGNALS = [
+    "this job is no longer available",
+    "this position has been filled",
+    "this listing has expired",
+    "no longer accepting applications",
+    "this job has been closed",
+    "position closed",
+]
+
+DEAD_STATUSES = (404, 410)
+
+
+class PostingChecker:
+    def __init__(self, http_client, config: dict | None = None):
+        self.http = http_client
+        config = (config or {}).get("posting_checker", {})
+        self.ttl = config.get("cache_ttl_seconds", 6 * 3600)
+        self.scan_bytes = config.get("scan_kb", 64) * 1024
+        self.sweep_interval = config.get("sweep_interval_seconds", 3600)
+        signals = config.get("expired_signals", EXPIRED_SIGNALS)
+        self.matcher = re.compile("|".join(re.escape(s) for s in signals), re.I)
+        self._cache = {}
+
+    async def is_live(self, url: str, max_age: float | None = None) -> tuple:
+        """Returns (is_live, status_code, notes). Served from cache when fresh."""
+        cached = self.cached(url, max_age)
+        if cached is not None:
+            return cached
+        return await self._check(url)
+
+    async def check_many(self, urls, max_age: float | None = None) -> dict:
+        """Check many URLs concurrently. Returns url -> (is_live, status_code, notes)."""
+        urls = list(dict.fromkeys(urls))
+        results = await asyncio.gather(*(self.is_live(u, max_age) for u in urls))
+        return dict(zip(urls, results))
+
+    def cached(self, url: str, max_age: float | None = None) -> tuple | None:
+        """Fresh cached verdict for url, or None. Never touches the network."""
+        entry = self._cache.get(url)
+        if entry is None:
+            return None
+        age = time.monotonic() - entry["checked_at"]
+        if age > (self.ttl if max_age is None else max_age):
+            return None
+        return entry["result"]
+
+    async def refresh_stale(self, urls) -> dict:
+        """Re-check only the URLs whose cache entry is missing or past half its TTL."""
+        stale = [u for u in urls if self.cached(u, self.ttl / 2) is None]
+        if not stale:
+            return {}
+        return dict(zip(stale, await asyncio.gather(*(self._check(u) for u in stale))))
+
+    async def run_sweep(self, get_urls) -> None:
+        """Background loop keeping queued postings' liveness current.
+
+        get_urls: callable returning the URLs currently in the review queue.
+        """
+        while True:
+            await self.refresh_stale(get_urls())
+            await asyncio.sleep(self.sweep_interval)
+
+    async def _check(self, url: str) -> tuple:
+        entry = self._cache.get(url)
+        try:
+            # 1. HEAD: cheap 404/410 detection and validator comparison
+            head = await self.http.head(url, max_bytes=0)
+            if head.status in DEAD_STATUSES:
+                return self._store(url, (False, head.status, f"HTTP {head.status}"))
+            if entry is not None and head.status == 200 and self._unchanged(entry, head.headers):
+                return self._store(url, entry["result"], entry)
+
+            # 2. Conditional GET, reading only the first scan_kb of the body
+            headers = {}
+            if entry is not None and entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry is not None and entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+            resp = await self.http.get(url, headers=headers, max_bytes=self.scan_bytes)
+        except asyncio.TimeoutError:
+            return (False, 0, "Connection timed out — treat as potentially expired")
+        except aiohttp.ClientError as e:
+            return (False, 0, f"Connection error: {e}")
+
+        if resp.status == 304 and entry is not None:
+            return self._store(url, entry["result"], entry)
+        if resp.status in DEAD_STATUSES:
+            result = (False, resp.status, f"HTTP {resp.status}")
+        elif resp.status != 200:
+            result = (False, resp.status, f"Unexpected status {resp.status}")
+        else:
+            m = self.matcher.search(resp.text())
+            if m:
+                result = (False, resp.status, f"Expired signal: '{m.group(0)}'")
+            else:
+                result = (True, resp.status, "Live")
+        return self._store(url, result, resp.headers)
+
+    def _unchanged(self, entry: dict, headers: dict) -> bool:
+        etag = headers.get("ETag")
+        if etag and entry.get("etag"):
+            return etag == entry["etag"]
+        modified = headers.get("Last-Modified")
+        if modified and entry.get("last_modified"):
+            return modified == entry["last_modified"]
+        return False
+
+    def _store(self, url: str, result: tuple, validators: dict | None = None) -> tuple:
+        validators = validators or {}
+        self._cache[url] = {
+            "result": result,
+            "checked_at": time.monotonic(),
+            "etag": validators.get("ETag", validators.get("etag")),
+            "last_modified": validators.get("Last-Modified", validators.get("last_modified")),
+        }
+        return result
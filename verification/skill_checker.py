@@ -76,6 +76,8 @@ class SkillLevelChecker:
                         "skill": skill_name,
                         "claimed_level": claimed_level,
                         "profile_level": profile_level,
+                        "start": match.start(),
+                        "end": match.end(),
                         "message": (
                             f"Skill '{skill_name}' claimed as '{claimed_level}' "
                             f"but profile says '{profile_level}'"
@@ -56,20 +56,24 @@ class SourceMapper:
             entry = {"claim": claim, "match": best, "status": status}
 
             if status == "unmatched":
-                entry["issue"] = {
-                    "type": "UNGROUNDED_CLAIM",
-                    "severity": "HIGH",
-                    "message": (
-                        f"Line {claim.get('line_number', '?')}: "
-                        f"'{claim['text'][:80]}' — "
-                        f"best match: {best['entry_id']} at {best['score']:.2f}"
-                    ),
-                }
+                entry["issue"] = self.unmatched_issue(claim, best)
 
             results.append(entry)
 
         return results
 
+    def unmatched_issue(self, claim, best):
+        """UNGROUNDED_CLAIM issue for a claim whose best match is under threshold."""
+        return {
+            "type": "UNGROUNDED_CLAIM",
+            "severity": "HIGH",
+            "message": (
+                f"Line {claim.get('line_number', '?')}: "
+                f"'{claim['text'][:80]}' — "
+                f"best match: {best['entry_id']} at {best['score']:.2f}"
+            ),
+        }
+
     def _is_company_claim(self, text):
         """Heuristic: detect pure company-claim sentences in cover letters.
 
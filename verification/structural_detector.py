@@ -7,6 +7,8 @@ paragraph balance, and sentence uniformity.
 import re
 import spacy
 
+from common.markdown_ast import parse
+
 nlp = spacy.load("en_core_web_sm")
 
 
@@ -47,31 +49,9 @@ class StructuralAIDetector:
         A section break (header line) resets the run counter.
         """
         issues = []
-        lines = content.split('\n')
-
-        # Partition bullets by section
-        sections = []
-        current_section_bullets = []
-
-        for line in lines:
-            stripped = line.strip()
-            if stripped.startswith('#'):
-                # Section break — save current section and start new one
-                if current_section_bullets:
-                    sections.append(current_section_bullets)
-                current_section_bullets = []
-                continue
-            bullet_match = re.match(r'^[-*•]\s+(.+)$', stripped)
-            if bullet_match:
-                current_section_bullets.append(bullet_match.group(1))
-            elif stripped and not stripped.startswith('#'):
-                # Non-bullet, non-header line also breaks the section
-                if current_section_bullets:
-                    sections.append(current_section_bullets)
-                current_section_bullets = []
-
-        if current_section_bullets:
-            sections.append(current_section_bullets)
+        # Runs of consecutive bullets, from the shared parse: a header or any
+        # non-bullet line ends the run, so bullets are partitioned by section
+        sections = parse(content).bullet_runs()
 
         # Check each section independently
         for bullets in sections: